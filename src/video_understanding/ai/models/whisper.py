@@ -28,9 +28,13 @@ class WhisperModel(BaseModel):
     Whisper model. It supports multiple languages and includes speaker
     diarization.
 
+    Longer recordings, such as the audio track of a video, are split into
+    chunks and transcribed concurrently by
+    :class:`~video_understanding.ai.transcription.service.TranscriptionService`.
+
     Attributes:
         SUPPORTED_LANGUAGES: Set of supported language codes
-        MAX_AUDIO_LENGTH: Maximum audio length in seconds
+        MAX_AUDIO_LENGTH: Maximum audio length in seconds per request
         SAMPLE_RATE: Required audio sample rate
     """
 
@@ -0,0 +1,26 @@
+"""Transcription module for Video Understanding AI."""
+
+from .audio import (
+    AudioChunk,
+    AudioChunker,
+    EnergyVAD,
+    SpeechDetector,
+    TimelineMap,
+    compact_speech,
+    iter_audio,
+    write_wav,
+)
+from .service import TranscriptionService, merge_segments
+
+__all__ = [
+    "AudioChunk",
+    "AudioChunker",
+    "EnergyVAD",
+    "SpeechDetector",
+    "TimelineMap",
+    "compact_speech",
+    "iter_audio",
+    "write_wav",
+    "TranscriptionService",
+    "merge_segments",
+]
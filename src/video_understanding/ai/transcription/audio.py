@@ -0,0 +1,599 @@
+"""Audio extraction and silence-based chunking for transcription.
+
+Audio is decoded from the video as a stream of mono float32 blocks, so a
+long video never has its whole soundtrack in memory. The chunker groups the
+blocks into chunks of bounded length and cuts them in the middle of a pause
+found by a lightweight energy-based voice activity detector (VAD). When a
+window has no pause long enough, it is cut at the maximum length and the
+next chunk repeats the last ``overlap_seconds`` of audio so that words on
+the cut are heard whole by one of the two chunks.
+
+Before transcription, a speech detector can reduce a chunk to its speech
+intervals (see :func:`compact_speech`), so music beds and silence are not
+transcribed; a :class:`TimelineMap` maps times back to the original audio.
+"""
+
+import logging
+import wave
+from bisect import bisect_right
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from ..exceptions.whisper import AudioError
+
+try:
+    import av
+except ImportError:  # pragma: no cover - optional dependency
+    av = None
+
+logger = logging.getLogger(__name__)
+
+
+def iter_audio(
+    video_path: str | Path,
+    sample_rate: int = 16000,
+    block_seconds: float = 5.0,
+) -> Iterator[np.ndarray]:
+    """Stream the first audio track of a video as mono float32 samples.
+
+    Args:
+        video_path: Path to the video file
+        sample_rate: Output sample rate in Hz
+        block_seconds: Approximate length of each yielded block
+
+    Yields:
+        1-D float32 arrays of samples in [-1, 1]
+
+    Raises:
+        AudioError: If PyAV is not installed, the video has no audio track
+            or decoding fails
+    """
+    if av is None:
+        raise AudioError("Audio extraction requires PyAV ('av' is not installed)")
+
+    try:
+        container = av.open(str(video_path))
+    except (av.error.FFmpegError, OSError) as e:
+        raise AudioError(f"Failed to open video: {video_path}", cause=e) from e
+
+    with container:
+        if not container.streams.audio:
+            raise AudioError(f"Video has no audio track: {video_path}")
+        stream = container.streams.audio[0]
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=sample_rate)
+        block_size = max(1, int(block_seconds * sample_rate))
+        pending: list[np.ndarray] = []
+        pending_size = 0
+
+        try:
+            frames = container.decode(stream)
+            for frame in _with_flush(frames):
+                for resampled in resampler.resample(frame):
+                    samples = resampled.to_ndarray().reshape(-1)
+                    pending.append(samples)
+                    pending_size += len(samples)
+                    if pending_size >= block_size:
+                        yield np.concatenate(pending)
+                        pending, pending_size = [], 0
+        except av.error.FFmpegError as e:
+            raise AudioError(f"Failed to decode audio: {video_path}", cause=e) from e
+
+        if pending:
+            yield np.concatenate(pending)
+
+
+def _with_flush(frames: Iterator) -> Iterator:
+    """Append the None frame that flushes the resampler."""
+    yield from frames
+    yield None
+
+
+def write_wav(path: str | Path, samples: np.ndarray, sample_rate: int = 16000) -> Path:
+    """Write mono float samples as a 16-bit PCM WAV file.
+
+    Args:
+        path: Output file path
+        samples: 1-D float array of samples in [-1, 1]
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(path)
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as output:
+        output.setnchannels(1)
+        output.setsampwidth(2)
+        output.setframerate(sample_rate)
+        output.writeframes(pcm.tobytes())
+    return path
+
+
+class EnergyVAD:
+    """Energy-based detection of pauses in speech.
+
+    Audio is split into short frames whose RMS level is computed in one
+    vectorized pass. The silence threshold adapts to the recording: it sits
+    ``margin_db`` above the noise floor (a low percentile of frame levels)
+    but never within ``margin_db`` of the typical loud level, so constant
+    speech is not mistaken for silence. Frames quieter than ``floor_db`` are
+    always silent.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: float = 30.0,
+        margin_db: float = 10.0,
+        floor_db: float = -50.0,
+        min_silence_ms: float = 300.0,
+    ) -> None:
+        """Initialize the detector.
+
+        Args:
+            sample_rate: Sample rate of analyzed audio in Hz
+            frame_ms: Analysis frame length in milliseconds
+            margin_db: Distance of the threshold from the noise floor and
+                from the loud level in dB
+            floor_db: Level in dBFS below which a frame is always silent
+            min_silence_ms: Minimum length of a reported pause
+
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        if sample_rate <= 0 or frame_ms <= 0 or min_silence_ms <= 0:
+            raise ValueError(
+                "sample_rate, frame_ms and min_silence_ms must be positive"
+            )
+        if margin_db < 0:
+            raise ValueError("margin_db must not be negative")
+
+        self.sample_rate = sample_rate
+        self.frame_size = max(1, int(sample_rate * frame_ms / 1000))
+        self.margin_db = margin_db
+        self.floor_db = floor_db
+        self.min_silence_frames = max(1, int(np.ceil(min_silence_ms / frame_ms)))
+
+    def frame_levels(self, samples: np.ndarray) -> np.ndarray:
+        """RMS level of each complete analysis frame in dBFS.
+
+        Args:
+            samples: 1-D float array of samples
+
+        Returns:
+            Array with one level per frame
+        """
+        return self._levels(self._frames(samples))
+
+    def _frames(self, samples: np.ndarray) -> np.ndarray:
+        """View complete analysis frames as rows of a 2-D array."""
+        count = len(samples) // self.frame_size
+        frames = np.asarray(samples[: count * self.frame_size], dtype=np.float32)
+        return frames.reshape(count, self.frame_size)
+
+    @staticmethod
+    def _levels(frames: np.ndarray) -> np.ndarray:
+        """RMS level of frame rows in dBFS."""
+        rms = np.sqrt(np.mean(np.square(frames), axis=1))
+        return 20.0 * np.log10(np.maximum(rms, 1e-5))
+
+    def silent_frames(self, samples: np.ndarray) -> np.ndarray:
+        """Classify analysis frames as silent.
+
+        Args:
+            samples: 1-D float array of samples
+
+        Returns:
+            Boolean array with one entry per frame, True for silence
+        """
+        return self._silent(self.frame_levels(samples))
+
+    def _silent(self, levels: np.ndarray) -> np.ndarray:
+        """Apply the adaptive silence threshold to frame levels."""
+        if not len(levels):
+            return np.zeros(0, dtype=bool)
+        noise, loud = np.percentile(levels, [10, 90])
+        threshold = min(noise + self.margin_db, loud - self.margin_db)
+        return (levels < self.floor_db) | (levels < threshold)
+
+    def silences(self, samples: np.ndarray) -> list[tuple[int, int]]:
+        """Find pauses of at least the minimum length.
+
+        Args:
+            samples: 1-D float array of samples
+
+        Returns:
+            List of (start, end) sample offsets of pauses
+        """
+        runs = _runs(self.silent_frames(samples))
+        runs = runs[runs[:, 1] - runs[:, 0] >= self.min_silence_frames]
+        return [
+            (int(start) * self.frame_size, int(end) * self.frame_size)
+            for start, end in runs
+        ]
+
+
+class SpeechDetector(EnergyVAD):
+    """Finds speech in audio from frame energy and a spectral speech score.
+
+    A frame is speech when it is not silent by the energy criterion of
+    :class:`EnergyVAD` and its speech score reaches ``speech_threshold``.
+    The score is the share of the frame's spectral energy in the speech band
+    (300-3400 Hz) weighted by how tonal the spectrum is (one minus its
+    spectral flatness), which rejects broadband noise and most low or high
+    pitched music. Speech runs closer than ``merge_gap_ms`` are joined,
+    shorter runs than ``min_speech_ms`` dropped and the remaining intervals
+    padded so that word onsets and endings are kept.
+    """
+
+    SPEECH_BAND = (300.0, 3400.0)
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: float = 30.0,
+        margin_db: float = 10.0,
+        floor_db: float = -50.0,
+        speech_threshold: float = 0.35,
+        min_speech_ms: float = 250.0,
+        merge_gap_ms: float = 500.0,
+        padding_ms: float = 200.0,
+    ) -> None:
+        """Initialize the detector.
+
+        Args:
+            sample_rate: Sample rate of analyzed audio in Hz
+            frame_ms: Analysis frame length in milliseconds
+            margin_db: Distance of the silence threshold from the noise floor
+                and from the loud level in dB
+            floor_db: Level in dBFS below which a frame is always silent
+            speech_threshold: Minimum speech score (0-1) of a speech frame
+            min_speech_ms: Minimum length of a speech interval
+            merge_gap_ms: Pauses shorter than this do not split speech
+            padding_ms: Audio kept before and after each speech interval
+
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        super().__init__(sample_rate, frame_ms, margin_db, floor_db)
+        if not 0 <= speech_threshold <= 1:
+            raise ValueError("speech_threshold must be between 0 and 1")
+        if min_speech_ms < 0 or merge_gap_ms < 0 or padding_ms < 0:
+            raise ValueError(
+                "min_speech_ms, merge_gap_ms and padding_ms must not be negative"
+            )
+
+        self.speech_threshold = speech_threshold
+        self.min_speech_frames = int(np.ceil(min_speech_ms / frame_ms))
+        self.merge_gap_frames = int(np.ceil(merge_gap_ms / frame_ms))
+        self.padding_frames = int(np.ceil(padding_ms / frame_ms))
+
+        frequencies = np.fft.rfftfreq(self.frame_size, 1.0 / sample_rate)
+        low, high = self.SPEECH_BAND
+        self._band = (frequencies >= low) & (frequencies <= high)
+        self._window = np.hanning(self.frame_size).astype(np.float32)
+
+    def speech_scores(self, samples: np.ndarray) -> np.ndarray:
+        """Spectral speech score of each complete analysis frame.
+
+        Args:
+            samples: 1-D float array of samples
+
+        Returns:
+            Array with one score in [0, 1] per frame
+        """
+        return self._scores(self._frames(samples))
+
+    def speech_frames(self, samples: np.ndarray) -> np.ndarray:
+        """Classify analysis frames as speech, before smoothing.
+
+        Args:
+            samples: 1-D float array of samples
+
+        Returns:
+            Boolean array with one entry per frame, True for speech
+        """
+        frames = self._frames(samples)
+        loud = ~self._silent(self._levels(frames))
+        return loud & (self._scores(frames) >= self.speech_threshold)
+
+    def speech_intervals(self, samples: np.ndarray) -> list[tuple[int, int]]:
+        """Find speech intervals.
+
+        Args:
+            samples: 1-D float array of samples
+
+        Returns:
+            List of non-overlapping (start, end) sample offsets in order
+        """
+        runs = _runs(self.speech_frames(samples))
+        if not len(runs):
+            return []
+
+        # Join runs separated by short pauses, then drop short runs
+        gaps = runs[1:, 0] - runs[:-1, 1]
+        starts = np.concatenate(
+            ([0], np.flatnonzero(gaps >= self.merge_gap_frames) + 1)
+        )
+        ends = np.concatenate((starts[1:], [len(runs)])) - 1
+        runs = np.stack((runs[starts, 0], runs[ends, 1]), axis=1)
+        runs = runs[runs[:, 1] - runs[:, 0] >= self.min_speech_frames]
+
+        total = len(samples)
+        intervals: list[tuple[int, int]] = []
+        for start, end in runs:
+            start = max(0, int(start - self.padding_frames) * self.frame_size)
+            end = min(total, int(end + self.padding_frames) * self.frame_size)
+            if intervals and start <= intervals[-1][1]:
+                intervals[-1] = (intervals[-1][0], end)
+            else:
+                intervals.append((start, end))
+        return intervals
+
+    def _scores(self, frames: np.ndarray) -> np.ndarray:
+        """Speech score of frame rows."""
+        if not len(frames):
+            return np.zeros(0, dtype=np.float32)
+        power = np.square(np.abs(np.fft.rfft(frames * self._window, axis=1))) + 1e-12
+        band_share = power[:, self._band].sum(axis=1) / power.sum(axis=1)
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        return band_share * (1.0 - flatness)
+
+
+def _runs(mask: np.ndarray) -> np.ndarray:
+    """Find runs of True values.
+
+    Args:
+        mask: 1-D boolean array
+
+    Returns:
+        Array of shape (runs, 2) with the start and end index of each run
+    """
+    # Run boundaries are where the padded mask changes value
+    padded = np.concatenate(([0], mask.astype(np.int8), [0]))
+    return np.flatnonzero(np.diff(padded)).reshape(-1, 2)
+
+
+@dataclass
+class TimelineMap:
+    """Maps times in compacted audio back to the original audio.
+
+    Compacted audio is the speech intervals of a recording placed one after
+    another with a short pause between them.
+
+    Attributes:
+        pieces: (compacted start, original start, duration) in seconds of each
+            interval, in order
+        gap: Pause inserted between intervals in seconds
+    """
+
+    pieces: list[tuple[float, float, float]]
+    gap: float = 0.0
+
+    @property
+    def speech_duration(self) -> float:
+        """Total duration of the mapped intervals in seconds."""
+        return sum(duration for _, _, duration in self.pieces)
+
+    def to_original(self, time: float) -> float:
+        """Map a time in the compacted audio to the original audio.
+
+        Times in an inserted pause map to the end of the interval before it
+        if they lie in its first half and to the start of the next interval
+        otherwise.
+
+        Args:
+            time: Seconds from the start of the compacted audio
+
+        Returns:
+            Seconds from the start of the original audio
+        """
+        if not self.pieces:
+            return time
+        index = max(0, bisect_right([piece[0] for piece in self.pieces], time) - 1)
+        compact_start, original_start, duration = self.pieces[index]
+        offset = max(0.0, time - compact_start)
+        if offset <= duration:
+            return original_start + offset
+        if index + 1 < len(self.pieces) and offset - duration > self.gap / 2:
+            return self.pieces[index + 1][1]
+        return original_start + duration
+
+
+def compact_speech(
+    samples: np.ndarray,
+    intervals: list[tuple[int, int]],
+    sample_rate: int,
+    gap_seconds: float = 0.3,
+) -> tuple[np.ndarray, TimelineMap]:
+    """Place speech intervals one after another, separated by short pauses.
+
+    Args:
+        samples: 1-D float array of samples
+        intervals: (start, end) sample offsets of speech, in order
+        sample_rate: Sample rate in Hz
+        gap_seconds: Silence inserted between intervals
+
+    Returns:
+        Tuple of (compacted samples, map back to the original timeline)
+    """
+    gap = np.zeros(int(gap_seconds * sample_rate), dtype=np.float32)
+    parts: list[np.ndarray] = []
+    pieces: list[tuple[float, float, float]] = []
+    position = 0
+    for start, end in intervals:
+        if parts:
+            parts.append(gap)
+            position += len(gap)
+        parts.append(samples[start:end])
+        pieces.append(
+            (position / sample_rate, start / sample_rate, (end - start) / sample_rate)
+        )
+        position += end - start
+    compacted = (
+        np.concatenate(parts).astype(np.float32, copy=False) if parts else samples[:0]
+    )
+    return compacted, TimelineMap(pieces, len(gap) / sample_rate)
+
+
+@dataclass
+class AudioChunk:
+    """A chunk of audio cut for transcription.
+
+    Attributes:
+        index: Position of the chunk in the audio
+        start: Start time in seconds from the beginning of the audio
+        samples: Mono float32 samples
+        sample_rate: Sample rate in Hz
+        overlap: Seconds at the start of the chunk that repeat the end of the
+            previous chunk (0 when the chunk was cut at a pause)
+    """
+
+    index: int
+    start: float
+    samples: np.ndarray
+    sample_rate: int
+    overlap: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        """Chunk length in seconds."""
+        return len(self.samples) / self.sample_rate
+
+    @property
+    def end(self) -> float:
+        """End time in seconds from the beginning of the audio."""
+        return self.start + self.duration
+
+
+class AudioChunker:
+    """Cuts streamed audio into chunks of bounded length at pauses.
+
+    Example:
+        >>> chunker = AudioChunker(max_chunk_seconds=300)
+        >>> for block in iter_audio(video_path):
+        ...     for chunk in chunker.feed(block):
+        ...         transcribe(chunk)
+        >>> last = chunker.flush()
+    """
+
+    def __init__(
+        self,
+        max_chunk_seconds: float = 300.0,
+        min_chunk_seconds: float | None = None,
+        overlap_seconds: float = 1.0,
+        sample_rate: int = 16000,
+        vad: EnergyVAD | None = None,
+    ) -> None:
+        """Initialize the chunker.
+
+        Args:
+            max_chunk_seconds: Maximum chunk length
+            min_chunk_seconds: Earliest point of a chunk at which it may be
+                cut at a pause (defaults to half the maximum length)
+            overlap_seconds: Audio repeated at the start of a chunk that had
+                to be cut without a pause
+            sample_rate: Sample rate of fed audio in Hz
+            vad: Pause detector (an EnergyVAD for the sample rate by default)
+
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        if min_chunk_seconds is None:
+            min_chunk_seconds = max_chunk_seconds / 2
+        if not 0 < min_chunk_seconds <= max_chunk_seconds:
+            raise ValueError("chunk lengths must satisfy 0 < min <= max")
+        if not 0 <= overlap_seconds < min_chunk_seconds:
+            raise ValueError("overlap_seconds must be shorter than min_chunk_seconds")
+
+        self.sample_rate = sample_rate
+        self.max_samples = int(max_chunk_seconds * sample_rate)
+        self.min_samples = int(min_chunk_seconds * sample_rate)
+        self.overlap_samples = int(overlap_seconds * sample_rate)
+        self.vad = vad or EnergyVAD(sample_rate=sample_rate)
+        self._blocks: list[np.ndarray] = []
+        self._buffered = 0
+        self._offset = 0  # Sample position of the buffer start
+        self._overlap = 0  # Repeated samples at the buffer start
+        self._index = 0
+
+    def feed(self, samples: np.ndarray) -> list[AudioChunk]:
+        """Add streamed samples.
+
+        Args:
+            samples: 1-D float array of samples
+
+        Returns:
+            Chunks completed by the added samples
+        """
+        if len(samples):
+            self._blocks.append(samples)
+            self._buffered += len(samples)
+
+        chunks = []
+        while self._buffered >= self.max_samples:
+            buffer = (
+                np.concatenate(self._blocks)
+                if len(self._blocks) > 1
+                else self._blocks[0]
+            )
+            cut, resume = self._find_cut(buffer[: self.max_samples])
+            chunks.append(self._emit(buffer[:cut]))
+            self._offset += resume
+            self._overlap = cut - resume
+            remainder = buffer[resume:]
+            self._blocks = [remainder] if len(remainder) else []
+            self._buffered = len(remainder)
+        return chunks
+
+    def flush(self) -> AudioChunk | None:
+        """Emit the buffered tail of the audio.
+
+        Returns:
+            The last chunk, or None if nothing but repeated overlap is left
+        """
+        if self._buffered <= self._overlap:
+            return None
+        chunk = self._emit(np.concatenate(self._blocks))
+        self._blocks, self._buffered = [], 0
+        return chunk
+
+    def _find_cut(self, window: np.ndarray) -> tuple[int, int]:
+        """Choose where to cut a full window.
+
+        Args:
+            window: The first max_samples buffered samples
+
+        Returns:
+            Tuple of (chunk end, start of the next chunk) in samples
+        """
+        # Cut each pause in the allowed range as close to its middle as the
+        # range permits, and prefer the longest pause
+        candidates = [
+            (end - start, min(max((start + end) // 2, self.min_samples, start), end))
+            for start, end in self.vad.silences(window)
+            if end >= self.min_samples
+        ]
+        if candidates:
+            _, cut = max(candidates)
+            return cut, cut
+        return self.max_samples, self.max_samples - self.overlap_samples
+
+    def _emit(self, samples: np.ndarray) -> AudioChunk:
+        """Create the next chunk from the start of the buffer."""
+        chunk = AudioChunk(
+            index=self._index,
+            start=self._offset / self.sample_rate,
+            samples=samples.astype(np.float32, copy=False),
+            sample_rate=self.sample_rate,
+            overlap=self._overlap / self.sample_rate,
+        )
+        self._index += 1
+        logger.debug(
+            f"Audio chunk {chunk.index}: {chunk.start:.2f}s-{chunk.end:.2f}s"
+            f" (overlap {chunk.overlap:.2f}s)"
+        )
+        return chunk
@@ -0,0 +1,440 @@
+"""Chunked parallel transcription service for Video Understanding AI.
+
+The service streams audio out of a video, cuts it into chunks of bounded
+length at pauses (see :mod:`video_understanding.ai.transcription.audio`) and
+transcribes the chunks concurrently with a transcription model such as
+:class:`~video_understanding.ai.models.whisper.WhisperModel`. Audio
+extraction runs in a worker thread while earlier chunks are transcribed,
+and at most ``concurrency`` chunks are in flight at any time, which also
+bounds the temporary WAV files on disk.
+
+Only speech is sent to the model: a speech detector finds the speech
+intervals of each chunk, which are joined with short pauses between them,
+and chunks without speech are skipped. Transcription cost therefore scales
+with the amount of speech rather than the length of the video.
+
+Segments are mapped back onto the video timeline and merged in time order.
+Where a chunk had to be cut without a pause, the two chunks share
+``overlap_seconds`` of audio: the previous chunk keeps what starts before
+the middle of the overlap, the next chunk what starts after it, and words
+repeated across the boundary are dropped from the next chunk.
+"""
+
+import asyncio
+import logging
+import re
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from video_understanding.ai.exceptions.whisper import TranscriptionError
+from video_understanding.ai.models.base import BaseModel
+from video_understanding.ai.transcription.audio import (
+    AudioChunk,
+    AudioChunker,
+    EnergyVAD,
+    SpeechDetector,
+    TimelineMap,
+    compact_speech,
+    iter_audio,
+    write_wav,
+)
+
+logger = logging.getLogger(__name__)
+
+# Longest run of words compared when removing duplicates at a boundary
+MAX_BOUNDARY_WORDS = 8
+
+
+class TranscriptionService:
+    """Service for transcribing the audio track of videos in chunks.
+
+    Example:
+        >>> service = TranscriptionService(WhisperModel(api_key), concurrency=4)
+        >>> result = await service.transcribe("talk.mp4", language="en")
+        >>> print(result["text"])
+    """
+
+    def __init__(
+        self,
+        model: BaseModel,
+        max_chunk_seconds: float = 300.0,
+        min_chunk_seconds: float | None = None,
+        overlap_seconds: float = 1.0,
+        concurrency: int = 4,
+        sample_rate: int = 16000,
+        vad: EnergyVAD | None = None,
+        skip_non_speech: bool = True,
+        speech_detector: SpeechDetector | None = None,
+    ) -> None:
+        """Initialize the transcription service.
+
+        Args:
+            model: Transcription model; its process() takes an audio_path and
+                returns segments with start and end times in seconds
+            max_chunk_seconds: Maximum chunk length, capped at the model's
+                MAX_AUDIO_LENGTH if it has one
+            min_chunk_seconds: Earliest point of a chunk at which it may be
+                cut at a pause (defaults to half the maximum length)
+            overlap_seconds: Audio shared by chunks cut without a pause
+            concurrency: Maximum number of chunks transcribed at once
+            sample_rate: Sample rate of the extracted audio in Hz
+            vad: Pause detector used to place cuts
+            skip_non_speech: Whether only speech intervals are transcribed
+            speech_detector: Detector finding speech intervals (a
+                SpeechDetector for the sample rate by default)
+
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        model_limit = getattr(model, "MAX_AUDIO_LENGTH", None)
+        if model_limit:
+            max_chunk_seconds = min(max_chunk_seconds, model_limit)
+        # Validate the chunking parameters once up front
+        AudioChunker(
+            max_chunk_seconds, min_chunk_seconds, overlap_seconds, sample_rate, vad
+        )
+
+        self.model = model
+        self.max_chunk_seconds = max_chunk_seconds
+        self.min_chunk_seconds = min_chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.concurrency = concurrency
+        self.sample_rate = sample_rate
+        self.vad = vad
+        self.speech_detector = None
+        if skip_non_speech:
+            self.speech_detector = speech_detector or SpeechDetector(
+                sample_rate=sample_rate
+            )
+
+    async def transcribe(
+        self, video_path: str | Path, language: str = "en", **options: Any
+    ) -> dict[str, Any]:
+        """Transcribe the audio track of a video.
+
+        Args:
+            video_path: Path to the video file
+            language: Language code passed to the model
+            **options: Additional model options
+
+        Returns:
+            Dictionary containing:
+                - text: Full transcription text
+                - segments: Segments with start and end on the video timeline
+                - language: Language reported by the model
+                - duration: Audio duration in seconds
+                - speech_duration: Seconds of audio sent to the model
+                - chunks: Number of transcribed chunks
+
+        Raises:
+            AudioError: If the audio cannot be extracted
+            TranscriptionError: If a chunk fails to transcribe
+        """
+        chunker = AudioChunker(
+            self.max_chunk_seconds,
+            self.min_chunk_seconds,
+            self.overlap_seconds,
+            self.sample_rate,
+            self.vad,
+        )
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks: list[asyncio.Task] = []
+        skipped: list[tuple[AudioChunk, dict[str, Any]]] = []
+        duration = 0.0
+        speech_duration = 0.0
+
+        with tempfile.TemporaryDirectory(prefix="transcription_") as work_dir:
+
+            async def submit(chunk: AudioChunk) -> None:
+                # Waiting for a slot here pauses extraction while all
+                # workers are busy
+                nonlocal speech_duration
+                await slots.acquire()
+                path = Path(work_dir) / f"chunk_{chunk.index:05d}.wav"
+                try:
+                    timeline = await asyncio.to_thread(self._prepare_chunk, chunk, path)
+                except BaseException:
+                    slots.release()
+                    raise
+                # The samples are on disk now; keep only the chunk timing
+                timing = replace(chunk, samples=chunk.samples[:0])
+                if timeline is None:
+                    slots.release()
+                    skipped.append((timing, {"segments": []}))
+                    return
+                speech_duration += timeline.speech_duration
+                tasks.append(
+                    asyncio.create_task(
+                        self._transcribe_chunk(
+                            timing, path, timeline, language, options, slots
+                        )
+                    )
+                )
+
+            blocks = iter_audio(video_path, self.sample_rate)
+            try:
+                while (
+                    block := await asyncio.to_thread(next, blocks, None)
+                ) is not None:
+                    duration += len(block) / self.sample_rate
+                    for chunk in chunker.feed(block):
+                        await submit(chunk)
+                if (chunk := chunker.flush()) is not None:
+                    await submit(chunk)
+                results = list(await asyncio.gather(*tasks)) + skipped
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            finally:
+                blocks.close()
+
+        segments = merge_segments(results)
+        languages = [
+            data.get("language") for _, data in results if data.get("language")
+        ]
+        logger.info(
+            f"Transcribed {speech_duration:.1f}s of {duration:.1f}s of audio in "
+            f"{len(tasks)} of {len(results)} chunks ({len(segments)} segments)"
+        )
+        return {
+            "text": " ".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": languages[0] if languages else language,
+            "duration": duration,
+            "speech_duration": speech_duration,
+            "chunks": len(results),
+        }
+
+    def _prepare_chunk(self, chunk: AudioChunk, path: Path) -> TimelineMap | None:
+        """Write the audio of a chunk that should be transcribed.
+
+        Args:
+            chunk: Chunk to prepare
+            path: WAV file to write
+
+        Returns:
+            Map from times in the written audio to times in the chunk, or
+            None if the chunk has no speech and nothing was written
+        """
+        if self.speech_detector is None:
+            write_wav(path, chunk.samples, chunk.sample_rate)
+            return TimelineMap([(0.0, 0.0, chunk.duration)])
+
+        intervals = self.speech_detector.speech_intervals(chunk.samples)
+        if not intervals:
+            logger.debug(f"No speech in audio chunk {chunk.index}, skipping it")
+            return None
+        samples, timeline = compact_speech(chunk.samples, intervals, chunk.sample_rate)
+        write_wav(path, samples, chunk.sample_rate)
+        return timeline
+
+    async def _transcribe_chunk(
+        self,
+        chunk: AudioChunk,
+        path: Path,
+        timeline: TimelineMap,
+        language: str,
+        options: dict[str, Any],
+        slots: asyncio.Semaphore,
+    ) -> tuple[AudioChunk, dict[str, Any]]:
+        """Transcribe one chunk and release its slot.
+
+        Args:
+            chunk: Chunk metadata
+            path: WAV file holding the chunk audio
+            timeline: Map from times in the WAV file to times in the chunk
+            language: Language code
+            options: Additional model options
+            slots: Semaphore bounding concurrent chunks
+
+        Returns:
+            Tuple of (chunk, transcription data with times relative to the
+            chunk)
+
+        Raises:
+            TranscriptionError: If the model fails
+        """
+        try:
+            result = await self.model.process(
+                {"audio_path": str(path), "language": language, "options": options}
+            )
+            data = result.get("data", result)
+            segments = [
+                _remap(segment, timeline) for segment in data.get("segments", [])
+            ]
+            return chunk, {**data, "segments": segments}
+        except Exception as e:
+            raise TranscriptionError(
+                f"Transcription of chunk {chunk.index} "
+                f"({chunk.start:.1f}s) failed: {e!s}",
+                cause=e,
+            ) from e
+        finally:
+            path.unlink(missing_ok=True)
+            slots.release()
+
+
+def merge_segments(
+    results: list[tuple[AudioChunk, dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """Merge per-chunk segments onto one timeline.
+
+    Args:
+        results: (chunk, transcription data) pairs; segment and word times
+            are relative to their chunk
+
+    Returns:
+        Segments in time order with times relative to the audio start
+    """
+    merged: list[dict[str, Any]] = []
+    for chunk, data in sorted(results, key=lambda item: item[0].start):
+        segments = [
+            _shift(segment, chunk.start) for segment in data.get("segments", [])
+        ]
+        # A chunk without segments leaves the overlap to the previous one
+        if chunk.overlap and merged and segments:
+            boundary = chunk.start + chunk.overlap / 2
+            merged = [s for s in (_clip(s, end=boundary) for s in merged) if s]
+            segments = [s for s in (_clip(s, start=boundary) for s in segments) if s]
+            _drop_repeated_words(merged, segments)
+        merged.extend(segments)
+    return merged
+
+
+def _remap(segment: dict[str, Any], timeline: TimelineMap) -> dict[str, Any]:
+    """Copy a segment with its times mapped through a timeline map."""
+    remapped = {
+        **segment,
+        "start": timeline.to_original(segment["start"]),
+        "end": timeline.to_original(segment["end"]),
+    }
+    if segment.get("words"):
+        remapped["words"] = [
+            {
+                **word,
+                "start": timeline.to_original(word["start"]),
+                "end": timeline.to_original(word["end"]),
+            }
+            for word in segment["words"]
+        ]
+    return remapped
+
+
+def _shift(segment: dict[str, Any], offset: float) -> dict[str, Any]:
+    """Copy a segment with its times moved by an offset."""
+    shifted = {
+        **segment,
+        "start": segment["start"] + offset,
+        "end": segment["end"] + offset,
+    }
+    if segment.get("words"):
+        shifted["words"] = [
+            {**word, "start": word["start"] + offset, "end": word["end"] + offset}
+            for word in segment["words"]
+        ]
+    return shifted
+
+
+def _clip(
+    segment: dict[str, Any], start: float | None = None, end: float | None = None
+) -> dict[str, Any] | None:
+    """Keep the part of a segment on one side of an overlap boundary.
+
+    Segments with word timings are split between words; others are kept or
+    dropped whole by where their midpoint lies.
+
+    Args:
+        segment: Segment to clip
+        start: Keep what starts at or after this time
+        end: Keep what starts before this time
+
+    Returns:
+        The clipped segment, or None if nothing is kept
+    """
+
+    def keep(first: float, last: float) -> bool:
+        point = (first + last) / 2
+        return (start is None or point >= start) and (end is None or point < end)
+
+    words = segment.get("words")
+    if not words:
+        return segment if keep(segment["start"], segment["end"]) else None
+
+    kept = [word for word in words if keep(word["start"], word["end"])]
+    if not kept:
+        return None
+    if len(kept) == len(words):
+        return segment
+    return _with_words(segment, kept)
+
+
+def _with_words(segment: dict[str, Any], words: list[dict[str, Any]]) -> dict[str, Any]:
+    """Copy a segment restricted to some of its words."""
+    return {
+        **segment,
+        "start": words[0]["start"],
+        "end": words[-1]["end"],
+        "text": " ".join(word["word"].strip() for word in words),
+        "words": words,
+    }
+
+
+def _tokens(text: str) -> list[str]:
+    """Split text into words normalized for comparison.
+
+    Punctuation is removed within each word rather than used to split, so
+    the tokens line up with ``text.split()``.
+    """
+    return [re.sub(r"[^\w'-]", "", word) for word in text.lower().split()]
+
+
+def _drop_repeated_words(
+    previous: list[dict[str, Any]], following: list[dict[str, Any]]
+) -> None:
+    """Remove words at the start of a chunk that repeat the previous chunk.
+
+    Models place words near a cut imprecisely, so both chunks may still
+    transcribe the same words after clipping at the boundary. The longest
+    run of words that ends the previous chunk and starts the next one is
+    removed from the next one.
+
+    Args:
+        previous: Merged segments so far (not modified)
+        following: Segments of the next chunk, modified in place
+    """
+    if not previous or not following:
+        return
+    tail = _tokens(previous[-1]["text"])[-MAX_BOUNDARY_WORDS:]
+    head = following[0]
+    words = head.get("words")
+    head_tokens = (
+        [" ".join(_tokens(w["word"])) for w in words]
+        if words
+        else _tokens(head["text"])
+    )
+    tail = [token for token in tail if token]
+
+    repeated = 0
+    for size in range(min(len(tail), len(head_tokens)), 0, -1):
+        if tail[-size:] == head_tokens[:size]:
+            repeated = size
+            break
+    if not repeated:
+        return
+
+    if words:
+        rest = words[repeated:]
+        replacement = _with_words(head, rest) if rest else None
+    else:
+        rest_text = head["text"].split()[repeated:]
+        replacement = {**head, "text": " ".join(rest_text)} if rest_text else None
+    if replacement is None:
+        following.pop(0)
+    else:
+        following[0] = replacement
@@ -0,0 +1,274 @@
+"""Parallel frame export.
+
+Writing extracted frames with cv2.imwrite inside the decode loop makes every
+frame wait for its own JPEG encode. FrameWriter moves resizing and encoding
+to a thread pool instead (OpenCV releases the GIL while encoding) so decoding
+carries on while earlier frames are written:
+
+- Images are written as JPEG, WebP or PNG with configurable quality, or
+  appended to a single raw ``.npy`` stack.
+- Frames are optionally downscaled to fit a maximum size.
+- At most ``queue_size`` frames wait for encoding, which bounds memory; the
+  decoder only blocks when encoding falls that far behind.
+- Paths are returned in the order frames were written.
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO
+
+import cv2
+import numpy as np
+
+from .exceptions import ProcessingError
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("jpeg", "webp", "png", "npy")
+
+_EXTENSIONS = {"jpeg": ".jpg", "webp": ".webp", "png": ".png", "npy": ".npy"}
+
+# Space reserved for the .npy header of a stack, filled in on close
+_NPY_HEADER_SIZE = 128
+
+
+def _npy_header(shape: tuple[int, ...], dtype: np.dtype) -> bytes:
+    """Build a fixed-size version 1.0 .npy header.
+
+    Args:
+        shape: Array shape
+        dtype: Array dtype
+
+    Returns:
+        Header bytes padded to _NPY_HEADER_SIZE
+    """
+    header = repr(
+        {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": shape,
+        }
+    )
+    prefix = np.lib.format.magic(1, 0)
+    length = _NPY_HEADER_SIZE - len(prefix) - 2
+    if len(header) + 1 > length:
+        raise ProcessingError(f"Frame stack shape {shape} is too large for header")
+    header = header.ljust(length - 1) + "\n"
+    return prefix + length.to_bytes(2, "little") + header.encode("latin1")
+
+
+class FrameWriter:
+    """Writes frames to disk on a thread pool.
+
+    Example:
+        >>> with FrameWriter(output_dir, image_format="webp", quality=80,
+        ...                  max_size=(320, 180)) as writer:
+        ...     for number, frame in frames:
+        ...         writer.write(frame, number)
+        >>> paths = writer.paths
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        image_format: str = "jpeg",
+        quality: int = 95,
+        png_compression: int = 3,
+        max_size: tuple[int, int] | None = None,
+        workers: int = 4,
+        queue_size: int = 16,
+        prefix: str = "frame",
+    ) -> None:
+        """Initialize the frame writer.
+
+        Args:
+            output_dir: Directory to write frames to
+            image_format: "jpeg", "webp", "png", or "npy" to append all frames
+                to one stack file
+            quality: JPEG or WebP quality (1 to 100)
+            png_compression: PNG compression level (0 to 9)
+            max_size: Maximum (width, height); larger frames are downscaled
+                keeping their aspect ratio
+            workers: Number of encoding threads
+            queue_size: Maximum frames waiting to be written
+            prefix: File name prefix
+
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        if image_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown image format: {image_format}")
+        if not 1 <= quality <= 100:
+            raise ValueError("quality must be between 1 and 100")
+        if not 0 <= png_compression <= 9:
+            raise ValueError("png_compression must be between 0 and 9")
+        if max_size is not None and min(max_size) < 1:
+            raise ValueError("max_size must be positive")
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers and queue_size must be positive")
+
+        self.output_dir = Path(output_dir)
+        self.image_format = image_format
+        self.max_size = max_size
+        self.prefix = prefix
+        self.paths: list[Path] = []
+        self._params = {
+            "jpeg": [cv2.IMWRITE_JPEG_QUALITY, quality],
+            "webp": [cv2.IMWRITE_WEBP_QUALITY, quality],
+            "png": [cv2.IMWRITE_PNG_COMPRESSION, png_compression],
+            "npy": [],
+        }[image_format]
+
+        # A stack is appended to in frame order, so it gets a single thread
+        self._executor = ThreadPoolExecutor(
+            max_workers=1 if image_format == "npy" else workers,
+            thread_name_prefix="frame-writer",
+        )
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._pending: deque[Future] = deque()
+        self._closed = False
+
+        self._stack: BinaryIO | None = None
+        self._stack_shape: tuple[int, ...] | None = None
+        self._stack_dtype: np.dtype | None = None
+        self._stack_count = 0
+
+    def __enter__(self) -> "FrameWriter":
+        """Enter context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Wait for pending writes and release the thread pool.
+
+        If the block raised, a failure to close is only logged, so it does
+        not replace the original exception.
+        """
+        if exc_type is None:
+            self.close()
+            return
+        try:
+            self.close()
+        except Exception as e:
+            logger.warning(f"Failed to close frame writer: {e}")
+
+    def write(self, frame: np.ndarray, index: int, name: str | None = None) -> Path:
+        """Queue a frame for writing.
+
+        The frame must not be modified until it is written. Blocks while
+        ``queue_size`` frames are waiting.
+
+        Args:
+            frame: Frame as numpy array (BGR for image formats)
+            index: Frame index used in the file name
+            name: File name stem to use instead of the prefix and index
+
+        Returns:
+            Path the frame is written to (the stack file for "npy")
+
+        Raises:
+            ProcessingError: If the writer is closed or an earlier write failed
+        """
+        if self._closed:
+            raise ProcessingError("Frame writer is closed")
+        self._raise_failed()
+
+        if self.image_format == "npy":
+            path = self.output_dir / f"{self.prefix}s.npy"
+            if not self.paths:
+                self.paths.append(path)
+        else:
+            stem = name or f"{self.prefix}_{index:06d}"
+            path = self.output_dir / f"{stem}{_EXTENSIONS[self.image_format]}"
+            self.paths.append(path)
+
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(self._write_frame, frame, path)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._pending.append(future)
+        return path
+
+    def close(self) -> list[Path]:
+        """Wait for all pending writes.
+
+        Returns:
+            Written paths in write order
+
+        Raises:
+            ProcessingError: If any write failed
+        """
+        if self._closed:
+            return self.paths
+        self._closed = True
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        except Exception as e:
+            raise ProcessingError(f"Failed to write frame: {e}") from e
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._finish_stack()
+        return self.paths
+
+    def _raise_failed(self) -> None:
+        """Drop finished writes, raising the first failure."""
+        while self._pending and self._pending[0].done():
+            error = self._pending.popleft().exception()
+            if error is not None:
+                raise ProcessingError(f"Failed to write frame: {error}") from error
+
+    def _resize(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale a frame to fit max_size."""
+        if self.max_size is None:
+            return frame
+        max_width, max_height = self.max_size
+        height, width = frame.shape[:2]
+        scale = min(max_width / width, max_height / height)
+        if scale >= 1:
+            return frame
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    def _write_frame(self, frame: np.ndarray, path: Path) -> None:
+        """Resize and encode one frame (runs on the thread pool)."""
+        frame = self._resize(frame)
+        if self.image_format == "npy":
+            self._append_to_stack(frame, path)
+        elif not cv2.imwrite(str(path), frame, self._params):
+            raise ProcessingError(f"Could not encode frame to {path}")
+
+    def _append_to_stack(self, frame: np.ndarray, path: Path) -> None:
+        """Append a frame to the .npy stack file (single writer thread)."""
+        if self._stack is None:
+            self._stack = open(path, "wb")
+            self._stack.write(b"\0" * _NPY_HEADER_SIZE)
+            self._stack_shape = frame.shape
+            self._stack_dtype = frame.dtype
+        elif frame.shape != self._stack_shape or frame.dtype != self._stack_dtype:
+            raise ProcessingError(
+                f"Frame shape {frame.shape} does not match stack shape "
+                f"{self._stack_shape}"
+            )
+        self._stack.write(np.ascontiguousarray(frame).tobytes())
+        self._stack_count += 1
+
+    def _finish_stack(self) -> None:
+        """Write the stack header now that the frame count is known."""
+        if self._stack is None:
+            return
+        try:
+            self._stack.seek(0)
+            self._stack.write(
+                _npy_header(
+                    (self._stack_count, *self._stack_shape), self._stack_dtype
+                )
+            )
+        finally:
+            self._stack.close()
+            self._stack = None
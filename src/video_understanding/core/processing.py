@@ -31,6 +31,7 @@ if TYPE_CHECKING:
 
 # Local imports
 from ..core.exceptions import ProcessingError, ValidationError
+from ..core.frame_export import FrameWriter
 from ..models.scene import Scene
 from ..models.video import Video
 
@@ -224,16 +225,29 @@ def process_video(video_path: str) -> VideoResults:
         raise ProcessingError(f"Failed to process video: {e}") from e
 
 
-def extract_frames(video: Video, output_dir: Path, interval: float = 1.0) -> list[Path]:
+def extract_frames(
+    video: Video,
+    output_dir: Path,
+    interval: float = 1.0,
+    image_format: str = "jpeg",
+    quality: int = 95,
+    max_size: tuple[int, int] | None = None,
+) -> list[Path]:
     """Extract frames from a video at specified intervals.
 
+    Frames are encoded and written on a thread pool while decoding continues.
+
     Args:
         video: Video to extract frames from
         output_dir: Directory to save extracted frames
         interval: Time interval between frames in seconds
+        image_format: "jpeg", "webp", "png", or "npy" to save all frames in
+            one stack file
+        quality: JPEG or WebP quality (1 to 100)
+        max_size: Maximum (width, height) to downscale frames to
 
     Returns:
-        List of paths to extracted frame images
+        List of paths to extracted frame images, in frame order
 
     Raises:
         src.core.exceptions.ProcessingError: If frame extraction fails
@@ -242,23 +256,23 @@ def extract_frames(video: Video, output_dir: Path, interval: float = 1.0) -> lis
         cap = cv2.VideoCapture(str(video.file_info.file_path))
         fps = cap.get(cv2.CAP_PROP_FPS)
         frame_interval = int(fps * interval)
-        frame_paths: list[Path] = []
 
         frame_count = 0
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
+        with FrameWriter(
+            output_dir, image_format=image_format, quality=quality, max_size=max_size
+        ) as writer:
+            while cap.isOpened():
+                ret, frame = cap.read()
+                if not ret:
+                    break
 
-            if frame_count % frame_interval == 0:
-                frame_path = output_dir / f"frame_{frame_count:06d}.jpg"
-                cv2.imwrite(str(frame_path), frame)
-                frame_paths.append(frame_path)
+                if frame_count % frame_interval == 0:
+                    writer.write(frame, frame_count)
 
-            frame_count += 1
+                frame_count += 1
 
         cap.release()
-        return frame_paths
+        return writer.paths
     except Exception as e:
         raise ProcessingError(f"Failed to extract frames: {e}") from e
 
@@ -31,6 +31,8 @@ from ...types.cv2 import (
     create_video_capture,
 )
 from ..config import ProcessingConfig
+from ..decoder import FrameDecoder
+from ..frame_export import FrameWriter
 from ..exceptions import ProcessingError, VideoProcessingError
 from .pipeline import ProcessingPipeline, analyze_scene
 
@@ -177,43 +179,77 @@ def process_video(video: Video, output_dir: Path | None = None) -> dict[str, Any
         raise ProcessingError(f"Failed to process video: {e!s}")
 
 
-def extract_frames(video: Video, output_dir: Path) -> list[Path]:
+def extract_frames(
+    video: Video,
+    output_dir: Path,
+    profile: str = "full",
+    image_format: str = "jpeg",
+    quality: int = 95,
+    max_size: tuple[int, int] | None = None,
+    workers: int = 4,
+) -> list[Path]:
     """Extract frames from video at regular intervals.
 
+    Frames are encoded and written on a thread pool while decoding continues.
+
     Args:
         video: Video object containing file information
         output_dir: Directory to save extracted frames
+        profile: "full" saves every 30th frame. "fast" saves keyframes only,
+            skipping decode of all other frames.
+        image_format: "jpeg", "webp", "png", or "npy" to save all frames in
+            one stack file
+        quality: JPEG or WebP quality (1 to 100)
+        max_size: Maximum (width, height) to downscale frames to
+        workers: Number of encoding threads
 
     Returns:
-        List of paths to extracted frame images
+        List of paths to extracted frame images, in frame order
 
     Raises:
         ProcessingError: If frame extraction fails
     """
     try:
-        cap = cv2.VideoCapture(str(video.file_info.file_path))
-        if not cap.isOpened():
-            raise ProcessingError(
-                f"Could not open video file: {video.file_info.file_path}"
-            )
+        writer = FrameWriter(
+            output_dir,
+            image_format=image_format,
+            quality=quality,
+            max_size=max_size,
+            workers=workers,
+        )
+    except ValueError as e:
+        raise ProcessingError(f"Failed to extract frames: {e!s}")
 
-        frame_paths: list[Path] = []
-        frame_count = 0
+    if profile == "fast":
+        try:
+            with writer:
+                for decoded in FrameDecoder(video.file_info.file_path, profile="fast"):
+                    writer.write(decoded.image, decoded.index)
+            return writer.paths
+        except Exception as e:
+            raise ProcessingError(f"Failed to extract frames: {e!s}")
 
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
+    try:
+        with writer:
+            cap = cv2.VideoCapture(str(video.file_info.file_path))
+            if not cap.isOpened():
+                raise ProcessingError(
+                    f"Could not open video file: {video.file_info.file_path}"
+                )
 
-            # Save every 30th frame (adjust as needed)
-            if frame_count % 30 == 0:
-                frame_path = output_dir / f"frame_{frame_count:06d}.jpg"
-                cv2.imwrite(str(frame_path), frame)
-                frame_paths.append(frame_path)
+            frame_count = 0
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
 
-            frame_count += 1
+                # Save every 30th frame (adjust as needed)
+                if frame_count % 30 == 0:
+                    writer.write(frame, frame_count)
+
+                frame_count += 1
 
-        return frame_paths
+        return writer.paths
 
     except Exception as e:
         raise ProcessingError(f"Failed to extract frames: {e!s}")
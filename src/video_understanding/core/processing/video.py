@@ -5,8 +5,17 @@ This module provides the core video processing functionality including:
 - Text detection
 - Audio transcription
 - Scene detection
+
+Frames are streamed: extract_frames() is a generator and process_video()
+hands each frame to every consumer before the next one is decoded, so memory
+stays bounded by a single frame regardless of video length. Results refer to
+frames by index and timestamp rather than holding their pixels.
 """
 
+import asyncio
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -16,6 +25,7 @@ from PIL import Image
 import os
 import psutil
 
+from ..decoder import DecodedFrame, FrameDecoder
 from ..exceptions import (
     ValidationError,
     VideoProcessingError,
@@ -39,13 +49,22 @@ class VideoProcessor:
         concurrent_limit: Maximum allowed number of concurrent processing jobs
     """
 
-    def __init__(self, metrics_tracker: MetricsTracker | None = None):
+    def __init__(
+        self,
+        metrics_tracker: MetricsTracker | None = None,
+        transcriber: Any | None = None,
+    ):
         """Initialize the VideoProcessor.
 
         Args:
             metrics_tracker: Optional metrics tracker instance
+            transcriber: Optional transcription service with an async
+                transcribe(video_path) method, such as
+                ai.transcription.service.TranscriptionService; without one
+                transcription results are empty
         """
         self.metrics_tracker = metrics_tracker or MetricsTracker()
+        self.transcriber = transcriber
         self.supported_formats = [".mp4", ".avi", ".mov"]
         self.max_file_size = 2 * 1024 * 1024 * 1024  # 2GB
         self.memory_limit = 4 * 1024 * 1024 * 1024  # 4GB
@@ -115,7 +134,9 @@ class VideoProcessor:
             options: Dictionary of processing options
 
         Returns:
-            Dict containing processing results
+            Dict containing processing results: "frames" holds the index and
+            timestamp of each sampled frame, "text_results" the detected text
+            per frame and "audio_results" the transcription
 
         Raises:
             VideoProcessingError: If processing fails
@@ -131,11 +152,16 @@ class VideoProcessor:
                 # Validate input
                 self.validate_video(video_path)
 
-                # Extract frames
-                frames = self.extract_frames(video_path, options)
-
-                # Detect text in frames
-                text_results = self.detect_text(frames)
+                # Stream frames through the per-frame consumers; each frame
+                # is released once all of them have used it
+                frames: list[dict[str, Any]] = []
+                text_results = list(
+                    self.iter_text(
+                        self._record_frames(
+                            self.extract_frames(video_path, options), frames
+                        )
+                    )
+                )
 
                 # Transcribe audio
                 audio_results = self.transcribe_audio(video_path)
@@ -155,56 +181,123 @@ class VideoProcessor:
             if hasattr(self, "metrics_tracker") and self.metrics_tracker:
                 self.metrics_tracker.decrement_active_count()
 
+    @staticmethod
+    def _record_frames(
+        frames: Iterable[DecodedFrame], references: list[dict[str, Any]]
+    ) -> Iterator[DecodedFrame]:
+        """Pass frames through, recording the index and timestamp of each.
+
+        Args:
+            frames: Decoded frames
+            references: List the frame references are appended to
+
+        Yields:
+            The input frames
+        """
+        for frame in frames:
+            references.append({"index": frame.index, "timestamp": frame.timestamp})
+            yield frame
+
     def extract_frames(
         self, video_path: str, options: dict[str, Any] | None = None
-    ) -> list[np.ndarray]:
+    ) -> Iterator[DecodedFrame]:
         """Extract frames from video file.
 
+        Frames are decoded lazily as the generator is consumed. Frames between
+        samples are skipped without being converted to images.
+
+        The frame_extraction_time metric counts decoding only, not the time
+        the consumer spends between frames, and is recorded once the
+        generator is exhausted, fails or is closed.
+
         Args:
             video_path: Path to the video file
-            options: Dictionary of extraction options
+            options: Dictionary of extraction options. Supported keys are
+                "frame_interval" (seconds between frames) and "decode_profile"
+                ("full", or "fast" to return keyframes only)
 
-        Returns:
-            List of extracted frames as numpy arrays
+        Yields:
+            Extracted frames with their index and timestamp
 
         Raises:
             VideoProcessingError: If frame extraction fails
         """
+        frames = self._decode_frames(video_path, options or {})
+        elapsed = 0.0
+        error = None
         try:
-            with PerformanceTimer(self.metrics_tracker, "frame_extraction_time"):
-                options = options or {}
-                frame_interval = options.get("frame_interval", 1)  # seconds
+            while True:
+                started = time.perf_counter()
+                try:
+                    frame = next(frames, None)
+                finally:
+                    elapsed += time.perf_counter() - started
+                if frame is None:
+                    return
+                yield frame
 
-                cap = cv2.VideoCapture(video_path)
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                frame_skip = int(fps * frame_interval)
+        except Exception as e:
+            error = str(e)
+            raise VideoProcessingError(
+                f"Frame extraction failed: {e!s}", video_path=video_path
+            ) from e
+        finally:
+            frames.close()
+            self.metrics_tracker.record_metric(
+                "frame_extraction_time", elapsed, context={"error": error}
+            )
 
-                frames = []
-                frame_count = 0
+    @staticmethod
+    def _decode_frames(
+        video_path: str, options: dict[str, Any]
+    ) -> Iterator[DecodedFrame]:
+        """Decode the sampled frames of a video.
 
-                while cap.isOpened():
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
+        Args:
+            video_path: Path to the video file
+            options: Extraction options, see extract_frames()
 
-                    if frame_count % frame_skip == 0:
-                        frames.append(frame)
+        Yields:
+            Sampled frames with their index and timestamp
+        """
+        frame_interval = options.get("frame_interval", 1)  # seconds
 
-                    frame_count += 1
+        if options.get("decode_profile", "full") == "fast":
+            yield from FrameDecoder(video_path, profile="fast")
+            return
 
-                cap.release()
-                return frames
+        cap = cv2.VideoCapture(video_path)
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            frame_skip = max(1, int(fps * frame_interval))
+            frame_count = 0
 
-        except Exception as e:
-            raise VideoProcessingError(
-                f"Frame extraction failed: {e!s}", video_path=video_path
-            ) from e
+            while cap.isOpened():
+                if not cap.grab():
+                    break
 
-    def detect_text(self, frames: list[np.ndarray]) -> list[dict[str, Any]]:
+                if frame_count % frame_skip == 0:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        break
+                    yield DecodedFrame(
+                        index=frame_count,
+                        timestamp=frame_count / fps,
+                        image=frame,
+                    )
+
+                frame_count += 1
+        finally:
+            cap.release()
+
+    def detect_text(
+        self, frames: Iterable[np.ndarray | DecodedFrame]
+    ) -> list[dict[str, Any]]:
         """Detect text in video frames.
 
         Args:
-            frames: List of video frames as numpy arrays
+            frames: Video frames as numpy arrays or decoded frames, e.g. the
+                generator returned by extract_frames()
 
         Returns:
             List of dictionaries containing detected text and positions
@@ -212,32 +305,90 @@ class VideoProcessor:
         Raises:
             VideoProcessingError: If text detection fails
         """
-        try:
-            with PerformanceTimer(self.metrics_tracker, "text_detection_time"):
-                results = []
+        return list(self.iter_text(frames))
 
-                for frame in frames:
-                    # Convert frame to PIL Image for OCR
-                    pil_image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    def iter_text(
+        self, frames: Iterable[np.ndarray | DecodedFrame]
+    ) -> Iterator[dict[str, Any]]:
+        """Detect text in a stream of video frames.
 
-                    # TODO: Implement actual OCR using preferred library
-                    # This is a placeholder for the actual implementation
-                    text_result = {
-                        "text": "",
-                        "confidence": 0.0,
-                        "position": {"x": 0, "y": 0, "width": 0, "height": 0},
-                    }
+        Each frame is only referenced while its result is produced.
 
-                    results.append(text_result)
+        The text_detection_time metric counts detection only, not the time
+        spent producing or consuming frames, and is recorded once the
+        generator is exhausted, fails or is closed.
+
+        Args:
+            frames: Video frames as numpy arrays or decoded frames
 
-                return results
+        Yields:
+            Dictionaries containing detected text and positions. Results for
+            decoded frames also carry the frame index and timestamp.
+
+        Raises:
+            VideoProcessingError: If text detection fails
+        """
+        elapsed = 0.0
+        error = None
+        try:
+            for frame in frames:
+                started = time.perf_counter()
+                image = frame.image if isinstance(frame, DecodedFrame) else frame
+
+                # Convert frame to PIL Image for OCR
+                pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+                # TODO: Implement actual OCR using preferred library
+                # This is a placeholder for the actual implementation
+                text_result = {
+                    "text": "",
+                    "confidence": 0.0,
+                    "position": {"x": 0, "y": 0, "width": 0, "height": 0},
+                }
+                if isinstance(frame, DecodedFrame):
+                    text_result["frame_index"] = frame.index
+                    text_result["timestamp"] = frame.timestamp
+
+                elapsed += time.perf_counter() - started
+                yield text_result
 
         except Exception as e:
+            error = str(e)
             raise VideoProcessingError(f"Text detection failed: {e!s}") from e
+        finally:
+            self.metrics_tracker.record_metric(
+                "text_detection_time", elapsed, context={"error": error}
+            )
 
     def transcribe_audio(self, video_path: str) -> dict[str, Any]:
         """Transcribe audio from video file.
 
+        May be called from inside a running event loop, in which case the
+        transcription runs on its own loop in a worker thread. Async callers
+        should await transcribe_audio_async() instead.
+
+        Args:
+            video_path: Path to the video file
+
+        Returns:
+            Dictionary containing transcription results
+
+        Raises:
+            VideoProcessingError: If transcription fails
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.transcribe_audio_async(video_path))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(
+                asyncio.run, self.transcribe_audio_async(video_path)
+            ).result()
+
+    async def transcribe_audio_async(self, video_path: str) -> dict[str, Any]:
+        """Transcribe audio from video file on the running event loop.
+
         Args:
             video_path: Path to the video file
 
@@ -249,16 +400,28 @@ class VideoProcessor:
         """
         try:
             with PerformanceTimer(self.metrics_tracker, "audio_transcription_time"):
-                # TODO: Implement actual audio transcription using preferred library
-                # This is a placeholder for the actual implementation
-                transcription_result = {
-                    "text": "",
-                    "segments": [],
-                    "speakers": [],
-                    "confidence": 0.0,
-                }
+                if self.transcriber is None:
+                    return {
+                        "text": "",
+                        "segments": [],
+                        "speakers": [],
+                        "confidence": 0.0,
+                    }
 
-                return transcription_result
+                # The transcriber chunks the audio and transcribes the
+                # chunks concurrently
+                result = await self.transcriber.transcribe(video_path)
+                segments = result.get("segments", [])
+                confidences = [s["confidence"] for s in segments if "confidence" in s]
+                return {
+                    **result,
+                    "speakers": sorted(
+                        {s["speaker"] for s in segments if s.get("speaker")}
+                    ),
+                    "confidence": (
+                        sum(confidences) / len(confidences) if confidences else 0.0
+                    ),
+                }
 
         except Exception as e:
             raise VideoProcessingError(
@@ -23,6 +23,7 @@ Performance Targets:
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, cast
@@ -34,6 +35,9 @@ from numpy.typing import NDArray
 
 from ..models.scene import Scene
 from ..models.video import Video
+from .decoder import DECODE_PROFILES, FrameDecoder
+from .exceptions import VideoProcessingError
+from .frame_export import FrameWriter
 
 logger = logging.getLogger(__name__)
 
@@ -74,9 +78,16 @@ class SceneDetector:
     Attributes:
         min_scene_length (float): Minimum scene length in seconds
         max_scenes (int): Maximum number of scenes to detect
+        decode_profile (str): "full" to analyze every frame, "fast" to analyze
+            keyframes only
     """
 
-    def __init__(self, min_scene_length: float = 2.0, max_scenes: int = 500):
+    def __init__(
+        self,
+        min_scene_length: float = 2.0,
+        max_scenes: int = 500,
+        decode_profile: str = "full",
+    ):
         """Initialize scene detector.
 
         Args:
@@ -84,14 +95,23 @@ class SceneDetector:
                 this will be merged with adjacent scenes. Default is 2.0 seconds.
             max_scenes: Maximum number of scenes to detect. Processing will stop
                 after this many scenes are found. Default is 500 scenes.
+            decode_profile: "full" decodes every frame. "fast" decodes keyframes
+                only, placing boundaries at the nearest keyframe. Default is "full".
+
+        Raises:
+            ValueError: If decode_profile is unknown
 
         Note:
             These parameters can significantly impact processing time and accuracy.
             Lower min_scene_length or higher max_scenes will increase processing time.
         """
+        if decode_profile not in DECODE_PROFILES:
+            raise ValueError(f"Unknown decode profile: {decode_profile}")
         self.min_scene_length = min_scene_length
         self.max_scenes = max_scenes
+        self.decode_profile = decode_profile
         self._scene_change_threshold = 30.0
+        self._keyframe_writer: FrameWriter | None = None
 
     def set_scene_change_threshold(self, threshold: float) -> None:
         """Set the threshold for scene change detection.
@@ -137,12 +157,17 @@ class SceneDetector:
         finally:
             cap.release()
 
-    def extract_keyframe(self, video_path: Path, timestamp: float) -> NDArray[np.uint8]:
+    def extract_keyframe(
+        self, video_path: Path, timestamp: float, fast: bool = False
+    ) -> NDArray[np.uint8]:
         """Extract a keyframe from the video at the specified timestamp.
 
         Args:
             video_path: Path to the video file
             timestamp: Time in seconds to extract frame from
+            fast: Return the nearest keyframe at or before the timestamp instead
+                of the exact frame. This needs a single seek and decode, which
+                suits thumbnails.
 
         Returns:
             Extracted frame as numpy array
@@ -150,6 +175,13 @@ class SceneDetector:
         Raises:
             ValueError: If frame cannot be extracted
         """
+        if fast:
+            try:
+                decoded = FrameDecoder(video_path, profile="fast").read_at(timestamp)
+            except VideoProcessingError as e:
+                raise ValueError(f"Failed to extract frame at {timestamp}s: {e}") from e
+            return cast(NDArray[np.uint8], decoded.image)
+
         cap = cv2.VideoCapture(str(video_path))
         if not cap.isOpened():
             raise ValueError("Failed to open video file")
@@ -167,6 +199,92 @@ class SceneDetector:
         finally:
             cap.release()
 
+    def extract_keyframes(
+        self,
+        video_path: Path,
+        timestamps: Sequence[float],
+        output_dir: Path | None = None,
+        seek_threshold: float = 2.0,
+        image_format: str = "jpeg",
+        workers: int = 4,
+    ) -> list[NDArray[np.uint8]] | list[Path]:
+        """Extract frames at many timestamps in a single pass over the video.
+
+        Timestamps are visited in sorted order with one open video. Gaps
+        longer than seek_threshold are crossed with a seek; shorter gaps are
+        crossed by grabbing frames without converting them, which is cheaper
+        than seeking back to a keyframe and decoding forward again. Frames
+        are the same as extract_keyframe() returns for each timestamp.
+
+        Args:
+            video_path: Path to the video file
+            timestamps: Times in seconds to extract frames from, in any order
+            output_dir: Directory to write the frames to in parallel, or None
+                to return the frames
+            seek_threshold: Gap in seconds above which to seek instead of
+                grabbing forward
+            image_format: Image format when writing ("jpeg", "webp" or "png")
+            workers: Number of encoding threads when writing
+
+        Returns:
+            Frames, or paths of the written images, in the order of timestamps
+
+        Raises:
+            ValueError: If the video cannot be opened, its frame rate is
+                unavailable or a frame cannot be extracted
+        """
+        cap = cv2.VideoCapture(str(video_path))
+        if not cap.isOpened():
+            raise ValueError("Failed to open video file")
+
+        writer = (
+            FrameWriter(
+                output_dir,
+                image_format=image_format,
+                workers=workers,
+                prefix="keyframe",
+            )
+            if output_dir is not None
+            else None
+        )
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            if fps <= 0:
+                raise ValueError(
+                    "Video frame rate is unavailable, cannot map timestamps "
+                    "to frames"
+                )
+            frame_numbers = [int(timestamp * fps) for timestamp in timestamps]
+            seek_gap = max(1, int(seek_threshold * fps))
+            extracted: dict[int, Any] = {}
+            position = 0
+
+            for target in sorted(set(frame_numbers)):
+                if target - position > seek_gap:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                    position = target
+                while position < target:
+                    if not cap.grab():
+                        break
+                    position += 1
+
+                ret, frame = cap.read()
+                if position != target or not ret or frame is None:
+                    raise ValueError(f"Failed to extract frame at {target / fps}s")
+                position += 1
+
+                if writer is not None:
+                    extracted[target] = writer.write(frame, target)
+                else:
+                    extracted[target] = frame
+
+            return [extracted[number] for number in frame_numbers]
+
+        finally:
+            if writer is not None:
+                writer.close()
+            cap.release()
+
     def _get_video_format(self, video_path: Path) -> str:
         """Get the format/codec of the video file.
 
@@ -210,10 +328,14 @@ class SceneDetector:
         if not video_path.exists():
             raise ValueError(f"Video file not found: {video_path}")
 
+        if self.decode_profile == "fast":
+            return self._process_keyframes(video, video_path)
+
         cap = cv2.VideoCapture(str(video_path))
         if not cap.isOpened():
             raise ValueError(f"Failed to open video: {video_path}")
 
+        self._open_keyframe_writer(video_path.parent)
         try:
             fps = float(cap.get(cv2.CAP_PROP_FPS))
             frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
@@ -270,8 +392,79 @@ class SceneDetector:
             raise RuntimeError(f"Failed to process video: {e}") from e
 
         finally:
+            self._close_keyframe_writer()
             cap.release()
 
+    def _process_keyframes(self, video: Video, video_path: Path) -> list[Scene]:
+        """Detect scenes by comparing consecutive keyframes.
+
+        Args:
+            video: Video object to process
+            video_path: Path to the video file
+
+        Returns:
+            List of detected Scene objects
+
+        Raises:
+            RuntimeError: If processing fails
+        """
+        decoder = FrameDecoder(video_path, profile="fast")
+        scenes: list[Scene] = []
+        current_scene_start = 0.0
+        prev_frame = None
+        last_index = 0
+
+        self._open_keyframe_writer(video_path.parent)
+        try:
+            for decoded in decoder:
+                if prev_frame is not None and self._is_scene_change(
+                    prev_frame, decoded.image
+                ):
+                    if decoded.timestamp - current_scene_start >= self.min_scene_length:
+                        scenes.append(
+                            self._create_scene(
+                                SceneParams(
+                                    video_id=video.id,
+                                    start_time=current_scene_start,
+                                    end_time=decoded.timestamp,
+                                    keyframe=decoded.image,
+                                    output_dir=video_path.parent,
+                                )
+                            )
+                        )
+                        current_scene_start = decoded.timestamp
+
+                        if len(scenes) >= self.max_scenes:
+                            break
+
+                prev_frame = decoded.image
+                last_index = decoded.index
+
+            end_time = (last_index + 1) / decoder.fps if decoder.fps else 0.0
+            if (
+                prev_frame is not None
+                and end_time - current_scene_start >= self.min_scene_length
+            ):
+                scenes.append(
+                    self._create_scene(
+                        SceneParams(
+                            video_id=video.id,
+                            start_time=current_scene_start,
+                            end_time=end_time,
+                            keyframe=prev_frame,
+                            output_dir=video_path.parent,
+                        )
+                    )
+                )
+
+            return scenes
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to process video: {e}") from e
+
+        finally:
+            self._close_keyframe_writer()
+
     def detect_scenes(self, video: Video) -> list[Scene]:
         """Detect scenes in a video.
 
@@ -352,10 +545,14 @@ class SceneDetector:
         keyframe_dir = params.output_dir / "keyframes"
         keyframe_dir.mkdir(exist_ok=True)
 
-        # Save keyframe
+        # Save keyframe, in the background during scene detection
         scene_id = uuid4()
-        keyframe_path = keyframe_dir / f"{scene_id}.jpg"
-        cv2.imwrite(str(keyframe_path), params.keyframe)
+        writer = self._keyframe_writer
+        if writer is not None and writer.output_dir == keyframe_dir:
+            keyframe_path = writer.write(params.keyframe, 0, name=str(scene_id))
+        else:
+            keyframe_path = keyframe_dir / f"{scene_id}.jpg"
+            cv2.imwrite(str(keyframe_path), params.keyframe)
 
         return Scene(
             id=scene_id,
@@ -365,3 +562,19 @@ class SceneDetector:
             keyframe_path=keyframe_path,
             confidence_score=1.0,  # TODO: Implement confidence scoring
         )
+
+    def _open_keyframe_writer(self, output_dir: Path) -> None:
+        """Start writing scene keyframes on background threads.
+
+        Args:
+            output_dir: Base directory keyframes are saved under
+        """
+        keyframe_dir = output_dir / "keyframes"
+        keyframe_dir.mkdir(exist_ok=True)
+        self._keyframe_writer = FrameWriter(keyframe_dir, workers=2, queue_size=4)
+
+    def _close_keyframe_writer(self) -> None:
+        """Wait for pending keyframe writes and stop the writer."""
+        writer, self._keyframe_writer = self._keyframe_writer, None
+        if writer is not None:
+            writer.close()
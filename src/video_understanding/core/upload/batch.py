@@ -0,0 +1,324 @@
+"""Bounded-concurrency batch execution for video uploads.
+
+Scene detection and OCR are declared ``async`` but decode every frame
+synchronously, so gathering all uploads of a batch on one event loop runs
+them one after another while every file is held open. BatchExecutor runs a
+batch as a pipeline instead:
+
+- A producer feeds file paths into a bounded queue, so a large or
+  generated batch is read only as fast as uploads complete.
+- A fixed number of workers, the global concurrency limit, take files from
+  the queue and run the upload pipeline on them.
+- I/O stages (hashing, integrity and security checks) run on threads, as
+  the checkers already hand their file reads to ``asyncio.to_thread``.
+- Decode-heavy analysis (scene detection and OCR) runs on a thread, so
+  uploads overlap wherever OpenCV releases the GIL while decoding. With
+  ``analysis_workers`` set, it runs in a pool of worker processes instead.
+  Each worker builds its own detector and OCR processor once, in the pool
+  initializer, which is why the pool is opt-in.
+- Results are yielded in completion order as each upload finishes.
+
+Example:
+    >>> with BatchExecutor(uploader, max_concurrency=4) as executor:
+    ...     async for result in executor.stream(paths):
+    ...         print(result.file_path, result.ok)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from video_understanding.core.upload.config import UploadConfig
+from video_understanding.core.upload.frame_cache import FrameCache
+from video_understanding.core.upload.ocr import OCRProcessor
+from video_understanding.core.upload.scene import SceneDetector
+
+if TYPE_CHECKING:
+    from video_understanding.core.upload.processor import VideoUploader
+
+logger = logging.getLogger(__name__)
+
+# Per-process state, set by _init_worker
+_worker_detector: Optional[SceneDetector] = None
+_worker_ocr: Optional[OCRProcessor] = None
+
+
+def create_scene_detector(config: UploadConfig) -> SceneDetector:
+    """Create a scene detector configured for uploads.
+
+    Args:
+        config: Upload configuration
+
+    Returns:
+        Scene detector with the configured decode profile and frame cache
+
+    Detectors created in different worker processes open the same cache
+    directory. They share its index, so the size cap applies to the cache as
+    a whole rather than to each worker.
+    """
+    detector = SceneDetector()
+    detector.set_decode_profile(config.scene_decode_profile)
+    if config.frame_cache_dir is not None:
+        detector.set_frame_cache(
+            FrameCache(config.frame_cache_dir, max_bytes=config.frame_cache_max_bytes)
+        )
+    return detector
+
+
+def _init_worker(config: UploadConfig) -> None:
+    """Create the analyzers once per worker process."""
+    global _worker_detector, _worker_ocr
+    _worker_detector = create_scene_detector(config)
+    _worker_ocr = OCRProcessor()
+
+
+def run_analysis(
+    detector: SceneDetector, ocr: OCRProcessor, file_path: Path
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Detect scenes and extract text, blocking the calling thread.
+
+    Runs the analyzers on an event loop of its own, so it can be called from
+    a worker thread or process.
+
+    Args:
+        detector: Scene detector
+        ocr: OCR processor
+        file_path: Path to video file
+
+    Returns:
+        Tuple of (scenes, text content)
+    """
+
+    async def analyze() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        scenes = await detector.detect(file_path)
+        text = await ocr.process(file_path)
+        return scenes, text
+
+    return asyncio.run(analyze())
+
+
+def analyze_video(file_path: Path) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Detect scenes and extract text in a worker process.
+
+    Args:
+        file_path: Path to video file
+
+    Returns:
+        Tuple of (scenes, text content)
+    """
+    return run_analysis(_worker_detector, _worker_ocr, file_path)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one upload in a batch.
+
+    Attributes:
+        index: Position of the file in the batch
+        file_path: Path of the uploaded file
+        result: Processing results if the upload succeeded
+        error: Exception raised if the upload failed
+    """
+
+    index: int
+    file_path: Path
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the upload succeeded."""
+        return self.error is None
+
+
+class BatchExecutor:
+    """Runs batches of uploads with bounded concurrency.
+
+    The analysis process pool is started on first use and kept for later
+    batches until close().
+
+    Attributes:
+        uploader: Uploader whose pipeline runs on each file
+        max_concurrency: Uploads processed at once
+        queue_size: Files queued ahead of the workers
+        analysis_workers: Analysis processes (0 analyzes on threads)
+    """
+
+    def __init__(
+        self,
+        uploader: "VideoUploader",
+        max_concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        analysis_workers: Optional[int] = None,
+        start_method: Optional[str] = None,
+    ) -> None:
+        """Initialize the batch executor.
+
+        Args:
+            uploader: Uploader whose pipeline runs on each file
+            max_concurrency: Uploads processed at once (defaults to the
+                config's batch_concurrency)
+            queue_size: Files queued ahead of the workers (defaults to the
+                config's batch_queue_size)
+            analysis_workers: Analysis processes (defaults to the config's
+                analysis_workers)
+            start_method: Multiprocessing start method for the analysis
+                pool (default: platform default)
+
+        Raises:
+            ValueError: If a limit is invalid
+        """
+        config = uploader.config
+        self.uploader = uploader
+        self.max_concurrency = max_concurrency or config.batch_concurrency
+        self.queue_size = queue_size or config.batch_queue_size
+        if analysis_workers is None:
+            analysis_workers = config.analysis_workers
+        self.analysis_workers = analysis_workers
+        if self.max_concurrency < 1 or self.queue_size < 1 or self.analysis_workers < 0:
+            raise ValueError(
+                "max_concurrency and queue_size must be positive, "
+                "analysis_workers non-negative"
+            )
+        self._start_method = start_method
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "BatchExecutor":
+        """Enter context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Shut down the analysis workers."""
+        self.close()
+
+    async def stream(
+        self,
+        file_paths: Union[Iterable[Path], AsyncIterable[Path]],
+    ) -> AsyncIterator[BatchResult]:
+        """Process files, yielding results as uploads complete.
+
+        Args:
+            file_paths: Paths of the uploaded files; may be an async iterable
+                that produces paths as they arrive
+
+        Yields:
+            BatchResult per file in completion order. Failed uploads are
+            reported through BatchResult.error rather than raised.
+
+        Raises:
+            Exception: Any error raised while iterating file_paths
+        """
+        self._ensure_started()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        done: asyncio.Queue = asyncio.Queue()
+        producer_errors: List[Exception] = []
+
+        async def produce() -> None:
+            try:
+                index = 0
+                async for path in _iterate(file_paths):
+                    # Blocks while the queue is full
+                    await queue.put((index, Path(path)))
+                    index += 1
+            except Exception as e:
+                producer_errors.append(e)
+            for _ in range(self.max_concurrency):
+                await queue.put(None)
+
+        async def work() -> None:
+            while (item := await queue.get()) is not None:
+                index, path = item
+                try:
+                    result = await self.uploader.process_upload(path)
+                    await done.put(BatchResult(index, path, result=result))
+                except Exception as e:
+                    await done.put(BatchResult(index, path, error=e))
+            await done.put(None)
+
+        tasks = [asyncio.create_task(produce())]
+        tasks.extend(asyncio.create_task(work()) for _ in range(self.max_concurrency))
+        try:
+            running = self.max_concurrency
+            while running:
+                result = await done.get()
+                if result is None:
+                    running -= 1
+                else:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if producer_errors:
+            raise producer_errors[0]
+
+    async def run(
+        self,
+        file_paths: Union[Iterable[Path], AsyncIterable[Path]],
+    ) -> List[BatchResult]:
+        """Process files and collect all results.
+
+        Args:
+            file_paths: Paths of the uploaded files
+
+        Returns:
+            BatchResult per file in input order
+        """
+        results = [result async for result in self.stream(file_paths)]
+        return sorted(results, key=lambda result: result.index)
+
+    def close(self) -> None:
+        """Shut down the analysis workers."""
+        if self._pool is not None:
+            if self.uploader.analysis_pool is self._pool:
+                self.uploader.analysis_pool = None
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _ensure_started(self) -> None:
+        """Start the analysis pool and hand it to the uploader."""
+        if self._pool is None and self.analysis_workers > 0:
+            context = (
+                multiprocessing.get_context(self._start_method)
+                if self._start_method
+                else None
+            )
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.analysis_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.uploader.config,),
+            )
+            logger.info(
+                f"Started batch executor with {self.max_concurrency} uploads in "
+                f"flight and {self.analysis_workers} analysis workers"
+            )
+        self.uploader.analysis_pool = self._pool
+
+
+async def _iterate(
+    items: Union[Iterable[Path], AsyncIterable[Path]],
+) -> AsyncIterator[Path]:
+    """Iterate a sync or async iterable asynchronously."""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
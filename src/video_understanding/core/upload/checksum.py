@@ -0,0 +1,219 @@
+"""Single-read parallel checksum calculation.
+
+The file is read once, sequentially, into two page-aligned buffers that are
+used in turn: while the hashers work on one buffer the next chunk is read
+into the other. Each chunk is fanned out to all hashers on a thread pool;
+hashlib releases the GIL for large updates, so MD5, SHA-256 and the rest
+run on separate cores and the read is the limiting factor.
+
+An optional BLAKE2b tree hash splits the file into fixed-size leaves that
+are hashed independently, in parallel, and combined in a root node. It is
+a fast content key for deduplication; its value depends on the leaf size,
+so the same leaf size must be used wherever keys are compared.
+
+Example:
+    >>> engine = ChecksumEngine(tree_hash=True)
+    >>> checksums = await engine.compute_async(Path("video.mp4"))
+    >>> checksums["sha256"], checksums["blake2b_tree"]
+"""
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 8 * 1024 * 1024  # 8MB
+DEFAULT_LEAF_SIZE = 4 * 1024 * 1024  # 4MB
+TREE_HASH_KEY = "blake2b_tree"
+TREE_DIGEST_SIZE = 32
+
+
+class ChecksumEngine:
+    """Calculates several checksums of a file in one read.
+
+    Attributes:
+        algorithms: hashlib algorithm names to calculate
+        buffer_size: Bytes read per chunk
+        tree_hash: Whether the BLAKE2b tree hash is calculated
+        leaf_size: Leaf size of the tree hash in bytes
+        max_workers: Threads used for hashing
+    """
+
+    def __init__(
+        self,
+        algorithms: Sequence[str] = ("md5", "sha256"),
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        tree_hash: bool = False,
+        leaf_size: int = DEFAULT_LEAF_SIZE,
+        max_workers: Optional[int] = None,
+    ):
+        """Initialize the checksum engine.
+
+        Args:
+            algorithms: hashlib algorithm names to calculate
+            buffer_size: Bytes read per chunk; rounded up to a multiple of
+                the leaf size when the tree hash is enabled
+            tree_hash: Whether to calculate the BLAKE2b tree hash
+            leaf_size: Leaf size of the tree hash in bytes
+            max_workers: Threads used for hashing (defaults to one per
+                algorithm plus the CPU count for tree leaves)
+
+        Raises:
+            ValueError: If an algorithm is unknown or sizes are invalid
+        """
+        for algorithm in algorithms:
+            hashlib.new(algorithm)
+        if buffer_size < 1 or leaf_size < 1:
+            raise ValueError("buffer_size and leaf_size must be positive")
+        if not algorithms and not tree_hash:
+            raise ValueError("At least one checksum must be calculated")
+
+        if tree_hash:
+            buffer_size = -(-buffer_size // leaf_size) * leaf_size
+        self.algorithms = tuple(algorithms)
+        self.buffer_size = buffer_size
+        self.tree_hash = tree_hash
+        self.leaf_size = leaf_size
+        leaf_workers = (os.cpu_count() or 1) if tree_hash else 0
+        self.max_workers = max_workers or len(self.algorithms) + leaf_workers
+
+    async def compute_async(self, file_path: Path) -> Dict[str, str]:
+        """Calculate checksums without blocking the event loop.
+
+        Args:
+            file_path: File to hash
+
+        Returns:
+            Dictionary mapping algorithm name to hex digest
+        """
+        return await asyncio.to_thread(self.compute, file_path)
+
+    def compute(self, file_path: Path) -> Dict[str, str]:
+        """Calculate checksums.
+
+        Args:
+            file_path: File to hash
+
+        Returns:
+            Dictionary mapping algorithm name (and "blake2b_tree" if enabled)
+            to hex digest
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        hashers = {algorithm: hashlib.new(algorithm) for algorithm in self.algorithms}
+        leaves: List[Tuple[int, bytes]] = []
+        # Anonymous maps are page aligned, which suits large sequential reads
+        buffers = [mmap.mmap(-1, self.buffer_size) for _ in range(2)]
+        view = None
+
+        try:
+            with open(file_path, "rb", buffering=0) as f, ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="checksum"
+            ) as pool:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+                size = os.fstat(f.fileno()).st_size
+                pending = []
+                offset = 0
+                current = 0
+                while True:
+                    read = self._fill(f, buffers[current])
+                    # The other buffer may be reused once its hashers finish
+                    wait(pending)
+                    for future in pending:
+                        future.result()
+                    if not read:
+                        break
+                    view = memoryview(buffers[current])[:read]
+                    pending = [pool.submit(h.update, view) for h in hashers.values()]
+                    if self.tree_hash:
+                        pending.extend(
+                            self._submit_leaves(pool, view, offset, size, leaves)
+                        )
+                    offset += read
+                    current = 1 - current
+                if self.tree_hash and size == 0:
+                    leaves.append((0, self._leaf(b"", 0, True)))
+        finally:
+            # Views must be gone before the maps can be closed
+            view = None
+            for buffer in buffers:
+                buffer.close()
+
+        checksums = {algorithm: h.hexdigest() for algorithm, h in hashers.items()}
+        if self.tree_hash:
+            checksums[TREE_HASH_KEY] = self._root(leaves)
+        logger.debug(f"Checksums of {file_path} ({offset} bytes): {sorted(checksums)}")
+        return checksums
+
+    @staticmethod
+    def _fill(f, buffer: mmap.mmap) -> int:
+        """Read into a buffer until it is full or the file ends."""
+        view = memoryview(buffer)
+        filled = 0
+        while filled < len(buffer):
+            read = f.readinto(view[filled:])
+            if not read:
+                break
+            filled += read
+        return filled
+
+    def _submit_leaves(
+        self,
+        pool: ThreadPoolExecutor,
+        view: memoryview,
+        offset: int,
+        size: int,
+        leaves: List[Tuple[int, bytes]],
+    ) -> list:
+        """Hash the tree leaves of a chunk in parallel."""
+
+        def hash_leaf(start: int) -> None:
+            index = (offset + start) // self.leaf_size
+            data = view[start:start + self.leaf_size]
+            last = offset + start + len(data) >= size
+            # list.append is atomic, leaves are sorted by index later
+            leaves.append((index, self._leaf(data, index, last)))
+
+        return [
+            pool.submit(hash_leaf, start)
+            for start in range(0, len(view), self.leaf_size)
+        ]
+
+    def _leaf(self, data, index: int, last: bool) -> bytes:
+        """Digest of one tree leaf."""
+        return hashlib.blake2b(
+            data,
+            digest_size=TREE_DIGEST_SIZE,
+            fanout=0,
+            depth=2,
+            leaf_size=self.leaf_size,
+            inner_size=TREE_DIGEST_SIZE,
+            node_offset=index,
+            node_depth=0,
+            last_node=last,
+        ).digest()
+
+    def _root(self, leaves: List[Tuple[int, bytes]]) -> str:
+        """Combine leaf digests into the root digest."""
+        root = hashlib.blake2b(
+            digest_size=TREE_DIGEST_SIZE,
+            fanout=0,
+            depth=2,
+            leaf_size=self.leaf_size,
+            inner_size=TREE_DIGEST_SIZE,
+            node_offset=0,
+            node_depth=1,
+            last_node=True,
+        )
+        for _, digest in sorted(leaves):
+            root.update(digest)
+        return root.hexdigest()
@@ -9,9 +9,14 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, List, Optional
 
+from video_understanding.core.decoder import DECODE_PROFILES
 from video_understanding.core.exceptions import ConfigurationError
+from video_understanding.core.upload.dedup import HASH_METHODS
 from video_understanding.models.video import ProcessingStatus
 
+SCENE_DETECTION_BACKENDS = ("absdiff", "histogram")
+SAMPLING_STRATEGIES = ("fixed", "motion")
+
 
 @dataclass
 class ProcessorConfig:
@@ -26,19 +31,53 @@ class ProcessorConfig:
         upload_chunk_size: Upload chunk size in bytes
         max_retries: Maximum number of retries for operations
         retry_delay: Delay between retries in seconds
+        progress_interval: Seconds after which a coalesced progress update is
+            published even if progress moved less than progress_min_delta
+        progress_min_delta: Progress change in percent that is published
+            immediately
         max_video_size: Maximum video file size in bytes
         supported_formats: List of supported video formats
         min_scene_length: Minimum scene length in seconds
         max_scenes: Maximum number of scenes per video
+        scene_detection_backend: Scene change detector ("absdiff" or "histogram")
         concurrent_jobs: Maximum number of concurrent processing jobs
         memory_limit: Memory limit per job in bytes
+        prefetch_queue_size: Frames decoded ahead of analysis on a background
+            thread
+        preload_models: Whether to load the detection and OCR models when the
+            processor is created instead of on first use
         object_detection_model: Path to YOLOv8 model weights
         detection_confidence: Minimum confidence threshold for detections
+        detection_batch_size: Number of sampled frames per object detection call
         detection_enabled: Whether to enable object detection
+        frame_dedup_enabled: Whether to reuse results for near-identical frames
+        frame_dedup_threshold: Maximum perceptual hash Hamming distance for a
+            frame to count as unchanged
+        frame_dedup_method: Perceptual hash used for deduplication ("dhash" or
+            "phash")
+        sampling_strategy: How analyze_frames picks frames: "fixed" analyzes
+            every sample_rate-th frame, "motion" analyzes frames by how much
+            their content changed
+        sampling_motion_threshold: Fraction of thumbnail pixels (0-1) that
+            must change for the motion sampler to analyze a frame
+        sampling_min_interval: Minimum frames between motion-sampled frames
+        sampling_floor_interval: Maximum frames between motion-sampled frames
+        sampling_frame_budget: Maximum analyzed frames per video with motion
+            sampling (None for no limit)
         ocr_languages: List of languages for OCR
         ocr_confidence: Minimum confidence threshold for OCR
         ocr_enabled: Whether to enable OCR
         ocr_gpu: Whether to use GPU for OCR
+        ocr_workers: Number of OCR worker processes (0 runs OCR in-process)
+        ocr_max_in_flight: Maximum frames queued for OCR workers (defaults to
+            twice ocr_workers)
+        ocr_incremental: Whether to recognize only changed text boxes and
+            report text as time-ranged spans (requires ocr_workers = 0)
+        ocr_similarity_threshold: Minimum SSIM for a text box to count as
+            unchanged in incremental OCR
+        frame_cache_dir: Directory of the on-disk frame and result cache
+            (None disables caching)
+        frame_cache_max_bytes: Size cap of the frame cache in bytes
     """
     # Resource limits
     max_concurrent_uploads: int = 3
@@ -56,6 +95,8 @@ class ProcessorConfig:
     )
     custom_validators: list[Callable[[Path], None]] = field(default_factory=list)
     progress_callbacks: list[Callable[[Any], None]] = field(default_factory=list)
+    progress_interval: float = 0.1  # seconds between coalesced progress updates
+    progress_min_delta: float = 1.0  # percent change published immediately
 
     # Stage weights for progress calculation
     stage_weights: dict[ProcessingStatus, float] = field(
@@ -75,19 +116,43 @@ class ProcessorConfig:
     supported_formats: list[str] = field(default_factory=lambda: ["mp4", "avi", "mov"])
     min_scene_length: float = 2.0
     max_scenes: int = 500
+    scene_detection_backend: str = "absdiff"
     concurrent_jobs: int = 3
     memory_limit: int = 4 * 1024 * 1024 * 1024  # 4GB
+    prefetch_queue_size: int = 8
+    preload_models: bool = False
 
     # Object detection configuration
     object_detection_model: str | None = None  # Uses default YOLOv8n if None
     detection_confidence: float = 0.5
+    detection_batch_size: int = 8
     detection_enabled: bool = True
 
+    # Frame deduplication configuration
+    frame_dedup_enabled: bool = False
+    frame_dedup_threshold: int = 4
+    frame_dedup_method: str = "phash"
+
+    # Frame sampling configuration
+    sampling_strategy: str = "fixed"
+    sampling_motion_threshold: float = 0.02
+    sampling_min_interval: int = 1
+    sampling_floor_interval: int = 30
+    sampling_frame_budget: int | None = None
+
     # OCR configuration
     ocr_languages: list[str] = field(default_factory=lambda: ["en"])
     ocr_confidence: float = 0.5
     ocr_enabled: bool = True
     ocr_gpu: bool = False
+    ocr_workers: int = 0
+    ocr_max_in_flight: int | None = None
+    ocr_incremental: bool = False
+    ocr_similarity_threshold: float = 0.9
+
+    # Frame cache configuration
+    frame_cache_dir: str | None = None
+    frame_cache_max_bytes: int = 1024 * 1024 * 1024  # 1GB
 
     def __post_init__(self) -> None:
         """Validate configuration values."""
@@ -119,12 +184,43 @@ class ProcessorConfig:
             raise ConfigurationError("min_scene_length must be positive")
         if self.max_scenes <= 0:
             raise ConfigurationError("max_scenes must be positive")
+        if self.scene_detection_backend not in SCENE_DETECTION_BACKENDS:
+            raise ConfigurationError(
+                "scene_detection_backend must be one of "
+                f"{', '.join(SCENE_DETECTION_BACKENDS)}"
+            )
         if self.concurrent_jobs <= 0:
             raise ConfigurationError("concurrent_jobs must be positive")
         if self.memory_limit <= 0:
             raise ConfigurationError("memory_limit must be positive")
+        if self.prefetch_queue_size <= 0:
+            raise ConfigurationError("prefetch_queue_size must be positive")
         if self.detection_confidence < 0 or self.detection_confidence > 1:
             raise ConfigurationError("detection_confidence must be between 0 and 1")
+        if self.detection_batch_size <= 0:
+            raise ConfigurationError("detection_batch_size must be positive")
+        if not 0 <= self.frame_dedup_threshold < 64:
+            raise ConfigurationError("frame_dedup_threshold must be between 0 and 63")
+        if self.frame_dedup_method not in HASH_METHODS:
+            raise ConfigurationError(
+                f"frame_dedup_method must be one of {', '.join(HASH_METHODS)}"
+            )
+        if self.sampling_strategy not in SAMPLING_STRATEGIES:
+            raise ConfigurationError(
+                "sampling_strategy must be one of "
+                f"{', '.join(SAMPLING_STRATEGIES)}"
+            )
+        if not 0 < self.sampling_motion_threshold <= 1:
+            raise ConfigurationError(
+                "sampling_motion_threshold must be between 0 and 1"
+            )
+        if not 1 <= self.sampling_min_interval <= self.sampling_floor_interval:
+            raise ConfigurationError(
+                "sampling intervals must satisfy "
+                "1 <= sampling_min_interval <= sampling_floor_interval"
+            )
+        if self.sampling_frame_budget is not None and self.sampling_frame_budget <= 0:
+            raise ConfigurationError("sampling_frame_budget must be positive")
         if (
             self.object_detection_model
             and not Path(self.object_detection_model).exists()
@@ -134,6 +230,20 @@ class ProcessorConfig:
             raise ConfigurationError("ocr_confidence must be between 0 and 1")
         if not self.ocr_languages:
             raise ConfigurationError("ocr_languages cannot be empty")
+        if self.ocr_workers < 0:
+            raise ConfigurationError("ocr_workers must be non-negative")
+        if self.ocr_max_in_flight is not None and self.ocr_max_in_flight <= 0:
+            raise ConfigurationError("ocr_max_in_flight must be positive")
+        if not 0 < self.ocr_similarity_threshold <= 1:
+            raise ConfigurationError("ocr_similarity_threshold must be between 0 and 1")
+        if self.ocr_incremental and self.ocr_workers > 0:
+            raise ConfigurationError("ocr_incremental requires ocr_workers = 0")
+        if self.frame_cache_max_bytes <= 0:
+            raise ConfigurationError("frame_cache_max_bytes must be positive")
+        if self.progress_interval < 0:
+            raise ConfigurationError("progress_interval must be non-negative")
+        if self.progress_min_delta < 0:
+            raise ConfigurationError("progress_min_delta must be non-negative")
 
     def add_processing_hook(
         self,
@@ -250,6 +360,19 @@ class UploadConfig:
     min_scene_duration: float = 2.0  # seconds
     max_scenes: int = 500
     scene_threshold: float = 30.0  # threshold for scene change detection
+    scene_decode_profile: str = "full"  # "full" or "fast" (keyframes only)
+
+    # Frame cache (disabled if frame_cache_dir is None)
+    frame_cache_dir: Optional[Path] = None
+    frame_cache_max_bytes: int = 1024 * 1024 * 1024  # 1GB
+
+    # Content-hash dedup registry (disabled if dedup_registry_path is None)
+    dedup_registry_path: Optional[Path] = None
+
+    # Batch processing
+    batch_concurrency: int = 4  # uploads processed at once
+    batch_queue_size: int = 8  # files queued ahead of the batch workers
+    analysis_workers: int = 0  # analysis processes; 0 analyzes on threads
 
     # Security
     virus_scan_enabled: bool = True
@@ -265,3 +388,18 @@ class UploadConfig:
             self.temp_dir = Path(self.temp_dir)
         if isinstance(self.output_dir, str):
             self.output_dir = Path(self.output_dir)
+        if isinstance(self.frame_cache_dir, str):
+            self.frame_cache_dir = Path(self.frame_cache_dir)
+        if isinstance(self.dedup_registry_path, str):
+            self.dedup_registry_path = Path(self.dedup_registry_path)
+        if self.batch_concurrency < 1:
+            raise ConfigurationError("batch_concurrency must be positive")
+        if self.batch_queue_size < 1:
+            raise ConfigurationError("batch_queue_size must be positive")
+        if self.analysis_workers < 0:
+            raise ConfigurationError("analysis_workers must be non-negative")
+        if self.scene_decode_profile not in DECODE_PROFILES:
+            raise ConfigurationError(
+                "scene_decode_profile must be one of "
+                f"{', '.join(DECODE_PROFILES)}"
+            )
@@ -0,0 +1,228 @@
+"""Container structure checks that need no decoding.
+
+Reads only box and chunk headers, seeking over their payloads, so a
+multi-gigabyte file is checked with a few kilobytes of reads:
+
+- MP4/MOV (ISO base media): top-level boxes must tile the file exactly. A
+  ``moov`` atom with a movie header and at least one complete track
+  (``tkhd`` and ``mdia``) must exist, and media data (``mdat`` or movie
+  fragments) must be present. A truncated upload typically ends inside
+  ``mdat``, or before a trailing ``moov``, and fails here.
+- AVI (RIFF): the RIFF size must fit the file, and the ``hdrl`` list must
+  hold the main header and at least one stream header list.
+"""
+
+import logging
+import os
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from video_understanding.utils.exceptions import VideoIntegrityError
+
+logger = logging.getLogger(__name__)
+
+# Top-level box types that may start an ISO base media file
+_ISOBMFF_TYPES = {
+    b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pnot", b"styp"
+}
+
+# Deepest box nesting walked when looking for track headers
+_MAX_DEPTH = 3
+
+
+@dataclass
+class ContainerStructure:
+    """Structure of a video container.
+
+    Attributes:
+        format: "isobmff" (MP4/MOV) or "riff" (AVI)
+        boxes: Top-level box or chunk types in file order
+        tracks: Number of tracks (MP4/MOV) or streams (AVI)
+        faststart: Whether the movie header precedes the media data, so the
+            file can be read front to back (None for AVI)
+        fragmented: Whether media data is stored in movie fragments
+    """
+
+    format: str
+    boxes: List[str] = field(default_factory=list)
+    tracks: int = 0
+    faststart: Optional[bool] = None
+    fragmented: bool = False
+
+
+def inspect_container(file_path: Path) -> Optional[ContainerStructure]:
+    """Check the structure of a video container.
+
+    Args:
+        file_path: Path to the video file
+
+    Returns:
+        The container structure, or None if the format is not MP4, MOV or AVI
+
+    Raises:
+        VideoIntegrityError: If the container is truncated or malformed
+    """
+    try:
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            head = f.read(12)
+            f.seek(0)
+            if len(head) >= 12 and head[:4] == b"RIFF" and head[8:12] == b"AVI ":
+                return _inspect_riff(f, size)
+            if len(head) >= 8 and head[4:8] in _ISOBMFF_TYPES:
+                return _inspect_isobmff(f, size)
+    except OSError as e:
+        raise VideoIntegrityError(f"Failed to read container structure: {e}")
+
+    logger.debug(f"No structure check for container of {file_path}")
+    return None
+
+
+def _inspect_isobmff(f: BinaryIO, size: int) -> ContainerStructure:
+    """Check the box structure of an MP4 or MOV file."""
+    structure = ContainerStructure(format="isobmff")
+    moov: Optional[Tuple[int, int]] = None
+    has_media = False
+
+    for box_type, start, end in _boxes(f, 0, size):
+        structure.boxes.append(box_type)
+        if box_type == "moov":
+            moov = (start, end)
+            if structure.faststart is None:
+                structure.faststart = True
+        elif box_type in ("mdat", "moof"):
+            has_media = True
+            structure.fragmented |= box_type == "moof"
+            if structure.faststart is None:
+                structure.faststart = False
+
+    if moov is None:
+        raise VideoIntegrityError("Container has no moov atom (missing or truncated)")
+    if not has_media:
+        raise VideoIntegrityError("Container has no media data")
+
+    children = [box_type for box_type, _, _ in _boxes(f, *moov, depth=1)]
+    if "mvhd" not in children:
+        raise VideoIntegrityError("moov atom has no movie header")
+    for box_type, start, end in _boxes(f, *moov, depth=1):
+        if box_type != "trak":
+            continue
+        track = {child for child, _, _ in _boxes(f, start, end, depth=2)}
+        if not {"tkhd", "mdia"} <= track:
+            raise VideoIntegrityError("Track without header or media information")
+        structure.tracks += 1
+    if not structure.tracks:
+        raise VideoIntegrityError("moov atom has no tracks")
+    return structure
+
+
+def _boxes(
+    f: BinaryIO, start: int, end: int, depth: int = 0
+) -> Iterator[Tuple[str, int, int]]:
+    """Iterate the boxes between two offsets.
+
+    For nested walks (depth > 0), ``start`` is the offset of the parent box
+    and its header is skipped.
+
+    Yields:
+        Tuples of (box type, box start, box end)
+    """
+    if depth > _MAX_DEPTH:
+        return
+    offset = start
+    if depth:
+        # Skip the parent's own header
+        offset = _payload_start(f, start)
+    while offset < end:
+        if end - offset < 8:
+            raise VideoIntegrityError(f"Truncated box header at offset {offset}")
+        f.seek(offset)
+        box_size, raw_type = struct.unpack(">I4s", f.read(8))
+        header = 8
+        if box_size == 1:
+            (box_size,) = struct.unpack(">Q", f.read(8))
+            header = 16
+        elif box_size == 0:
+            box_size = end - offset
+        box_type = raw_type.decode("latin-1")
+        if box_size < header:
+            raise VideoIntegrityError(
+                f"Invalid size of {box_type!r} box at offset {offset}"
+            )
+        if offset + box_size > end:
+            raise VideoIntegrityError(
+                f"Box {box_type!r} at offset {offset} extends past the end of "
+                f"its container ({offset + box_size} > {end}); file is truncated"
+            )
+        yield box_type, offset, offset + box_size
+        offset += box_size
+
+
+def _payload_start(f: BinaryIO, box_start: int) -> int:
+    """Offset of the payload of the box starting at an offset."""
+    f.seek(box_start)
+    (box_size,) = struct.unpack(">I", f.read(4))
+    return box_start + (16 if box_size == 1 else 8)
+
+
+def _inspect_riff(f: BinaryIO, size: int) -> ContainerStructure:
+    """Check the chunk structure of an AVI file."""
+    structure = ContainerStructure(format="riff")
+    f.seek(4)
+    (riff_size,) = struct.unpack("<I", f.read(4))
+    riff_end = 8 + riff_size
+    if riff_end > size:
+        raise VideoIntegrityError(
+            f"RIFF size {riff_end} exceeds file size {size}; file is truncated"
+        )
+
+    header_list = None
+    for chunk_id, list_type, start, end in _chunks(f, 12, riff_end):
+        structure.boxes.append(list_type or chunk_id)
+        if list_type == "hdrl":
+            header_list = (start, end)
+    if header_list is None:
+        raise VideoIntegrityError("AVI file has no header list")
+
+    children = list(_chunks(f, header_list[0] + 12, header_list[1]))
+    if not any(chunk_id == "avih" for chunk_id, _, _, _ in children):
+        raise VideoIntegrityError("AVI file has no main header")
+    for chunk_id, list_type, start, end in children:
+        if list_type != "strl":
+            continue
+        stream = {child for child, _, _, _ in _chunks(f, start + 12, end)}
+        if "strh" not in stream:
+            raise VideoIntegrityError("AVI stream without stream header")
+        structure.tracks += 1
+    if not structure.tracks:
+        raise VideoIntegrityError("AVI file has no streams")
+    return structure
+
+
+def _chunks(
+    f: BinaryIO, start: int, end: int
+) -> Iterator[Tuple[str, Optional[str], int, int]]:
+    """Iterate the RIFF chunks between two offsets.
+
+    Yields:
+        Tuples of (chunk id, list type for LIST chunks, chunk start, chunk end)
+    """
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        raw_id, chunk_size = struct.unpack("<4sI", f.read(8))
+        chunk_id = raw_id.decode("latin-1")
+        list_type = None
+        if chunk_id in ("LIST", "RIFF"):
+            list_type = f.read(4).decode("latin-1")
+        chunk_end = offset + 8 + chunk_size
+        if chunk_end > end:
+            raise VideoIntegrityError(
+                f"Chunk {chunk_id!r} at offset {offset} extends past the end of "
+                f"its list; file is truncated"
+            )
+        yield chunk_id, list_type, offset, chunk_end
+        # Chunks are padded to an even size
+        offset = chunk_end + (chunk_size & 1)
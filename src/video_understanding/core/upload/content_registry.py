@@ -0,0 +1,337 @@
+"""Content-hash registry for deduplicating repeated uploads.
+
+The same video often arrives more than once, from different users or from
+retries. The registry maps the SHA-256 of a video's content to the video
+that was processed first, its stored artifact and its processing results,
+so later uploads of the same content can reuse them instead of running
+validation, analysis and model calls again.
+
+Every upload that uses an entry holds a reference, keyed by its own video
+id. Releasing the last reference removes the entry and hands the shared
+artifact back to the caller for deletion.
+
+The hash is normally computed while the file is ingested (see
+:func:`video_understanding.video.ingest.ingest_file`), which makes the
+lookup for a duplicate a single index query. Otherwise
+:meth:`ContentRegistry.hash_file` reads the file once.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from video_understanding.core.upload.checksum import ChecksumEngine
+
+logger = logging.getLogger(__name__)
+
+# Algorithm of registry keys; matches the default ingest checksum
+CONTENT_HASH_ALGORITHM = "sha256"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contents (
+    content_hash TEXT PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    file_path TEXT,
+    results TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS refs (
+    video_id TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL REFERENCES contents (content_hash)
+);
+CREATE INDEX IF NOT EXISTS refs_content ON refs (content_hash);
+"""
+
+
+@dataclass
+class ContentEntry:
+    """A registered video content.
+
+    Attributes:
+        content_hash: SHA-256 hex digest of the content
+        video_id: Id of the video whose processing produced the results
+        file_path: Stored artifact shared by all references (None if the
+            results do not depend on a stored file)
+        results: Stored processing results
+        ref_count: Number of videos referencing the entry
+        hits: Number of duplicate uploads served from the entry
+        created_at: Registration time (epoch seconds)
+    """
+
+    content_hash: str
+    video_id: UUID
+    file_path: Optional[Path]
+    results: Dict[str, Any]
+    ref_count: int
+    hits: int
+    created_at: float
+
+
+@dataclass
+class ContentRegistryStats:
+    """Registry lookup counters.
+
+    Attributes:
+        hits: Lookups that found a registered content
+        misses: Lookups that found nothing
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups that found a registered content."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to dictionary format.
+
+        Returns:
+            Dictionary with counters and hit ratio
+        """
+        return {"hits": self.hits, "misses": self.misses, "hit_ratio": self.hit_ratio}
+
+
+class ContentRegistry:
+    """Maps content hashes to processed videos and their results.
+
+    Example:
+        >>> registry = ContentRegistry(Path("uploads/content_registry.sqlite"))
+        >>> content_hash = registry.hash_file(path)
+        >>> entry = registry.lookup(content_hash)
+        >>> if entry is not None:
+        ...     registry.add_reference(content_hash, video.id)
+        ...     results = entry.results
+        ... else:
+        ...     results = process(path)
+        ...     registry.register(content_hash, video.id, stored_path, results)
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        """Initialize the registry, creating the database if needed.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.stats = ContentRegistryStats()
+        self._hasher = ChecksumEngine(algorithms=(CONTENT_HASH_ALGORITHM,))
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def __enter__(self) -> "ContentRegistry":
+        """Enter context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Close the registry."""
+        self.close()
+
+    def hash_file(self, file_path: Path) -> str:
+        """Calculate the registry key of a file.
+
+        Args:
+            file_path: File to hash
+
+        Returns:
+            SHA-256 hex digest of the content
+        """
+        return self._hasher.compute(file_path)[CONTENT_HASH_ALGORITHM]
+
+    async def hash_file_async(self, file_path: Path) -> str:
+        """Calculate the registry key of a file off the event loop.
+
+        Args:
+            file_path: File to hash
+
+        Returns:
+            SHA-256 hex digest of the content
+        """
+        checksums = await self._hasher.compute_async(file_path)
+        return checksums[CONTENT_HASH_ALGORITHM]
+
+    def lookup(self, content_hash: str) -> Optional[ContentEntry]:
+        """Find a registered content.
+
+        Args:
+            content_hash: SHA-256 hex digest of the content
+
+        Returns:
+            The entry, or None if the content is not registered
+        """
+        with self._lock:
+            entry = self._get(content_hash)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self._db.execute(
+                "UPDATE contents SET hits = hits + 1, last_used = ? "
+                "WHERE content_hash = ?",
+                (time.time(), content_hash),
+            )
+            self._db.commit()
+            entry.hits += 1
+            return entry
+
+    def register(
+        self,
+        content_hash: str,
+        video_id: UUID,
+        file_path: Optional[Path],
+        results: Dict[str, Any],
+    ) -> ContentEntry:
+        """Register processed content and reference it from its video.
+
+        If the content was registered meanwhile, for example by a concurrent
+        upload of the same file, the existing entry is kept and referenced
+        instead; the caller can compare video ids to detect this.
+
+        Args:
+            content_hash: SHA-256 hex digest of the content
+            video_id: Id of the processed video
+            file_path: Stored artifact shared by later references
+            results: JSON-serializable processing results
+
+        Returns:
+            The registered entry
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO contents "
+                "(content_hash, video_id, file_path, results, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    content_hash,
+                    str(video_id),
+                    str(file_path) if file_path is not None else None,
+                    json.dumps(results, default=str),
+                    now,
+                    now,
+                ),
+            )
+            return self.add_reference(content_hash, video_id)
+
+    def add_reference(self, content_hash: str, video_id: UUID) -> ContentEntry:
+        """Reference a registered content from a video.
+
+        Args:
+            content_hash: SHA-256 hex digest of the content
+            video_id: Id of the referencing video
+
+        Returns:
+            The referenced entry
+
+        Raises:
+            KeyError: If the content is not registered
+        """
+        with self._lock:
+            if self._get(content_hash) is None:
+                raise KeyError(f"Content not registered: {content_hash}")
+            self._db.execute(
+                "INSERT OR REPLACE INTO refs (video_id, content_hash) VALUES (?, ?)",
+                (str(video_id), content_hash),
+            )
+            self._db.commit()
+            return self._get(content_hash)
+
+    def release(self, video_id: UUID) -> Optional[ContentEntry]:
+        """Drop a video's reference.
+
+        Args:
+            video_id: Id of the referencing video
+
+        Returns:
+            The entry if this was its last reference; it has been removed
+            from the registry and its artifact may be deleted. None otherwise.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content_hash FROM refs WHERE video_id = ?", (str(video_id),)
+            ).fetchone()
+            if row is None:
+                return None
+            content_hash = row[0]
+            self._db.execute("DELETE FROM refs WHERE video_id = ?", (str(video_id),))
+            entry = self._get(content_hash)
+            if entry is not None and entry.ref_count == 0:
+                self._db.execute(
+                    "DELETE FROM contents WHERE content_hash = ?", (content_hash,)
+                )
+            else:
+                entry = None
+            self._db.commit()
+            if entry is not None:
+                logger.info(f"Released last reference to content {content_hash[:12]}")
+            return entry
+
+    def forget(self, content_hash: str) -> None:
+        """Remove a content and all references to it.
+
+        Used when a registered artifact turns out to be missing.
+
+        Args:
+            content_hash: SHA-256 hex digest of the content
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM refs WHERE content_hash = ?", (content_hash,))
+            self._db.execute(
+                "DELETE FROM contents WHERE content_hash = ?", (content_hash,)
+            )
+            self._db.commit()
+
+    def references(self, content_hash: str) -> List[UUID]:
+        """List the videos referencing a content.
+
+        Args:
+            content_hash: SHA-256 hex digest of the content
+
+        Returns:
+            Ids of referencing videos
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT video_id FROM refs WHERE content_hash = ?", (content_hash,)
+            ).fetchall()
+        return [UUID(video_id) for (video_id,) in rows]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    def _get(self, content_hash: str) -> Optional[ContentEntry]:
+        """Read an entry with its reference count."""
+        row = self._db.execute(
+            "SELECT video_id, file_path, results, hits, created_at, "
+            "(SELECT COUNT(*) FROM refs "
+            "WHERE refs.content_hash = contents.content_hash) "
+            "FROM contents WHERE content_hash = ?",
+            (content_hash,),
+        ).fetchone()
+        if row is None:
+            return None
+        video_id, file_path, results, hits, created_at, ref_count = row
+        return ContentEntry(
+            content_hash=content_hash,
+            video_id=UUID(video_id),
+            file_path=Path(file_path) if file_path is not None else None,
+            results=json.loads(results),
+            ref_count=ref_count,
+            hits=hits,
+            created_at=created_at,
+        )
@@ -24,12 +24,20 @@ T = TypeVar('T')  # Generic type for resources
 class UploadContext:
     """Manages context for video upload processing."""
 
-    def __init__(self, video: Union[Video, Path], progress_tracker: Optional[ProgressTracker] = None):
+    def __init__(
+        self,
+        video: Union[Video, Path],
+        progress_tracker: Optional[ProgressTracker] = None,
+        temp_root: Optional[Path] = None,
+    ):
         """Initialize upload context.
 
         Args:
             video: Video object or path to uploaded video file
             progress_tracker: Optional progress tracking
+            temp_root: Directory for temporary files (default: system
+                temporary directory). Files left there by a crashed job are
+                reclaimed by the janitor if it sweeps this directory.
         """
         self.video = video if isinstance(video, Video) else None
         self.file_path = video.file_info.file_path if isinstance(video, Video) else video
@@ -42,6 +50,7 @@ class UploadContext:
             "size_bytes": video.file_info.file_size if isinstance(video, Video) else self.file_path.stat().st_size,
             "upload_time": self.start_time.isoformat()
         }
+        self.temp_root = temp_root
         self.temp_files: List[Path] = []
         self.temp_dirs: List[Path] = []
         self._resources: Dict[str, Any] = {}
@@ -160,7 +169,7 @@ class UploadContext:
         Returns:
             Path to temporary file
         """
-        temp_file = Path(tempfile.mktemp(suffix=suffix))
+        temp_file = Path(tempfile.mktemp(suffix=suffix, dir=self.temp_root))
         self.temp_files.append(temp_file)
         self.track_temp_file(temp_file)
         return temp_file
@@ -171,7 +180,7 @@ class UploadContext:
         Returns:
             Path to temporary directory
         """
-        temp_dir = Path(tempfile.mkdtemp())
+        temp_dir = Path(tempfile.mkdtemp(dir=self.temp_root))
         self.temp_dirs.append(temp_dir)
         self.track_temp_dir(temp_dir)
         return temp_dir
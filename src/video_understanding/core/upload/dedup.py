@@ -0,0 +1,200 @@
+"""Perceptual-hash frame deduplication for video processing.
+
+This module detects near-identical frames so that expensive analysis such as
+OCR and object detection can be skipped for them. Slides, screencasts and
+talking-head videos often show the same picture for minutes at a time.
+
+Two hashes are supported, both computed on a tiny grayscale thumbnail:
+- dhash: sign of horizontal gradients, the cheapest option, but flat areas
+  such as slide backgrounds flip bits under sensor or compression noise
+- phash: sign of low-frequency DCT coefficients against their median, robust
+  to noise and small brightness changes (the default)
+"""
+
+import logging
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HASH_METHODS = ("dhash", "phash")
+
+
+def _grayscale(frame: np.ndarray) -> np.ndarray:
+    """Convert a BGR or single-channel frame to grayscale."""
+    if frame.ndim == 3 and frame.shape[2] > 1:
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return frame.reshape(frame.shape[:2])
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    """Pack a boolean array into an integer hash."""
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def dhash(frame: np.ndarray, hash_size: int = 8) -> int:
+    """Compute the difference hash of a frame.
+
+    Args:
+        frame: Frame as numpy array (BGR or grayscale)
+        hash_size: Hash side length, giving hash_size**2 bits
+
+    Returns:
+        Hash as an integer
+    """
+    thumbnail = cv2.resize(
+        _grayscale(frame), (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA
+    )
+    return _bits_to_int(thumbnail[:, 1:] > thumbnail[:, :-1])
+
+
+def phash(frame: np.ndarray, hash_size: int = 8) -> int:
+    """Compute the DCT-based perceptual hash of a frame.
+
+    Args:
+        frame: Frame as numpy array (BGR or grayscale)
+        hash_size: Hash side length, giving hash_size**2 bits
+
+    Returns:
+        Hash as an integer
+    """
+    side = hash_size * 4
+    thumbnail = cv2.resize(
+        _grayscale(frame), (side, side), interpolation=cv2.INTER_AREA
+    )
+    coefficients = cv2.dct(np.float32(thumbnail))[:hash_size, :hash_size]
+    # The DC term only carries mean brightness
+    median = np.median(coefficients.ravel()[1:])
+    return _bits_to_int(coefficients > median)
+
+
+def hamming_distance(hash1: int, hash2: int) -> int:
+    """Count the differing bits between two hashes.
+
+    Args:
+        hash1: First hash
+        hash2: Second hash
+
+    Returns:
+        Number of differing bits
+    """
+    return (hash1 ^ hash2).bit_count()
+
+
+@dataclass
+class DedupStats:
+    """Frame deduplication counters.
+
+    Attributes:
+        frames_checked: Frames passed to is_duplicate()
+        frames_skipped: Frames found to duplicate the last analyzed frame
+    """
+
+    frames_checked: int = 0
+    frames_skipped: int = 0
+
+    @property
+    def skip_ratio(self) -> float:
+        """Fraction of checked frames that were skipped."""
+        return self.frames_skipped / self.frames_checked if self.frames_checked else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert stats to dictionary format.
+
+        Returns:
+            Dictionary with counters and skip ratio
+        """
+        return {
+            "frames_checked": self.frames_checked,
+            "frames_skipped": self.frames_skipped,
+            "skip_ratio": self.skip_ratio,
+        }
+
+
+class FrameDeduplicator:
+    """Detects frames that are unchanged since the last analyzed frame.
+
+    Frames are compared against the last frame that was *not* a duplicate,
+    so a slow drift across many frames is still picked up once it exceeds
+    the threshold.
+
+    Example:
+        >>> dedup = FrameDeduplicator(threshold=4, method="phash")
+        >>> for number, frame in enumerate(frames):
+        ...     if dedup.is_duplicate(frame):
+        ...         continue
+        ...     analyze(frame)
+        >>> print(f"Skipped {dedup.stats.skip_ratio:.0%} of frames")
+    """
+
+    def __init__(
+        self,
+        threshold: int = 4,
+        method: str = "phash",
+        hash_size: int = 8,
+    ) -> None:
+        """Initialize the deduplicator.
+
+        Args:
+            threshold: Maximum Hamming distance for frames to count as the same
+            method: Hash method, "dhash" or "phash"
+            hash_size: Hash side length, giving hash_size**2 bits
+
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        if method not in HASH_METHODS:
+            raise ValueError(f"Unknown hash method: {method}")
+        if hash_size < 2:
+            raise ValueError("hash_size must be at least 2")
+        if threshold < 0 or threshold >= hash_size * hash_size:
+            raise ValueError("threshold must be between 0 and the hash length")
+
+        self.threshold = threshold
+        self.method = method
+        self.hash_size = hash_size
+        self.stats = DedupStats()
+        self._hash_func = dhash if method == "dhash" else phash
+        self._reference: int | None = None
+
+    def reset(self) -> None:
+        """Forget the reference frame and counters, e.g. for a new video."""
+        self.stats = DedupStats()
+        self._reference = None
+
+    def compute_hash(self, frame: np.ndarray) -> int:
+        """Compute the configured perceptual hash of a frame.
+
+        Args:
+            frame: Frame as numpy array
+
+        Returns:
+            Hash as an integer
+        """
+        return self._hash_func(frame, self.hash_size)
+
+    def is_duplicate(self, frame: np.ndarray) -> bool:
+        """Check a frame against the last analyzed frame.
+
+        Frames that are not duplicates become the new reference.
+
+        Args:
+            frame: Frame as numpy array
+
+        Returns:
+            True if the frame is within the threshold of the reference
+        """
+        frame_hash = self.compute_hash(frame)
+        self.stats.frames_checked += 1
+
+        if (
+            self._reference is not None
+            and hamming_distance(frame_hash, self._reference) <= self.threshold
+        ):
+            self.stats.frames_skipped += 1
+            return True
+
+        self._reference = frame_hash
+        return False
@@ -4,12 +4,18 @@ This module provides object detection functionality using YOLOv8.
 """
 
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
+import cv2
 import numpy as np
 from ultralytics import YOLO
 
+from video_understanding.core.upload.model_registry import (
+    ModelRegistry,
+    get_model_registry,
+)
 from video_understanding.utils.exceptions import ProcessingError
 
 
@@ -43,40 +49,91 @@ class DetectedObject:
         }
 
 
+def _load_yolo(model_path: str) -> Any:
+    """Load YOLO model weights."""
+    return YOLO(model_path)
+
+
 class ObjectDetector:
     """YOLOv8-based object detector for video frames.
 
     This class handles object detection in video frames using YOLOv8.
     It supports configurable confidence thresholds and model paths.
 
+    Frames from a video stream can be passed to detect_batch() to run
+    inference on several frames per model call, which amortises the
+    per-call overhead of the model.
+
+    The YOLO model is loaded from the process-wide model registry on first
+    use, so creating a detector is cheap and detectors with the same weights
+    share one model.
+
     Example:
         >>> detector = ObjectDetector()
         >>> frame = cv2.imread("frame.jpg")
         >>> detections = detector.detect_objects(frame)
         >>> for obj in detections:
         ...     print(f"Found {obj.label} with confidence {obj.confidence}")
+        >>> batches = detector.detect_batch([frame1, frame2], [0, 30])
     """
 
+    LETTERBOX_COLOR = 114  # YOLOv8 padding value
+
     def __init__(
         self,
         model_path: Optional[str] = None,
         confidence_threshold: float = 0.5,
+        batch_size: int = 8,
+        image_size: int = 640,
+        registry: Optional[ModelRegistry] = None,
     ) -> None:
         """Initialize the object detector.
 
+        The model is not loaded until the first detection or preload().
+
         Args:
             model_path: Path to YOLOv8 model weights (uses yolov8n.pt if None)
             confidence_threshold: Minimum confidence threshold for detections
+            batch_size: Maximum number of frames per model call in detect_batch
+            image_size: Square inference size frames are letterboxed to in
+                detect_batch (must be a multiple of 32)
+            registry: Model registry to load the model through (the
+                process-wide registry if None)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        if image_size < 32 or image_size % 32 != 0:
+            raise ValueError("image_size must be a positive multiple of 32")
+
+        self.batch_size = batch_size
+        self.image_size = image_size
+        self.confidence_threshold = confidence_threshold
+        self.model_path = model_path or "yolov8n.pt"
+        self.model_key = f"yolo:{self.model_path}"
+        self._registry = registry or get_model_registry()
+        # A plain function, so the registry does not keep this detector alive
+        self._registry.register(self.model_key, partial(_load_yolo, self.model_path))
+
+    @property
+    def model(self) -> Any:
+        """The YOLO model, loaded on first access.
 
         Raises:
-            ProcessingError: If model initialization fails
+            ProcessingError: If the model cannot be loaded
         """
         try:
-            self.model = YOLO(model_path or "yolov8n.pt")
-            self.confidence_threshold = confidence_threshold
+            return self._registry.get(self.model_key)
         except Exception as e:
             raise ProcessingError(f"Failed to initialize object detector: {e}")
 
+    def preload(self) -> None:
+        """Load the model now instead of on the first detection.
+
+        Raises:
+            ProcessingError: If the model cannot be loaded
+        """
+        self.model
+
     def detect_objects(
         self,
         frame: np.ndarray,
@@ -123,6 +180,155 @@ class ObjectDetector:
         except Exception as e:
             raise ProcessingError(f"Object detection failed: {e}")
 
+    def detect_batch(
+        self,
+        frames: Sequence[np.ndarray],
+        frame_numbers: Optional[Sequence[int]] = None,
+    ) -> List[List[DetectedObject]]:
+        """Detect objects in several frames with batched inference.
+
+        Frames are letterboxed to ``image_size`` up front, sent to the model
+        in chunks of ``batch_size``, and boxes are mapped back to the
+        original frame coordinates.
+
+        Args:
+            frames: Input frames as numpy arrays (BGR format)
+            frame_numbers: Frame numbers matching frames (defaults to 0..n-1)
+
+        Returns:
+            One list of detected objects per input frame, in input order
+
+        Raises:
+            ProcessingError: If detection fails
+        """
+        if frame_numbers is None:
+            frame_numbers = range(len(frames))
+        if len(frame_numbers) != len(frames):
+            raise ProcessingError("frame_numbers must match the number of frames")
+
+        try:
+            detections: List[List[DetectedObject]] = []
+            for start in range(0, len(frames), self.batch_size):
+                chunk = frames[start:start + self.batch_size]
+                batch, gains, pads = self._letterbox_batch(chunk)
+                results = self.model(
+                    list(batch),
+                    imgsz=self.image_size,
+                    conf=self.confidence_threshold,
+                    verbose=False,
+                )
+                for offset, result in enumerate(results):
+                    detections.append(
+                        self._extract_detections(
+                            result,
+                            gain=gains[offset],
+                            pad=pads[offset],
+                            shape=chunk[offset].shape[:2],
+                            frame_number=frame_numbers[start + offset],
+                        )
+                    )
+            return detections
+
+        except ProcessingError:
+            raise
+        except Exception as e:
+            raise ProcessingError(f"Batch object detection failed: {e}")
+
+    def _letterbox_batch(
+        self,
+        frames: Sequence[np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Resize and pad frames into one preallocated batch array.
+
+        Each frame is scaled so its longer side fits ``image_size``. The batch
+        canvas is the smallest stride-aligned size that holds every scaled
+        frame, so 16:9 video is padded to 384x640 rather than 640x640.
+
+        Args:
+            frames: Input frames (BGR format)
+
+        Returns:
+            Tuple of (batch of shape (n, height, width, 3), per-frame scale
+            factors, per-frame (x, y) padding offsets)
+        """
+        size = self.image_size
+        shapes = np.array([frame.shape[:2] for frame in frames], dtype=np.float64)
+        gains = np.minimum(size / shapes[:, 0], size / shapes[:, 1])
+        scaled = np.minimum(np.round(shapes * gains[:, None]), size).astype(np.int64)
+
+        stride = 32
+        canvas_h, canvas_w = (
+            np.ceil(scaled.max(axis=0) / stride).astype(np.int64) * stride
+        )
+        pads = np.stack(
+            [(canvas_w - scaled[:, 1]) // 2, (canvas_h - scaled[:, 0]) // 2], axis=1
+        )
+
+        batch = np.full(
+            (len(frames), canvas_h, canvas_w, 3), self.LETTERBOX_COLOR, dtype=np.uint8
+        )
+        for i, frame in enumerate(frames):
+            new_h, new_w = scaled[i]
+            pad_x, pad_y = pads[i]
+            if frame.shape[:2] != (new_h, new_w):
+                frame = cv2.resize(
+                    frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR
+                )
+            if frame.ndim == 2:
+                frame = frame[:, :, None]
+            batch[i, pad_y:pad_y + new_h, pad_x:pad_x + new_w] = frame
+
+        return batch, gains.astype(np.float32), pads.astype(np.float32)
+
+    def _extract_detections(
+        self,
+        result: Any,
+        gain: float,
+        pad: np.ndarray,
+        shape: Tuple[int, int],
+        frame_number: int,
+    ) -> List[DetectedObject]:
+        """Convert one model result into detections in frame coordinates.
+
+        Args:
+            result: Model result for a letterboxed frame
+            gain: Scale factor applied during letterboxing
+            pad: (x, y) padding offsets applied during letterboxing
+            shape: Original frame (height, width)
+            frame_number: Frame number of the frame
+
+        Returns:
+            List of detected objects above the confidence threshold
+        """
+        boxes = result.boxes
+        confidences = np.asarray(boxes.conf.cpu().numpy(), dtype=np.float32)
+        mask = confidences >= self.confidence_threshold
+        if not mask.any():
+            return []
+
+        xyxy = np.asarray(boxes.xyxy.cpu().numpy(), dtype=np.float32)[mask]
+        classes = np.asarray(boxes.cls.cpu().numpy()).astype(np.int64)[mask]
+        confidences = confidences[mask]
+
+        # Undo letterboxing and clip to the original frame
+        xyxy = (xyxy - np.tile(pad, 2)) / gain
+        height, width = shape
+        np.clip(xyxy[:, 0::2], 0, width, out=xyxy[:, 0::2])
+        np.clip(xyxy[:, 1::2], 0, height, out=xyxy[:, 1::2])
+
+        names = result.names
+        return [
+            DetectedObject(
+                label=names[cls],
+                confidence=conf,
+                bbox=bbox,
+                frame_number=frame_number,
+            )
+            for cls, conf, bbox in zip(
+                classes.tolist(), confidences.tolist(), xyxy.tolist()
+            )
+        ]
+
     def __call__(
         self,
         frame: np.ndarray,
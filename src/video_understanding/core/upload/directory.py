@@ -2,15 +2,35 @@
 
 This module provides functionality for managing the directory structure and
 permissions for the video upload system.
+
+Long-lived subdirectories (completed, failed and quarantine) are sharded:
+an entry ``completed/<video_id>`` is stored as ``completed/ab/cd/<video_id>``,
+where ``ab/cd`` is a hex prefix of the entry's name. Names that are hex
+strings, such as video ids and content hashes, use their own leading digits;
+other names use a hash. With the default two levels of 256 directories, a
+million entries leave about 15 per leaf directory, so lookups and listings
+stay fast on ext4 and XFS at any scale.
+
+Entries stored before sharding, directly under the subdirectory, are still
+found: path resolution checks the sharded location and then the flat one.
+migrate_to_sharded() moves them into the sharded layout while the system is
+running.
 """
 
+import hashlib
 import logging
 import os
+import re
 import shutil
+import time
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional, Sequence
 
 from video_understanding.utils.constants import (
+    SHARDED_UPLOAD_SUBDIRS,
+    UPLOAD_SHARD_DEPTH,
+    UPLOAD_SHARD_WIDTH,
     UPLOAD_SUBDIRS,
     UPLOAD_DIR_MODE,
     UPLOAD_FILE_MODE,
@@ -19,6 +39,30 @@ from video_understanding.utils.exceptions import StorageError
 
 logger = logging.getLogger(__name__)
 
+_HEX = re.compile(r"[0-9a-f]+")
+
+# Hex digits available for shard prefixes of non-hex names
+_NAME_DIGEST_SIZE = 8
+
+
+@dataclass
+class ShardMigrationStats:
+    """Outcome of moving flat entries into the sharded layout.
+
+    Attributes:
+        moved: Entries moved into shard directories
+        conflicts: Entries left in place because the sharded location is taken
+        failed: Entries that could not be moved
+    """
+
+    moved: int = 0
+    conflicts: int = 0
+    failed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert statistics to a dictionary."""
+        return asdict(self)
+
 
 class DirectoryManager:
     """Manages directory structure and permissions for video uploads.
@@ -30,29 +74,53 @@ class DirectoryManager:
     Attributes:
         base_dir: Base directory for all upload operations
         test_mode: Whether running in test mode (skips actual file operations)
+        shard_depth: Levels of shard directories (0 disables sharding)
+        shard_width: Hex digits per shard level; each level fans out into
+            16**shard_width directories
+        sharded_subdirs: Subdirectories whose entries are sharded
 
     Example:
         >>> manager = DirectoryManager(Path("/uploads"))
         >>> manager.initialize_directories()
         >>> manager.ensure_directory_exists("processing")
+        >>> manager.get_path("completed/0f3a9c2e-...", "video.mp4")
+        PosixPath('/uploads/completed/0f/3a/0f3a9c2e-.../video.mp4')
     """
 
     def __init__(
         self,
         base_dir: Path,
         test_mode: bool = False,
+        shard_depth: int = UPLOAD_SHARD_DEPTH,
+        shard_width: int = UPLOAD_SHARD_WIDTH,
+        sharded_subdirs: Sequence[str] = SHARDED_UPLOAD_SUBDIRS,
     ) -> None:
         """Initialize the directory manager.
 
         Args:
             base_dir: Base directory for all upload operations
             test_mode: Whether to run in test mode (skip file operations)
+            shard_depth: Levels of shard directories (0 disables sharding)
+            shard_width: Hex digits per shard level
+            sharded_subdirs: Subdirectories whose entries are sharded
 
         Raises:
-            StorageError: If base directory is invalid or inaccessible
+            StorageError: If base directory is invalid or inaccessible, or the
+                shard layout is invalid
         """
+        if (
+            shard_depth < 0
+            or shard_width < 1
+            or shard_depth * shard_width > 2 * _NAME_DIGEST_SIZE
+        ):
+            raise StorageError(
+                f"Invalid shard layout: depth {shard_depth}, width {shard_width}"
+            )
         self.base_dir = base_dir
         self.test_mode = test_mode
+        self.shard_depth = shard_depth
+        self.shard_width = shard_width
+        self.sharded_subdirs = tuple(sharded_subdirs)
         self._validate_base_dir()
 
     def _validate_base_dir(self) -> None:
@@ -112,11 +180,11 @@ class DirectoryManager:
             StorageError: If directory cannot be created or secured
         """
         if self.test_mode:
-            return self.base_dir / subdir
+            return self.get_path(subdir)
 
         try:
-            dir_path = self.base_dir / subdir
-            dir_path.mkdir(exist_ok=True)
+            dir_path = self.get_path(subdir)
+            self._make_dirs(dir_path)
             os.chmod(str(dir_path), UPLOAD_DIR_MODE)
 
             logger.debug(f"Ensured directory exists: {dir_path}")
@@ -125,11 +193,37 @@ class DirectoryManager:
         except OSError as e:
             raise StorageError(f"Failed to ensure directory exists: {e}")
 
+    def shard_prefix(self, name: str) -> Path:
+        """Get the shard directories for an entry.
+
+        Names differing only in their extensions share a shard, so sidecar
+        files stay next to their file.
+
+        Args:
+            name: Name of the entry directly under a sharded subdirectory
+
+        Returns:
+            Relative shard path, e.g. ``Path("ab/cd")``
+        """
+        stem = name.split(".", 1)[0]
+        digits = stem.replace("-", "").lower()
+        size = self.shard_depth * self.shard_width
+        if len(digits) < size or not _HEX.fullmatch(digits):
+            digest = hashlib.blake2b(stem.encode(), digest_size=_NAME_DIGEST_SIZE)
+            digits = digest.hexdigest()
+        return Path(
+            *(digits[i:i + self.shard_width] for i in range(0, size, self.shard_width))
+        )
+
     def get_path(self, subdir: str, filename: Optional[str] = None) -> Path:
         """Get path within the directory structure.
 
+        Entries of sharded subdirectories resolve to their shard directory,
+        unless they exist only at their flat location from before sharding.
+
         Args:
-            subdir: Subdirectory name
+            subdir: Subdirectory name, optionally with an entry below it
+                (e.g. ``completed/<video_id>``)
             filename: Optional filename to append to path
 
         Returns:
@@ -139,9 +233,14 @@ class DirectoryManager:
             StorageError: If path would be invalid
         """
         try:
-            path = self.base_dir / subdir
+            parts = Path(subdir).parts
             if filename:
-                path = path / filename
+                parts += (filename,)
+            path = self.base_dir.joinpath(*parts)
+            if self._is_sharded(parts):
+                sharded = self._sharded_path(parts)
+                if sharded.exists() or not path.exists():
+                    path = sharded
 
             # Ensure path is within base directory (prevent path traversal)
             if not str(path.resolve()).startswith(str(self.base_dir.resolve())):
@@ -152,6 +251,33 @@ class DirectoryManager:
         except Exception as e:
             raise StorageError(f"Failed to get valid path: {e}")
 
+    def locate(self, path: Path) -> Path:
+        """Find the current location of a file in the upload directory.
+
+        Paths recorded before or after a migration to the sharded layout
+        are mapped to where the file is now.
+
+        Args:
+            path: Path to a file or directory under the base directory
+
+        Returns:
+            Current path of the file, or path unchanged if it is not found
+        """
+        if path.exists():
+            return path
+        try:
+            parts = path.relative_to(self.base_dir).parts
+        except ValueError:
+            return path
+        if not self._is_sharded(parts):
+            return path
+
+        if self._in_shard(parts):
+            candidate = self.base_dir.joinpath(parts[0], *parts[self.shard_depth + 1:])
+        else:
+            candidate = self._sharded_path(parts)
+        return candidate if candidate.exists() else path
+
     def move_file(
         self,
         source: Path,
@@ -181,7 +307,7 @@ class DirectoryManager:
 
             # Get destination path
             dest = self.get_path(dest_subdir, filename or source.name)
-            dest.parent.mkdir(exist_ok=True)
+            self._make_dirs(dest.parent)
 
             # Move file
             shutil.move(str(source), str(dest))
@@ -196,6 +322,10 @@ class DirectoryManager:
     def cleanup_empty_dirs(self, subdir: str) -> None:
         """Remove empty directories within a subdirectory.
 
+        Walks the whole subdirectory, so it is meant for occasional
+        maintenance; prune_empty_dirs() cleans up after a single file. Shard
+        directories are kept, as they are reused by later entries.
+
         Args:
             subdir: Subdirectory to clean up
 
@@ -212,7 +342,9 @@ class DirectoryManager:
 
             # Walk directory tree bottom-up
             for dirpath, dirnames, filenames in os.walk(str(path), topdown=False):
-                if not dirnames and not filenames and dirpath != str(path):
+                if self._is_permanent(Path(dirpath)):
+                    continue
+                if not dirnames and not filenames:
                     try:
                         Path(dirpath).rmdir()
                         logger.debug(f"Removed empty directory: {dirpath}")
@@ -222,6 +354,154 @@ class DirectoryManager:
         except Exception as e:
             raise StorageError(f"Failed to cleanup empty directories: {e}")
 
+    def prune_empty_dirs(self, directory: Path) -> None:
+        """Remove a directory and its parents while they are empty.
+
+        Stops at the first non-empty directory, a shard directory or the
+        subdirectory itself, so it only touches the path of one entry.
+
+        Args:
+            directory: Directory left behind by a removed file
+        """
+        if self.test_mode:
+            return
+
+        while not self._is_permanent(directory):
+            try:
+                directory.rmdir()
+            except OSError:
+                return  # Not empty, or already removed
+            logger.debug(f"Removed empty directory: {directory}")
+            directory = directory.parent
+
+    def migrate_to_sharded(
+        self,
+        subdir: str,
+        batch_size: int = 1000,
+        pause: float = 0.0,
+        exclude: Iterable[str] = (),
+    ) -> ShardMigrationStats:
+        """Move flat entries of a subdirectory into the sharded layout.
+
+        Safe to run while uploads are processed: each entry is moved with an
+        atomic rename, and path resolution finds it at either location.
+        Entries are moved in a single scan of the subdirectory, repeated
+        until a scan finds nothing left to move.
+
+        Args:
+            subdir: Sharded subdirectory to migrate
+            batch_size: Entries moved between progress reports and pauses
+            pause: Seconds to sleep after each batch, to limit I/O load
+            exclude: Names of entries to leave in place
+
+        Returns:
+            Migration statistics
+
+        Raises:
+            StorageError: If the subdirectory is not sharded or cannot be read
+        """
+        if subdir not in self.sharded_subdirs or not self.shard_depth:
+            raise StorageError(f"Subdirectory is not sharded: {subdir}")
+
+        stats = ShardMigrationStats()
+        root = self.get_path(subdir)
+        if self.test_mode or not root.exists():
+            return stats
+
+        skipped = set(exclude)
+        try:
+            while True:
+                moved = stats.moved
+                with os.scandir(root) as entries:
+                    for entry in entries:
+                        if entry.name in skipped or self._is_shard_dir(entry):
+                            continue
+                        target = self._sharded_path((subdir, entry.name))
+                        if target.exists():
+                            logger.warning(
+                                f"Not migrating {entry.path}: {target} exists"
+                            )
+                            stats.conflicts += 1
+                            skipped.add(entry.name)
+                            continue
+                        try:
+                            self._make_dirs(target.parent)
+                            os.rename(entry.path, target)
+                        except OSError as e:
+                            logger.warning(f"Failed to migrate {entry.path}: {e}")
+                            stats.failed += 1
+                            skipped.add(entry.name)
+                            continue
+                        stats.moved += 1
+                        if stats.moved % batch_size == 0:
+                            logger.info(f"Migrated {stats.moved} entries of {root}")
+                            if pause:
+                                time.sleep(pause)
+                if stats.moved == moved:
+                    break
+
+        except OSError as e:
+            raise StorageError(f"Failed to migrate {subdir} to sharded layout: {e}")
+
+        logger.info(
+            f"Migrated {root} to sharded layout: {stats.moved} moved, "
+            f"{stats.conflicts} conflicts, {stats.failed} failed"
+        )
+        return stats
+
+    def _is_sharded(self, parts: Sequence[str]) -> bool:
+        """Whether a relative path names an entry of a sharded subdirectory."""
+        return (
+            bool(self.shard_depth)
+            and len(parts) > 1
+            and parts[0] in self.sharded_subdirs
+        )
+
+    def _in_shard(self, parts: Sequence[str]) -> bool:
+        """Whether a relative path already runs through shard directories."""
+        depth = self.shard_depth
+        return (
+            len(parts) > depth + 1
+            and Path(*parts[1:depth + 1]) == self.shard_prefix(parts[depth + 1])
+        )
+
+    def _sharded_path(self, parts: Sequence[str]) -> Path:
+        """Sharded location of an entry given by its flat relative path."""
+        return self.base_dir.joinpath(parts[0], self.shard_prefix(parts[1]), *parts[1:])
+
+    def _is_shard_dir(self, entry: os.DirEntry) -> bool:
+        """Whether a directory entry is a top-level shard directory."""
+        return (
+            len(entry.name) == self.shard_width
+            and _HEX.fullmatch(entry.name) is not None
+            and entry.is_dir(follow_symlinks=False)
+        )
+
+    def _is_permanent(self, directory: Path) -> bool:
+        """Whether a directory is a subdirectory root or shard directory."""
+        try:
+            parts = directory.relative_to(self.base_dir).parts
+        except ValueError:
+            return True
+        if len(parts) <= 1:
+            return True
+        if parts[0] not in self.sharded_subdirs or len(parts) > self.shard_depth + 1:
+            return False
+        return all(
+            len(part) == self.shard_width and _HEX.fullmatch(part)
+            for part in parts[1:]
+        )
+
+    def _make_dirs(self, directory: Path) -> None:
+        """Create a directory and missing parents with upload permissions."""
+        missing = []
+        while not directory.exists():
+            missing.append(directory)
+            directory = directory.parent
+        for path in reversed(missing):
+            path.mkdir(exist_ok=True)
+            os.chmod(str(path), UPLOAD_DIR_MODE)
+
     def remove_file(self, subdir: str, filename: str) -> None:
         """Remove a file from a subdirectory.
 
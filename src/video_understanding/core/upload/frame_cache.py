@@ -0,0 +1,609 @@
+"""Content-addressed on-disk cache of frames and per-frame analysis results.
+
+Re-running analysis after changing one stage (an OCR threshold, a new scene
+detector setting) should not decode and analyze the whole video again. This
+module caches two kinds of data, both keyed by the hash of the video's
+content so renamed or re-uploaded copies hit the same entries:
+
+- Downscaled frames, keyed by (video, frame index, transform). Frames with
+  the same transform are stored in fixed-size chunks, one memory-mapped
+  ``.npy`` file per chunk.
+- Analysis results, keyed by (video, frame index, stage, version, params),
+  stored as JSON. Changing a model version or parameter changes the key, so
+  only that stage misses.
+
+Entries are tracked in a SQLite index, which also keeps the total size of
+the cache. When the total exceeds the cap, the least recently used chunks and
+results are evicted. Several processes may share one cache directory: the
+index runs in WAL mode with a busy timeout, every update is committed on its
+own, and chunk files are created without overwriting another process's.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Seconds a writer waits for another process's transaction to finish
+BUSY_TIMEOUT = 30.0
+
+# Candidates examined per eviction query
+EVICTION_BATCH_SIZE = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    chunk TEXT PRIMARY KEY,
+    nbytes INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS frames (
+    video TEXT NOT NULL,
+    transform TEXT NOT NULL,
+    frame_index INTEGER NOT NULL,
+    chunk TEXT NOT NULL,
+    PRIMARY KEY (video, transform, frame_index)
+);
+CREATE INDEX IF NOT EXISTS frames_chunk ON frames (chunk);
+CREATE TABLE IF NOT EXISTS results (
+    video TEXT NOT NULL,
+    frame_index INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    version TEXT NOT NULL,
+    params TEXT NOT NULL,
+    data TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (video, stage, version, params, frame_index)
+);
+CREATE INDEX IF NOT EXISTS results_access ON results (last_access);
+CREATE INDEX IF NOT EXISTS chunks_access ON chunks (last_access);
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    nbytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO usage VALUES (
+    0,
+    (SELECT COALESCE(SUM(nbytes), 0) FROM chunks)
+    + (SELECT COALESCE(SUM(nbytes), 0) FROM results)
+);
+CREATE TRIGGER IF NOT EXISTS chunks_insert AFTER INSERT ON chunks
+BEGIN
+    UPDATE usage SET nbytes = nbytes + NEW.nbytes;
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_delete AFTER DELETE ON chunks
+BEGIN
+    UPDATE usage SET nbytes = nbytes - OLD.nbytes;
+END;
+CREATE TRIGGER IF NOT EXISTS results_insert AFTER INSERT ON results
+BEGIN
+    UPDATE usage SET nbytes = nbytes + NEW.nbytes;
+END;
+CREATE TRIGGER IF NOT EXISTS results_delete AFTER DELETE ON results
+BEGIN
+    UPDATE usage SET nbytes = nbytes - OLD.nbytes;
+END;
+"""
+
+
+@dataclass(frozen=True)
+class FrameTransform:
+    """Downscaling applied to frames before they are cached.
+
+    Attributes:
+        width: Target width in pixels
+        height: Target height in pixels
+        grayscale: Whether to convert frames to grayscale
+    """
+
+    width: int
+    height: int
+    grayscale: bool = False
+
+    @property
+    def key(self) -> str:
+        """Transform spec used in cache keys."""
+        return f"{self.width}x{self.height}{':gray' if self.grayscale else ''}"
+
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale a BGR frame.
+
+        Args:
+            frame: Frame as numpy array
+
+        Returns:
+            Transformed frame
+        """
+        if frame.shape[1] != self.width or frame.shape[0] != self.height:
+            frame = cv2.resize(
+                frame, (self.width, self.height), interpolation=cv2.INTER_AREA
+            )
+        if self.grayscale and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return frame
+
+
+@dataclass
+class FrameCacheStats:
+    """Frame cache counters.
+
+    Attributes:
+        frame_hits: Frames served from the cache
+        frame_misses: Frame lookups not in the cache
+        result_hits: Results served from the cache
+        result_misses: Result lookups not in the cache
+        evicted_bytes: Bytes evicted to stay under the size cap
+    """
+
+    frame_hits: int = 0
+    frame_misses: int = 0
+    result_hits: int = 0
+    result_misses: int = 0
+    evicted_bytes: int = 0
+
+
+def _params_key(params: Optional[Dict[str, Any]]) -> str:
+    """Serialize stage parameters into a stable key."""
+    return json.dumps(params or {}, sort_keys=True, default=str)
+
+
+class FrameCache:
+    """On-disk cache of downscaled frames and per-frame analysis results.
+
+    Example:
+        >>> cache = FrameCache(Path("cache"), max_bytes=2 * 1024**3)
+        >>> video = cache.video_key(path)
+        >>> objects = cache.get_result(video, 30, "objects", "yolov8n", params)
+        >>> if objects is None:
+        ...     objects = detect(frame)
+        ...     cache.put_result(video, 30, "objects", "yolov8n", params, objects)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = 1024 * 1024 * 1024,
+        chunk_frames: int = 256,
+        max_open_chunks: int = 8,
+    ) -> None:
+        """Initialize the cache, creating the directory and index if needed.
+
+        Args:
+            cache_dir: Directory holding the index and chunk files
+            max_bytes: Size cap for cached frames and results
+            chunk_frames: Number of frames per chunk file
+            max_open_chunks: Number of chunk files kept memory-mapped
+
+        Raises:
+            ValueError: If a size parameter is not positive
+        """
+        if max_bytes <= 0 or chunk_frames <= 0 or max_open_chunks <= 0:
+            raise ValueError(
+                "max_bytes, chunk_frames and max_open_chunks must be positive"
+            )
+
+        self.cache_dir = Path(cache_dir)
+        self.chunk_dir = self.cache_dir / "chunks"
+        self.chunk_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.chunk_frames = chunk_frames
+        self.max_open_chunks = max_open_chunks
+        self.stats = FrameCacheStats()
+
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(
+            str(self.cache_dir / "index.sqlite"),
+            timeout=BUSY_TIMEOUT,
+            check_same_thread=False,
+        )
+        self._db.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        # Replaced rows fire the delete triggers that keep the size total
+        self._db.execute("PRAGMA recursive_triggers = ON")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self._open_chunks: "OrderedDict[str, np.memmap]" = OrderedDict()
+
+    def __enter__(self) -> "FrameCache":
+        """Enter context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Flush and close the cache."""
+        self.close()
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes held by cached frames and results, across all processes."""
+        with self._lock:
+            return self._db.execute("SELECT nbytes FROM usage").fetchone()[0]
+
+    def video_key(self, path: Path) -> str:
+        """Hash a video's content.
+
+        The hash is remembered per (path, size, mtime), so unchanged files
+        are only read once.
+
+        Args:
+            path: Path to the video file
+
+        Returns:
+            Hex digest of the file content
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT hash FROM file_hashes "
+                "WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (str(path), stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+        if row:
+            return row[0]
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(4 * 1024 * 1024), b""):
+                digest.update(block)
+        video = digest.hexdigest()
+
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?)",
+                (str(path), stat.st_size, stat.st_mtime_ns, video),
+            )
+        return video
+
+    def get_frame(
+        self, video: str, frame_index: int, transform: FrameTransform
+    ) -> Optional[np.ndarray]:
+        """Look up a cached frame.
+
+        Args:
+            video: Video key from video_key()
+            frame_index: Frame index in the video
+            transform: Transform the frame was cached with
+
+        Returns:
+            Copy of the cached frame, or None if it is not cached
+        """
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT chunk FROM frames "
+                "WHERE video = ? AND transform = ? AND frame_index = ?",
+                (video, transform.key, frame_index),
+            ).fetchone()
+            if row is None:
+                self.stats.frame_misses += 1
+                return None
+            chunk = self._map_chunk(row[0])
+            if chunk is None:
+                self.stats.frame_misses += 1
+                return None
+            self._db.execute(
+                "UPDATE chunks SET last_access = ? WHERE chunk = ?",
+                (time.time(), row[0]),
+            )
+            self.stats.frame_hits += 1
+            return np.array(chunk[frame_index % self.chunk_frames])
+
+    def frame_indices(self, video: str, transform: FrameTransform) -> Set[int]:
+        """List the cached frames of a video.
+
+        Args:
+            video: Video key from video_key()
+            transform: Transform the frames were cached with
+
+        Returns:
+            Set of cached frame indices
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT frame_index FROM frames WHERE video = ? AND transform = ?",
+                (video, transform.key),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def put_frame(
+        self,
+        video: str,
+        frame_index: int,
+        transform: FrameTransform,
+        frame: np.ndarray,
+    ) -> np.ndarray:
+        """Transform a frame and store it.
+
+        Args:
+            video: Video key from video_key()
+            frame_index: Frame index in the video
+            transform: Transform to apply before caching
+            frame: Full-size frame
+
+        Returns:
+            The transformed frame
+        """
+        small = transform.apply(frame)
+        name = self._chunk_name(video, transform, frame_index)
+        with self._lock, self._db:
+            chunk = self._writable_chunk(name, small)
+            chunk[frame_index % self.chunk_frames] = small
+            self._db.execute(
+                "INSERT OR REPLACE INTO frames VALUES (?, ?, ?, ?)",
+                (video, transform.key, frame_index, name),
+            )
+            # The chunk being filled is the most recently used one
+            self._db.execute(
+                "UPDATE chunks SET last_access = ? WHERE chunk = ?",
+                (time.time(), name),
+            )
+            self._maybe_evict()
+        return small
+
+    def get_result(
+        self,
+        video: str,
+        frame_index: int,
+        stage: str,
+        version: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Look up a cached analysis result.
+
+        Args:
+            video: Video key from video_key()
+            frame_index: Frame index, or -1 for whole-video results
+            stage: Analysis stage name
+            version: Model name and version of the stage
+            params: Parameters that affect the stage's output
+
+        Returns:
+            The cached result, or None if it is not cached
+        """
+        params_key = _params_key(params)
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT data FROM results WHERE video = ? AND stage = ? "
+                "AND version = ? AND params = ? AND frame_index = ?",
+                (video, stage, version, params_key, frame_index),
+            ).fetchone()
+            if row is None:
+                self.stats.result_misses += 1
+                return None
+            self._db.execute(
+                "UPDATE results SET last_access = ? WHERE video = ? AND stage = ? "
+                "AND version = ? AND params = ? AND frame_index = ?",
+                (time.time(), video, stage, version, params_key, frame_index),
+            )
+            self.stats.result_hits += 1
+            return json.loads(row[0])
+
+    def get_results(
+        self,
+        video: str,
+        stage: str,
+        version: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[int, Any]:
+        """Look up all cached results of a stage for a video.
+
+        Args:
+            video: Video key from video_key()
+            stage: Analysis stage name
+            version: Model name and version of the stage
+            params: Parameters that affect the stage's output
+
+        Returns:
+            Dictionary mapping frame indices to results
+        """
+        params_key = _params_key(params)
+        with self._lock, self._db:
+            rows = self._db.execute(
+                "SELECT frame_index, data FROM results WHERE video = ? AND stage = ? "
+                "AND version = ? AND params = ?",
+                (video, stage, version, params_key),
+            ).fetchall()
+            if rows:
+                self._db.execute(
+                    "UPDATE results SET last_access = ? WHERE video = ? AND stage = ? "
+                    "AND version = ? AND params = ?",
+                    (time.time(), video, stage, version, params_key),
+                )
+            self.stats.result_hits += len(rows)
+        return {frame_index: json.loads(data) for frame_index, data in rows}
+
+    def put_result(
+        self,
+        video: str,
+        frame_index: int,
+        stage: str,
+        version: str,
+        params: Optional[Dict[str, Any]],
+        result: Any,
+    ) -> None:
+        """Store an analysis result.
+
+        Args:
+            video: Video key from video_key()
+            frame_index: Frame index, or -1 for whole-video results
+            stage: Analysis stage name
+            version: Model name and version of the stage
+            params: Parameters that affect the stage's output
+            result: JSON-serializable result
+        """
+        data = json.dumps(result, default=str)
+        params_key = _params_key(params)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    video, frame_index, stage, version, params_key,
+                    data, len(data), time.time(),
+                ),
+            )
+            self._maybe_evict()
+
+    def flush(self) -> None:
+        """Write pending frames to disk."""
+        with self._lock:
+            for chunk in self._open_chunks.values():
+                chunk.flush()
+            self._db.commit()
+
+    def close(self) -> None:
+        """Flush and release all files."""
+        with self._lock:
+            self.flush()
+            self._open_chunks.clear()
+            self._db.close()
+
+    def _chunk_name(
+        self, video: str, transform: FrameTransform, frame_index: int
+    ) -> str:
+        """Name of the chunk holding a frame."""
+        key = f"{video}:{transform.key}:{frame_index // self.chunk_frames}"
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    def _chunk_path(self, name: str) -> Path:
+        return self.chunk_dir / f"{name}.npy"
+
+    def _map_chunk(self, name: str) -> Optional[np.memmap]:
+        """Memory-map an existing chunk file (lock held)."""
+        chunk = self._open_chunks.get(name)
+        if chunk is not None:
+            self._open_chunks.move_to_end(name)
+            return chunk
+        path = self._chunk_path(name)
+        if not path.exists():
+            return None
+        chunk = np.lib.format.open_memmap(path, mode="r+")
+        self._remember_chunk(name, chunk)
+        return chunk
+
+    def _writable_chunk(self, name: str, frame: np.ndarray) -> np.memmap:
+        """Map the chunk for a frame, creating it if needed (lock held).
+
+        A mapping is only reused while the chunk is indexed, since another
+        process may have evicted it.
+        """
+        indexed = self._db.execute(
+            "SELECT 1 FROM chunks WHERE chunk = ?", (name,)
+        ).fetchone()
+        if indexed is None:
+            self._open_chunks.pop(name, None)
+        chunk = self._map_chunk(name) if indexed else None
+        if chunk is not None and (
+            chunk.shape[1:] != frame.shape or chunk.dtype != frame.dtype
+        ):
+            self._drop_chunk(name)
+            chunk = None
+        return chunk if chunk is not None else self._create_chunk(name, frame)
+
+    def _create_chunk(self, name: str, frame: np.ndarray) -> np.memmap:
+        """Create a chunk file sized for frames like the given one (lock held).
+
+        The file is written under a temporary name and linked into place, so
+        a chunk another process created first is mapped instead of truncated.
+        """
+        path = self._chunk_path(name)
+        temp_path = path.with_name(f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        chunk = np.lib.format.open_memmap(
+            temp_path,
+            mode="w+",
+            dtype=frame.dtype,
+            shape=(self.chunk_frames, *frame.shape),
+        )
+        try:
+            os.link(temp_path, path)
+        except FileExistsError:
+            existing = np.lib.format.open_memmap(path, mode="r+")
+            if existing.shape == chunk.shape and existing.dtype == chunk.dtype:
+                chunk = existing
+            else:
+                os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+        self._db.execute(
+            "INSERT OR IGNORE INTO chunks VALUES (?, ?, ?)",
+            (name, os.path.getsize(path), time.time()),
+        )
+        self._remember_chunk(name, chunk)
+        return chunk
+
+    def _remember_chunk(self, name: str, chunk: np.memmap) -> None:
+        """Keep a chunk mapped, unmapping the least recently used (lock held)."""
+        self._open_chunks[name] = chunk
+        while len(self._open_chunks) > self.max_open_chunks:
+            _, oldest = self._open_chunks.popitem(last=False)
+            oldest.flush()
+
+    def _drop_chunk(self, name: str) -> int:
+        """Delete a chunk and its frame entries (lock held).
+
+        Returns:
+            Bytes freed
+        """
+        self._open_chunks.pop(name, None)
+        row = self._db.execute(
+            "SELECT nbytes FROM chunks WHERE chunk = ?", (name,)
+        ).fetchone()
+        self._db.execute("DELETE FROM frames WHERE chunk = ?", (name,))
+        self._db.execute("DELETE FROM chunks WHERE chunk = ?", (name,))
+        self._chunk_path(name).unlink(missing_ok=True)
+        return row[0] if row else 0
+
+    def _maybe_evict(self) -> None:
+        """Evict least recently used entries above the size cap (lock held).
+
+        The total is shared by all processes using the cache. Evicts down to
+        90% of the cap so eviction does not run on every put, examining the
+        oldest entries a batch at a time.
+        """
+        total = self._db.execute("SELECT nbytes FROM usage").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        while total > target:
+            candidates = self._db.execute(
+                "SELECT last_access, 'chunk', chunk, NULL, NULL, NULL, NULL, nbytes "
+                "FROM chunks UNION ALL "
+                "SELECT last_access, 'result', video, stage, version, params, "
+                "frame_index, nbytes FROM results ORDER BY 1 LIMIT ?",
+                (EVICTION_BATCH_SIZE,),
+            ).fetchall()
+            if not candidates:
+                break
+            for _, kind, key, stage, version, params, frame_index, nbytes in candidates:
+                if total <= target:
+                    break
+                if kind == "chunk":
+                    freed = self._drop_chunk(key)
+                else:
+                    self._db.execute(
+                        "DELETE FROM results WHERE video = ? AND stage = ? "
+                        "AND version = ? AND params = ? AND frame_index = ?",
+                        (key, stage, version, params, frame_index),
+                    )
+                    freed = nbytes
+                total -= freed
+                self.stats.evicted_bytes += freed
+        logger.info(f"Evicted frame cache entries down to {total} bytes")
@@ -2,18 +2,28 @@
 
 This module provides functionality for validating video file integrity,
 including format validation, frame validation, and codec compatibility checks.
+
+VideoIntegrityChecker.validate() does all of this in one pass over a single
+open of the container. It reads the metadata, bitrate and first frame, then
+samples frames with keyframe-aligned seeks in increasing order, so each
+sample decodes one keyframe instead of a GOP.
 """
 
 import logging
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple
 
 import cv2
 import magic
-import hashlib
 import asyncio
 from typing import Dict
 
+try:
+    import av
+except ImportError:  # pragma: no cover - optional dependency
+    av = None
+
 from video_understanding.utils.constants import (
     VALID_VIDEO_FORMATS,
     MIN_SCENE_LENGTH,
@@ -22,10 +32,33 @@ from video_understanding.utils.constants import (
 from video_understanding.utils.exceptions import VideoIntegrityError, VideoFormatError
 from video_understanding.models.video import VideoMetadata
 from ..exceptions import IntegrityError
+from .checksum import ChecksumEngine
+from .container import ContainerStructure, inspect_container
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class IntegrityReport:
+    """Result of a one-pass video validation.
+
+    Attributes:
+        metadata: Extracted video metadata
+        bitrate: Bitrate in bits per second
+        frame_width: Width of the decoded frames in pixels
+        frame_height: Height of the decoded frames in pixels
+        samples_checked: Number of distinct frames decoded and checked
+        structure: Container structure, if it was checked
+    """
+
+    metadata: VideoMetadata
+    bitrate: int
+    frame_width: int
+    frame_height: int
+    samples_checked: int
+    structure: Optional[ContainerStructure] = None
+
+
 class VideoIntegrityChecker:
     """Checks video file integrity and extracts metadata.
 
@@ -44,13 +77,247 @@ class VideoIntegrityChecker:
         ...     print(f"Invalid video: {e}")
     """
 
-    def __init__(self, test_mode: bool = False):
+    def __init__(self, test_mode: bool = False, check_structure: bool = False):
         """Initialize the integrity checker.
 
         Args:
             test_mode: Whether to run in test mode (skip actual validation)
+            check_structure: Whether validate() also checks the container
+                structure (moov atom, stream headers) without decoding
         """
         self.test_mode = test_mode
+        self.check_structure = check_structure
+
+    def validate(
+        self,
+        file_path: Path,
+        sample_count: int = 5,
+        check_structure: Optional[bool] = None,
+    ) -> IntegrityReport:
+        """Validate a video in one pass.
+
+        Combines check_video(), validate_frames() and estimate_bitrate()
+        while opening the container only once. Samples are the first frame
+        and the keyframes at or before evenly spaced times; with PyAV only
+        those keyframes are decoded.
+
+        Args:
+            file_path: Path to the video file
+            sample_count: Number of frames to sample, including the first
+            check_structure: Whether to check the container structure
+                (defaults to the checker's setting)
+
+        Returns:
+            IntegrityReport with metadata, bitrate and sampling results
+
+        Raises:
+            VideoFormatError: If video format is invalid
+            VideoIntegrityError: If video fails integrity checks
+        """
+        if self.test_mode:
+            return IntegrityReport(
+                metadata=self.check_video(file_path),
+                bitrate=5_000_000,
+                frame_width=1920,
+                frame_height=1080,
+                samples_checked=0,
+            )
+        if check_structure is None:
+            check_structure = self.check_structure
+
+        try:
+            self._validate_format(file_path)
+            structure = inspect_container(file_path) if check_structure else None
+
+            if av is not None:
+                report = self._probe_pyav(file_path, max(1, sample_count))
+            else:
+                report = self._probe_opencv(file_path, max(1, sample_count))
+            report.structure = structure
+            return report
+
+        except (VideoFormatError, VideoIntegrityError):
+            raise
+        except Exception as e:
+            raise VideoIntegrityError(f"Failed to validate video: {e}")
+
+    def _probe_pyav(self, file_path: Path, sample_count: int) -> IntegrityReport:
+        """Read metadata and sample keyframes with PyAV.
+
+        Args:
+            file_path: Path to the video file
+            sample_count: Number of frames to sample, including the first
+
+        Returns:
+            IntegrityReport without structure information
+
+        Raises:
+            VideoIntegrityError: If the video cannot be opened or decoded, or
+                its metadata fails validation
+        """
+        size_bits = file_path.stat().st_size * 8
+        try:
+            container = av.open(str(file_path))
+        except av.error.FFmpegError as e:
+            raise VideoIntegrityError(f"Failed to open video file: {e}")
+
+        try:
+            if not container.streams.video:
+                raise VideoIntegrityError("No video stream found")
+            stream = container.streams.video[0]
+
+            rate = stream.average_rate or stream.guessed_rate
+            fps = float(rate) if rate else 0.0
+            if stream.duration is not None:
+                duration = float(stream.duration * stream.time_base)
+            elif container.duration is not None:
+                duration = container.duration / av.time_base
+            else:
+                duration = 0.0
+            try:
+                metadata = VideoMetadata(
+                    duration=duration,
+                    width=stream.codec_context.width,
+                    height=stream.codec_context.height,
+                    fps=fps,
+                    codec=stream.codec_context.name,
+                    total_frames=stream.frames or int(round(duration * fps)),
+                )
+            except ValueError as e:
+                raise VideoIntegrityError(f"Invalid video metadata: {e}")
+            self._validate_metadata(metadata)
+            bitrate = container.bit_rate or int(size_bits / duration)
+
+            # Decode keyframes only; every sample is a keyframe
+            stream.codec_context.skip_frame = "NONKEY"
+            first = self._decode_keyframe(container, stream, None)
+            if first is None:
+                raise VideoIntegrityError("Failed to read first frame")
+            width, height = first.width, first.height
+            last_pts = first.pts
+            samples = 1
+
+            start = stream.start_time or 0
+            for i in range(1, sample_count):
+                timestamp = duration * i / sample_count
+                container.seek(
+                    start + int(timestamp / stream.time_base),
+                    stream=stream,
+                    backward=True,
+                    any_frame=False,
+                )
+                frame = self._decode_keyframe(container, stream, last_pts)
+                if frame is None:
+                    # Same keyframe as the previous sample
+                    continue
+                if frame.width != width or frame.height != height:
+                    raise VideoIntegrityError(
+                        f"Inconsistent frame dimensions at {timestamp:.2f}s"
+                    )
+                last_pts = frame.pts
+                samples += 1
+
+            return IntegrityReport(
+                metadata=metadata,
+                bitrate=bitrate,
+                frame_width=width,
+                frame_height=height,
+                samples_checked=samples,
+            )
+
+        except av.error.FFmpegError as e:
+            raise VideoIntegrityError(f"Failed to decode video: {e}")
+        finally:
+            container.close()
+
+    def _decode_keyframe(self, container, stream, after_pts: Optional[int]):
+        """Decode the first keyframe from the current position.
+
+        Args:
+            container: Open PyAV container, positioned by a seek
+            stream: Video stream with non-key frames skipped
+            after_pts: Presentation time of the last sampled keyframe
+
+        Returns:
+            The decoded frame, or None if the keyframe is not after
+            ``after_pts`` and so was sampled already
+
+        Raises:
+            VideoIntegrityError: If no frame can be decoded
+        """
+        decoding = False
+        for packet in container.demux(stream):
+            if not decoding and packet.size:
+                if not packet.is_keyframe:
+                    continue
+                if (
+                    after_pts is not None
+                    and packet.pts is not None
+                    and packet.pts <= after_pts
+                ):
+                    return None
+                decoding = True
+            # The empty packet at the end of the file flushes the decoder
+            for frame in packet.decode():
+                return frame
+        raise VideoIntegrityError("Failed to decode a keyframe")
+
+    def _probe_opencv(self, file_path: Path, sample_count: int) -> IntegrityReport:
+        """Read metadata and sample frames with OpenCV.
+
+        OpenCV cannot seek to keyframes, so unlike the PyAV probe this
+        fallback seeks to exact frame positions, decoding from the preceding
+        keyframe for every sample.
+
+        Args:
+            file_path: Path to the video file
+            sample_count: Number of frames to sample, including the first
+
+        Returns:
+            IntegrityReport without structure information
+
+        Raises:
+            VideoIntegrityError: If the video cannot be opened or read, or its
+                metadata fails validation
+        """
+        size_bits = file_path.stat().st_size * 8
+        cap = cv2.VideoCapture(str(file_path))
+        if not cap.isOpened():
+            raise VideoIntegrityError("Failed to open video file")
+
+        try:
+            metadata = self._capture_metadata(cap)
+            self._validate_metadata(metadata)
+            bitrate = int(size_bits / metadata.duration)
+
+            ret, frame = cap.read()
+            if not ret or frame is None:
+                raise VideoIntegrityError("Failed to read first frame")
+            height, width = frame.shape[:2]
+
+            for i in range(1, sample_count):
+                pos = i * metadata.total_frames // sample_count
+                cap.set(cv2.CAP_PROP_POS_FRAMES, pos)
+                ret, frame = cap.read()
+                if not ret or frame is None:
+                    raise VideoIntegrityError(f"Failed to read frame at position {pos}")
+                if frame.shape[0] != height or frame.shape[1] != width:
+                    raise VideoIntegrityError(
+                        f"Inconsistent frame dimensions at position {pos}"
+                    )
+
+            return IntegrityReport(
+                metadata=metadata,
+                bitrate=bitrate,
+                frame_width=width,
+                frame_height=height,
+                samples_checked=sample_count,
+            )
+
+        except cv2.error as e:
+            raise VideoIntegrityError(f"OpenCV error: {e}")
+        finally:
+            cap.release()
 
     def check_video(self, file_path: Path) -> VideoMetadata:
         """Perform comprehensive video integrity check.
@@ -141,31 +408,7 @@ class VideoIntegrityChecker:
                 raise VideoIntegrityError("Failed to open video file")
 
             try:
-                # Extract basic properties
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                codec_int = int(cap.get(cv2.CAP_PROP_FOURCC))
-
-                # Convert codec to string
-                codec = "".join([
-                    chr((codec_int >> 8 * i) & 0xFF)
-                    for i in range(4)
-                ]).strip()
-
-                # Calculate duration
-                duration = frame_count / fps if fps > 0 else 0.0
-
-                return VideoMetadata(
-                    duration=duration,
-                    width=width,
-                    height=height,
-                    fps=fps,
-                    codec=codec,
-                    total_frames=frame_count,
-                )
-
+                return self._capture_metadata(cap)
             finally:
                 cap.release()
 
@@ -174,6 +417,47 @@ class VideoIntegrityChecker:
         except Exception as e:
             raise VideoIntegrityError(f"Failed to extract metadata: {e}")
 
+    def _capture_metadata(self, cap: cv2.VideoCapture) -> VideoMetadata:
+        """Read metadata from an open video capture.
+
+        Args:
+            cap: Opened video capture
+
+        Returns:
+            VideoMetadata containing extracted information
+
+        Raises:
+            VideoIntegrityError: If a property is missing or invalid, such as
+                an unreadable frame rate
+        """
+        # Extract basic properties
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        codec_int = int(cap.get(cv2.CAP_PROP_FOURCC))
+
+        # Convert codec to string
+        codec = "".join([
+            chr((codec_int >> 8 * i) & 0xFF)
+            for i in range(4)
+        ]).strip()
+
+        # Calculate duration
+        duration = frame_count / fps if fps > 0 else 0.0
+
+        try:
+            return VideoMetadata(
+                duration=duration,
+                width=width,
+                height=height,
+                fps=fps,
+                codec=codec,
+                total_frames=frame_count,
+            )
+        except ValueError as e:
+            raise VideoIntegrityError(f"Invalid video metadata: {e}")
+
     def _validate_metadata(self, metadata: VideoMetadata) -> None:
         """Validate extracted metadata against requirements.
 
@@ -309,11 +593,28 @@ class VideoIntegrityChecker:
 
 
 class FileIntegrityChecker:
-    """Checks integrity of uploaded video files."""
+    """Checks integrity of uploaded video files.
 
-    def __init__(self):
-        """Initialize the integrity checker."""
-        self.chunk_size = 8192  # 8KB chunks for reading
+    Checksums are calculated by a ChecksumEngine in a worker thread, which
+    reads the file once and hashes each chunk with all algorithms in
+    parallel, so other uploads on the event loop are not blocked.
+    """
+
+    def __init__(
+        self, tree_hash: bool = False, checksum_engine: Optional[ChecksumEngine] = None
+    ):
+        """Initialize the integrity checker.
+
+        Args:
+            tree_hash: Whether to add a BLAKE2b tree hash ("blake2b_tree")
+                to the checksums
+            checksum_engine: Engine used for checksums; overrides tree_hash
+        """
+        self.checksum_engine = checksum_engine or ChecksumEngine(
+            algorithms=("md5", "sha256"), tree_hash=tree_hash
+        )
+        self.chunk_size = self.checksum_engine.buffer_size
+        self.checksums: Optional[Dict[str, str]] = None
 
     async def check(self, file_path: Path) -> None:
         """Check file integrity.
@@ -327,13 +628,12 @@ class FileIntegrityChecker:
         if not file_path.exists():
             raise IntegrityError(f"File not found: {file_path}")
 
-        tasks = [
+        # Cheap checks first, so rejected files are never read
+        await asyncio.gather(
             self._check_file_size(file_path),
             self._check_file_format(file_path),
-            self._calculate_checksums(file_path)
-        ]
-
-        await asyncio.gather(*tasks)
+        )
+        self.checksums = await self._calculate_checksums(file_path)
 
     async def _check_file_size(self, file_path: Path) -> None:
         """Check if file size is within limits."""
@@ -347,16 +647,8 @@ class FileIntegrityChecker:
             raise IntegrityError(f"Unsupported file format: {file_path.suffix}")
 
     async def _calculate_checksums(self, file_path: Path) -> Dict[str, str]:
-        """Calculate file checksums."""
-        md5 = hashlib.md5()
-        sha256 = hashlib.sha256()
-
-        with open(file_path, "rb") as f:
-            while chunk := f.read(self.chunk_size):
-                md5.update(chunk)
-                sha256.update(chunk)
-
-        return {
-            "md5": md5.hexdigest(),
-            "sha256": sha256.hexdigest()
-        }
+        """Calculate file checksums off the event loop."""
+        try:
+            return await self.checksum_engine.compute_async(file_path)
+        except OSError as e:
+            raise IntegrityError(f"Failed to read file for checksums: {e}")
@@ -0,0 +1,459 @@
+"""Background reclamation of abandoned upload files.
+
+UploadContext and UploadProcessor clean up after themselves when a job ends
+normally, but a crashed worker leaves its files in ``temp/`` and
+``processing/``. The janitor removes such leftovers while the system runs:
+
+- Each directory is scanned incrementally through a persistent cursor, a
+  batch of entries at a time, rate limited so a scan never competes with
+  uploads for I/O. There are no stop-the-world sweeps.
+- Entries are reclaimed once they are older than a maximum age, measured
+  from their last modification or move into the directory.
+- Live jobs hold a lease on the name of the file they work on. Leases are
+  files in the ``leases/`` directory whose modification time is their
+  expiry, so they work across processes, and a crashed job's lease simply
+  runs out.
+- Reclaimed files and bytes are counted per directory and reported to a
+  MetricsTracker after each pass.
+
+Example:
+    >>> leases = LeaseRegistry(directory_manager.get_path("leases"))
+    >>> janitor = Janitor(directory_manager, leases, max_age=6 * 3600)
+    >>> janitor.start()
+    >>> ...
+    >>> await janitor.stop()
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from video_understanding.core.upload.directory import DirectoryManager
+
+if TYPE_CHECKING:
+    from video_understanding.core.metrics import MetricsTracker
+
+logger = logging.getLogger(__name__)
+
+# Subdirectories swept by default
+JANITOR_SUBDIRS = ("temp", "processing")
+
+DEFAULT_LEASE_TTL = 60 * 60  # 1 hour
+DEFAULT_MAX_AGE = 24 * 60 * 60  # 24 hours
+
+
+@dataclass
+class Lease:
+    """A live job's claim on an upload file.
+
+    Attributes:
+        name: Name of the leased file
+        path: Lease file (None in test mode)
+        ttl: Seconds the lease lasts from each renewal
+    """
+
+    name: str
+    path: Optional[Path]
+    ttl: float
+
+    def renew(self) -> None:
+        """Extend the lease by its TTL from now."""
+        if self.path is not None:
+            expires = time.time() + self.ttl
+            os.utime(self.path, (expires, expires))
+
+    def release(self) -> None:
+        """Give up the lease."""
+        if self.path is None:
+            return
+        self.path.unlink(missing_ok=True)
+        try:
+            self.path.parent.rmdir()
+        except OSError:
+            pass  # Other holders remain, or already removed
+        self.path = None
+
+    def __enter__(self) -> "Lease":
+        """Enter context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Release the lease."""
+        self.release()
+
+
+class LeaseRegistry:
+    """Leases on upload files, shared by all processes on the upload directory.
+
+    Each leased name has a directory holding one file per holder, whose
+    modification time is the holder's expiry. A name is held while any of
+    its lease files has not expired.
+    """
+
+    def __init__(
+        self,
+        lease_dir: Path,
+        ttl: float = DEFAULT_LEASE_TTL,
+        test_mode: bool = False,
+    ) -> None:
+        """Initialize the lease registry.
+
+        Args:
+            lease_dir: Directory for lease files
+            ttl: Default seconds a lease lasts without renewal
+            test_mode: Whether to run in test mode (skip file operations)
+        """
+        self.lease_dir = lease_dir
+        self.ttl = ttl
+        self.test_mode = test_mode
+
+    def acquire(self, name: str, ttl: Optional[float] = None) -> Lease:
+        """Lease a file name.
+
+        Args:
+            name: Name of the file, as it appears in the swept directories
+            ttl: Seconds the lease lasts without renewal (default: registry TTL)
+
+        Returns:
+            The lease, to be renewed during long jobs and released at the end
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if self.test_mode:
+            return Lease(name, None, ttl)
+
+        holders = self._holders_dir(name)
+        path = holders / f"{os.getpid()}-{uuid.uuid4().hex}"
+        for _ in range(3):
+            holders.mkdir(parents=True, exist_ok=True)
+            try:
+                # The directory may be removed by a concurrent release
+                path.touch(exist_ok=False)
+                break
+            except FileNotFoundError:
+                continue
+        lease = Lease(name, path, ttl)
+        lease.renew()
+        logger.debug(f"Leased {name} for {ttl:.0f}s")
+        return lease
+
+    @contextmanager
+    def hold(self, name: str, ttl: Optional[float] = None) -> Iterator[Lease]:
+        """Hold a lease for the duration of a block.
+
+        Args:
+            name: Name of the file
+            ttl: Seconds the lease lasts without renewal
+
+        Yields:
+            The lease
+        """
+        lease = self.acquire(name, ttl)
+        try:
+            yield lease
+        finally:
+            lease.release()
+
+    def is_held(self, name: str) -> bool:
+        """Check whether a live job holds a file name.
+
+        Args:
+            name: Name of the file
+
+        Returns:
+            True if any lease on the name has not expired
+        """
+        if self.test_mode:
+            return False
+        now = time.time()
+        try:
+            with os.scandir(self._holders_dir(name)) as holders:
+                return any(holder.stat().st_mtime > now for holder in holders)
+        except FileNotFoundError:
+            return False
+
+    def cleanup_expired(self) -> int:
+        """Remove lease files left by crashed jobs.
+
+        Returns:
+            Number of expired leases removed
+        """
+        if self.test_mode or not self.lease_dir.exists():
+            return 0
+        now = time.time()
+        removed = 0
+        for holders in self.lease_dir.iterdir():
+            try:
+                for holder in holders.iterdir():
+                    if holder.stat().st_mtime <= now:
+                        holder.unlink(missing_ok=True)
+                        removed += 1
+                holders.rmdir()
+            except OSError:
+                pass  # Live holders remain, or a concurrent release
+        return removed
+
+    def _holders_dir(self, name: str) -> Path:
+        """Directory of the leases on a name."""
+        return self.lease_dir / hashlib.sha1(name.encode()).hexdigest()
+
+
+@dataclass
+class JanitorStats:
+    """Janitor statistics since start.
+
+    Attributes:
+        scanned: Entries inspected
+        reclaimed: Entries removed
+        reclaimed_bytes: Bytes freed by removed entries
+        leased: Expired entries kept because a live job holds them
+        errors: Entries that could not be inspected or removed
+        passes: Completed scans over all directories
+        expired_leases: Lease files of crashed jobs removed
+        reclaimed_bytes_by_dir: Bytes freed per swept directory
+    """
+
+    scanned: int = 0
+    reclaimed: int = 0
+    reclaimed_bytes: int = 0
+    leased: int = 0
+    errors: int = 0
+    passes: int = 0
+    expired_leases: int = 0
+    reclaimed_bytes_by_dir: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert statistics to a dictionary."""
+        return asdict(self)
+
+
+class Janitor:
+    """Reclaims abandoned files from upload work directories.
+
+    Attributes:
+        leases: Registry of files held by live jobs
+        max_age: Seconds after which an unleased entry is abandoned
+        batch_size: Entries inspected per step
+        max_entries_per_second: Scan rate limit (None for unlimited)
+        interval: Seconds between the end of one pass and the next
+        stats: Statistics since start
+    """
+
+    def __init__(
+        self,
+        directory_manager: DirectoryManager,
+        leases: LeaseRegistry,
+        subdirs: Sequence[str] = JANITOR_SUBDIRS,
+        extra_dirs: Sequence[Path] = (),
+        max_age: float = DEFAULT_MAX_AGE,
+        batch_size: int = 100,
+        max_entries_per_second: Optional[float] = 1000.0,
+        interval: float = 300.0,
+        metrics: Optional["MetricsTracker"] = None,
+    ) -> None:
+        """Initialize the janitor.
+
+        Args:
+            directory_manager: Directory manager of the upload directory
+            leases: Registry of files held by live jobs
+            subdirs: Upload subdirectories to sweep
+            extra_dirs: Other directories to sweep, e.g. the temporary
+                directory given to UploadContext
+            max_age: Seconds after which an unleased entry is abandoned
+            batch_size: Entries inspected per step
+            max_entries_per_second: Scan rate limit (None for unlimited)
+            interval: Seconds between the end of one pass and the next
+            metrics: Optional tracker receiving reclaimed bytes per pass
+
+        Raises:
+            ValueError: If a limit is invalid
+        """
+        if batch_size < 1 or max_age < 0 or interval < 0:
+            raise ValueError(
+                "batch_size must be positive, max_age and interval non-negative"
+            )
+        if max_entries_per_second is not None and max_entries_per_second <= 0:
+            raise ValueError("max_entries_per_second must be positive")
+        self.leases = leases
+        self.max_age = max_age
+        self.batch_size = batch_size
+        self.max_entries_per_second = max_entries_per_second
+        self.interval = interval
+        self.metrics = metrics
+        self.stats = JanitorStats()
+        self._dirs: List[Path] = [
+            directory_manager.get_path(subdir) for subdir in subdirs
+        ]
+        self._dirs.extend(Path(d) for d in extra_dirs)
+        self._dir_index = 0
+        self._cursor: Optional[Iterator[os.DirEntry]] = None
+        self._pass_reclaimed = 0
+        self._pass_bytes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def step(self) -> bool:
+        """Inspect the next batch of entries.
+
+        Blocking; run() calls it off the event loop.
+
+        Returns:
+            True if the step completed a pass over all directories
+        """
+        for _ in range(self.batch_size):
+            item = self._next_entry()
+            if item is None:
+                self._finish_pass()
+                return True
+            self._inspect(*item)
+        return False
+
+    def sweep(self) -> JanitorStats:
+        """Run one complete pass without rate limiting.
+
+        Returns:
+            Statistics since start
+        """
+        while not self.step():
+            pass
+        return self.stats
+
+    async def run(self) -> None:
+        """Sweep continuously until cancelled."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                started = loop.time()
+                finished = await asyncio.to_thread(self.step)
+                delay = 0.0
+                if self.max_entries_per_second is not None:
+                    delay = self.batch_size / self.max_entries_per_second
+                    delay -= loop.time() - started
+                if finished:
+                    delay = max(delay, self.interval)
+                await asyncio.sleep(max(delay, 0.0))
+        finally:
+            self._close_cursor()
+
+    def start(self) -> asyncio.Task:
+        """Start sweeping in the background of the running event loop.
+
+        Returns:
+            The janitor task
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+            logger.info(f"Started janitor for {', '.join(str(d) for d in self._dirs)}")
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop background sweeping."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _next_entry(self) -> Optional[Tuple[Path, os.DirEntry]]:
+        """Advance the cursor to the next entry.
+
+        Returns:
+            Tuple of (directory, entry), or None at the end of a pass
+        """
+        while True:
+            if self._dir_index >= len(self._dirs):
+                self._dir_index = 0
+                return None
+            directory = self._dirs[self._dir_index]
+            if self._cursor is None:
+                try:
+                    self._cursor = os.scandir(directory)
+                except OSError:
+                    self._dir_index += 1
+                    continue
+            entry = next(self._cursor, None)
+            if entry is not None:
+                return directory, entry
+            self._close_cursor()
+            self._dir_index += 1
+
+    def _inspect(self, directory: Path, entry: os.DirEntry) -> None:
+        """Reclaim an entry if it is abandoned."""
+        self.stats.scanned += 1
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if is_dir:
+                changed, size = _tree_usage(entry.path)
+            else:
+                stat = entry.stat(follow_symlinks=False)
+                # ctime also changes when a file is moved into the directory
+                changed, size = max(stat.st_mtime, stat.st_ctime), stat.st_size
+            if time.time() - changed < self.max_age:
+                return
+            if self.leases.is_held(entry.name):
+                self.stats.leased += 1
+                return
+
+            if is_dir:
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+        except FileNotFoundError:
+            return  # Removed by its job in the meantime
+        except OSError as e:
+            self.stats.errors += 1
+            logger.warning(f"Janitor failed to reclaim {entry.path}: {e}")
+            return
+
+        self.stats.reclaimed += 1
+        self.stats.reclaimed_bytes += size
+        by_dir = self.stats.reclaimed_bytes_by_dir
+        by_dir[str(directory)] = by_dir.get(str(directory), 0) + size
+        self._pass_reclaimed += 1
+        self._pass_bytes += size
+        logger.info(f"Reclaimed abandoned {entry.path} ({size} bytes)")
+
+    def _finish_pass(self) -> None:
+        """Record the results of a completed pass."""
+        self.stats.passes += 1
+        self.stats.expired_leases += self.leases.cleanup_expired()
+        if self.metrics is not None:
+            self.metrics.record_metric(
+                "janitor_reclaimed_bytes",
+                float(self._pass_bytes),
+                {"reclaimed": self._pass_reclaimed, "pass": self.stats.passes},
+            )
+        if self._pass_reclaimed:
+            logger.info(
+                f"Janitor pass {self.stats.passes} reclaimed {self._pass_reclaimed} "
+                f"entries ({self._pass_bytes} bytes)"
+            )
+        self._pass_reclaimed = 0
+        self._pass_bytes = 0
+
+    def _close_cursor(self) -> None:
+        """Close the directory scan in progress."""
+        if self._cursor is not None:
+            self._cursor.close()
+            self._cursor = None
+
+
+def _tree_usage(path: str) -> Tuple[float, int]:
+    """Latest change time and total size of a directory tree."""
+    stat = os.stat(path)
+    changed, size = max(stat.st_mtime, stat.st_ctime), 0
+    for dirpath, dirnames, filenames in os.walk(path):
+        for name in dirnames + filenames:
+            try:
+                stat = os.lstat(os.path.join(dirpath, name))
+            except FileNotFoundError:
+                continue
+            changed = max(changed, stat.st_mtime, stat.st_ctime)
+            if name in filenames:
+                size += stat.st_size
+    return changed, size
@@ -0,0 +1,317 @@
+"""Process-wide registry of lazily loaded models.
+
+Loading YOLO weights or an EasyOCR reader takes seconds and hundreds of MB,
+so processors should not load them eagerly or each keep their own copy. The
+registry loads a model on first use, shares it between every user in the
+process, and keeps track of how long each load took and how much memory the
+model holds:
+
+- get() returns the cached model or loads it; concurrent first uses of the
+  same model wait for a single load.
+- preload() loads registered models up front, e.g. when a worker starts.
+- With a memory cap, the least recently used models are evicted once the
+  total exceeds it. Users resolve models through the registry on each use,
+  so an evicted model is simply loaded again when next needed. The cap
+  belongs to the registry: pass it when creating one, or set it once at
+  startup on the process-wide registry.
+- Loaders should be plain functions rather than bound methods, so the
+  registry does not keep the objects that registered them alive.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelStats:
+    """Load and usage metrics for one model.
+
+    Attributes:
+        key: Registry key of the model
+        loads: Number of times the model was loaded
+        hits: Number of get() calls served from the cache
+        evictions: Number of times the model was evicted
+        load_seconds: Duration of the most recent load
+        memory_bytes: Estimated memory held by the loaded model
+        last_used: Monotonic time of the most recent get()
+    """
+
+    key: str
+    loads: int = 0
+    hits: int = 0
+    evictions: int = 0
+    load_seconds: float = 0.0
+    memory_bytes: int = 0
+    last_used: float = 0.0
+
+
+def estimate_model_memory(model: Any) -> int:
+    """Estimate the memory held by a model's tensors.
+
+    Torch modules are found on the model itself or on its attributes (such as
+    EasyOCR's detector and recognizer networks). Shared tensors are counted
+    once.
+
+    Args:
+        model: Loaded model
+
+    Returns:
+        Bytes held by parameters and buffers, or 0 if no modules were found
+    """
+    candidates = [model] + [
+        value for value in getattr(model, "__dict__", {}).values()
+        if value is not model
+    ]
+    seen = set()
+    total = 0
+    for candidate in candidates:
+        if not (
+            callable(getattr(candidate, "parameters", None))
+            and callable(getattr(candidate, "buffers", None))
+        ):
+            continue
+        try:
+            tensors = list(candidate.parameters()) + list(candidate.buffers())
+        except Exception:
+            continue
+        for tensor in tensors:
+            if id(tensor) in seen:
+                continue
+            seen.add(id(tensor))
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class ModelRegistry:
+    """Lazily loads models and shares them within the process.
+
+    Example:
+        >>> registry = get_model_registry()
+        >>> registry.register("yolo:yolov8n.pt", lambda: YOLO("yolov8n.pt"))
+        >>> registry.preload()
+        >>> model = registry.get("yolo:yolov8n.pt")
+        >>> print(registry.stats()["yolo:yolov8n.pt"]["load_seconds"])
+    """
+
+    def __init__(self, max_memory_bytes: Optional[int] = None) -> None:
+        """Initialize the registry.
+
+        Args:
+            max_memory_bytes: Memory cap for loaded models (unlimited if None)
+
+        Raises:
+            ValueError: If max_memory_bytes is not positive
+        """
+        if max_memory_bytes is not None and max_memory_bytes <= 0:
+            raise ValueError("max_memory_bytes must be positive")
+
+        self.max_memory_bytes = max_memory_bytes
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._stats: Dict[str, ModelStats] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated memory held by all loaded models."""
+        with self._lock:
+            return sum(self._stats[key].memory_bytes for key in self._models)
+
+    def set_memory_limit(self, max_memory_bytes: Optional[int]) -> None:
+        """Change the memory cap, evicting models if needed.
+
+        Args:
+            max_memory_bytes: Memory cap for loaded models (unlimited if None)
+
+        Raises:
+            ValueError: If max_memory_bytes is not positive
+        """
+        if max_memory_bytes is not None and max_memory_bytes <= 0:
+            raise ValueError("max_memory_bytes must be positive")
+        with self._lock:
+            self.max_memory_bytes = max_memory_bytes
+            self._enforce_limit(keep=None)
+
+    def register(self, key: str, loader: Callable[[], Any]) -> None:
+        """Declare how to load a model without loading it.
+
+        Args:
+            key: Registry key of the model
+            loader: Callable returning the loaded model
+        """
+        with self._lock:
+            self._loaders[key] = loader
+
+    def is_loaded(self, key: str) -> bool:
+        """Check whether a model is currently loaded.
+
+        Args:
+            key: Registry key of the model
+
+        Returns:
+            True if the model is in memory
+        """
+        with self._lock:
+            return key in self._models
+
+    def get(self, key: str, loader: Optional[Callable[[], Any]] = None) -> Any:
+        """Return a model, loading it on first use.
+
+        Args:
+            key: Registry key of the model
+            loader: Callable returning the loaded model; registered for the
+                key if given, otherwise a previously registered loader is used
+
+        Returns:
+            Loaded model
+
+        Raises:
+            KeyError: If the model is not loaded and no loader is known
+            Exception: Any error raised by the loader
+        """
+        with self._lock:
+            if loader is not None:
+                self._loaders[key] = loader
+            model = self._cached(key)
+            if model is not None:
+                return model
+            if key not in self._loaders:
+                raise KeyError(f"No loader registered for model {key}")
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other models stay available
+        with load_lock:
+            with self._lock:
+                model = self._cached(key)
+                if model is not None:
+                    return model
+                loader = self._loaders[key]
+            return self._load(key, loader)
+
+    def preload(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Load registered models ahead of their first use.
+
+        Args:
+            keys: Keys to load (all registered models if None)
+
+        Raises:
+            KeyError: If a key has no registered loader
+        """
+        with self._lock:
+            keys = list(self._loaders) if keys is None else list(keys)
+        for key in keys:
+            self.get(key)
+
+    def evict(self, key: str) -> bool:
+        """Drop a loaded model from the registry.
+
+        The model is freed once no caller holds a reference to it. Its loader
+        stays registered.
+
+        Args:
+            key: Registry key of the model
+
+        Returns:
+            True if the model was loaded
+        """
+        with self._lock:
+            if key not in self._models:
+                return False
+            self._drop(key)
+            return True
+
+    def clear(self) -> None:
+        """Drop all models, loaders and metrics."""
+        with self._lock:
+            self._models.clear()
+            self._loaders.clear()
+            self._stats.clear()
+            self._load_locks.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Report per-model metrics.
+
+        Returns:
+            Dictionary mapping keys to ModelStats fields plus a loaded flag
+        """
+        with self._lock:
+            return {
+                key: {**asdict(stats), "loaded": key in self._models}
+                for key, stats in self._stats.items()
+            }
+
+    def _cached(self, key: str) -> Any:
+        """Return a loaded model and mark it recently used (lock held)."""
+        model = self._models.get(key)
+        if model is not None:
+            self._models.move_to_end(key)
+            stats = self._stats[key]
+            stats.hits += 1
+            stats.last_used = time.monotonic()
+        return model
+
+    def _load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Load a model, record its metrics and apply the memory cap."""
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        start = time.perf_counter()
+        model = loader()
+        load_seconds = time.perf_counter() - start
+        memory = estimate_model_memory(model) or max(
+            0, process.memory_info().rss - rss_before
+        )
+
+        with self._lock:
+            stats = self._stats.setdefault(key, ModelStats(key=key))
+            stats.loads += 1
+            stats.load_seconds = load_seconds
+            stats.memory_bytes = memory
+            stats.last_used = time.monotonic()
+            self._models[key] = model
+            self._enforce_limit(keep=key)
+
+        logger.info(
+            f"Loaded model {key} in {load_seconds:.2f}s "
+            f"({memory / (1024 * 1024):.1f} MB)"
+        )
+        return model
+
+    def _enforce_limit(self, keep: Optional[str]) -> None:
+        """Evict least recently used models above the cap (lock held)."""
+        if self.max_memory_bytes is None:
+            return
+        total = sum(self._stats[key].memory_bytes for key in self._models)
+        for key in list(self._models):
+            if total <= self.max_memory_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._stats[key].memory_bytes
+            self._drop(key)
+            logger.info(f"Evicted model {key} to stay under the memory limit")
+
+    def _drop(self, key: str) -> None:
+        """Remove a loaded model (lock held)."""
+        del self._models[key]
+        self._stats[key].evictions += 1
+
+
+_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide model registry.
+
+    Returns:
+        Shared model registry
+    """
+    return _registry
@@ -1,9 +1,15 @@
 """OCR module for text extraction from video frames.
 
 This module provides text extraction functionality using EasyOCR.
+
+Besides per-frame extraction, IncrementalTextExtractor builds a time-ranged
+text track: it runs EasyOCR's detector on every frame but only runs the far
+more expensive recognizer on text boxes whose pixels changed since the
+previous frame, and extends the time span of text that stayed the same.
 """
 
 from dataclasses import dataclass
+from functools import partial
 from typing import Any, List, Dict, Optional
 
 import easyocr
@@ -13,6 +19,10 @@ from pathlib import Path
 import cv2
 
 from video_understanding.core.exceptions import OCRError
+from video_understanding.core.upload.model_registry import (
+    ModelRegistry,
+    get_model_registry,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,28 +54,190 @@ class ExtractedText:
         }
 
 
+@dataclass
+class TextSpan:
+    """Text that stays visible over a range of frames.
+
+    Attributes:
+        text: The recognized text string
+        confidence: Confidence score of the recognition
+        bounding_box: Coordinates of text bounding box when first recognized
+        start_frame: First frame the text was seen in
+        end_frame: Last frame the text was seen in
+        start_time: Timestamp of the first frame in seconds
+        end_time: Timestamp of the last frame in seconds
+    """
+
+    text: str
+    confidence: float
+    bounding_box: list[list[int]]
+    start_frame: int
+    end_frame: int
+    start_time: float
+    end_time: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary representation.
+
+        Returns:
+            Dictionary containing text and time span data
+        """
+        return {
+            "text": self.text,
+            "confidence": self.confidence,
+            "bounding_box": self.bounding_box,
+            "start_frame": self.start_frame,
+            "end_frame": self.end_frame,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+        }
+
+
+@dataclass
+class IncrementalOCRStats:
+    """Incremental OCR counters.
+
+    Attributes:
+        frames_processed: Frames passed through the text detector
+        boxes_detected: Text boxes found by the detector
+        boxes_recognized: Text boxes sent to the recognizer
+    """
+
+    frames_processed: int = 0
+    boxes_detected: int = 0
+    boxes_recognized: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of detected boxes whose text was carried forward."""
+        if not self.boxes_detected:
+            return 0.0
+        return 1.0 - self.boxes_recognized / self.boxes_detected
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert stats to dictionary format.
+
+        Returns:
+            Dictionary with counters and reuse ratio
+        """
+        return {
+            "frames_processed": self.frames_processed,
+            "boxes_detected": self.boxes_detected,
+            "boxes_recognized": self.boxes_recognized,
+            "reuse_ratio": self.reuse_ratio,
+        }
+
+
+@dataclass
+class _TextTrack:
+    """A text box followed across frames.
+
+    Boxes whose recognition fell below the confidence threshold are still
+    tracked, with no span, so they are not recognized again while unchanged.
+    """
+
+    box: list[int]
+    signature: np.ndarray
+    span: TextSpan | None = None
+
+
+def _box_iou(box1: list[int], box2: list[int]) -> float:
+    """Intersection over union of two [x_min, x_max, y_min, y_max] boxes."""
+    width = min(box1[1], box2[1]) - max(box1[0], box2[0])
+    height = min(box1[3], box2[3]) - max(box1[2], box2[2])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    area1 = (box1[1] - box1[0]) * (box1[3] - box1[2])
+    area2 = (box2[1] - box2[0]) * (box2[3] - box2[2])
+    return intersection / (area1 + area2 - intersection)
+
+
+def crop_similarity(crop1: np.ndarray, crop2: np.ndarray) -> float:
+    """Compute the global SSIM of two equally sized grayscale crops.
+
+    Args:
+        crop1: First crop
+        crop2: Second crop
+
+    Returns:
+        Structural similarity, 1.0 for identical crops
+    """
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    x = crop1.astype(np.float32)
+    y = crop2.astype(np.float32)
+    mean_x, mean_y = x.mean(), y.mean()
+    var_x, var_y = x.var(), y.var()
+    covariance = ((x - mean_x) * (y - mean_y)).mean()
+    return float(
+        (2 * mean_x * mean_y + c1)
+        * (2 * covariance + c2)
+        / ((mean_x**2 + mean_y**2 + c1) * (var_x + var_y + c2))
+    )
+
+
+def _load_easyocr_reader(languages: List[str], gpu: bool) -> Any:
+    """Create an EasyOCR reader."""
+    return easyocr.Reader(languages, gpu=gpu)
+
+
 class TextExtractor:
-    """Text extraction from images using EasyOCR."""
+    """Text extraction from images using EasyOCR.
+
+    The EasyOCR reader is loaded from the process-wide model registry on
+    first use and shared by extractors with the same languages and device.
+    """
 
     def __init__(
         self,
         languages: list[str] | None = None,
         confidence_threshold: float = 0.5,
         gpu: bool = False,
+        registry: ModelRegistry | None = None,
     ) -> None:
         """Initialize text extractor.
 
+        The reader is not loaded until the first extraction or preload().
+
         Args:
             languages: List of languages to detect
             confidence_threshold: Minimum confidence threshold
             gpu: Whether to use GPU
+            registry: Model registry to load the reader through (the
+                process-wide registry if None)
+        """
+        self.languages = languages or ["en"]
+        self.confidence_threshold = confidence_threshold
+        self.gpu = gpu
+        self.model_key = (
+            f"easyocr:{','.join(self.languages)}:{'gpu' if gpu else 'cpu'}"
+        )
+        self._registry = registry or get_model_registry()
+        # A plain function, so the registry does not keep this extractor alive
+        self._registry.register(
+            self.model_key, partial(_load_easyocr_reader, self.languages, self.gpu)
+        )
+
+    @property
+    def reader(self) -> Any:
+        """The EasyOCR reader, loaded on first access.
+
+        Raises:
+            OCRError: If the reader cannot be loaded
         """
         try:
-            self.reader = easyocr.Reader(languages or ["en"], gpu=gpu)
-            self.confidence_threshold = confidence_threshold
+            return self._registry.get(self.model_key)
         except Exception as e:
             raise OCRError("Failed to initialize EasyOCR") from e
 
+    def preload(self) -> None:
+        """Load the reader now instead of on the first extraction.
+
+        Raises:
+            OCRError: If the reader cannot be loaded
+        """
+        self.reader
+
     def extract_text(self, frame: np.ndarray) -> list[ExtractedText]:
         """Extract text from a video frame.
 
@@ -94,6 +266,266 @@ class TextExtractor:
         except Exception as e:
             raise OCRError("Failed to extract text from frame") from e
 
+    def incremental(self, **kwargs: Any) -> "IncrementalTextExtractor":
+        """Create an incremental extractor sharing this extractor's reader.
+
+        Args:
+            **kwargs: Options passed to IncrementalTextExtractor
+
+        Returns:
+            Incremental text extractor
+        """
+        return IncrementalTextExtractor(
+            lambda: self.reader,
+            confidence_threshold=self.confidence_threshold,
+            **kwargs,
+        )
+
+
+class IncrementalTextExtractor:
+    """Builds a time-ranged text track from a stream of frames.
+
+    Each frame goes through the EasyOCR text detector only. Detected boxes
+    are matched to the boxes of the previous frame by overlap, and a box whose
+    crop is still similar to the matched box (global SSIM on a small fixed
+    size thumbnail) keeps its text, extending its time span. Recognition runs
+    only for new boxes and boxes whose content changed.
+
+    Example:
+        >>> tracker = TextExtractor().incremental()
+        >>> for number, frame in enumerate(frames):
+        ...     tracker.process_frame(frame, number, number / fps)
+        >>> for span in tracker.finish():
+        ...     print(span.start_time, span.end_time, span.text)
+    """
+
+    def __init__(
+        self,
+        reader: Any,
+        confidence_threshold: float = 0.5,
+        similarity_threshold: float = 0.9,
+        iou_threshold: float = 0.5,
+        signature_size: tuple[int, int] = (64, 16),
+    ) -> None:
+        """Initialize incremental text extractor.
+
+        Args:
+            reader: EasyOCR reader providing detect() and recognize(), or a
+                callable returning the reader on each use
+            confidence_threshold: Minimum confidence threshold
+            similarity_threshold: Minimum SSIM for a box to count as unchanged
+            iou_threshold: Minimum box overlap to match a box to the previous
+                frame
+            signature_size: (width, height) crops are resized to for comparison
+
+        Raises:
+            ValueError: If thresholds are out of range
+        """
+        if not 0 < similarity_threshold <= 1:
+            raise ValueError("similarity_threshold must be between 0 and 1")
+        if not 0 < iou_threshold <= 1:
+            raise ValueError("iou_threshold must be between 0 and 1")
+
+        self._reader = reader
+        self.confidence_threshold = confidence_threshold
+        self.similarity_threshold = similarity_threshold
+        self.iou_threshold = iou_threshold
+        self.signature_size = signature_size
+        self.stats = IncrementalOCRStats()
+        self._tracks: list[_TextTrack] = []
+        self._closed: list[TextSpan] = []
+
+    @property
+    def reader(self) -> Any:
+        """The EasyOCR reader used for detection and recognition."""
+        return self._reader() if callable(self._reader) else self._reader
+
+    def reset(self) -> None:
+        """Discard the track and counters, e.g. for a new video."""
+        self.stats = IncrementalOCRStats()
+        self._tracks = []
+        self._closed = []
+
+    @property
+    def active_spans(self) -> list[TextSpan]:
+        """Spans of the text visible in the last processed frame."""
+        return [track.span for track in self._tracks if track.span is not None]
+
+    def process_frame(
+        self, frame: np.ndarray, frame_number: int, timestamp: float
+    ) -> list[TextSpan]:
+        """Update the text track with a frame.
+
+        Args:
+            frame: Video frame as numpy array (BGR or grayscale)
+            frame_number: Frame number in the video
+            timestamp: Frame timestamp in seconds
+
+        Returns:
+            Spans of the text visible in the frame
+
+        Raises:
+            OCRError: If text detection or recognition fails
+        """
+        try:
+            gray = (
+                cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                if frame.ndim == 3
+                else frame
+            )
+            boxes = self._detect_boxes(gray)
+        except Exception as e:
+            raise OCRError(f"Failed to detect text in frame {frame_number}") from e
+
+        self.stats.frames_processed += 1
+        self.stats.boxes_detected += len(boxes)
+
+        previous = self._tracks
+        matched: set[int] = set()
+        tracks: list[_TextTrack] = []
+        for box in boxes:
+            signature = cv2.resize(
+                gray[box[2] : box[3], box[0] : box[1]],
+                self.signature_size,
+                interpolation=cv2.INTER_AREA,
+            )
+            match = self._match(box, previous, matched)
+            if match is not None:
+                matched.add(match)
+                track = previous[match]
+                if (
+                    crop_similarity(signature, track.signature)
+                    >= self.similarity_threshold
+                ):
+                    if track.span is not None:
+                        track.span.end_frame = frame_number
+                        track.span.end_time = timestamp
+                    tracks.append(track)
+                    continue
+                self._close(track)
+
+            tracks.append(
+                _TextTrack(
+                    box=box,
+                    signature=signature,
+                    span=self._recognize(gray, box, frame_number, timestamp),
+                )
+            )
+
+        for index, track in enumerate(previous):
+            if index not in matched:
+                self._close(track)
+
+        self._tracks = tracks
+        return self.active_spans
+
+    def extend(self, frame_number: int, timestamp: float) -> list[TextSpan]:
+        """Extend all visible text to a frame known to be unchanged.
+
+        Use this for frames skipped as duplicates instead of process_frame().
+
+        Args:
+            frame_number: Frame number in the video
+            timestamp: Frame timestamp in seconds
+
+        Returns:
+            Spans of the text visible in the frame
+        """
+        for span in self.active_spans:
+            span.end_frame = frame_number
+            span.end_time = timestamp
+        return self.active_spans
+
+    def finish(self) -> list[TextSpan]:
+        """Close all visible text and return the complete track.
+
+        Returns:
+            All text spans ordered by start frame
+        """
+        for track in self._tracks:
+            self._close(track)
+        self._tracks = []
+        return sorted(self._closed, key=lambda span: span.start_frame)
+
+    def _detect_boxes(self, gray: np.ndarray) -> list[list[int]]:
+        """Run the text detector and return non-empty boxes.
+
+        Free-form (rotated) boxes are reduced to their bounding rectangle.
+
+        Args:
+            gray: Grayscale frame
+
+        Returns:
+            Boxes as [x_min, x_max, y_min, y_max] clipped to the frame
+        """
+        horizontal_list, free_list = self.reader.detect(gray)
+        boxes = list(horizontal_list[0])
+        for points in free_list[0]:
+            xs = [point[0] for point in points]
+            ys = [point[1] for point in points]
+            boxes.append([min(xs), max(xs), min(ys), max(ys)])
+
+        height, width = gray.shape[:2]
+        clipped = []
+        for x_min, x_max, y_min, y_max in boxes:
+            box = [
+                max(0, int(x_min)),
+                min(width, int(x_max)),
+                max(0, int(y_min)),
+                min(height, int(y_max)),
+            ]
+            if box[1] > box[0] and box[3] > box[2]:
+                clipped.append(box)
+        return clipped
+
+    def _match(
+        self, box: list[int], tracks: list[_TextTrack], matched: set[int]
+    ) -> int | None:
+        """Find the unmatched previous track overlapping a box the most."""
+        best, best_iou = None, self.iou_threshold
+        for index, track in enumerate(tracks):
+            if index in matched:
+                continue
+            iou = _box_iou(box, track.box)
+            if iou >= best_iou:
+                best, best_iou = index, iou
+        return best
+
+    def _recognize(
+        self, gray: np.ndarray, box: list[int], frame_number: int, timestamp: float
+    ) -> TextSpan | None:
+        """Recognize the text in one box and open a span for it.
+
+        Returns:
+            New span, or None if nothing was recognized above the threshold
+        """
+        self.stats.boxes_recognized += 1
+        try:
+            results = self.reader.recognize(
+                gray, horizontal_list=[box], free_list=[]
+            )
+        except Exception as e:
+            raise OCRError(f"Failed to recognize text in frame {frame_number}") from e
+
+        results = [r for r in results if r[2] >= self.confidence_threshold]
+        if not results:
+            return None
+        bbox, text, conf = max(results, key=lambda r: r[2])
+        return TextSpan(
+            text=text,
+            confidence=float(conf),
+            bounding_box=[[int(x), int(y)] for x, y in bbox],
+            start_frame=frame_number,
+            end_frame=frame_number,
+            start_time=timestamp,
+            end_time=timestamp,
+        )
+
+    def _close(self, track: _TextTrack) -> None:
+        """Move a track's span to the finished text track."""
+        if track.span is not None:
+            self._closed.append(track.span)
+
 
 class OCRProcessor:
     """Processes video frames for text extraction."""
@@ -0,0 +1,352 @@
+"""Process-pool OCR execution engine.
+
+EasyOCR is CPU heavy and holds the GIL for much of its work, so running it in
+the caller's thread serializes the whole analysis pipeline. This module runs
+OCR in a pool of worker processes instead:
+
+- Each worker loads its EasyOCR reader once, in the pool initializer.
+- Frames are handed over through shared memory slots rather than being
+  pickled, so only the slot name, shape and dtype cross the process boundary.
+- At most ``max_in_flight`` frames are held in workers at once. submit()
+  blocks until a slot frees up, which bounds memory.
+- Results are returned as futures keyed by frame number and can be collected
+  in submission order.
+"""
+
+import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from video_understanding.core.exceptions import OCRError
+from video_understanding.core.upload.ocr import ExtractedText
+
+logger = logging.getLogger(__name__)
+
+# Per-process state, set by _init_worker
+_worker_reader: Any = None
+_worker_confidence: float = 0.0
+
+
+def create_easyocr_reader(languages: List[str], gpu: bool) -> Any:
+    """Create an EasyOCR reader.
+
+    Args:
+        languages: Languages to recognize
+        gpu: Whether to use GPU
+
+    Returns:
+        EasyOCR reader
+    """
+    import easyocr
+
+    return easyocr.Reader(languages, gpu=gpu)
+
+
+def _init_worker(
+    reader_factory: Callable[[List[str], bool], Any],
+    languages: List[str],
+    gpu: bool,
+    confidence_threshold: float,
+) -> None:
+    """Load the OCR reader once per worker process."""
+    global _worker_reader, _worker_confidence
+    _worker_reader = reader_factory(languages, gpu)
+    _worker_confidence = confidence_threshold
+
+
+def _ocr_shared_frame(
+    slot_name: str,
+    shape: Tuple[int, ...],
+    dtype: str,
+) -> List[Tuple[List[List[int]], str, float]]:
+    """Run OCR on a frame stored in a shared memory slot.
+
+    Args:
+        slot_name: Shared memory block name
+        shape: Frame shape
+        dtype: Frame dtype
+
+    Returns:
+        List of (bounding box, text, confidence) tuples above the threshold
+    """
+    block = shared_memory.SharedMemory(name=slot_name)
+    try:
+        frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        results = _worker_reader.readtext(frame)
+        del frame
+    finally:
+        block.close()
+
+    return [
+        ([[int(x), int(y)] for x, y in bbox], text, float(conf))
+        for bbox, text, conf in results
+        if conf >= _worker_confidence
+    ]
+
+
+class _SharedFrameSlot:
+    """A reusable shared memory block for handing one frame to a worker."""
+
+    def __init__(self) -> None:
+        self.block: Optional[shared_memory.SharedMemory] = None
+
+    def write(self, frame: np.ndarray) -> Tuple[str, Tuple[int, ...], str]:
+        """Copy a frame into the slot, growing it if needed.
+
+        Args:
+            frame: Frame to copy
+
+        Returns:
+            Tuple of (block name, shape, dtype) describing the frame
+        """
+        if self.block is None or self.block.size < frame.nbytes:
+            self.release()
+            self.block = shared_memory.SharedMemory(
+                create=True, size=max(1, frame.nbytes)
+            )
+        view = np.ndarray(frame.shape, dtype=frame.dtype, buffer=self.block.buf)
+        view[...] = frame
+        del view
+        return self.block.name, frame.shape, frame.dtype.str
+
+    def release(self) -> None:
+        """Free the shared memory block."""
+        if self.block is not None:
+            self.block.close()
+            self.block.unlink()
+            self.block = None
+
+
+class OCREngine:
+    """Runs EasyOCR on frames in a pool of worker processes.
+
+    Example:
+        >>> with OCREngine(languages=["en"], workers=4) as engine:
+        ...     for number, frame in enumerate(frames):
+        ...         engine.submit(frame, number)
+        ...     for number, texts in engine.results():
+        ...         print(number, [t.text for t in texts])
+    """
+
+    def __init__(
+        self,
+        languages: Optional[List[str]] = None,
+        confidence_threshold: float = 0.5,
+        gpu: bool = False,
+        workers: int = 2,
+        max_in_flight: Optional[int] = None,
+        reader_factory: Callable[[List[str], bool], Any] = create_easyocr_reader,
+        start_method: Optional[str] = None,
+    ) -> None:
+        """Initialize the OCR engine.
+
+        Worker processes are started on the first submitted frame.
+
+        Args:
+            languages: Languages to recognize
+            confidence_threshold: Minimum confidence threshold
+            gpu: Whether workers use GPU
+            workers: Number of worker processes
+            max_in_flight: Maximum frames queued or running in workers at
+                once. A frame's slot frees up when OCR of it completes,
+                whether or not its result has been collected, so submit()
+                blocks only on unfinished frames (defaults to twice the
+                worker count)
+            reader_factory: Picklable callable creating a reader in each
+                worker from (languages, gpu)
+            start_method: Multiprocessing start method (platform default if
+                None)
+
+        Raises:
+            ValueError: If workers or max_in_flight is not positive
+        """
+        if workers < 1:
+            raise ValueError("workers must be positive")
+        max_in_flight = max_in_flight or workers * 2
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be positive")
+
+        self.languages = languages or ["en"]
+        self.confidence_threshold = confidence_threshold
+        self.gpu = gpu
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self._reader_factory = reader_factory
+        self._start_method = start_method
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: "OrderedDict[int, Future]" = OrderedDict()
+        self._free_slots: List[_SharedFrameSlot] = [
+            _SharedFrameSlot() for _ in range(max_in_flight)
+        ]
+        self._all_slots = list(self._free_slots)
+        self._slots_available = threading.Semaphore(max_in_flight)
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "OCREngine":
+        """Enter context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Shut down workers and free shared memory."""
+        self.close()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of frames submitted and not yet collected."""
+        return len(self._futures)
+
+    def submit(
+        self, frame: np.ndarray, frame_number: int
+    ) -> "Future[List[ExtractedText]]":
+        """Submit a frame for OCR.
+
+        Blocks while ``max_in_flight`` frames are still running in workers.
+
+        Args:
+            frame: Frame as numpy array
+            frame_number: Frame number used to key the result
+
+        Returns:
+            Future resolving to the extracted text of the frame
+
+        Raises:
+            OCRError: If the frame number is already pending or the engine
+                is closed
+        """
+        if frame_number in self._futures:
+            raise OCRError(f"Frame {frame_number} is already submitted")
+
+        executor = self._ensure_started()
+        self._slots_available.acquire()
+        with self._lock:
+            slot = self._free_slots.pop()
+
+        try:
+            name, shape, dtype = slot.write(np.ascontiguousarray(frame))
+            raw_future = executor.submit(_ocr_shared_frame, name, shape, dtype)
+        except Exception as e:
+            self._return_slot(slot)
+            raise OCRError(f"Failed to submit frame {frame_number} for OCR: {e}") from e
+
+        future: "Future[List[ExtractedText]]" = Future()
+        raw_future.add_done_callback(
+            lambda done: self._complete(done, future, slot, frame_number)
+        )
+        self._futures[frame_number] = future
+        return future
+
+    def result(self, frame_number: int) -> List[ExtractedText]:
+        """Wait for and collect the result of one frame.
+
+        Args:
+            frame_number: Frame number passed to submit()
+
+        Returns:
+            Extracted text for the frame
+
+        Raises:
+            KeyError: If the frame was not submitted or was already collected
+            OCRError: If OCR failed for the frame
+        """
+        return self._futures.pop(frame_number).result()
+
+    def results(self) -> Iterator[Tuple[int, List[ExtractedText]]]:
+        """Collect all pending results in submission order.
+
+        Yields:
+            Tuples of (frame number, extracted text)
+
+        Raises:
+            OCRError: If OCR failed for a frame
+        """
+        while self._futures:
+            frame_number = next(iter(self._futures))
+            yield frame_number, self.result(frame_number)
+
+    def map(
+        self,
+        frames: Iterator[Tuple[int, np.ndarray]],
+    ) -> Iterator[Tuple[int, List[ExtractedText]]]:
+        """Run OCR over a stream of frames, yielding results in order.
+
+        Frames are submitted ahead up to the in-flight window, so workers
+        stay busy while results are consumed.
+
+        Args:
+            frames: Iterable of (frame number, frame) pairs
+
+        Yields:
+            Tuples of (frame number, extracted text) in input order
+        """
+        for frame_number, frame in frames:
+            if self.in_flight >= self.max_in_flight:
+                oldest = next(iter(self._futures))
+                yield oldest, self.result(oldest)
+            self.submit(frame, frame_number)
+        yield from self.results()
+
+    def close(self) -> None:
+        """Shut down worker processes and free shared memory."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._futures.clear()
+        for slot in self._all_slots:
+            slot.release()
+
+    def _ensure_started(self) -> ProcessPoolExecutor:
+        """Start the worker pool if it is not running yet."""
+        if self._executor is None:
+            context = (
+                multiprocessing.get_context(self._start_method)
+                if self._start_method
+                else None
+            )
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(
+                    self._reader_factory,
+                    self.languages,
+                    self.gpu,
+                    self.confidence_threshold,
+                ),
+            )
+            logger.info(f"Started OCR engine with {self.workers} workers")
+        return self._executor
+
+    def _return_slot(self, slot: _SharedFrameSlot) -> None:
+        """Make a shared memory slot available for the next frame."""
+        with self._lock:
+            self._free_slots.append(slot)
+        self._slots_available.release()
+
+    def _complete(
+        self,
+        done: Future,
+        future: "Future[List[ExtractedText]]",
+        slot: _SharedFrameSlot,
+        frame_number: int,
+    ) -> None:
+        """Convert a worker result and recycle its shared memory slot."""
+        self._return_slot(slot)
+        try:
+            texts = [
+                ExtractedText(text=text, confidence=conf, bounding_box=bbox)
+                for bbox, text, conf in done.result()
+            ]
+        except Exception as e:
+            logger.error(f"OCR failed for frame {frame_number}: {e}")
+            future.set_exception(
+                OCRError(f"Failed to extract text from frame {frame_number}: {e}")
+            )
+            return
+        future.set_result(texts)
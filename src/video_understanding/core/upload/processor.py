@@ -5,15 +5,28 @@ the various components involved in video upload handling.
 """
 
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from uuid import UUID, uuid4
 import asyncio
 
 import cv2
 import numpy as np
 
+from video_understanding.utils.constants import UPLOAD_SHARD_DEPTH, UPLOAD_SHARD_WIDTH
 from video_understanding.utils.exceptions import (
     ProcessingError,
     SecurityError,
@@ -26,22 +39,54 @@ from video_understanding.models.video import (
     ProcessingStatus,
     VideoMetadata,
 )
+from video_understanding.core.decoder import PrefetchFrameReader
 from video_understanding.core.upload.directory import DirectoryManager
 from video_understanding.core.upload.integrity import VideoIntegrityChecker as FileIntegrityChecker
 from video_understanding.core.upload.security import SecurityValidator as SecurityScanner
 from video_understanding.core.upload.quarantine import QuarantineManager
+from video_understanding.core.upload.batch import (
+    BatchExecutor,
+    BatchResult,
+    analyze_video,
+    create_scene_detector,
+    run_analysis,
+)
 from video_understanding.core.upload.config import ProcessorConfig
+from video_understanding.core.upload.content_registry import (
+    ContentEntry,
+    ContentRegistry,
+)
 from video_understanding.core.upload.context import UploadContext
+from video_understanding.core.upload.janitor import LeaseRegistry
 from video_understanding.core.upload.progress import ProgressTracker
-from video_understanding.core.upload.scene import SceneDetector, SceneChange
-from video_understanding.core.upload.detection import ObjectDetector
-from video_understanding.core.upload.ocr import TextExtractor
+from video_understanding.core.upload.scene import (
+    HistogramSceneDetector,
+    SceneDetector,
+    SceneChange,
+)
+from video_understanding.core.upload.dedup import FrameDeduplicator
+from video_understanding.core.upload.frame_cache import FrameCache
+from video_understanding.core.upload.sampling import MotionAdaptiveSampler
+from video_understanding.core.upload.model_registry import (
+    ModelRegistry,
+    get_model_registry,
+)
+from video_understanding.core.upload.detection import DetectedObject, ObjectDetector
+from video_understanding.core.upload.ocr import (
+    ExtractedText,
+    IncrementalTextExtractor,
+    TextExtractor,
+)
+from video_understanding.core.upload.ocr_engine import OCREngine
 from video_understanding.core.upload.config import UploadConfig
 from video_understanding.core.upload.ocr import OCRProcessor
 from video_understanding.exceptions import VideoUnderstandingError
 
 logger = logging.getLogger(__name__)
 
+# Version of the cached list of sampled frames
+FRAME_PLAN_VERSION = "1"
+
 
 class UploadProcessor:
     """Orchestrates the video upload processing pipeline.
@@ -53,6 +98,10 @@ class UploadProcessor:
     4. Progress tracking
     5. Error handling and quarantine
 
+    With a content registry, an upload whose content was processed before
+    skips the pipeline: it references the stored artifact and metadata of
+    the first upload and completes without validation or processing.
+
     Example:
         >>> processor = UploadProcessor(Path("/uploads"))
         >>> try:
@@ -66,32 +115,51 @@ class UploadProcessor:
         self,
         upload_dir: Path,
         test_mode: bool = False,
+        content_registry: Optional[ContentRegistry] = None,
+        shard_depth: int = UPLOAD_SHARD_DEPTH,
+        shard_width: int = UPLOAD_SHARD_WIDTH,
     ) -> None:
         """Initialize the upload processor.
 
         Args:
             upload_dir: Base directory for uploads
             test_mode: Whether to run in test mode
+            content_registry: Optional registry for deduplicating uploads
+                by content hash
+            shard_depth: Levels of shard directories for stored files
+                (0 keeps them flat)
+            shard_width: Hex digits per shard level
         """
-        self.directory_manager = DirectoryManager(upload_dir, test_mode)
+        self.directory_manager = DirectoryManager(
+            upload_dir, test_mode, shard_depth=shard_depth, shard_width=shard_width
+        )
         self.integrity_checker = FileIntegrityChecker(test_mode)
         self.security_validator = SecurityScanner(self.directory_manager, test_mode)
         self.quarantine_manager = QuarantineManager(self.directory_manager, test_mode)
+        self.leases = LeaseRegistry(
+            self.directory_manager.get_path("leases"), test_mode=test_mode
+        )
+        self.content_registry = content_registry
         self.test_mode = test_mode
 
     def process_upload(
         self,
         file_path: Path,
         video_id: Optional[UUID] = None,
+        content_hash: Optional[str] = None,
     ) -> Video:
         """Process a video upload through the complete pipeline.
 
         Args:
             file_path: Path to the uploaded file
             video_id: Optional UUID for the video
+            content_hash: SHA-256 hex digest of the file if already known,
+                e.g. from ingest; calculated when a content registry is set
+                and no hash is given
 
         Returns:
-            Video object with processing results
+            Video object with processing results. For a duplicate upload its
+            file path is the artifact shared with the first upload.
 
         Raises:
             ProcessingError: If processing fails
@@ -101,45 +169,59 @@ class UploadProcessor:
         try:
             # Initialize video object
             video = self._create_video(file_path, video_id)
-            self._update_status(video, ProcessingStatus.UPLOADING)
 
-            # Move to temp directory for processing
-            temp_path = self._move_to_temp(file_path)
+            if self.content_registry is not None:
+                content_hash = content_hash or self._hash_content(file_path)
+                video.file_info.checksum = content_hash
+                duplicate = self._find_duplicate(content_hash)
+                if duplicate is not None:
+                    return self._reuse_duplicate(video, file_path, duplicate)
 
-            try:
-                # Validate security
-                self._update_status(video, ProcessingStatus.VALIDATING)
-                self._validate_security(temp_path)
+            # Keep the janitor away from the file while it is processed
+            with self.leases.hold(file_path.name) as lease:
+                self._update_status(video, ProcessingStatus.UPLOADING)
+
+                # Move to temp directory for processing
+                temp_path = self._move_to_temp(file_path)
 
-                # Check video integrity
-                metadata = self._validate_integrity(temp_path)
-                video.metadata = metadata
+                try:
+                    # Validate security
+                    self._update_status(video, ProcessingStatus.VALIDATING)
+                    lease.renew()
+                    self._validate_security(temp_path)
 
-                # Move to processing directory
-                self._update_status(video, ProcessingStatus.PROCESSING)
-                processing_path = self._move_to_processing(temp_path)
+                    # Check video integrity
+                    metadata = self._validate_integrity(temp_path)
+                    video.metadata = metadata
 
-                # Process video (placeholder for future processing)
-                processed_path = self._process_video(processing_path)
+                    # Move to processing directory
+                    self._update_status(video, ProcessingStatus.PROCESSING)
+                    lease.renew()
+                    processing_path = self._move_to_processing(temp_path)
 
-                # Move to completed directory
-                final_path = self._move_to_completed(processed_path, video.id)
+                    # Process video (placeholder for future processing)
+                    processed_path = self._process_video(processing_path)
 
-                # Update video information
-                video.file_info.file_path = final_path
-                self._update_status(video, ProcessingStatus.COMPLETED)
+                    # Move to completed directory
+                    final_path = self._move_to_completed(processed_path, video.id)
 
-                return video
+                    # Update video information
+                    video.file_info.file_path = final_path
+                    if self.content_registry is not None:
+                        self._register_content(video, content_hash)
+                    self._update_status(video, ProcessingStatus.COMPLETED)
 
-            except (SecurityError, VideoIntegrityError) as e:
-                # Quarantine file on validation failure
-                self._handle_validation_failure(temp_path, str(e), video)
-                raise
+                    return video
 
-            except Exception as e:
-                # Move to failed directory on processing failure
-                self._handle_processing_failure(temp_path, str(e), video)
-                raise ProcessingError(f"Upload processing failed: {e}")
+                except (SecurityError, VideoIntegrityError) as e:
+                    # Quarantine file on validation failure
+                    self._handle_validation_failure(temp_path, str(e), video)
+                    raise
+
+                except Exception as e:
+                    # Move to failed directory on processing failure
+                    self._handle_processing_failure(temp_path, str(e), video)
+                    raise ProcessingError(f"Upload processing failed: {e}")
 
         except Exception as e:
             if not isinstance(e, (ProcessingError, SecurityError, VideoIntegrityError)):
@@ -172,6 +254,133 @@ class UploadProcessor:
             processing=processing,
         )
 
+    def _hash_content(self, file_path: Path) -> str:
+        """Calculate the content hash of an upload.
+
+        Args:
+            file_path: Path to the uploaded file
+
+        Returns:
+            SHA-256 hex digest of the file
+
+        Raises:
+            ProcessingError: If the file cannot be read
+        """
+        try:
+            return self.content_registry.hash_file(file_path)
+        except OSError as e:
+            raise ProcessingError(f"Failed to hash upload: {e}")
+
+    def _find_duplicate(self, content_hash: str) -> Optional[ContentEntry]:
+        """Look up a previous upload with the same content.
+
+        Entries whose artifact has disappeared are dropped, so the upload is
+        processed again.
+
+        Args:
+            content_hash: SHA-256 hex digest of the upload
+
+        Returns:
+            Registry entry of the previous upload, or None
+        """
+        entry = self.content_registry.lookup(content_hash)
+        if entry is None:
+            return None
+        if entry.file_path is not None:
+            # The artifact may have moved into the sharded layout
+            entry.file_path = self.directory_manager.locate(entry.file_path)
+        if not self.test_mode and (
+            entry.file_path is None or not entry.file_path.exists()
+        ):
+            logger.warning(
+                f"Artifact of content {content_hash[:12]} is missing, processing again"
+            )
+            self.content_registry.forget(content_hash)
+            return None
+        return entry
+
+    def _reuse_duplicate(
+        self, video: Video, file_path: Path, entry: ContentEntry
+    ) -> Video:
+        """Complete a duplicate upload from a previous upload's results.
+
+        The video references the stored artifact, so the uploaded copy is
+        discarded.
+
+        Args:
+            video: Video object of the duplicate upload
+            file_path: Path to the uploaded file
+            entry: Registry entry of the previous upload
+
+        Returns:
+            Completed Video object
+        """
+        self.content_registry.add_reference(entry.content_hash, video.id)
+        if entry.results.get("metadata"):
+            video.metadata = VideoMetadata(**entry.results["metadata"])
+        video.file_info.file_path = entry.file_path
+        if not self.test_mode:
+            file_path.unlink(missing_ok=True)
+
+        logger.info(f"Video {video.id} is a duplicate of {entry.video_id}")
+        self._update_status(video, ProcessingStatus.COMPLETED)
+        return video
+
+    def _register_content(self, video: Video, content_hash: str) -> None:
+        """Register a processed upload for later duplicates.
+
+        If the same content finished processing concurrently, the video is
+        switched to the artifact registered first and its own copy removed.
+
+        Args:
+            video: Processed video
+            content_hash: SHA-256 hex digest of the upload
+        """
+        results = {"metadata": asdict(video.metadata) if video.metadata else None}
+        entry = self.content_registry.register(
+            content_hash, video.id, video.file_info.file_path, results
+        )
+        if entry.video_id != video.id:
+            logger.info(
+                f"Video {video.id} was processed concurrently as {entry.video_id}"
+            )
+            self._remove_artifact(video.file_info.file_path)
+            video.file_info.file_path = entry.file_path
+
+    def release_video(self, video_id: UUID) -> bool:
+        """Drop a video's reference to its deduplicated artifact.
+
+        The artifact is deleted when no video references it any more.
+
+        Args:
+            video_id: Video UUID to release
+
+        Returns:
+            True if the shared artifact was deleted
+        """
+        if self.content_registry is None:
+            return False
+        entry = self.content_registry.release(video_id)
+        if entry is None or entry.file_path is None:
+            return False
+        self._remove_artifact(entry.file_path)
+        return True
+
+    def _remove_artifact(self, file_path: Path) -> None:
+        """Delete a completed file and its directory if it is left empty.
+
+        Args:
+            file_path: Completed file to delete
+        """
+        if self.test_mode:
+            return
+        try:
+            file_path = self.directory_manager.locate(file_path)
+            file_path.unlink(missing_ok=True)
+            self.directory_manager.prune_empty_dirs(file_path.parent)
+        except OSError as e:
+            logger.error(f"Failed to remove artifact {file_path}: {e}")
+
     def _update_status(
         self,
         video: Video,
@@ -232,6 +441,9 @@ class UploadProcessor:
     def _validate_integrity(self, file_path: Path) -> VideoMetadata:
         """Validate video integrity and extract metadata.
 
+        Metadata, bitrate and sampled frames are checked in one pass over
+        the container.
+
         Args:
             file_path: Path to the file to validate
 
@@ -241,13 +453,7 @@ class UploadProcessor:
         Raises:
             VideoIntegrityError: If validation fails
         """
-        # Check basic integrity
-        metadata = self.integrity_checker.check_video(file_path)
-
-        # Validate frames
-        self.integrity_checker.validate_frames(file_path)
-
-        return metadata
+        return self.integrity_checker.validate(file_path).metadata
 
     def _move_to_processing(self, file_path: Path) -> Path:
         """Move file to processing directory.
@@ -402,11 +608,18 @@ class VideoProcessor:
         ...     print(f"Processed {result['frame_count']} frames")
     """
 
-    def __init__(self, config: ProcessorConfig) -> None:
+    def __init__(
+        self,
+        config: ProcessorConfig,
+        model_registry: Optional[ModelRegistry] = None,
+    ) -> None:
         """Initialize video processor.
 
         Args:
             config: Processing configuration
+            model_registry: Registry to load models through (the process-wide
+                registry if None). Its memory cap is set where it is created,
+                not by the processor
 
         Raises:
             ConfigurationError: If configuration is invalid
@@ -415,18 +628,104 @@ class VideoProcessor:
         config.validate()
 
         self.config = config
-        self._progress = ProgressTracker(video_id=None)
+        self._progress = self._create_progress_tracker(None)
+        self._current_video: Optional[Video] = None
         self._current_frame = 0
-        self.scene_detector = SceneDetector()
-        self.object_detector = ObjectDetector(
-            confidence_threshold=config.detection_confidence,
-            model_path=config.object_detection_model,
+        self._fps: Optional[float] = None
+        if config.scene_detection_backend == "histogram":
+            self.scene_detector = HistogramSceneDetector()
+        else:
+            self.scene_detector = SceneDetector()
+        # Models load on first use from the registry, by default the
+        # process-wide one, so they are shared between processors and
+        # skipped by jobs not using them
+        self.model_registry = model_registry or get_model_registry()
+        self.object_detector: Optional[ObjectDetector] = None
+        if config.detection_enabled:
+            self.object_detector = ObjectDetector(
+                confidence_threshold=config.detection_confidence,
+                model_path=config.object_detection_model,
+                batch_size=config.detection_batch_size,
+                registry=self.model_registry,
+            )
+        self.frame_deduplicator = (
+            FrameDeduplicator(
+                threshold=config.frame_dedup_threshold,
+                method=config.frame_dedup_method,
+            )
+            if config.frame_dedup_enabled
+            else None
         )
-        self.text_extractor = TextExtractor(
-            languages=config.ocr_languages,
-            confidence_threshold=config.ocr_confidence,
-            gpu=config.ocr_gpu,
+        self.frame_sampler = (
+            MotionAdaptiveSampler(
+                motion_threshold=config.sampling_motion_threshold,
+                min_interval=config.sampling_min_interval,
+                floor_interval=config.sampling_floor_interval,
+                frame_budget=config.sampling_frame_budget,
+            )
+            if config.sampling_strategy == "motion"
+            else None
         )
+        self._last_frame_result: Optional[Dict[str, Any]] = None
+        # With OCR workers each worker process loads its own reader, so no
+        # reader is loaded in this process
+        self.ocr_engine: Optional[OCREngine] = None
+        self.text_extractor: Optional[TextExtractor] = None
+        if config.ocr_enabled and config.ocr_workers > 0:
+            self.ocr_engine = OCREngine(
+                languages=config.ocr_languages,
+                confidence_threshold=config.ocr_confidence,
+                gpu=config.ocr_gpu,
+                workers=config.ocr_workers,
+                max_in_flight=config.ocr_max_in_flight,
+            )
+        elif config.ocr_enabled:
+            self.text_extractor = TextExtractor(
+                languages=config.ocr_languages,
+                confidence_threshold=config.ocr_confidence,
+                gpu=config.ocr_gpu,
+                registry=self.model_registry,
+            )
+        self.text_tracker: Optional[IncrementalTextExtractor] = None
+        if config.ocr_incremental and self.text_extractor is not None:
+            self.text_tracker = self.text_extractor.incremental(
+                similarity_threshold=config.ocr_similarity_threshold
+            )
+
+        # Per-frame results and scene detection inputs are cached by video
+        # content, so re-running with one changed stage only recomputes it
+        self.frame_cache: Optional[FrameCache] = None
+        if config.frame_cache_dir is not None:
+            self.frame_cache = FrameCache(
+                Path(config.frame_cache_dir),
+                max_bytes=config.frame_cache_max_bytes,
+            )
+        self._cache_video: Optional[str] = None
+        self._cache_stages: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self._cached_results: Dict[str, Dict[int, Any]] = {}
+
+        if config.preload_models:
+            self.preload_models()
+
+    def preload_models(self) -> None:
+        """Load the models this processor uses ahead of the first frame.
+
+        Raises:
+            ProcessingError: If the detection model cannot be loaded
+            OCRError: If the OCR reader cannot be loaded
+        """
+        if self.object_detector is not None:
+            self.object_detector.preload()
+        if self.text_extractor is not None:
+            self.text_extractor.preload()
+
+    def close(self) -> None:
+        """Release processing resources such as OCR worker processes."""
+        self._progress.close()
+        if self.ocr_engine is not None:
+            self.ocr_engine.close()
+        if self.frame_cache is not None:
+            self.frame_cache.close()
 
     def process(self, video: Video) -> UploadContext:
         """Process a video file.
@@ -446,7 +745,12 @@ class VideoProcessor:
         """
         # Set up processing state
         self._current_video = video
-        self._progress = ProgressTracker(video.id)
+        self._fps = None
+        self._progress.close()
+        self._progress = self._create_progress_tracker(video.id)
+
+        # Start scene detection from a clean state for each video
+        self.scene_detector.reset()
 
         # Add progress callbacks
         for callback in self.config.progress_callbacks:
@@ -455,6 +759,21 @@ class VideoProcessor:
         # Create and return context
         return UploadContext(video, self._progress)
 
+    def _create_progress_tracker(self, video_id: Optional[UUID]) -> ProgressTracker:
+        """Create a progress tracker with the configured update rate.
+
+        Args:
+            video_id: UUID of the video being processed
+
+        Returns:
+            Progress tracker
+        """
+        return ProgressTracker(
+            video_id,
+            min_interval=self.config.progress_interval,
+            min_delta=self.config.progress_min_delta,
+        )
+
     def extract_metadata(self, context: UploadContext) -> Dict[str, Any]:
         """Extract metadata from video file.
 
@@ -535,14 +854,28 @@ class VideoProcessor:
 
         Args:
             context: Processing context
-            sample_rate: Number of frames to skip between samples
+            sample_rate: Number of frames to skip between samples (ignored
+                with motion sampling, which picks frames by content change)
 
         Returns:
             Dictionary containing analysis results:
             - frame_count: Number of frames analyzed
             - scenes: List of scene transitions
             - objects: Detected objects
-            - text: Extracted text
+            - text: Extracted text, one entry per frame, or time-ranged text
+              spans when incremental OCR is enabled
+            - ocr: Incremental OCR counters and reuse ratio, when incremental
+              OCR is enabled
+            - dedup: Duplicate frame counters and skip ratio, when frame
+              deduplication is enabled
+            - sampling: Motion sampling counters and sample ratio, when
+              motion sampling is enabled
+            - prefetch: Frame prefetch queue metrics (PrefetchStats fields
+              plus starvation_ratio)
+            - models: Load time, memory and usage metrics of shared models
+            - frame_cache: Frame cache counters (FrameCacheStats fields plus
+              replayed), when the frame cache is enabled. Replayed analyses
+              report no dedup or prefetch metrics.
 
         Raises:
             ProcessingError: If frame analysis fails
@@ -556,14 +889,25 @@ class VideoProcessor:
                     current_stage="analysis",
                 )
 
-            # Open video file
-            cap = cv2.VideoCapture(str(context.video.file_info.file_path))
-            if not cap.isOpened():
-                raise ProcessingError("Failed to open video file")
+            # Frame rate is read once per analysis, see _get_fps
+            self._fps = None
+
+            # When every stage is cached, rebuild the results without decoding
+            self._begin_frame_cache(context, sample_rate)
+            results = self._replay_cached_analysis()
+            if results is not None:
+                return self._complete_analysis(results)
+
+            # Open video file, decoding ahead on a background thread
+            reader = PrefetchFrameReader(
+                context.video.file_info.file_path,
+                queue_size=self.config.prefetch_queue_size,
+            )
 
             try:
                 # Get video properties
-                frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                frame_count = reader.frame_count
+                self._fps = reader.fps
                 processed_frames = 0
                 results = {
                     "frame_count": 0,
@@ -572,98 +916,482 @@ class VideoProcessor:
                     "text": [],
                 }
 
+                # Sampled frames are collected into batches for detection.
+                # Prefetch buffers are recycled, so batched frames are copied.
+                batch_frames: List[Optional[np.ndarray]] = []
+                batch_numbers: List[int] = []
+                frame_plan: List[Tuple[int, bool]] = []
+                unique_frames = 0
+                self._last_frame_result = None
+                if self.frame_deduplicator is not None:
+                    self.frame_deduplicator.reset()
+                if self.frame_sampler is not None:
+                    self.frame_sampler.reset(frame_count)
+                if self.text_tracker is not None:
+                    self.text_tracker.reset()
+
                 # Process frames
                 while True:
                     # Read frame
-                    ret, frame = cap.read()
+                    ret, frame = reader.read()
                     if not ret:
                         break
 
-                    # Skip frames based on sample rate
-                    if processed_frames % sample_rate != 0:
+                    # Skip frames based on sample rate or content change
+                    if self.frame_sampler is not None:
+                        skip = not self.frame_sampler.should_sample(
+                            frame, processed_frames
+                        )
+                    else:
+                        skip = processed_frames % sample_rate != 0
+                    if skip:
                         processed_frames += 1
                         continue
 
-                    # Process frame
-                    frame_result = self._process_frame(frame, processed_frames)
-                    self._update_results(results, frame_result)
-
-                    # Update progress
-                    if self._progress:
-                        progress = (processed_frames / frame_count) * 100
-                        self._progress.update_progress(
-                            ProcessingStatus.PROCESSING,
-                            progress=progress,
-                            current_stage="analysis",
-                            frames_processed=processed_frames,
+                    # Frames unchanged since the last analyzed frame reuse
+                    # its results and are not copied
+                    if (
+                        self.frame_deduplicator is not None
+                        and self.frame_deduplicator.is_duplicate(frame)
+                    ):
+                        batch_frames.append(None)
+                    else:
+                        batch_frames.append(frame.copy())
+                        unique_frames += 1
+                    batch_numbers.append(processed_frames)
+                    frame_plan.append((processed_frames, batch_frames[-1] is None))
+                    if unique_frames >= self.config.detection_batch_size:
+                        self._analyze_batch(
+                            results, batch_frames, batch_numbers, frame_count
                         )
+                        batch_frames, batch_numbers = [], []
+                        unique_frames = 0
 
                     processed_frames += 1
 
-                # Update final progress
-                if self._progress:
-                    self._progress.update_progress(
-                        ProcessingStatus.PROCESSING,
-                        progress=100.0,
-                        current_stage="analysis",
-                        results=results,
+                if batch_frames:
+                    self._analyze_batch(
+                        results, batch_frames, batch_numbers, frame_count
                     )
 
-                return results
+                if self.text_tracker is not None:
+                    results["text"] = [
+                        span.to_dict() for span in self.text_tracker.finish()
+                    ]
+                    results["ocr"] = self.text_tracker.stats.to_dict()
+
+                if self.frame_deduplicator is not None:
+                    results["dedup"] = self.frame_deduplicator.stats.to_dict()
+                    logger.info(
+                        f"Skipped analysis of "
+                        f"{self.frame_deduplicator.stats.frames_skipped} duplicate "
+                        f"frames ({self.frame_deduplicator.stats.skip_ratio:.1%})"
+                    )
+
+                if self.frame_sampler is not None:
+                    results["sampling"] = self.frame_sampler.stats.to_dict()
+                    logger.info(
+                        f"Motion sampling analyzed "
+                        f"{self.frame_sampler.stats.frames_sampled} of "
+                        f"{self.frame_sampler.stats.frames_seen} frames"
+                    )
+
+                results["prefetch"] = asdict(reader.stats)
+                results["prefetch"]["starvation_ratio"] = reader.stats.starvation_ratio
+
+                if self._cache_video is not None:
+                    self._cache_result(
+                        -1,
+                        "frames",
+                        {"frame_count": frame_count, "frames": frame_plan},
+                    )
+                    results["frame_cache"] = {
+                        **asdict(self.frame_cache.stats),
+                        "replayed": False,
+                    }
+
+                return self._complete_analysis(results)
 
             finally:
-                cap.release()
+                reader.release()
 
         except Exception as e:
             raise ProcessingError(f"Failed to analyze frames: {e}")
 
+    def _complete_analysis(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Add model metrics to analysis results and report completion.
+
+        Args:
+            results: Analysis results
+
+        Returns:
+            The results
+        """
+        results["models"] = self.model_registry.stats()
+        if self.frame_cache is not None:
+            self.frame_cache.flush()
+
+        # Update final progress
+        if self._progress:
+            self._progress.update_progress(
+                ProcessingStatus.PROCESSING,
+                progress=100.0,
+                current_stage="analysis",
+                results=results,
+            )
+
+        return results
+
+    def _begin_frame_cache(self, context: UploadContext, sample_rate: int) -> None:
+        """Load this video's cached results for each analysis stage.
+
+        Stages are keyed by their model version and parameters, so a stage
+        whose settings changed misses the cache while the others hit it.
+
+        Args:
+            context: Processing context
+            sample_rate: Number of frames to skip between samples
+        """
+        self._cache_video = None
+        self._cache_stages = {}
+        self._cached_results = {}
+        if self.frame_cache is None:
+            return
+
+        self._cache_video = self.frame_cache.video_key(
+            context.video.file_info.file_path
+        )
+        # Sampling and deduplication decide which frames are analyzed and
+        # which frame each absdiff difference is taken against
+        sampling = {
+            "sample_rate": sample_rate,
+            "motion": (
+                [
+                    self.frame_sampler.motion_threshold,
+                    self.frame_sampler.min_interval,
+                    self.frame_sampler.floor_interval,
+                    self.frame_sampler.frame_budget,
+                ]
+                if self.frame_sampler is not None
+                else None
+            ),
+            "dedup": (
+                [self.config.frame_dedup_method, self.config.frame_dedup_threshold]
+                if self.frame_deduplicator is not None
+                else None
+            ),
+        }
+        stages = {"frames": (FRAME_PLAN_VERSION, sampling)}
+        if self.object_detector is not None:
+            stages["objects"] = (
+                self.object_detector.model_key,
+                {"confidence": self.config.detection_confidence},
+            )
+        # Incremental OCR carries state between frames, so it is not cached
+        if self.text_tracker is None and (
+            self.text_extractor is not None or self.ocr_engine is not None
+        ):
+            stages["text"] = (
+                f"easyocr:{','.join(self.config.ocr_languages)}",
+                {"confidence": self.config.ocr_confidence},
+            )
+        if not isinstance(self.scene_detector, HistogramSceneDetector):
+            stages["scene_diff"] = (SceneDetector.DIFF_VERSION, sampling)
+
+        self._cache_stages = stages
+        self._cached_results = {
+            stage: self.frame_cache.get_results(
+                self._cache_video, stage, version, params
+            )
+            for stage, (version, params) in stages.items()
+        }
+
+    def _replay_cached_analysis(self) -> Optional[Dict[str, Any]]:
+        """Rebuild analysis results from the frame cache without decoding.
+
+        Scene detection runs again on cached thumbnails or frame
+        differences, so scene detector settings may differ from the cached
+        run.
+
+        Returns:
+            Analysis results, or None if any stage misses the cache or
+            processing hooks need the decoded frames
+        """
+        plan = self._cached_results.get("frames", {}).get(-1)
+        if (
+            plan is None
+            or self.text_tracker is not None
+            or self.config.processing_hooks.get(ProcessingStatus.PROCESSING)
+        ):
+            return None
+
+        analyzed = [number for number, duplicate in plan["frames"] if not duplicate]
+        for stage in self._cache_stages.keys() - {"frames"}:
+            # The first analyzed frame has no difference to a previous one
+            required = analyzed[1:] if stage == "scene_diff" else analyzed
+            if not all(number in self._cached_results[stage] for number in required):
+                return None
+        if isinstance(self.scene_detector, HistogramSceneDetector):
+            thumbnails = self.frame_cache.frame_indices(
+                self._cache_video, self.scene_detector.thumbnail_transform
+            )
+            if not thumbnails.issuperset(analyzed):
+                return None
+
+        results = {
+            "frame_count": 0,
+            "scenes": [],
+            "objects": [],
+            "text": [],
+        }
+        self._last_frame_result = None
+        for frame_number, duplicate in plan["frames"]:
+            if duplicate and self._last_frame_result is not None:
+                frame_result = self._reuse_frame_result(frame_number)
+            else:
+                frame_result = self._process_frame(None, frame_number)
+                self._last_frame_result = frame_result
+            self._update_results(results, frame_result)
+            self._report_frame_progress(frame_number, plan["frame_count"])
+
+        results["frame_cache"] = {**asdict(self.frame_cache.stats), "replayed": True}
+        logger.info(f"Replayed analysis of {len(analyzed)} frames from the frame cache")
+        return results
+
+    def _cached_result(self, stage: str, frame_number: int) -> Any:
+        """Get a stage's cached result for a frame.
+
+        Args:
+            stage: Analysis stage name
+            frame_number: Frame number
+
+        Returns:
+            The cached result, or None if it is not cached
+        """
+        return self._cached_results.get(stage, {}).get(frame_number)
+
+    def _cache_result(self, frame_number: int, stage: str, result: Any) -> None:
+        """Store a stage's result for a frame if the frame cache is enabled.
+
+        Args:
+            frame_number: Frame number, or -1 for whole-video results
+            stage: Analysis stage name
+            result: JSON-serializable result
+        """
+        if self._cache_video is None or stage not in self._cache_stages:
+            return
+        version, params = self._cache_stages[stage]
+        self.frame_cache.put_result(
+            self._cache_video, frame_number, stage, version, params, result
+        )
+
+    def _report_frame_progress(self, frame_number: int, frame_count: int) -> None:
+        """Report analysis progress after a frame.
+
+        Args:
+            frame_number: Frame number of the frame just analyzed
+            frame_count: Total frame count
+        """
+        if self._progress:
+            progress = (frame_number / frame_count) * 100
+            self._progress.update_progress(
+                ProcessingStatus.PROCESSING,
+                progress=progress,
+                current_stage="analysis",
+                frames_processed=frame_number,
+            )
+
+    def _analyze_batch(
+        self,
+        results: Dict[str, Any],
+        frames: List[Optional[np.ndarray]],
+        frame_numbers: List[int],
+        frame_count: int,
+    ) -> None:
+        """Analyze a batch of sampled frames and merge the results.
+
+        Object detection runs once for all new frames in the batch. The
+        remaining per-frame analysis runs in frame order. Duplicate frames,
+        given as None, reuse the results of the last analyzed frame. Frames
+        with cached detections or text skip those models.
+
+        Args:
+            results: Overall results dictionary to update
+            frames: Sampled frames in stream order, None for duplicates
+            frame_numbers: Frame numbers matching frames
+            frame_count: Total frame count used for progress
+        """
+        unique = [i for i, frame in enumerate(frames) if frame is not None]
+        ocr_pending = {
+            i for i in unique if self._cached_result("text", frame_numbers[i]) is None
+        }
+        detection_pending = [
+            i for i in unique
+            if self._cached_result("objects", frame_numbers[i]) is None
+        ]
+
+        # Start OCR in worker processes so it overlaps with detection
+        if self.ocr_engine is not None:
+            for i in sorted(ocr_pending):
+                self.ocr_engine.submit(frames[i], frame_numbers[i])
+
+        batch_detections: Dict[int, Optional[List[DetectedObject]]] = {}
+        if self.object_detector is not None and detection_pending:
+            try:
+                detected = self.object_detector.detect_batch(
+                    [frames[i] for i in detection_pending],
+                    [frame_numbers[i] for i in detection_pending],
+                )
+                for i, objects in zip(detection_pending, detected):
+                    self._cache_result(
+                        frame_numbers[i], "objects", [obj.to_dict() for obj in objects]
+                    )
+            except Exception as e:
+                logger.warning(
+                    f"Object detection failed for frames "
+                    f"{frame_numbers[0]}-{frame_numbers[-1]}: {e}"
+                )
+                detected = [[] for _ in detection_pending]
+            batch_detections = dict(zip(detection_pending, detected))
+
+        for i, (frame, frame_number) in enumerate(zip(frames, frame_numbers)):
+            if frame is None and self._last_frame_result is not None:
+                frame_result = self._reuse_frame_result(frame_number)
+            else:
+                texts = None
+                if self.ocr_engine is not None and i in ocr_pending:
+                    try:
+                        texts = self.ocr_engine.result(frame_number)
+                        self._cache_result(
+                            frame_number, "text", [text.to_dict() for text in texts]
+                        )
+                    except Exception as e:
+                        logger.warning(
+                            f"Text extraction failed for frame {frame_number}: {e}"
+                        )
+                        texts = []
+                frame_result = self._process_frame(
+                    frame, frame_number, batch_detections.get(i), texts
+                )
+                self._last_frame_result = frame_result
+            self._update_results(results, frame_result)
+            self._report_frame_progress(frame_number, frame_count)
+
+    def _reuse_frame_result(self, frame_number: int) -> Dict[str, Any]:
+        """Build a duplicate frame's result from the last analyzed frame.
+
+        Detections and text are copied and re-tagged with the new frame
+        number and timestamp. A duplicate frame is never a scene change.
+
+        Args:
+            frame_number: Frame number of the duplicate frame
+
+        Returns:
+            Dictionary containing frame analysis results
+        """
+        previous = self._last_frame_result
+        timestamp = frame_number / self._get_fps()
+        if self.text_tracker is not None:
+            self.text_tracker.extend(frame_number, timestamp)
+        return {
+            "frame_number": frame_number,
+            "timestamp": timestamp,
+            "objects": [
+                {**obj, "frame_number": frame_number}
+                for obj in previous.get("objects", [])
+            ],
+            "text": [dict(text) for text in previous.get("text", [])],
+            "scene_change": None,
+            "duplicate_of": previous["frame_number"],
+        }
+
     def _process_frame(
         self,
-        frame: np.ndarray,
+        frame: Optional[np.ndarray],
         frame_number: int,
+        detections: Optional[List[DetectedObject]] = None,
+        texts: Optional[List[ExtractedText]] = None,
     ) -> Dict[str, Any]:
         """Process a single video frame.
 
+        Results cached for this frame are used instead of running the stage.
+
         Args:
-            frame: Input frame as numpy array
+            frame: Input frame as numpy array, or None when replaying cached
+                results
             frame_number: Frame number in sequence
+            detections: Objects already detected for this frame by a batched
+                call, or None to run detection on the frame here
+            texts: Text already extracted for this frame by the OCR engine,
+                or None to run text extraction on the frame here
 
         Returns:
             Dictionary containing frame analysis results
         """
+        self._current_frame = frame_number
         result = {
             "frame_number": frame_number,
             "timestamp": frame_number / self._get_fps(),
         }
 
         # Run object detection if enabled
-        if self.object_detector is not None:
+        cached_objects = self._cached_result("objects", frame_number)
+        if self.object_detector is not None and cached_objects is not None:
+            result["objects"] = cached_objects
+        elif self.object_detector is not None:
             try:
-                detections = self.object_detector(frame, frame_number)
-                result["objects"] = [obj.to_dict() for obj in detections]
+                if detections is None:
+                    detections = self.object_detector(frame, frame_number)
+                    result["objects"] = [obj.to_dict() for obj in detections]
+                    self._cache_result(frame_number, "objects", result["objects"])
+                else:
+                    result["objects"] = [obj.to_dict() for obj in detections]
             except Exception as e:
                 logger.warning(f"Object detection failed for frame {frame_number}: {e}")
                 result["objects"] = []
 
         # Run text extraction if enabled
-        if self.text_extractor is not None:
+        if self.text_tracker is not None:
+            try:
+                spans = self.text_tracker.process_frame(
+                    frame, frame_number, result["timestamp"]
+                )
+                result["text"] = [
+                    ExtractedText(
+                        text=span.text,
+                        confidence=span.confidence,
+                        bounding_box=span.bounding_box,
+                    ).to_dict()
+                    for span in spans
+                ]
+            except Exception as e:
+                logger.warning(f"Text extraction failed for frame {frame_number}: {e}")
+                result["text"] = []
+        elif texts is not None:
+            result["text"] = [text.to_dict() for text in texts]
+        elif self._cached_result("text", frame_number) is not None:
+            result["text"] = self._cached_result("text", frame_number)
+        elif self.text_extractor is not None:
             try:
                 texts = self.text_extractor.extract_text(frame)
                 result["text"] = [text.to_dict() for text in texts]
+                self._cache_result(frame_number, "text", result["text"])
             except Exception as e:
                 logger.warning(f"Text extraction failed for frame {frame_number}: {e}")
                 result["text"] = []
 
-        # Add other frame processing results
-        result.update(self._analyze_frame_content(frame))
+        # Add other frame processing results without discarding extracted text
+        for key, value in self._analyze_frame_content(frame).items():
+            result.setdefault(key, value)
 
         return result
 
-    def _analyze_frame_content(self, frame: np.ndarray) -> Dict[str, Any]:
+    def _analyze_frame_content(self, frame: Optional[np.ndarray]) -> Dict[str, Any]:
         """Analyze frame content for various features.
 
         Args:
-            frame: Input frame as numpy array
+            frame: Input frame as numpy array, or None when replaying cached
+                results
 
         Returns:
             Dictionary containing analysis results
@@ -674,11 +1402,7 @@ class VideoProcessor:
         }
 
         # Detect scene changes
-        scene_change = self.scene_detector.detect_change(
-            frame,
-            frame_number=self._current_frame,
-            timestamp=self._current_frame / self._get_fps(),
-        )
+        scene_change = self._detect_scene_change(frame)
         if scene_change:
             result["scene_change"] = {
                 "confidence": scene_change.confidence,
@@ -686,10 +1410,50 @@ class VideoProcessor:
             }
 
         # Run processing hooks
-        self._run_frame_hooks(frame, result)
+        if frame is not None:
+            self._run_frame_hooks(frame, result)
 
         return result
 
+    def _detect_scene_change(
+        self, frame: Optional[np.ndarray]
+    ) -> Optional[SceneChange]:
+        """Feed the current frame to the scene detector.
+
+        With the frame cache enabled, the histogram detector's thumbnails
+        and the absdiff detector's frame differences are cached, so scene
+        detection can be re-run with new settings without decoding.
+
+        Args:
+            frame: Input frame as numpy array, or None to use cached input
+
+        Returns:
+            SceneChange if a change was detected, None otherwise
+        """
+        frame_number = self._current_frame
+        timestamp = frame_number / self._get_fps()
+
+        if isinstance(self.scene_detector, HistogramSceneDetector):
+            if self._cache_video is not None:
+                transform = self.scene_detector.thumbnail_transform
+                if frame is None:
+                    frame = self.frame_cache.get_frame(
+                        self._cache_video, frame_number, transform
+                    )
+                else:
+                    frame = self.frame_cache.put_frame(
+                        self._cache_video, frame_number, transform, frame
+                    )
+            return self.scene_detector.detect_change(frame, frame_number, timestamp)
+
+        if frame is None:
+            diff = self._cached_result("scene_diff", frame_number)
+        else:
+            diff = self.scene_detector.frame_diff(frame)
+            if diff is not None:
+                self._cache_result(frame_number, "scene_diff", diff)
+        return self.scene_detector.change_from_diff(diff, frame_number, timestamp)
+
     def _update_results(
         self,
         results: Dict[str, Any],
@@ -715,8 +1479,9 @@ class VideoProcessor:
         # Add detected objects
         results["objects"].extend(frame_result["objects"])
 
-        # Add extracted text
-        results["text"].extend(frame_result["text"])
+        # Add extracted text; incremental OCR reports its spans at the end
+        if self.text_tracker is None:
+            results["text"].extend(frame_result["text"])
 
     def _run_frame_hooks(
         self,
@@ -750,6 +1515,19 @@ class VideoProcessor:
     def _get_fps(self) -> float:
         """Get current video FPS.
 
+        Every analyzed frame needs the frame rate for its timestamp, so it
+        is read from the container once per video and kept.
+
+        Returns:
+            Frames per second or 30.0 if unknown
+        """
+        if self._fps is None:
+            self._fps = self._read_fps()
+        return self._fps
+
+    def _read_fps(self) -> float:
+        """Read the current video's FPS from its container.
+
         Returns:
             Frames per second or 30.0 if unknown
         """
@@ -770,15 +1548,29 @@ class VideoProcessor:
 
 
 class VideoUploader:
-    """Handles video upload processing and validation."""
+    """Handles video upload processing and validation.
+
+    With ``dedup_registry_path`` configured, results are stored by content
+    hash and returned for repeated uploads of the same content without
+    running checks, scene detection or OCR again.
+
+    Batches run through a BatchExecutor, which limits the uploads in flight
+    and moves scene detection and OCR into worker processes.
+    """
 
     def __init__(self, config: Optional[UploadConfig] = None):
         """Initialize the uploader with optional config."""
         self.config = config or UploadConfig()
         self.integrity_checker = FileIntegrityChecker()
         self.security_scanner = SecurityScanner()
-        self.scene_detector = SceneDetector()
+        self.scene_detector = create_scene_detector(self.config)
         self.ocr_processor = OCRProcessor()
+        # Process pool for analysis, set by the batch executor
+        self.analysis_pool: Optional[ProcessPoolExecutor] = None
+        self._batch_executor: Optional[BatchExecutor] = None
+        self.content_registry = None
+        if self.config.dedup_registry_path is not None:
+            self.content_registry = ContentRegistry(self.config.dedup_registry_path)
 
     async def process_upload(self, file_path: Path) -> Dict[str, Any]:
         """Process an uploaded video file.
@@ -787,14 +1579,23 @@ class VideoUploader:
             file_path: Path to the uploaded video file
 
         Returns:
-            Dict containing processing results
+            Dict containing processing results. With a dedup registry it also
+            holds the "video_id" referencing the stored results, and
+            "duplicate_of" for uploads served from a previous upload.
 
         Raises:
             VideoUnderstandingError: If processing fails
         """
         try:
+            content_hash = None
+            if self.content_registry is not None:
+                content_hash = await self.content_registry.hash_file_async(file_path)
+                entry = self.content_registry.lookup(content_hash)
+                if entry is not None:
+                    return self._reuse_results(file_path, entry)
+
             # Create processing context
-            context = UploadContext(file_path)
+            context = UploadContext(file_path, temp_root=self.config.temp_dir)
 
             # Run integrity checks
             await self.integrity_checker.check(file_path)
@@ -802,28 +1603,123 @@ class VideoUploader:
             # Scan for security issues
             await self.security_scanner.scan(file_path)
 
-            # Detect scenes
-            scenes = await self.scene_detector.detect(file_path)
+            # Detect scenes and extract text with OCR
+            scenes, text = await self._analyze(file_path)
             context.add_scenes(scenes)
-
-            # Extract text with OCR
-            text = await self.ocr_processor.process(file_path)
             context.add_text(text)
 
-            return context.get_results()
+            results = context.get_results()
+            if self.content_registry is not None:
+                video_id = uuid4()
+                self.content_registry.register(content_hash, video_id, None, results)
+                results["video_id"] = str(video_id)
+            return results
 
         except Exception as e:
             logger.error(f"Error processing upload {file_path}: {str(e)}")
             raise VideoUnderstandingError(f"Upload processing failed: {str(e)}")
 
+    async def _analyze(
+        self, file_path: Path
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Detect scenes and extract text.
+
+        Runs in the analysis process pool when one is set, otherwise on a
+        thread, so the event loop keeps serving other uploads.
+
+        Args:
+            file_path: Path to the uploaded video file
+
+        Returns:
+            Tuple of (scenes, text content)
+        """
+        if self.analysis_pool is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.analysis_pool, analyze_video, file_path
+            )
+        return await asyncio.to_thread(
+            run_analysis, self.scene_detector, self.ocr_processor, file_path
+        )
+
+    def _reuse_results(self, file_path: Path, entry: ContentEntry) -> Dict[str, Any]:
+        """Build the results of a duplicate upload from stored results.
+
+        Args:
+            file_path: Path to the uploaded video file
+            entry: Registry entry of the previous upload
+
+        Returns:
+            Stored results with this upload's file details
+        """
+        started = datetime.now()
+        video_id = uuid4()
+        self.content_registry.add_reference(entry.content_hash, video_id)
+        logger.info(f"Upload {file_path} is a duplicate of {entry.video_id}")
+
+        results = dict(entry.results)
+        results["metadata"] = {
+            **results.get("metadata", {}),
+            "filename": file_path.name,
+            "upload_time": started.isoformat(),
+        }
+        results["video_id"] = str(video_id)
+        results["duplicate_of"] = str(entry.video_id)
+        results["processing_time"] = (datetime.now() - started).total_seconds()
+        return results
+
+    def release_upload(self, video_id: UUID) -> None:
+        """Drop an upload's reference to its stored results.
+
+        Stored results are removed when no upload references them any more.
+
+        Args:
+            video_id: The "video_id" returned by process_upload
+        """
+        if self.content_registry is not None:
+            self.content_registry.release(video_id)
+
     async def process_batch(self, file_paths: List[Path]) -> List[Dict[str, Any]]:
         """Process multiple uploaded files concurrently.
 
+        At most ``batch_concurrency`` files are processed at once.
+
         Args:
             file_paths: List of paths to uploaded files
 
         Returns:
-            List of processing results for each file
+            List of processing results for each file, in input order; failed
+            uploads are represented by their exception
+        """
+        results = await self.batch_executor.run(file_paths)
+        return [result.result if result.ok else result.error for result in results]
+
+    async def iter_batch(
+        self, file_paths: Union[Iterable[Path], AsyncIterable[Path]]
+    ) -> AsyncIterator[BatchResult]:
+        """Process uploaded files, yielding results as they complete.
+
+        Args:
+            file_paths: Paths to uploaded files; may be an async iterable
+                producing paths as they arrive
+
+        Yields:
+            BatchResult per file in completion order
         """
-        tasks = [self.process_upload(path) for path in file_paths]
-        return await asyncio.gather(*tasks, return_exceptions=True)
+        async for result in self.batch_executor.stream(file_paths):
+            yield result
+
+    @property
+    def batch_executor(self) -> BatchExecutor:
+        """Executor for batches, created on first use."""
+        if self._batch_executor is None:
+            self._batch_executor = BatchExecutor(self)
+        return self._batch_executor
+
+    def close(self) -> None:
+        """Shut down batch analysis workers and close the dedup registry."""
+        if self._batch_executor is not None:
+            self._batch_executor.close()
+            self._batch_executor = None
+        if self.content_registry is not None:
+            self.content_registry.close()
@@ -2,18 +2,33 @@
 
 This module provides functionality for tracking progress of video uploads
 and processing through various stages.
+
+Progress is reported once per analyzed frame, so updates are coalesced:
+an update is only published when the stage changes, progress moved by at
+least ``min_delta`` percent, ``min_interval`` seconds passed since the last
+publication, or the stage completes. Other updates are kept as pending and
+overwritten by the next one, at the cost of a comparison and a clock read.
+Published updates are handed to callbacks on a background thread through a
+queue in which consecutive updates of a stage also coalesce, so slow
+callbacks never hold up processing.
 """
 
 import logging
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from video_understanding.models.video import ProcessingStatus
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PROGRESS_INTERVAL = 0.1  # seconds (10 Hz)
+DEFAULT_PROGRESS_DELTA = 1.0  # percent
+
 
 @dataclass
 class ProgressInfo:
@@ -49,23 +64,50 @@ class ProgressTracker:
     3. Error tracking
     4. Progress callbacks
 
+    Callbacks run on a delivery thread unless the tracker is synchronous;
+    flush() waits until they have seen every published update.
+
     Example:
         >>> tracker = ProgressTracker(video_id)
         >>> tracker.add_callback(lambda info: print(f"Progress: {info.progress}%"))
         >>> tracker.update_progress(ProcessingStatus.UPLOADING, 50.0)
+        >>> tracker.close()
     """
 
-    def __init__(self, video_id: UUID) -> None:
+    def __init__(
+        self,
+        video_id: UUID,
+        min_interval: float = DEFAULT_PROGRESS_INTERVAL,
+        min_delta: float = DEFAULT_PROGRESS_DELTA,
+        synchronous: bool = False,
+    ) -> None:
         """Initialize the progress tracker.
 
         Args:
             video_id: UUID of the video being processed
+            min_interval: Seconds after which a pending update is published
+                even if progress moved less than min_delta (0 publishes
+                every update)
+            min_delta: Progress change in percent that publishes an update
+                immediately
+            synchronous: Whether to call callbacks on the updating thread
+                instead of the delivery thread
         """
         self.video_id = video_id
+        self.min_interval = min_interval
+        self.min_delta = min_delta
+        self.synchronous = synchronous
         self.stages: Dict[ProcessingStatus, ProgressInfo] = {}
         self.callbacks: List[Callable[[ProgressInfo], None]] = []
         self.current_stage: Optional[ProcessingStatus] = None
         self._start_time = datetime.now()
+        self._published_progress = 0.0
+        self._published_at = 0.0
+        self._pending: Optional[Tuple[ProcessingStatus, float, Dict[str, Any]]] = None
+        self._deliveries: Deque[ProgressInfo] = deque()
+        self._delivery_lock = threading.Condition()
+        self._delivering: Optional[threading.Thread] = None
+        self._delivery_thread: Optional[threading.Thread] = None
 
     def update_progress(
         self,
@@ -80,30 +122,49 @@ class ProgressTracker:
             progress: Current progress (0-100)
             **details: Additional stage-specific details
         """
-        try:
-            # Create progress info
-            info = ProgressInfo(
-                stage=stage,
-                progress=progress,
-                start_time=self.stages[stage].start_time if stage in self.stages
-                else datetime.now(),
-                details=details,
-            )
-
-            # Update stage information
-            self.stages[stage] = info
-            self.current_stage = stage
+        if (
+            stage is self.current_stage
+            and progress < 100.0
+            and abs(progress - self._published_progress) < self.min_delta
+            and time.monotonic() - self._published_at < self.min_interval
+        ):
+            # Coalesce with the next update
+            self._pending = (stage, progress, details)
+            return
+
+        if self._pending is not None and self._pending[0] is not stage:
+            self._publish_pending()
+        self._pending = None
+        self._publish(stage, progress, details)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Publish any pending update and wait until callbacks received it.
+
+        Called from a callback, this does not wait: the updates still queued
+        are delivered once the callback returns.
 
-            # Notify callbacks
-            self._notify_callbacks(info)
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
 
-            logger.debug(
-                f"Progress updated for {self.video_id}: "
-                f"{stage.value} - {progress:.1f}%"
+        Returns:
+            True if every published update was delivered
+        """
+        self._publish_pending()
+        with self._delivery_lock:
+            if self._on_delivery_thread():
+                return not self._deliveries
+            return self._delivery_lock.wait_for(
+                lambda: not self._deliveries and not self._delivering, timeout
             )
 
-        except Exception as e:
-            logger.error(f"Failed to update progress: {e}")
+    def close(self) -> None:
+        """Deliver outstanding updates and stop the delivery thread."""
+        self.flush()
+        with self._delivery_lock:
+            thread, self._delivery_thread = self._delivery_thread, None
+            self._delivery_lock.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
 
     def mark_stage_error(
         self,
@@ -119,6 +180,8 @@ class ProgressTracker:
             **details: Additional error details
         """
         try:
+            self._publish_pending()
+
             # Create error progress info
             info = ProgressInfo(
                 stage=stage,
@@ -137,8 +200,7 @@ class ProgressTracker:
             self._notify_callbacks(info)
 
             logger.error(
-                f"Stage failed for {self.video_id}: "
-                f"{stage.value} - {error}"
+                "Stage failed for %s: %s - %s", self.video_id, stage.value, error
             )
 
         except Exception as e:
@@ -181,6 +243,7 @@ class ProgressTracker:
         Returns:
             Progress information or None if stage not started
         """
+        self._publish_pending()
         return self.stages.get(stage)
 
     def get_overall_progress(self) -> float:
@@ -189,6 +252,7 @@ class ProgressTracker:
         Returns:
             Overall progress percentage (0-100)
         """
+        self._publish_pending()
         if not self.stages:
             return 0.0
 
@@ -217,16 +281,116 @@ class ProgressTracker:
             (current_progress * (1.0 - current_weight))
         )
 
+    def _publish(
+        self,
+        stage: ProcessingStatus,
+        progress: float,
+        details: Dict[str, Any],
+    ) -> None:
+        """Record an update and hand it to the callbacks."""
+        try:
+            # Create progress info
+            info = ProgressInfo(
+                stage=stage,
+                progress=progress,
+                start_time=self.stages[stage].start_time if stage in self.stages
+                else datetime.now(),
+                details=details,
+            )
+
+            # Update stage information
+            self.stages[stage] = info
+            self.current_stage = stage
+            self._published_progress = info.progress
+            self._published_at = time.monotonic()
+
+            # Notify callbacks
+            self._notify_callbacks(info)
+
+            logger.debug(
+                "Progress updated for %s: %s - %.1f%%",
+                self.video_id,
+                stage.value,
+                info.progress,
+            )
+
+        except Exception as e:
+            logger.error("Failed to update progress: %s", e)
+
+    def _publish_pending(self) -> None:
+        """Publish the update held back by coalescing, if any."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self._publish(*pending)
+
     def _notify_callbacks(self, info: ProgressInfo) -> None:
         """Notify all callbacks of a progress update.
 
+        Updates are queued for the delivery thread unless the tracker is
+        synchronous. A queued update replaces a queued predecessor of the
+        same stage that callbacks have not seen yet; errors are never
+        replaced.
+
+        Args:
+            info: Progress information to send to callbacks
+        """
+        if not self.callbacks:
+            return
+        if self.synchronous:
+            self._deliver(info)
+            return
+
+        with self._delivery_lock:
+            if (
+                self._deliveries
+                and self._deliveries[-1].stage is info.stage
+                and self._deliveries[-1].error is None
+            ):
+                self._deliveries[-1] = info
+            else:
+                self._deliveries.append(info)
+            if self._delivery_thread is None:
+                self._delivery_thread = threading.Thread(
+                    target=self._delivery_loop,
+                    name=f"progress-{self.video_id}",
+                    daemon=True,
+                )
+                self._delivery_thread.start()
+            self._delivery_lock.notify_all()
+
+    def _on_delivery_thread(self) -> bool:
+        """Whether the caller is the delivery thread, i.e. a callback."""
+        return self._delivering is threading.current_thread()
+
+    def _delivery_loop(self) -> None:
+        """Deliver queued updates until the tracker is closed."""
+        current = threading.current_thread()
+        while True:
+            with self._delivery_lock:
+                self._delivery_lock.wait_for(
+                    lambda: self._deliveries or self._delivery_thread is not current
+                )
+                if not self._deliveries:
+                    return
+                info = self._deliveries.popleft()
+                self._delivering = current
+            try:
+                self._deliver(info)
+            finally:
+                with self._delivery_lock:
+                    self._delivering = None
+                    self._delivery_lock.notify_all()
+
+    def _deliver(self, info: ProgressInfo) -> None:
+        """Call every callback with an update.
+
         Args:
             info: Progress information to send to callbacks
         """
-        for callback in self.callbacks:
+        for callback in list(self.callbacks):
             try:
                 callback(info)
             except Exception as e:
-                logger.error(f"Progress callback failed: {e}")
+                logger.error("Progress callback failed: %s", e)
                 # Remove failed callback
                 self.remove_callback(callback)
@@ -1,12 +1,14 @@
 """Quarantine management for suspicious files.
 
 This module provides functionality for handling files that fail security
-validation or are otherwise suspicious.
+validation or are otherwise suspicious. Each quarantined file has a ``.meta``
+JSON sidecar and an entry in a SQLite catalog (see quarantine_catalog), which
+serves listing and cleanup without reading the sidecars.
 """
 
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -15,9 +17,19 @@ import magic
 from video_understanding.utils.constants import QUARANTINE_FILE_MODE
 from video_understanding.utils.exceptions import QuarantineError
 from video_understanding.core.upload.directory import DirectoryManager
+from video_understanding.core.upload.quarantine_catalog import (
+    CATALOG_NAME,
+    QuarantineCatalog,
+)
 
 logger = logging.getLogger(__name__)
 
+# Quarantined files removed per catalog transaction during cleanup
+CLEANUP_BATCH_SIZE = 500
+
+# Leading bytes read to detect the MIME type of a quarantined file
+MIME_DETECTION_BYTES = 8192
+
 
 class QuarantineManager:
     """Manages quarantined files and their metadata.
@@ -50,8 +62,22 @@ class QuarantineManager:
         """
         self.directory_manager = directory_manager
         self.test_mode = test_mode
+        self._catalog: Optional[QuarantineCatalog] = None
         self._ensure_quarantine_dir()
 
+    @property
+    def catalog(self) -> QuarantineCatalog:
+        """Catalog of quarantine entries, opened on first use.
+
+        A newly created catalog is filled from the existing ``.meta`` files.
+        """
+        if self._catalog is None:
+            quarantine_dir = self.directory_manager.get_path("quarantine")
+            self._catalog = QuarantineCatalog(quarantine_dir / CATALOG_NAME)
+            if self._catalog.created:
+                self._catalog.rebuild(quarantine_dir)
+        return self._catalog
+
     def _ensure_quarantine_dir(self) -> None:
         """Ensure quarantine directory exists with proper permissions.
 
@@ -128,6 +154,10 @@ class QuarantineManager:
     ) -> None:
         """Record metadata for a quarantined file.
 
+        Writes the ``.meta`` sidecar and adds the file to the catalog. A
+        "mime_type" in metadata is used as the file's MIME type; otherwise it
+        is detected from the file's first bytes.
+
         Args:
             quarantine_path: Path to the quarantined file
             reason: Reason for quarantining
@@ -140,15 +170,24 @@ class QuarantineManager:
             # Create metadata file path
             meta_path = quarantine_path.with_suffix(".meta")
 
+            metadata = dict(metadata)
+            mime_type = metadata.pop("mime_type", None)
+            if mime_type is None:
+                with open(quarantine_path, "rb") as f:
+                    mime_type = magic.from_buffer(
+                        f.read(MIME_DETECTION_BYTES), mime=True
+                    )
+
             # Gather file information
+            stat = quarantine_path.stat()
             file_info = {
                 "original_path": str(quarantine_path),
                 "quarantine_time": datetime.now().isoformat(),
                 "reason": reason,
                 "file_info": {
-                    "size": quarantine_path.stat().st_size,
-                    "mime_type": magic.from_file(str(quarantine_path), mime=True),
-                    "mode": oct(quarantine_path.stat().st_mode & 0o777),
+                    "size": stat.st_size,
+                    "mime_type": mime_type,
+                    "mode": oct(stat.st_mode & 0o777),
                 },
                 **metadata,
             }
@@ -160,6 +199,8 @@ class QuarantineManager:
             # Set restrictive permissions on metadata file
             meta_path.chmod(QUARANTINE_FILE_MODE)
 
+            self.catalog.add(quarantine_path.name, quarantine_path, file_info)
+
             logger.debug(f"Recorded metadata for quarantined file: {meta_path}")
 
         except Exception as e:
@@ -178,6 +219,11 @@ class QuarantineManager:
             QuarantineError: If information cannot be retrieved
         """
         try:
+            if not self.test_mode:
+                info = self.catalog.get(file_path.name)
+                if info is not None:
+                    return info
+
             meta_path = file_path.with_suffix(".meta")
             if not meta_path.exists():
                 raise QuarantineError(f"No metadata found for {file_path}")
@@ -191,94 +237,156 @@ class QuarantineManager:
     def list_quarantined_files(
         self,
         include_metadata: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        reason: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """List all quarantined files.
+        """List quarantined files, newest first.
 
         Args:
             include_metadata: Whether to include full metadata
+            limit: Maximum number of files to list (None for all)
+            offset: Number of files to skip, for paging through the list
+            reason: Only list files quarantined for this reason
 
         Returns:
-            Dictionary mapping filenames to quarantine information
+            Dictionary mapping filenames (without extension) to quarantine
+            information
 
         Raises:
             QuarantineError: If listing fails
         """
+        if self.test_mode:
+            return {}
+
         try:
-            quarantine_dir = self.directory_manager.get_path("quarantine")
-            if not quarantine_dir.exists():
-                return {}
-
-            quarantined = {}
-            for meta_file in quarantine_dir.glob("*.meta"):
-                try:
-                    with open(meta_file) as f:
-                        info = json.load(f)
-                        if include_metadata:
-                            quarantined[meta_file.stem] = info
-                        else:
-                            quarantined[meta_file.stem] = {
-                                "quarantine_time": info["quarantine_time"],
-                                "reason": info["reason"],
-                            }
-                except Exception as e:
-                    logger.warning(f"Failed to read metadata {meta_file}: {e}")
-
-            return quarantined
+            entries = self.catalog.list(
+                limit=limit,
+                offset=offset,
+                reason=reason,
+                include_metadata=include_metadata,
+            )
+            return {Path(name).stem: info for name, info in entries}
 
         except Exception as e:
             raise QuarantineError(f"Failed to list quarantined files: {e}")
 
-    def cleanup_quarantine(self, max_age_days: int = 30) -> None:
+    def count_quarantined_files(self, reason: Optional[str] = None) -> int:
+        """Count quarantined files.
+
+        Args:
+            reason: Only count files quarantined for this reason
+
+        Returns:
+            Number of quarantined files
+
+        Raises:
+            QuarantineError: If counting fails
+        """
+        if self.test_mode:
+            return 0
+
+        try:
+            return self.catalog.count(reason)
+        except Exception as e:
+            raise QuarantineError(f"Failed to count quarantined files: {e}")
+
+    def cleanup_quarantine(self, max_age_days: int = 30) -> int:
         """Clean up old quarantined files.
 
+        Files quarantined more than max_age_days full days ago are found
+        with one range query on the catalog and removed in batches, each
+        batch's catalog entries in a single transaction. Entries whose file
+        or sidecar cannot be deleted stay catalogued and are retried by the
+        next cleanup.
+
         Args:
             max_age_days: Maximum age of files to keep
 
+        Returns:
+            Number of quarantined files removed
+
         Raises:
             QuarantineError: If cleanup fails
         """
         if self.test_mode:
-            return
+            return 0
 
         try:
-            quarantine_dir = self.directory_manager.get_path("quarantine")
-            if not quarantine_dir.exists():
-                return
-
-            now = datetime.now()
-            for meta_file in quarantine_dir.glob("*.meta"):
-                try:
-                    # Read metadata
-                    with open(meta_file) as f:
-                        info = json.load(f)
-
-                    # Check age
-                    quarantine_time = datetime.fromisoformat(
-                        info["quarantine_time"]
-                    )
-                    age_days = (now - quarantine_time).days
+            cutoff = datetime.now() - timedelta(days=max_age_days + 1)
+            removed = 0
+            for batch in self.catalog.expired(cutoff, CLEANUP_BATCH_SIZE):
+                deleted = []
+                for name, quarantine_file in batch:
+                    try:
+                        quarantine_file.unlink(missing_ok=True)
+                        quarantine_file.with_suffix(".meta").unlink(missing_ok=True)
+                    except OSError as e:
+                        # Keep the entry so a later cleanup retries it
+                        logger.warning(f"Failed to remove {quarantine_file}: {e}")
+                        continue
+                    deleted.append(name)
+                self.catalog.remove(deleted)
+                removed += len(deleted)
+
+            if removed:
+                logger.info(
+                    f"Removed {removed} quarantined files older than "
+                    f"{max_age_days} days"
+                )
+            return removed
 
-                    if age_days > max_age_days:
-                        # Remove quarantined file
-                        quarantine_file = Path(info["original_path"])
-                        if quarantine_file.exists():
-                            quarantine_file.unlink()
+        except Exception as e:
+            raise QuarantineError(f"Failed to cleanup quarantine: {e}")
 
-                        # Remove metadata file
-                        meta_file.unlink()
+    def rebuild_catalog(self) -> int:
+        """Recreate the quarantine catalog from the ``.meta`` files.
 
-                        logger.info(
-                            f"Removed quarantined file: {quarantine_file} "
-                            f"(age: {age_days} days)"
-                        )
+        Recovers listing and cleanup after the catalog database was lost or
+        got out of step with the quarantine directory.
 
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to cleanup {meta_file}: {e}"
-                    )
+        Returns:
+            Number of quarantined files catalogued
 
+        Raises:
+            QuarantineError: If the rebuild fails
+        """
+        if self.test_mode:
+            return 0
+
+        try:
+            return self.catalog.rebuild(self.directory_manager.get_path("quarantine"))
         except Exception as e:
-            raise QuarantineError(f"Failed to cleanup quarantine: {e}")
+            raise QuarantineError(f"Failed to rebuild quarantine catalog: {e}")
+
+    def migrate_layout(self, pause: float = 0.0) -> Dict[str, Any]:
+        """Move flat quarantined files into the sharded layout.
+
+        The catalog is rebuilt afterwards to record the new locations.
+
+        Args:
+            pause: Seconds to sleep between batches of moved files
+
+        Returns:
+            Migration statistics
+
+        Raises:
+            QuarantineError: If the migration fails
+        """
+        if self.test_mode:
+            return {}
+
+        try:
+            catalog_files = {
+                CATALOG_NAME + suffix for suffix in ("", "-journal", "-wal", "-shm")
+            }
+            stats = self.directory_manager.migrate_to_sharded(
+                "quarantine", pause=pause, exclude=catalog_files
+            )
+            self.rebuild_catalog()
+            return stats.to_dict()
+        except Exception as e:
+            raise QuarantineError(f"Failed to migrate quarantine layout: {e}")
 
     def restore_file(
         self,
@@ -320,6 +428,7 @@ class QuarantineManager:
             meta_path = quarantine_path.with_suffix(".meta")
             if meta_path.exists():
                 meta_path.unlink()
+            self.catalog.remove([quarantine_path.name])
 
             logger.info(
                 f"Restored quarantined file: {quarantine_path} -> {restored_path}"
@@ -329,3 +438,9 @@ class QuarantineManager:
 
         except Exception as e:
             raise QuarantineError(f"Failed to restore file: {e}")
+
+    def close(self) -> None:
+        """Close the quarantine catalog."""
+        if self._catalog is not None:
+            self._catalog.close()
+            self._catalog = None
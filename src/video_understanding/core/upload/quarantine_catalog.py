@@ -0,0 +1,257 @@
+"""SQLite catalog of quarantined files.
+
+Every quarantined file has a ``.meta`` JSON sidecar. Listing or cleaning up
+the quarantine by reading every sidecar takes minutes once tens of
+thousands of files have piled up, so entries are also recorded in a
+catalog indexed by quarantine time and reason. Listing is a paginated
+index scan, and cleanup finds expired entries with one range query.
+
+The sidecars remain the record of truth: rebuild() recreates the catalog
+from them after the database is lost or damaged.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CATALOG_NAME = "catalog.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    quarantine_time REAL NOT NULL,
+    reason TEXT NOT NULL,
+    info TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_time ON entries (quarantine_time);
+CREATE INDEX IF NOT EXISTS entries_reason ON entries (reason, quarantine_time);
+"""
+
+
+class QuarantineCatalog:
+    """Indexed catalog of quarantine entries.
+
+    Entries are keyed by the quarantined file's name and hold the same
+    information as its ``.meta`` sidecar.
+
+    Example:
+        >>> catalog = QuarantineCatalog(Path("uploads/quarantine/catalog.sqlite"))
+        >>> catalog.add("20240101_120000_video.mp4", path, info)
+        >>> page = catalog.list(limit=50, offset=100, reason="Validation failed: ...")
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        """Open the catalog, creating the database if needed.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.created = not self.db_path.exists()
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def __enter__(self) -> "QuarantineCatalog":
+        """Enter context."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Close the catalog."""
+        self.close()
+
+    def add(self, name: str, path: Path, info: Dict[str, Any]) -> None:
+        """Record a quarantined file.
+
+        Args:
+            name: Name of the quarantined file
+            path: Path of the quarantined file
+            info: Quarantine information with "quarantine_time" (ISO format)
+                and "reason"
+        """
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(name, path, quarantine_time, reason, info) VALUES (?, ?, ?, ?, ?)",
+                self._row(name, path, info),
+            )
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the information of a quarantined file.
+
+        Args:
+            name: Name of the quarantined file
+
+        Returns:
+            Quarantine information, or None if the file is not catalogued
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT info FROM entries WHERE name = ?", (name,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def remove(self, names: List[str]) -> None:
+        """Remove entries in one transaction.
+
+        Args:
+            names: Names of the quarantined files
+        """
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM entries WHERE name = ?", [(name,) for name in names]
+            )
+
+    def list(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        reason: Optional[str] = None,
+        include_metadata: bool = False,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """List entries, newest first.
+
+        Args:
+            limit: Maximum number of entries (None for all)
+            offset: Number of entries to skip
+            reason: Only list entries with this reason
+            include_metadata: Whether to return the full information instead
+                of only quarantine time and reason
+
+        Returns:
+            List of (name, information) tuples
+        """
+        columns = "name, info" if include_metadata else "name, quarantine_time, reason"
+        query = f"SELECT {columns} FROM entries"
+        params: List[Any] = []
+        if reason is not None:
+            query += " WHERE reason = ?"
+            params.append(reason)
+        query += " ORDER BY quarantine_time DESC, name DESC LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, offset])
+
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        if include_metadata:
+            return [(name, json.loads(info)) for name, info in rows]
+        return [
+            (
+                name,
+                {
+                    "quarantine_time": datetime.fromtimestamp(timestamp).isoformat(),
+                    "reason": entry_reason,
+                },
+            )
+            for name, timestamp, entry_reason in rows
+        ]
+
+    def count(self, reason: Optional[str] = None) -> int:
+        """Count entries.
+
+        Args:
+            reason: Only count entries with this reason
+
+        Returns:
+            Number of entries
+        """
+        with self._lock:
+            if reason is None:
+                row = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()
+            else:
+                row = self._db.execute(
+                    "SELECT COUNT(*) FROM entries WHERE reason = ?", (reason,)
+                ).fetchone()
+        return row[0]
+
+    def expired(
+        self, before: datetime, batch_size: int = 500
+    ) -> Iterator[List[Tuple[str, Path]]]:
+        """Iterate entries quarantined at or before a time, in batches.
+
+        Each batch continues after the last entry of the previous one, so
+        entries may be removed in between or kept without being yielded
+        again.
+
+        Args:
+            before: Cutoff time
+            batch_size: Entries per batch
+
+        Yields:
+            Lists of (name, path) tuples, oldest first
+        """
+        cutoff = before.timestamp()
+        cursor: Tuple[float, str] = (float("-inf"), "")
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT quarantine_time, name, path FROM entries "
+                    "WHERE quarantine_time <= ? AND (quarantine_time, name) > (?, ?) "
+                    "ORDER BY quarantine_time, name LIMIT ?",
+                    (cutoff, *cursor, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            cursor = rows[-1][:2]
+            yield [(name, Path(path)) for _, name, path in rows]
+
+    def rebuild(self, quarantine_dir: Path) -> int:
+        """Recreate the catalog from the ``.meta`` sidecars.
+
+        Sidecars are searched in shard directories too, and entries point at
+        the file next to each sidecar.
+
+        Args:
+            quarantine_dir: Quarantine directory
+
+        Returns:
+            Number of entries catalogued
+        """
+        rows = []
+        for meta_file in quarantine_dir.rglob("*.meta"):
+            try:
+                with open(meta_file) as f:
+                    info = json.load(f)
+                # The file is next to its sidecar, wherever it was recorded
+                path = meta_file.with_name(Path(info["original_path"]).name)
+                info["original_path"] = str(path)
+                rows.append(self._row(path.name, path, info))
+            except Exception as e:
+                logger.warning(
+                    f"Skipping unreadable quarantine metadata {meta_file}: {e}"
+                )
+
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM entries")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries "
+                "(name, path, quarantine_time, reason, info) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        logger.info(f"Rebuilt quarantine catalog with {len(rows)} entries")
+        return len(rows)
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _row(
+        name: str, path: Path, info: Dict[str, Any]
+    ) -> Tuple[str, str, float, str, str]:
+        """Database row for an entry."""
+        return (
+            name,
+            str(path),
+            datetime.fromisoformat(info["quarantine_time"]).timestamp(),
+            info["reason"],
+            json.dumps(info, default=str),
+        )
@@ -0,0 +1,238 @@
+"""Motion-adaptive frame sampling for video processing.
+
+A fixed sample rate analyzes a static slide as often as a fast action
+sequence. The sampler here decides per decoded frame whether it should be
+analyzed, using a cheap motion signal: the fraction of pixels of a small
+grayscale thumbnail that changed noticeably since the last analyzed frame.
+Unlike a mean difference, this picks up a small moving object and ignores
+sensor and compression noise spread over the whole picture.
+
+- Frames that changed by more than the motion threshold are analyzed, at
+  most once every ``min_interval`` frames.
+- Static stretches fall back to a floor rate of one frame every
+  ``floor_interval`` frames.
+- An optional per-video budget caps the number of analyzed frames. The
+  floor rate is stretched so it fits the budget, and motion samples only
+  spend budget that is not reserved for the floor rate of the rest of the
+  video.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SamplingStats:
+    """Adaptive sampling counters.
+
+    Attributes:
+        frames_seen: Frames passed to should_sample()
+        frames_sampled: Frames selected for analysis
+        motion_samples: Frames selected because their content changed
+        floor_samples: Frames selected to keep the floor rate
+        budget_skipped: Changed frames skipped to stay within the budget
+    """
+
+    frames_seen: int = 0
+    frames_sampled: int = 0
+    motion_samples: int = 0
+    floor_samples: int = 0
+    budget_skipped: int = 0
+
+    @property
+    def sample_ratio(self) -> float:
+        """Fraction of seen frames that were selected."""
+        return self.frames_sampled / self.frames_seen if self.frames_seen else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert stats to dictionary format.
+
+        Returns:
+            Dictionary with counters and sample ratio
+        """
+        return {
+            "frames_seen": self.frames_seen,
+            "frames_sampled": self.frames_sampled,
+            "motion_samples": self.motion_samples,
+            "floor_samples": self.floor_samples,
+            "budget_skipped": self.budget_skipped,
+            "sample_ratio": self.sample_ratio,
+        }
+
+
+class MotionAdaptiveSampler:
+    """Selects frames for analysis by how much their content changed.
+
+    Example:
+        >>> sampler = MotionAdaptiveSampler(floor_interval=30, frame_budget=200)
+        >>> sampler.reset(frame_count)
+        >>> for number, frame in enumerate(frames):
+        ...     if sampler.should_sample(frame, number):
+        ...         analyze(frame)
+        >>> print(f"Analyzed {sampler.stats.sample_ratio:.0%} of frames")
+    """
+
+    def __init__(
+        self,
+        motion_threshold: float = 0.02,
+        min_interval: int = 1,
+        floor_interval: int = 30,
+        frame_budget: int | None = None,
+        pixel_threshold: int = 16,
+        thumbnail_size: tuple[int, int] = (64, 36),
+    ) -> None:
+        """Initialize the sampler.
+
+        Args:
+            motion_threshold: Fraction of thumbnail pixels (0-1) that must
+                have changed since the last analyzed frame for a frame to be
+                analyzed
+            min_interval: Minimum number of frames between analyzed frames
+            floor_interval: Maximum number of frames between analyzed frames
+            frame_budget: Maximum number of analyzed frames per video (None
+                for no limit)
+            pixel_threshold: Luma difference (0-255) above which a thumbnail
+                pixel counts as changed
+            thumbnail_size: (width, height) of the motion thumbnails
+
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        if not 0 < motion_threshold <= 1:
+            raise ValueError("motion_threshold must be in (0, 1]")
+        if not 0 <= pixel_threshold < 255:
+            raise ValueError("pixel_threshold must be between 0 and 254")
+        if min_interval < 1 or floor_interval < min_interval:
+            raise ValueError(
+                "intervals must satisfy 1 <= min_interval <= floor_interval"
+            )
+        if frame_budget is not None and frame_budget < 1:
+            raise ValueError("frame_budget must be positive")
+        if thumbnail_size[0] < 1 or thumbnail_size[1] < 1:
+            raise ValueError("thumbnail_size must be positive")
+
+        self.motion_threshold = motion_threshold
+        self.min_interval = min_interval
+        self.floor_interval = floor_interval
+        self.frame_budget = frame_budget
+        self.pixel_threshold = pixel_threshold
+        self.thumbnail_size = thumbnail_size
+        self.reset()
+
+    def reset(self, frame_count: int | None = None) -> None:
+        """Start sampling a new video.
+
+        Args:
+            frame_count: Number of frames in the video, used to spread the
+                budget over it (None or 0 if unknown)
+        """
+        self.stats = SamplingStats()
+        self.frame_count = frame_count or None
+        self._reference: np.ndarray | None = None
+        self._last_sampled = 0
+        # Stretch the floor rate so that it alone fits in the budget
+        self._floor = self.floor_interval
+        if self.frame_budget is not None and self.frame_count:
+            self._floor = max(
+                self._floor, math.ceil(self.frame_count / self.frame_budget)
+            )
+
+    @property
+    def effective_floor_interval(self) -> int:
+        """Floor interval after stretching it to fit the budget."""
+        return self._floor
+
+    def motion(self, frame: np.ndarray) -> float:
+        """Measure how much a frame changed since the last analyzed frame.
+
+        Args:
+            frame: Frame as numpy array (BGR or grayscale)
+
+        Returns:
+            Fraction of changed thumbnail pixels, or 1.0 if no frame has
+            been analyzed yet
+        """
+        return self._motion(self._thumbnail(frame))
+
+    def should_sample(self, frame: np.ndarray, frame_number: int) -> bool:
+        """Decide whether a decoded frame should be analyzed.
+
+        Args:
+            frame: Frame as numpy array
+            frame_number: Frame number in the video
+
+        Returns:
+            True if the frame should be analyzed
+        """
+        self.stats.frames_seen += 1
+        if (
+            self.frame_budget is not None
+            and self.stats.frames_sampled >= self.frame_budget
+        ):
+            return False
+
+        gap = frame_number - self._last_sampled
+        if self._reference is not None and gap < self.min_interval:
+            return False
+
+        thumbnail = self._thumbnail(frame)
+        if self._reference is None or gap >= self._floor:
+            self.stats.floor_samples += 1
+        elif self._motion(thumbnail) >= self.motion_threshold:
+            if not self._can_spend(frame_number):
+                self.stats.budget_skipped += 1
+                return False
+            self.stats.motion_samples += 1
+        else:
+            return False
+
+        self.stats.frames_sampled += 1
+        self._reference = thumbnail
+        self._last_sampled = frame_number
+        return True
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale a frame to a grayscale motion thumbnail.
+
+        Area averaging a full HD frame costs milliseconds, so the frame is
+        first resized bilinearly to four times the thumbnail size, which
+        reads only a few pixels per output, and then area averaged.
+        """
+        width, height = self.thumbnail_size
+        small = cv2.resize(
+            frame, (width * 4, height * 4), interpolation=cv2.INTER_LINEAR
+        )
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        thumbnail = cv2.resize(small, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        return thumbnail.astype(np.int16)
+
+    def _motion(self, thumbnail: np.ndarray) -> float:
+        """Fraction of thumbnail pixels that changed against the reference."""
+        if self._reference is None:
+            return 1.0
+        changed = np.abs(thumbnail - self._reference) > self.pixel_threshold
+        return np.count_nonzero(changed) / changed.size
+
+    def _can_spend(self, frame_number: int) -> bool:
+        """Check that a motion sample leaves budget for the floor rate.
+
+        Args:
+            frame_number: Frame number of the candidate sample
+
+        Returns:
+            True if the sample fits the budget
+        """
+        if self.frame_budget is None:
+            return True
+        remaining = self.frame_budget - self.stats.frames_sampled - 1
+        if self.frame_count is None:
+            return remaining >= 0
+        reserved = max(0, self.frame_count - frame_number) / self._floor
+        return remaining >= math.floor(reserved)
@@ -5,13 +5,18 @@ This module provides scene change detection functionality.
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import logging
 from pathlib import Path
 
 import cv2
 import numpy as np
-from video_understanding.core.exceptions import FileValidationError
+from video_understanding.core.decoder import DECODE_PROFILES, FrameDecoder
+from video_understanding.core.exceptions import (
+    FileValidationError,
+    VideoProcessingError,
+)
+from video_understanding.core.upload.frame_cache import FrameCache, FrameTransform
 
 logger = logging.getLogger(__name__)
 
@@ -41,17 +46,37 @@ class SceneChange:
 
 
 class SceneDetector:
-    """Detects scene changes in videos."""
+    """Detects scene changes in videos.
+
+    With the "fast" decode profile only keyframes are decoded, so scene
+    boundaries are located to the nearest keyframe at a fraction of the
+    decoding cost of a full pass.
+    """
+
+    # Version of the cached frame difference series
+    DIFF_VERSION = "absdiff-gray-mean:1"
 
     def __init__(self):
         """Initialize scene detector."""
         self.min_scene_duration = 2.0  # seconds
         self.max_scenes = 500
         self.threshold = 30.0  # threshold for scene change detection
+        self.decode_profile = "full"
+        self.frame_cache: Optional[FrameCache] = None
+
+    def reset(self) -> None:
+        """Forget the previous frame so detect_change() starts a new video."""
+        self._prev_frame: Optional[np.ndarray] = None
 
     async def detect(self, file_path: Path) -> List[Dict[str, Any]]:
         """Detect scenes in video file.
 
+        With a frame cache set, the per-frame difference series is cached for
+        the video's content, so detecting again with a different threshold,
+        minimum duration or scene limit does not decode the video. Decoding
+        stops once max_scenes scenes are found, and such partial series are
+        not cached.
+
         Args:
             file_path: Path to video file
 
@@ -64,7 +89,54 @@ class SceneDetector:
         if not file_path.exists():
             raise FileValidationError(f"Video file not found: {file_path}")
 
-        scenes = []
+        series = None
+        if self.frame_cache is not None:
+            video = self.frame_cache.video_key(file_path)
+            params = {"profile": self.decode_profile}
+            series = self.frame_cache.get_result(
+                video, -1, "scene_diffs", self.DIFF_VERSION, params
+            )
+
+        if series is None:
+            if self.decode_profile == "fast":
+                series = self._keyframe_diffs(file_path)
+            else:
+                series = self._frame_diffs(file_path)
+            if self.frame_cache is not None and series.get("complete", True):
+                self.frame_cache.put_result(
+                    video, -1, "scene_diffs", self.DIFF_VERSION, params, series
+                )
+                self.frame_cache.flush()
+
+        if series["profile"] == "fast":
+            return self._split_keyframe_scenes(series)
+        return self._split_scenes(series)
+
+    def set_frame_cache(self, frame_cache: Optional[FrameCache]) -> None:
+        """Set the cache for frame difference series.
+
+        Args:
+            frame_cache: Frame cache, or None to disable caching
+        """
+        self.frame_cache = frame_cache
+
+    def _frame_diffs(self, file_path: Path) -> Dict[str, Any]:
+        """Compute the difference between every pair of consecutive frames.
+
+        Reading stops at the frame that completes max_scenes scenes with the
+        current settings, since _split_scenes() ignores the rest.
+
+        Args:
+            file_path: Path to video file
+
+        Returns:
+            Dictionary with the fps, the number of frames read, the
+            difference of each frame to the previous one and whether the
+            series covers the whole video
+
+        Raises:
+            FileValidationError: If the video file cannot be opened
+        """
         cap = cv2.VideoCapture(str(file_path))
 
         if not cap.isOpened():
@@ -75,10 +147,12 @@ class SceneDetector:
             fps = cap.get(cv2.CAP_PROP_FPS)
             total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
             min_frames = int(self.min_scene_duration * fps)
-
+            diffs = []
             prev_frame = None
             frame_count = 0
             scene_start = 0
+            scene_count = 0
+            complete = True
 
             while cap.isOpened() and frame_count < total_frames:
                 ret, frame = cap.read()
@@ -86,39 +160,162 @@ class SceneDetector:
                     break
 
                 if prev_frame is not None:
-                    # Calculate frame difference
                     diff = self._calculate_frame_diff(prev_frame, frame)
-
-                    # Check for scene change
-                    if diff > self.threshold and (frame_count - scene_start) >= min_frames:
-                        scenes.append({
-                            "start_frame": scene_start,
-                            "end_frame": frame_count,
-                            "start_time": scene_start / fps,
-                            "end_time": frame_count / fps,
-                            "duration": (frame_count - scene_start) / fps
-                        })
+                    diffs.append(diff)
+                    if self._is_scene_change(
+                        diff, frame_count, scene_start, min_frames
+                    ):
                         scene_start = frame_count
-
-                        # Check max scenes limit
-                        if len(scenes) >= self.max_scenes:
+                        scene_count += 1
+                        if scene_count >= self.max_scenes:
+                            complete = False
                             break
 
-                prev_frame = frame.copy()
+                prev_frame = frame
                 frame_count += 1
 
-            # Add final scene if needed
-            if scene_start < frame_count:
+        finally:
+            cap.release()
+
+        return {
+            "profile": "full",
+            "fps": fps,
+            "frames": frame_count,
+            "diffs": diffs,
+            "complete": complete,
+        }
+
+    def _is_scene_change(
+        self, diff: float, frame_number: int, scene_start: int, min_frames: int
+    ) -> bool:
+        """Check whether a frame difference starts a new scene.
+
+        Args:
+            diff: Difference of the frame to the previous one
+            frame_number: Frame number of the frame
+            scene_start: First frame of the current scene
+            min_frames: Minimum scene length in frames
+
+        Returns:
+            True if the frame starts a new scene
+        """
+        return diff > self.threshold and (frame_number - scene_start) >= min_frames
+
+    def _split_scenes(self, series: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Split a full frame difference series into scenes.
+
+        Args:
+            series: Result of _frame_diffs()
+
+        Returns:
+            List of scene information dictionaries
+        """
+        fps = series["fps"]
+        frame_count = series["frames"]
+        min_frames = int(self.min_scene_duration * fps)
+        scenes = []
+        scene_start = 0
+
+        for frame_number, diff in enumerate(series["diffs"], start=1):
+            # Check for scene change
+            if self._is_scene_change(diff, frame_number, scene_start, min_frames):
                 scenes.append({
                     "start_frame": scene_start,
-                    "end_frame": frame_count,
+                    "end_frame": frame_number,
                     "start_time": scene_start / fps,
-                    "end_time": frame_count / fps,
-                    "duration": (frame_count - scene_start) / fps
+                    "end_time": frame_number / fps,
+                    "duration": (frame_number - scene_start) / fps
                 })
+                scene_start = frame_number
+
+                # Check max scenes limit
+                if len(scenes) >= self.max_scenes:
+                    return scenes
+
+        # Add final scene if needed
+        if scene_start < frame_count:
+            scenes.append({
+                "start_frame": scene_start,
+                "end_frame": frame_count,
+                "start_time": scene_start / fps,
+                "end_time": frame_count / fps,
+                "duration": (frame_count - scene_start) / fps
+            })
 
-        finally:
-            cap.release()
+        return scenes
+
+    def _keyframe_diffs(self, file_path: Path) -> Dict[str, Any]:
+        """Compute the difference between consecutive keyframes only.
+
+        Args:
+            file_path: Path to video file
+
+        Returns:
+            Dictionary with the fps and the index, timestamp and difference
+            to the previous keyframe of each keyframe
+
+        Raises:
+            FileValidationError: If the video file cannot be decoded
+        """
+        decoder = FrameDecoder(file_path, profile="fast")
+        keyframes = []
+        prev_frame = None
+
+        try:
+            for decoded in decoder:
+                diff = None
+                if prev_frame is not None:
+                    diff = self._calculate_frame_diff(prev_frame, decoded.image)
+                keyframes.append([decoded.index, decoded.timestamp, diff])
+                prev_frame = decoded.image
+        except VideoProcessingError as e:
+            raise FileValidationError(f"Failed to open video file: {file_path}: {e}")
+
+        return {"profile": "fast", "fps": decoder.fps, "keyframes": keyframes}
+
+    def _split_keyframe_scenes(self, series: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Split a keyframe difference series into scenes.
+
+        Args:
+            series: Result of _keyframe_diffs()
+
+        Returns:
+            List of scene information dictionaries
+        """
+        scenes = []
+        scene_start = 0
+        scene_start_time = 0.0
+
+        for index, timestamp, diff in series["keyframes"]:
+            if (
+                diff is not None
+                and diff > self.threshold
+                and timestamp - scene_start_time >= self.min_scene_duration
+            ):
+                scenes.append({
+                    "start_frame": scene_start,
+                    "end_frame": index,
+                    "start_time": scene_start_time,
+                    "end_time": timestamp,
+                    "duration": timestamp - scene_start_time
+                })
+                scene_start = index
+                scene_start_time = timestamp
+
+                if len(scenes) >= self.max_scenes:
+                    return scenes
+
+        # The final scene runs to the end of the last decoded GOP
+        if series["keyframes"]:
+            end_frame = series["keyframes"][-1][0] + 1
+            end_time = end_frame / series["fps"]
+            scenes.append({
+                "start_frame": scene_start,
+                "end_frame": end_frame,
+                "start_time": scene_start_time,
+                "end_time": end_time,
+                "duration": end_time - scene_start_time
+            })
 
         return scenes
 
@@ -166,6 +363,20 @@ class SceneDetector:
         """
         self.threshold = max(0.0, threshold)
 
+    def set_decode_profile(self, profile: str) -> None:
+        """Set the decode profile used by detect().
+
+        Args:
+            profile: "full" to compare every frame or "fast" to compare
+                keyframes only
+
+        Raises:
+            ValueError: If the profile is unknown
+        """
+        if profile not in DECODE_PROFILES:
+            raise ValueError(f"Unknown decode profile: {profile}")
+        self.decode_profile = profile
+
     def detect_change(
         self,
         frame: np.ndarray,
@@ -182,18 +393,41 @@ class SceneDetector:
         Returns:
             SceneChange object if change detected, None otherwise
         """
-        if not hasattr(self, '_prev_frame'):
-            self._prev_frame = frame.copy()
-            return None
+        return self.change_from_diff(self.frame_diff(frame), frame_number, timestamp)
 
-        # Calculate frame difference
-        diff = self._calculate_frame_diff(self._prev_frame, frame)
+    def frame_diff(self, frame: np.ndarray) -> Optional[float]:
+        """Feed the next frame and return its difference to the previous one.
 
-        # Update previous frame
+        Args:
+            frame: Current frame as numpy array
+
+        Returns:
+            Difference score, or None for the first frame
+        """
+        prev_frame = getattr(self, "_prev_frame", None)
         self._prev_frame = frame.copy()
+        if prev_frame is None:
+            return None
+        return self._calculate_frame_diff(prev_frame, frame)
+
+    def change_from_diff(
+        self,
+        diff: Optional[float],
+        frame_number: int,
+        timestamp: float,
+    ) -> Optional[SceneChange]:
+        """Decide whether a frame difference is a scene change.
 
+        Args:
+            diff: Difference score from frame_diff(), or None for the first frame
+            frame_number: Frame number in sequence
+            timestamp: Frame timestamp in seconds
+
+        Returns:
+            SceneChange object if change detected, None otherwise
+        """
         # Check if difference exceeds threshold
-        if diff > self.threshold:
+        if diff is not None and diff > self.threshold:
             return SceneChange(
                 frame_number=frame_number,
                 timestamp=timestamp,
@@ -202,3 +436,315 @@ class SceneDetector:
             )
 
         return None
+
+
+class HistogramSceneDetector:
+    """Streaming scene change detector based on compact frame histograms.
+
+    Each frame is downscaled to a small thumbnail and summarised as a
+    normalised hue/saturation/luma histogram. Consecutive histograms are
+    compared with a total variation distance, and the distance is tested
+    against an adaptive threshold derived from an exponentially weighted
+    mean and standard deviation of recent distances. Camera motion moves
+    pixels around without changing their distribution much, so it produces
+    far fewer false cuts than a per-pixel absolute difference.
+
+    Gradual transitions are tracked with a window: while the frame-to-frame
+    distance stays elevated the window stays open, and when it closes the
+    histogram from before the window is compared with the one after it. A
+    large enough overall change is reported as a FADE if the window passed
+    through near-black frames, and as a DISSOLVE otherwise.
+
+    All state is constant-size per stream, so the detector can be fed frames
+    one at a time with the same interface as ``SceneDetector.detect_change``.
+
+    Example:
+        >>> detector = HistogramSceneDetector()
+        >>> for number, frame in enumerate(frames):
+        ...     change = detector.detect_change(frame, number, number / fps)
+        ...     if change:
+        ...         print(change.type, change.frame_number)
+    """
+
+    # Frame-to-frame distance below which frames never open a transition window
+    MIN_GRADUAL_DISTANCE = 0.01
+    # How far above the window's average step a jump must be to count as a cut
+    WINDOW_CUT_RATIO = 3.0
+    _LUMA_KERNEL = np.array([0.25, 0.5, 0.25])
+
+    def __init__(
+        self,
+        thumbnail_size: Tuple[int, int] = (64, 36),
+        cut_threshold: float = 0.25,
+        sensitivity: float = 3.0,
+        gradual_threshold: float = 0.2,
+        min_gradual_frames: int = 3,
+        max_gradual_frames: int = 60,
+        fade_luma: float = 20.0,
+        smoothing: float = 0.05,
+        min_scene_frames: int = 5,
+    ) -> None:
+        """Initialize the histogram scene detector.
+
+        Args:
+            thumbnail_size: (width, height) frames are downscaled to before
+                computing histograms
+            cut_threshold: Minimum histogram distance (0-1) for a cut,
+                regardless of the adaptive threshold
+            sensitivity: Number of standard deviations above the running
+                mean a distance must reach to count as a cut
+            gradual_threshold: Minimum accumulated histogram distance (0-1)
+                across a window for a gradual transition
+            min_gradual_frames: Minimum window length for a gradual transition
+            max_gradual_frames: Window length after which a gradual
+                transition is closed and evaluated
+            fade_luma: Mean luma (0-255) below which a frame counts as black
+                when classifying fades
+            smoothing: Weight of the newest distance in the running statistics
+            min_scene_frames: Minimum number of frames between reported changes
+
+        Raises:
+            ValueError: If any parameter is out of range
+        """
+        if thumbnail_size[0] < 1 or thumbnail_size[1] < 1:
+            raise ValueError("thumbnail_size must be positive")
+        if not 0.0 < cut_threshold <= 1.0:
+            raise ValueError("cut_threshold must be in (0, 1]")
+        if not 0.0 < gradual_threshold <= 1.0:
+            raise ValueError("gradual_threshold must be in (0, 1]")
+        if not 0.0 < smoothing < 1.0:
+            raise ValueError("smoothing must be in (0, 1)")
+        if min_gradual_frames < 1 or max_gradual_frames < min_gradual_frames:
+            raise ValueError("invalid gradual transition window")
+
+        self.thumbnail_size = thumbnail_size
+        self.cut_threshold = cut_threshold
+        self.sensitivity = sensitivity
+        self.gradual_threshold = gradual_threshold
+        self.min_gradual_frames = min_gradual_frames
+        self.max_gradual_frames = max_gradual_frames
+        self.fade_luma = fade_luma
+        self.smoothing = smoothing
+        self.min_scene_frames = max(0, min_scene_frames)
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset stream state so the detector can be reused for a new video."""
+        self._prev_hist: Optional[np.ndarray] = None
+        self._prev_luma = 0.0
+        self._mean = 0.0
+        self._var = 0.0
+        self._samples = 0
+        self._last_change_frame: Optional[int] = None
+        # Gradual transition window
+        self._window_hist: Optional[np.ndarray] = None
+        self._window_start: Optional[Tuple[int, float]] = None
+        self._close_window()
+
+    def compute_histogram(self, frame: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Compute the normalised histogram signature of a frame.
+
+        Hue and saturation counts are weighted by pixel brightness, so a fade
+        through black changes the signature smoothly instead of flipping the
+        (meaningless) hue distribution of near-black pixels.
+
+        Args:
+            frame: Frame as numpy array (BGR or grayscale)
+
+        Returns:
+            Tuple of (histogram, mean luma)
+        """
+        thumb = cv2.resize(frame, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        if thumb.ndim == 2:
+            pixels = thumb.ravel()
+            hist = np.bincount(pixels >> 3, minlength=32).astype(np.float64)
+            return hist / max(1, pixels.size), float(pixels.mean())
+
+        hsv = cv2.cvtColor(thumb, cv2.COLOR_BGR2HSV).reshape(-1, 3)
+        value = hsv[:, 2]
+        weight = value / 255.0
+        # Soften luma bins so a uniform brightness ramp is not a bin flip
+        luma_hist = np.convolve(
+            np.bincount(value >> 4, minlength=16), self._LUMA_KERNEL, "same"
+        )
+        hist = np.concatenate([
+            np.bincount(hsv[:, 0].astype(np.uint16) * 16 // 180, weight, 16),
+            np.bincount(hsv[:, 1] >> 5, weight, 8),
+            luma_hist,
+        ])
+        # Normalise by pixel count per channel so the distance stays in [0, 1]
+        hist /= 3.0 * max(1, len(hsv))
+        return hist, float(value.mean())
+
+    @property
+    def thumbnail_transform(self) -> FrameTransform:
+        """Downscaling applied before computing histograms.
+
+        Frames already transformed with it, such as thumbnails from a frame
+        cache, give the same histograms as the full frames.
+        """
+        return FrameTransform(*self.thumbnail_size)
+
+    @staticmethod
+    def histogram_distance(hist1: np.ndarray, hist2: np.ndarray) -> float:
+        """Total variation distance between two histogram signatures.
+
+        Args:
+            hist1: First histogram
+            hist2: Second histogram
+
+        Returns:
+            Distance in [0, 1]
+        """
+        return 0.5 * float(np.abs(hist1 - hist2).sum())
+
+    @property
+    def adaptive_threshold(self) -> float:
+        """Current cut threshold from the running distance statistics."""
+        return max(
+            self.cut_threshold,
+            self._mean + self.sensitivity * float(np.sqrt(self._var)),
+        )
+
+    def detect_change(
+        self,
+        frame: np.ndarray,
+        frame_number: int,
+        timestamp: float,
+    ) -> Optional[SceneChange]:
+        """Feed the next frame and report a scene change if one completed.
+
+        Cuts are reported on the frame where they happen. Gradual transitions
+        are reported once they finish, with the frame number and timestamp of
+        the frame where they started.
+
+        Args:
+            frame: Current frame as numpy array
+            frame_number: Frame number in sequence
+            timestamp: Frame timestamp in seconds
+
+        Returns:
+            SceneChange if a cut or gradual transition was detected, None otherwise
+        """
+        hist, luma = self.compute_histogram(frame)
+        prev_hist, prev_luma = self._prev_hist, self._prev_luma
+        self._prev_hist, self._prev_luma = hist, luma
+
+        if prev_hist is None:
+            return None
+
+        distance = self.histogram_distance(prev_hist, hist)
+        # Steps into or out of black belong to a fade, never to a cut
+        dark_edge = min(luma, prev_luma) < self.fade_luma
+        in_window = self._window_hist is not None
+        # Inside a transition window only an outlier step counts as a cut
+        outlier = not in_window or distance > self.WINDOW_CUT_RATIO * (
+            self._window_distance / self._window_length
+        )
+
+        if distance > self.adaptive_threshold and outlier and not dark_edge:
+            self._close_window()
+            if not self._can_report(frame_number):
+                return None
+            self._last_change_frame = frame_number
+            return SceneChange(
+                frame_number=frame_number,
+                timestamp=timestamp,
+                confidence=min(100.0, distance / self.adaptive_threshold * 50.0),
+                type=SceneChangeType.CUT,
+            )
+
+        elevated = (
+            distance > self._mean + float(np.sqrt(self._var))
+            and distance > self.MIN_GRADUAL_DISTANCE
+        )
+        if elevated and self._window_length < self.max_gradual_frames:
+            if not in_window:
+                self._window_hist = prev_hist
+                self._window_start = (frame_number, timestamp)
+                self._window_min_luma = prev_luma
+            self._window_length += 1
+            self._window_distance += distance
+            self._window_min_luma = min(self._window_min_luma, luma)
+            return None
+
+        if not in_window:
+            self._update_statistics(distance)
+            return None
+
+        return self._finish_window(hist, luma)
+
+    def _finish_window(self, hist: np.ndarray, luma: float) -> Optional[SceneChange]:
+        """Close the open transition window and classify it.
+
+        Args:
+            hist: Histogram of the first frame after the window
+            luma: Mean luma of that frame
+
+        Returns:
+            SceneChange if the window amounts to a transition, None otherwise
+        """
+        overall = self.histogram_distance(self._window_hist, hist)
+        length = self._window_length
+        start_frame, start_time = self._window_start
+        min_luma = min(self._window_min_luma, luma)
+        self._close_window()
+
+        if overall < self.gradual_threshold or not self._can_report(start_frame):
+            return None
+
+        if min_luma < self.fade_luma:
+            change_type = SceneChangeType.FADE
+        elif length < self.min_gradual_frames:
+            change_type = SceneChangeType.CUT
+        else:
+            change_type = SceneChangeType.DISSOLVE
+
+        self._last_change_frame = start_frame
+        return SceneChange(
+            frame_number=start_frame,
+            timestamp=start_time,
+            confidence=min(100.0, overall / self.gradual_threshold * 50.0),
+            type=change_type,
+        )
+
+    def _close_window(self) -> None:
+        """Discard any open gradual transition window."""
+        self._window_hist = None
+        self._window_start = None
+        self._window_length = 0
+        self._window_distance = 0.0
+        self._window_min_luma = 255.0
+
+    def _can_report(self, frame_number: int) -> bool:
+        """Check the minimum spacing between reported changes.
+
+        Args:
+            frame_number: Frame number of the candidate change
+
+        Returns:
+            True if a change may be reported at this frame
+        """
+        return (
+            self._last_change_frame is None
+            or frame_number - self._last_change_frame >= self.min_scene_frames
+        )
+
+    def _update_statistics(self, distance: float) -> None:
+        """Fold a non-boundary distance into the running mean and variance.
+
+        Args:
+            distance: Histogram distance of the latest frame pair
+        """
+        self._samples += 1
+        if self._samples == 1:
+            self._mean = distance
+            self._var = 0.0
+            return
+
+        # Exponentially weighted mean/variance: O(1) state per stream
+        delta = distance - self._mean
+        self._mean += self.smoothing * delta
+        self._var = (1.0 - self.smoothing) * (
+            self._var + self.smoothing * delta * delta
+        )
@@ -300,29 +300,32 @@ class SecurityScanner:
     async def scan(self, file_path: Path) -> None:
         """Scan a file for security issues.
 
+        The checks read the file, so they run on threads rather than on the
+        event loop.
+
         Args:
             file_path: Path to file to scan
 
         Raises:
             SecurityError: If security issues are found
         """
-        if not file_path.exists():
+        if not await asyncio.to_thread(file_path.exists):
             raise SecurityError(f"File not found: {file_path}")
 
-        tasks = []
+        checks = []
         if self.virus_scan_enabled:
-            tasks.append(self._scan_viruses(file_path))
+            checks.append(self._scan_viruses)
         if self.content_validation_enabled:
-            tasks.append(self._validate_content(file_path))
+            checks.append(self._validate_content)
 
-        await asyncio.gather(*tasks)
+        await asyncio.gather(*(asyncio.to_thread(check, file_path) for check in checks))
 
-    async def _scan_viruses(self, file_path: Path) -> None:
+    def _scan_viruses(self, file_path: Path) -> None:
         """Scan file for viruses."""
         # TODO: Implement virus scanning
         logger.info(f"Virus scan completed for {file_path}")
 
-    async def _validate_content(self, file_path: Path) -> None:
+    def _validate_content(self, file_path: Path) -> None:
         """Validate file content."""
         # TODO: Implement content validation
         logger.info(f"Content validation completed for {file_path}")
@@ -0,0 +1,519 @@
+"""Resumable chunked upload sessions.
+
+Large uploads are sent as fixed-size chunks that can arrive in any order,
+in parallel and more than once. A session goes through three steps:
+
+1. ``create_session`` preallocates a data file of the final size and writes
+   the session manifest.
+2. ``put_chunk`` verifies a chunk, writes it at its offset with ``pwrite``
+   and records its SHA-256 in the manifest once the data is on disk.
+3. ``commit`` checks that every chunk arrived and hands the file to
+   :class:`~video_understanding.core.upload.processor.UploadProcessor`.
+
+The manifest is replaced atomically after every chunk, so after a crash or
+a dropped connection the session is reloaded from disk and the client only
+resends the chunks listed by ``missing_chunks``. Sessions without activity
+for the session TTL are removed by ``cleanup_expired``.
+
+Example:
+    >>> sessions = UploadSessionManager(processor)
+    >>> session = sessions.create_session("talk.mp4", total_size=size)
+    >>> for index in session.missing_chunks():
+    ...     sessions.put_chunk(session.session_id, index, read_chunk(index))
+    >>> video = sessions.commit(session.session_id)
+"""
+
+import asyncio
+import errno
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+from uuid import UUID, uuid4
+
+from video_understanding.core.upload.checksum import ChecksumEngine
+from video_understanding.core.upload.processor import UploadProcessor
+from video_understanding.models.video import Video
+from video_understanding.utils.constants import MAX_FILE_SIZE, UPLOAD_FILE_MODE
+from video_understanding.utils.exceptions import UploadSessionError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
+DEFAULT_SESSION_TTL = 24 * 60 * 60  # 24 hours
+
+MANIFEST_NAME = "manifest.json"
+DATA_NAME = "data.partial"
+
+_SESSION_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+@dataclass
+class UploadSession:
+    """State of a resumable upload.
+
+    Attributes:
+        session_id: Session identifier
+        filename: Name of the uploaded file
+        total_size: Final file size in bytes
+        chunk_size: Size of every chunk but the last in bytes
+        checksum: Expected SHA-256 of the whole file, if the client sent one
+        created_at: Creation time (epoch seconds)
+        expires_at: Time after which the session is removed (epoch seconds)
+        chunks: SHA-256 hex digest of each received chunk by index
+    """
+
+    session_id: str
+    filename: str
+    total_size: int
+    chunk_size: int
+    checksum: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    expires_at: float = 0.0
+    chunks: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def chunk_count(self) -> int:
+        """Number of chunks in the upload."""
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    @property
+    def received_bytes(self) -> int:
+        """Bytes of the received chunks."""
+        return sum(self.chunk_length(index) for index in self.chunks)
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether every chunk has been received."""
+        return len(self.chunks) == self.chunk_count
+
+    def chunk_length(self, index: int) -> int:
+        """Expected length of a chunk in bytes.
+
+        Args:
+            index: Chunk index
+
+        Returns:
+            Chunk size, or the remainder for the last chunk
+        """
+        return min(self.chunk_size, self.total_size - index * self.chunk_size)
+
+    def missing_chunks(self) -> List[int]:
+        """Indexes of the chunks not received yet.
+
+        Returns:
+            Sorted chunk indexes
+        """
+        return [index for index in range(self.chunk_count) if index not in self.chunks]
+
+    def to_dict(self) -> Dict:
+        """Convert the session to its manifest format.
+
+        Returns:
+            JSON-serializable dictionary
+        """
+        data = asdict(self)
+        data["chunks"] = {str(index): digest for index, digest in self.chunks.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "UploadSession":
+        """Create a session from its manifest format.
+
+        Args:
+            data: Dictionary from to_dict
+
+        Returns:
+            UploadSession instance
+        """
+        data = dict(data)
+        data["chunks"] = {
+            int(index): digest for index, digest in data["chunks"].items()
+        }
+        return cls(**data)
+
+
+class UploadSessionManager:
+    """Receives chunked uploads and commits them to the upload pipeline.
+
+    Sessions live in the "sessions" upload directory, one directory per
+    session holding the preallocated data file and the manifest. Chunks of
+    one session may be written from several threads at once; writes go to
+    disjoint offsets and only the manifest update is serialized.
+
+    Attributes:
+        processor: Upload pipeline that committed files are handed to
+        chunk_size: Default chunk size for new sessions
+        session_ttl: Seconds of inactivity before a session expires
+        max_size: Largest accepted upload in bytes
+    """
+
+    def __init__(
+        self,
+        processor: UploadProcessor,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        session_ttl: float = DEFAULT_SESSION_TTL,
+        max_size: int = MAX_FILE_SIZE,
+    ) -> None:
+        """Initialize the session manager.
+
+        Args:
+            processor: Upload pipeline that committed files are handed to
+            chunk_size: Default chunk size for new sessions
+            session_ttl: Seconds of inactivity before a session expires
+            max_size: Largest accepted upload in bytes
+
+        Raises:
+            ValueError: If a size or the TTL is not positive
+        """
+        if chunk_size < 1 or max_size < 1 or session_ttl <= 0:
+            raise ValueError("chunk_size, max_size and session_ttl must be positive")
+
+        self.processor = processor
+        self.chunk_size = chunk_size
+        self.session_ttl = session_ttl
+        self.max_size = max_size
+        self.sessions_dir = processor.directory_manager.get_path("sessions")
+        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        self._sessions: Dict[str, UploadSession] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def create_session(
+        self,
+        filename: str,
+        total_size: int,
+        chunk_size: Optional[int] = None,
+        checksum: Optional[str] = None,
+    ) -> UploadSession:
+        """Start an upload.
+
+        Args:
+            filename: Name of the uploaded file
+            total_size: Final file size in bytes
+            chunk_size: Chunk size, defaults to the manager's chunk size
+            checksum: Expected SHA-256 of the whole file, verified on commit
+
+        Returns:
+            The new session
+
+        Raises:
+            UploadSessionError: If the upload is invalid or space cannot be
+                allocated
+        """
+        name = Path(filename).name
+        if not name or name in (".", ".."):
+            raise UploadSessionError(f"Invalid filename: {filename!r}")
+        if not 0 < total_size <= self.max_size:
+            raise UploadSessionError(
+                f"Upload size must be between 1 and {self.max_size} bytes, "
+                f"got {total_size}"
+            )
+        chunk_size = chunk_size or self.chunk_size
+        if chunk_size < 1:
+            raise UploadSessionError("chunk_size must be positive")
+
+        session = UploadSession(
+            session_id=uuid4().hex,
+            filename=name,
+            total_size=total_size,
+            chunk_size=chunk_size,
+            checksum=checksum.lower() if checksum else None,
+        )
+        session.expires_at = session.created_at + self.session_ttl
+
+        session_dir = self._session_dir(session.session_id)
+        try:
+            session_dir.mkdir()
+            self._preallocate(session_dir / DATA_NAME, total_size)
+            self._write_manifest(session)
+        except OSError as e:
+            shutil.rmtree(session_dir, ignore_errors=True)
+            raise UploadSessionError(f"Failed to create upload session: {e}")
+
+        with self._lock:
+            self._sessions[session.session_id] = session
+        logger.info(
+            f"Created upload session {session.session_id} for {name} "
+            f"({total_size} bytes in {session.chunk_count} chunks)"
+        )
+        return session
+
+    def get_session(self, session_id: str) -> UploadSession:
+        """Get a session, loading it from its manifest if needed.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            The session
+
+        Raises:
+            UploadSessionError: If the session does not exist or has expired
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None:
+            session = self._load_session(session_id)
+
+        if session.expires_at < time.time():
+            self.abort(session_id)
+            raise UploadSessionError(f"Upload session expired: {session_id}")
+        return session
+
+    def put_chunk(
+        self,
+        session_id: str,
+        index: int,
+        data: bytes,
+        checksum: Optional[str] = None,
+    ) -> UploadSession:
+        """Write one chunk of an upload.
+
+        Resending a chunk that was already received is accepted, so clients
+        can retry any chunk whose acknowledgement was lost.
+
+        Args:
+            session_id: Session identifier
+            index: Chunk index
+            data: Chunk content
+            checksum: SHA-256 of the chunk as sent by the client
+
+        Returns:
+            The updated session
+
+        Raises:
+            UploadSessionError: If the chunk is invalid, corrupted in transit
+                or cannot be written
+        """
+        session = self.get_session(session_id)
+        if not 0 <= index < session.chunk_count:
+            raise UploadSessionError(
+                f"Chunk index {index} out of range 0-{session.chunk_count - 1}"
+            )
+        expected = session.chunk_length(index)
+        if len(data) != expected:
+            raise UploadSessionError(
+                f"Chunk {index} has {len(data)} bytes, expected {expected}"
+            )
+        digest = hashlib.sha256(data).hexdigest()
+        if checksum is not None and checksum.lower() != digest:
+            raise UploadSessionError(f"Chunk {index} checksum mismatch")
+        if session.chunks.get(index) == digest:
+            return session
+
+        try:
+            self._write_chunk(
+                self._session_dir(session_id) / DATA_NAME,
+                data,
+                index * session.chunk_size,
+            )
+            with self._session_lock(session_id):
+                session.chunks[index] = digest
+                session.expires_at = time.time() + self.session_ttl
+                self._write_manifest(session)
+        except OSError as e:
+            raise UploadSessionError(f"Failed to write chunk {index}: {e}")
+
+        logger.debug(
+            f"Session {session_id}: chunk {index} received "
+            f"({len(session.chunks)}/{session.chunk_count})"
+        )
+        return session
+
+    async def put_chunk_async(
+        self,
+        session_id: str,
+        index: int,
+        data: bytes,
+        checksum: Optional[str] = None,
+    ) -> UploadSession:
+        """Write one chunk without blocking the event loop.
+
+        Args:
+            session_id: Session identifier
+            index: Chunk index
+            data: Chunk content
+            checksum: SHA-256 of the chunk as sent by the client
+
+        Returns:
+            The updated session
+        """
+        return await asyncio.to_thread(
+            self.put_chunk, session_id, index, data, checksum
+        )
+
+    def commit(self, session_id: str, video_id: Optional[UUID] = None) -> Video:
+        """Finish an upload and process it.
+
+        The assembled file is passed to the upload pipeline, which validates,
+        quarantines or completes it. The session is removed either way.
+
+        Args:
+            session_id: Session identifier
+            video_id: Optional UUID for the video
+
+        Returns:
+            Video object from the upload pipeline
+
+        Raises:
+            UploadSessionError: If chunks are missing or the file does not
+                match the expected checksum
+            ProcessingError: If processing fails
+            SecurityError: If security validation fails
+            VideoIntegrityError: If video validation fails
+        """
+        session = self.get_session(session_id)
+        missing = session.missing_chunks()
+        if missing:
+            raise UploadSessionError(
+                f"Upload session {session_id} is missing {len(missing)} chunks"
+            )
+
+        session_dir = self._session_dir(session_id)
+        data_path = session_dir / DATA_NAME
+        content_hash = None
+        if session.checksum or self.processor.content_registry is not None:
+            engine = ChecksumEngine(algorithms=("sha256",))
+            content_hash = engine.compute(data_path)["sha256"]
+            if session.checksum and content_hash != session.checksum:
+                self.abort(session_id)
+                raise UploadSessionError(
+                    f"Upload {session.filename} does not match its checksum"
+                )
+
+        file_path = session_dir / session.filename
+        os.replace(data_path, file_path)
+        os.chmod(file_path, UPLOAD_FILE_MODE)
+        logger.info(f"Committing upload session {session_id} ({session.filename})")
+        try:
+            return self.processor.process_upload(
+                file_path, video_id, content_hash=content_hash
+            )
+        finally:
+            self.abort(session_id)
+
+    def abort(self, session_id: str) -> None:
+        """Remove a session and its data.
+
+        Args:
+            session_id: Session identifier
+        """
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._locks.pop(session_id, None)
+        if _SESSION_ID.match(session_id):
+            shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+
+    def cleanup_expired(self) -> int:
+        """Remove sessions that expired.
+
+        Session directories without a readable manifest are removed once
+        they are older than the session TTL.
+
+        Returns:
+            Number of sessions removed
+        """
+        now = time.time()
+        removed = 0
+        for session_dir in self.sessions_dir.iterdir():
+            if not session_dir.is_dir() or not _SESSION_ID.match(session_dir.name):
+                continue
+            try:
+                manifest = json.loads((session_dir / MANIFEST_NAME).read_text())
+                expires_at = manifest["expires_at"]
+            except (OSError, ValueError, KeyError):
+                try:
+                    expires_at = session_dir.stat().st_mtime + self.session_ttl
+                except OSError:
+                    continue
+            if expires_at < now:
+                self.abort(session_dir.name)
+                removed += 1
+
+        if removed:
+            logger.info(f"Removed {removed} expired upload sessions")
+        return removed
+
+    def _session_dir(self, session_id: str) -> Path:
+        """Directory of a session."""
+        return self.sessions_dir / session_id
+
+    def _session_lock(self, session_id: str) -> threading.Lock:
+        """Lock serializing manifest updates of a session."""
+        with self._lock:
+            return self._locks.setdefault(session_id, threading.Lock())
+
+    def _load_session(self, session_id: str) -> UploadSession:
+        """Load a session from its manifest.
+
+        Raises:
+            UploadSessionError: If the session does not exist
+        """
+        if not _SESSION_ID.match(session_id):
+            raise UploadSessionError(f"Upload session not found: {session_id}")
+        try:
+            manifest = self._session_dir(session_id) / MANIFEST_NAME
+            session = UploadSession.from_dict(json.loads(manifest.read_text()))
+        except (OSError, ValueError, KeyError, TypeError):
+            raise UploadSessionError(f"Upload session not found: {session_id}")
+
+        with self._lock:
+            session = self._sessions.setdefault(session_id, session)
+        logger.info(
+            f"Resumed upload session {session_id} "
+            f"({len(session.chunks)}/{session.chunk_count} chunks received)"
+        )
+        return session
+
+    def _write_manifest(self, session: UploadSession) -> None:
+        """Atomically replace the manifest of a session."""
+        manifest = self._session_dir(session.session_id) / MANIFEST_NAME
+        partial = manifest.with_suffix(".partial")
+        with open(partial, "w") as f:
+            json.dump(session.to_dict(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(partial, manifest)
+
+    @staticmethod
+    def _preallocate(path: Path, size: int) -> None:
+        """Create a file reserving its final size on disk."""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, UPLOAD_FILE_MODE)
+        try:
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except AttributeError:
+                os.ftruncate(fd, size)
+            except OSError as e:
+                # Filesystems without fallocate get a sparse file instead
+                if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS):
+                    raise
+                os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _write_chunk(path: Path, data: bytes, offset: int) -> None:
+        """Write a chunk at its offset and flush it to disk."""
+        fd = os.open(path, os.O_WRONLY)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(fd, view, offset)
+                view = view[written:]
+                offset += written
+            # The manifest may only record chunks that are on disk
+            if hasattr(os, "fdatasync"):
+                os.fdatasync(fd)
+            else:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -20,13 +20,20 @@ MAX_FILE_SIZE: Final[int] = 2 * 1024 * 1024 * 1024  # 2GB
 # Directory structure
 UPLOAD_SUBDIRS: Final[tuple[str, ...]] = (
     "temp",        # Temporary storage for uploads in progress
+    "sessions",    # Resumable chunked uploads in progress
     "processing",  # Storage for files being processed
     "completed",   # Storage for successfully processed files
     "failed",      # Storage for failed uploads and processing
     "quarantine",  # Storage for suspicious files
     "logs",        # Upload and processing logs
+    "leases",      # Leases of live jobs on upload files
 )
 
+# Subdirectories whose entries are spread over hex-prefix shard directories
+SHARDED_UPLOAD_SUBDIRS: Final[tuple[str, ...]] = ("completed", "failed", "quarantine")
+UPLOAD_SHARD_DEPTH: Final[int] = 2  # shard directory levels
+UPLOAD_SHARD_WIDTH: Final[int] = 2  # hex digits per level (fan-out 16**width)
+
 # File permissions
 UPLOAD_DIR_MODE: Final[int] = 0o750    # rwxr-x---
 UPLOAD_FILE_MODE: Final[int] = 0o640   # rw-r-----
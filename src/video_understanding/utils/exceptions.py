@@ -42,3 +42,8 @@ class ProcessingError(VideoUnderstandingError):
 class QuarantineError(VideoUnderstandingError):
     """Raised when quarantine operations fail."""
     pass
+
+
+class UploadSessionError(VideoUnderstandingError):
+    """Raised when a resumable upload session operation fails."""
+    pass
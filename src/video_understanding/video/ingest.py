@@ -0,0 +1,329 @@
+"""Streaming file ingest.
+
+Copies a video into storage without holding it in memory. The cheapest
+available method is used:
+
+1. A reflink (copy-on-write clone) or, if allowed, a hard link when source
+   and destination are on the same filesystem. No data is written, so
+   ingest takes the same time for any file size.
+2. ``os.copy_file_range`` or ``os.sendfile``, which copy inside the kernel,
+   when no checksum is requested.
+3. A chunked copy through one reusable buffer, which hashes the data as it
+   passes.
+
+Checksums of linked files are computed by reading the source once with the
+same bounded buffer. Memory use is constant in all cases. Files are written
+to a temporary name next to the destination and renamed into place, so a
+failed ingest never leaves a partial file under the destination name.
+"""
+
+import errno
+import hashlib
+import logging
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024  # 4MB
+
+# ioctl request that clones a file on Linux filesystems with copy-on-write
+# support (btrfs, XFS with reflink, OCFS2)
+FICLONE = 0x40049409
+
+# Errors meaning a copy method is not supported for this pair of files
+_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EPERM,
+    errno.EBADF,
+}
+
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class IngestResult:
+    """Outcome of an ingest.
+
+    Attributes:
+        path: Path of the ingested file
+        size: Size of the file in bytes
+        method: How the data got there: "reflink", "hardlink",
+            "copy_file_range", "sendfile", "chunked" or "existing" (source and
+            destination were already the same file)
+        checksum: Hex digest of the content, if requested
+        algorithm: Hash algorithm of the checksum
+        duration: Time taken in seconds
+    """
+
+    path: Path
+    size: int
+    method: str
+    checksum: str | None = None
+    algorithm: str | None = None
+    duration: float = 0.0
+
+
+def ingest_file(
+    source: str | Path,
+    destination: str | Path,
+    checksum_algorithm: str | None = "sha256",
+    allow_links: bool = True,
+    allow_hardlink: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress_callback: ProgressCallback | None = None,
+) -> IngestResult:
+    """Copy a file into place with constant memory.
+
+    Args:
+        source: File to ingest
+        destination: Target path; replaced if it exists
+        checksum_algorithm: hashlib algorithm for the content checksum, or
+            None to skip hashing
+        allow_links: Whether reflinks and hard links may be used
+        allow_hardlink: Whether a hard link may be used when a reflink is not
+            supported. A hard link shares the source's data, so later in-place
+            edits of the source also change the ingested file
+        chunk_size: Buffer size for chunked copies and hashing
+        progress_callback: Called with (bytes done, total bytes) as data is
+            copied or hashed
+
+    Returns:
+        IngestResult describing the ingest
+
+    Raises:
+        OSError: If the file cannot be read or written
+        ValueError: If the hash algorithm is unknown or chunk_size is invalid
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    hasher = hashlib.new(checksum_algorithm) if checksum_algorithm else None
+
+    started = time.perf_counter()
+    source = Path(source)
+    destination = Path(destination)
+    size = source.stat().st_size
+
+    if destination.exists() and os.path.samefile(source, destination):
+        method = "existing"
+        if hasher:
+            _hash_file(source, hasher, size, chunk_size, progress_callback)
+    else:
+        method, size = _ingest(
+            source, destination, size, hasher, allow_links, allow_hardlink,
+            chunk_size, progress_callback,
+        )
+
+    result = IngestResult(
+        path=destination,
+        size=size,
+        method=method,
+        checksum=hasher.hexdigest() if hasher else None,
+        algorithm=checksum_algorithm if hasher else None,
+        duration=time.perf_counter() - started,
+    )
+    logger.debug(
+        f"Ingested {source} -> {destination} ({size} bytes) by {method} "
+        f"in {result.duration:.3f}s"
+    )
+    return result
+
+
+def _ingest(
+    source: Path,
+    destination: Path,
+    size: int,
+    hasher,
+    allow_links: bool,
+    allow_hardlink: bool,
+    chunk_size: int,
+    progress_callback: ProgressCallback | None,
+) -> tuple[str, int]:
+    """Write the source to a temporary file and rename it into place.
+
+    Returns:
+        Tuple of (method, bytes ingested)
+    """
+    partial = destination.with_name(f".{destination.name}.{uuid4().hex[:8]}.partial")
+    try:
+        method = None
+        if allow_links and _same_filesystem(source, destination.parent):
+            method = _link(source, partial, allow_hardlink)
+        if method is not None:
+            if hasher:
+                _hash_file(source, hasher, size, chunk_size, progress_callback)
+            elif progress_callback:
+                progress_callback(size, size)
+        else:
+            method, size = _copy(
+                source, partial, size, hasher, chunk_size, progress_callback
+            )
+        os.replace(partial, destination)
+        return method, size
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+
+def _same_filesystem(source: Path, directory: Path) -> bool:
+    """Check whether a file and a directory are on the same device."""
+    try:
+        return source.stat().st_dev == directory.stat().st_dev
+    except OSError:
+        return False
+
+
+def _link(source: Path, target: Path, allow_hardlink: bool) -> str | None:
+    """Create the target as a reflink or hard link of the source.
+
+    Returns:
+        "reflink" or "hardlink", or None if neither is supported
+    """
+    if fcntl is not None:
+        try:
+            with open(source, "rb") as src, open(target, "xb") as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return "reflink"
+        except OSError as e:
+            target.unlink(missing_ok=True)
+            if e.errno not in _UNSUPPORTED:
+                raise
+
+    if allow_hardlink:
+        try:
+            os.link(source, target)
+            return "hardlink"
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED | {errno.EMLINK, errno.EACCES}:
+                raise
+    return None
+
+
+def _copy(
+    source: Path,
+    target: Path,
+    size: int,
+    hasher,
+    chunk_size: int,
+    progress_callback: ProgressCallback | None,
+) -> tuple[str, int]:
+    """Copy file data, in the kernel when no checksum is needed.
+
+    Returns:
+        Tuple of (method, bytes copied)
+    """
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        _advise_sequential(src)
+        if hasher is None:
+            for method, copy in _kernel_copies():
+                copied = _kernel_copy(copy, src.fileno(), dst.fileno(), size,
+                                      chunk_size, progress_callback)
+                if copied is not None:
+                    return method, copied
+
+        copied = 0
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while read := src.readinto(buffer):
+            if hasher:
+                hasher.update(view[:read])
+            dst.write(view[:read])
+            copied += read
+            if progress_callback:
+                progress_callback(copied, size)
+        return "chunked", copied
+
+
+def _kernel_copies() -> list[tuple[str, Callable[[int, int, int, int], int]]]:
+    """Available in-kernel copy functions taking (src, dst, offset, count)."""
+    copies = []
+    if hasattr(os, "copy_file_range"):
+        copies.append((
+            "copy_file_range",
+            lambda src, dst, offset, count: os.copy_file_range(
+                src, dst, count, offset, offset
+            ),
+        ))
+    if hasattr(os, "sendfile"):
+        copies.append((
+            "sendfile",
+            lambda src, dst, offset, count: os.sendfile(dst, src, offset, count),
+        ))
+    return copies
+
+
+def _kernel_copy(
+    copy: Callable[[int, int, int, int], int],
+    src: int,
+    dst: int,
+    size: int,
+    chunk_size: int,
+    progress_callback: ProgressCallback | None,
+) -> int | None:
+    """Copy with an in-kernel copy function.
+
+    Returns:
+        Bytes copied, or None if the function does not support these files
+        and nothing was copied
+    """
+    copied = 0
+    # Larger steps than the buffered copy; no user-space buffer is involved
+    step = max(chunk_size, 64 * 1024 * 1024)
+    while True:
+        try:
+            count = copy(src, dst, copied, step)
+        except OSError as e:
+            if copied == 0 and e.errno in _UNSUPPORTED:
+                return None
+            raise
+        if count == 0:
+            break
+        copied += count
+        if progress_callback:
+            progress_callback(copied, size)
+    # The function may report EOF instead of an error for unsupported files
+    if copied == 0 and size > 0:
+        return None
+    return copied
+
+
+def _hash_file(
+    path: Path,
+    hasher,
+    size: int,
+    chunk_size: int,
+    progress_callback: ProgressCallback | None,
+) -> None:
+    """Hash a file through one reusable buffer."""
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    done = 0
+    with open(path, "rb") as f:
+        _advise_sequential(f)
+        while read := f.readinto(buffer):
+            hasher.update(view[:read])
+            done += read
+            if progress_callback:
+                progress_callback(done, size)
+
+
+def _advise_sequential(f) -> None:
+    """Tell the kernel a file is read sequentially, where supported."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
@@ -5,10 +5,17 @@ import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Protocol
+from uuid import uuid4
 
 from video_understanding.core.config import VideoConfig
 from video_understanding.core.exceptions import FileValidationError
-from video_understanding.models.video import Video
+from video_understanding.models.video import Video, VideoFile, VideoProcessingInfo
+from video_understanding.video.ingest import (
+    DEFAULT_CHUNK_SIZE,
+    IngestResult,
+    ProgressCallback,
+    ingest_file,
+)
 
 
 class VideoUploader(Protocol):
@@ -24,12 +31,39 @@ class VideoUploader(Protocol):
 
 
 class LocalVideoUploader:
-    """Local filesystem video uploader implementation."""
+    """Local filesystem video uploader implementation.
 
-    def __init__(self, upload_dir: str = "uploads"):
-        """Initialize uploader with target directory."""
+    Files are streamed into the upload directory with constant memory (see
+    :func:`video_understanding.video.ingest.ingest_file`). On the same
+    filesystem they are reflinked or hard linked instead of copied.
+    """
+
+    def __init__(
+        self,
+        upload_dir: str = "uploads",
+        checksum_algorithm: str | None = "sha256",
+        allow_links: bool = True,
+        allow_hardlink: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """Initialize uploader with target directory.
+
+        Args:
+            upload_dir: Directory uploaded files are stored in
+            checksum_algorithm: hashlib algorithm for the stored checksum, or
+                None to skip hashing (makes linked ingests constant time)
+            allow_links: Whether files may be reflinked or hard linked
+            allow_hardlink: Whether a hard link may be used when the
+                filesystem cannot reflink
+            chunk_size: Buffer size for copies and hashing in bytes
+        """
         self.upload_dir = Path(upload_dir)
         self.upload_dir.mkdir(exist_ok=True)
+        self.checksum_algorithm = checksum_algorithm
+        self.allow_links = allow_links
+        self.allow_hardlink = allow_hardlink
+        self.chunk_size = chunk_size
+        self.last_ingest: IngestResult | None = None
 
     def validate(self, file_path: str) -> bool:
         """Validate video file exists and is accessible.
@@ -55,11 +89,15 @@ class LocalVideoUploader:
         except OSError as err:
             raise FileValidationError(str(err)) from err
 
-    def upload(self, file_path: str) -> Video:
+    def upload(
+        self, file_path: str, progress_callback: ProgressCallback | None = None
+    ) -> Video:
         """Upload video file to local storage.
 
         Args:
             file_path: Path to video file
+            progress_callback: Optional callback receiving (bytes done, total
+                bytes) during the copy
 
         Returns:
             Video: Uploaded video metadata
@@ -72,15 +110,30 @@ class LocalVideoUploader:
             source_path = Path(file_path)
             dest_path = self.upload_dir / source_path.name
 
-            # Copy file to upload directory
-            with open(source_path, "rb") as src, open(dest_path, "wb") as dst:
-                dst.write(src.read())
+            # Stream file to upload directory, hashing it on the way
+            result = ingest_file(
+                source_path,
+                dest_path,
+                checksum_algorithm=self.checksum_algorithm,
+                allow_links=self.allow_links,
+                allow_hardlink=self.allow_hardlink,
+                chunk_size=self.chunk_size,
+                progress_callback=progress_callback,
+            )
+            self.last_ingest = result
 
             return Video(
-                file_path=str(dest_path),
-                original_filename=source_path.name,
+                id=uuid4(),
+                file_info=VideoFile(
+                    filename=source_path.name,
+                    file_path=dest_path,
+                    format=source_path.suffix[1:].upper(),
+                    file_size=result.size,
+                    checksum=result.checksum,
+                ),
+                processing=VideoProcessingInfo(),
             )
-        except OSError as err:
+        except (OSError, ValueError) as err:
             raise FileValidationError(str(err)) from err
 
 
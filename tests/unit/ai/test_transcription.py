@@ -0,0 +1,265 @@
+"""Tests for chunked parallel transcription."""
+
+import asyncio
+import wave
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from video_understanding.ai.exceptions.whisper import TranscriptionError
+from video_understanding.ai.transcription import service as service_module
+from video_understanding.ai.transcription.audio import (
+    AudioChunk,
+    AudioChunker,
+    EnergyVAD,
+    SpeechDetector,
+    compact_speech,
+)
+from video_understanding.ai.transcription.service import (
+    TranscriptionService,
+    merge_segments,
+)
+
+RATE = 1000
+
+
+def _tone(seconds, amplitude=0.5):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 50 * t)).astype(np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+def _chunker(**kwargs):
+    vad = EnergyVAD(sample_rate=RATE, frame_ms=20, min_silence_ms=200)
+    return AudioChunker(sample_rate=RATE, vad=vad, **kwargs)
+
+
+def _chunks(chunker, audio, block_seconds=1.0):
+    block = int(block_seconds * RATE)
+    chunks = []
+    for offset in range(0, len(audio), block):
+        chunks.extend(chunker.feed(audio[offset:offset + block]))
+    last = chunker.flush()
+    return chunks + ([last] if last else [])
+
+
+def test_vad_finds_pauses():
+    """Test that pauses are found and short gaps ignored."""
+    vad = EnergyVAD(sample_rate=RATE, frame_ms=20, min_silence_ms=200)
+    audio = np.concatenate([_tone(1), _silence(0.5), _tone(1), _silence(0.1), _tone(1)])
+
+    assert vad.silences(audio) == [(1000, 1500)]
+
+
+def test_chunks_cut_in_middle_of_pause():
+    """Test that chunks end in the middle of the longest suitable pause."""
+    audio = np.concatenate(
+        [
+            _tone(3),
+            _silence(0.4),
+            _tone(2),
+            _silence(1.0),
+            _tone(3),
+            _silence(0.4),
+            _tone(1),
+        ]
+    )
+
+    chunks = _chunks(_chunker(max_chunk_seconds=8, min_chunk_seconds=2), audio)
+
+    assert [chunk.start for chunk in chunks] == [0.0, 5.9]
+    assert all(chunk.overlap == 0 for chunk in chunks)
+    assert sum(len(chunk.samples) for chunk in chunks) == len(audio)
+
+
+def test_chunks_without_pause_overlap():
+    """Test hard cuts at the maximum length repeat the overlap."""
+    chunks = _chunks(_chunker(max_chunk_seconds=4, overlap_seconds=1), _tone(10))
+
+    assert [(c.start, c.duration, c.overlap) for c in chunks] == [
+        (0.0, 4.0, 0.0),
+        (3.0, 4.0, 1.0),
+        (6.0, 4.0, 1.0),
+    ]
+
+
+def test_merge_clips_overlap_and_drops_repeated_words():
+    """Test that words heard by both chunks are kept once."""
+    first = AudioChunk(0, 0.0, np.zeros(0), RATE)
+    second = AudioChunk(1, 9.0, np.zeros(0), RATE, overlap=1.0)
+
+    def words(*timed):
+        return [{"word": w, "start": s, "end": s + 0.3} for w, s in timed]
+
+    merged = merge_segments([
+        (second, {"segments": [
+            {"start": 0.6, "end": 2.0, "text": "the lazy dog",
+             "words": words(("the", 0.6), ("lazy", 0.8), ("dog", 1.5))},
+        ]}),
+        (first, {"segments": [
+            {"start": 0.0, "end": 3.0, "text": "A quick fox.", "words": []},
+            {"start": 8.0, "end": 9.8, "text": "jumps over the",
+             "words": words(("jumps", 8.0), ("over", 8.8), ("the", 9.2), ("end", 9.7))},
+        ]}),
+    ])
+
+    assert [s["text"] for s in merged] == ["A quick fox.", "jumps over the", "lazy dog"]
+    assert merged[2]["start"] == pytest.approx(9.8)
+
+
+class _FakeModel:
+    """Transcription model stand-in tracking concurrent calls."""
+
+    MAX_AUDIO_LENGTH = 4
+
+    def __init__(self, fail_on=None):
+        self.active = 0
+        self.peak = 0
+        self.fail_on = fail_on
+        self.calls = 0
+
+    async def process(self, input_data):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise RuntimeError("model failed")
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        text = Path(input_data["audio_path"]).stem
+        return {
+            "data": {
+                "segments": [{"start": 0.5, "end": 1.0, "text": text}],
+                "language": "en",
+            }
+        }
+
+
+def _service(model, **kwargs):
+    vad = EnergyVAD(sample_rate=RATE, frame_ms=20, min_silence_ms=200)
+    kwargs.setdefault("skip_non_speech", False)
+    return TranscriptionService(model, max_chunk_seconds=10, overlap_seconds=0.5,
+                                sample_rate=RATE, vad=vad, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_chunks_transcribed_concurrently_within_limit(tmp_path):
+    """Test bounded concurrency and segment times on the video timeline."""
+    model = _FakeModel()
+    service = _service(model, concurrency=2)
+    blocks = [_tone(1) for _ in range(14)]
+
+    with patch.object(service_module, "iter_audio", return_value=(b for b in blocks)):
+        result = await service.transcribe(tmp_path / "video.mp4")
+
+    assert service.max_chunk_seconds == 4
+    assert result["chunks"] == 4
+    assert result["duration"] == 14
+    assert model.peak == 2
+    assert [s["start"] for s in result["segments"]] == [0.5, 4.0, 7.5, 11.0]
+
+
+@pytest.mark.asyncio
+async def test_chunk_failure_raises_transcription_error(tmp_path):
+    """Test that a failing chunk cancels the transcription."""
+    service = _service(_FakeModel(fail_on=2), concurrency=1)
+
+    with patch.object(
+        service_module, "iter_audio", return_value=(b for b in [_tone(12)])
+    ):
+        with pytest.raises(TranscriptionError, match="chunk 1"):
+            await service.transcribe(tmp_path / "video.mp4")
+
+
+SPEECH_RATE = 16000
+
+
+def _voiced(seconds):
+    """Tonal sound with its energy in the speech band."""
+    t = np.arange(int(seconds * SPEECH_RATE)) / SPEECH_RATE
+    harmonics = sum(np.sin(2 * np.pi * f * t) for f in (500, 1000, 1500))
+    return (0.05 * harmonics).astype(np.float32)
+
+
+def _noise(seconds, amplitude=0.05):
+    rng = np.random.default_rng(0)
+    noise = amplitude * rng.standard_normal(int(seconds * SPEECH_RATE))
+    return noise.astype(np.float32)
+
+
+def _hum(seconds):
+    t = np.arange(int(seconds * SPEECH_RATE)) / SPEECH_RATE
+    return (0.2 * np.sin(2 * np.pi * 60 * t)).astype(np.float32)
+
+
+def test_speech_detector_rejects_noise_and_hum():
+    """Test that only in-band tonal sound is reported as speech."""
+    detector = SpeechDetector(padding_ms=0)
+    audio = np.concatenate([
+        _noise(2, 0.001), _voiced(3), _noise(3), _hum(3), _voiced(1), _noise(2, 0.001),
+    ])
+
+    intervals = [(start / SPEECH_RATE, end / SPEECH_RATE)
+                 for start, end in detector.speech_intervals(audio)]
+
+    assert len(intervals) == 2
+    assert intervals[0] == pytest.approx((2.0, 5.0), abs=0.05)
+    assert intervals[1] == pytest.approx((11.0, 12.0), abs=0.05)
+
+
+def test_compacted_times_map_to_original_timeline():
+    """Test the timeline map of compacted speech."""
+    samples = np.arange(10 * RATE, dtype=np.float32)
+    compacted, timeline = compact_speech(
+        samples, [(2000, 4000), (7000, 8000)], RATE, gap_seconds=0.5
+    )
+
+    assert len(compacted) == 3500
+    assert compacted[2500] == 7000
+    assert timeline.speech_duration == 3.0
+    assert timeline.to_original(0.5) == 2.5
+    assert timeline.to_original(2.1) == 4.0  # First half of the pause
+    assert timeline.to_original(2.4) == 7.0  # Second half of the pause
+    assert timeline.to_original(3.0) == 7.5
+
+
+@pytest.mark.asyncio
+async def test_only_speech_sent_to_model(tmp_path):
+    """Test that non-speech is skipped and times are remapped."""
+    sent = []
+
+    class Model:
+        async def process(self, input_data):
+            with wave.open(input_data["audio_path"]) as audio:
+                sent.append(audio.getnframes() / audio.getframerate())
+            return {"data": {"segments": [{"start": 0.1, "end": 2.5, "text": "hello"}]}}
+
+    service = TranscriptionService(
+        Model(), max_chunk_seconds=20, speech_detector=SpeechDetector(padding_ms=0)
+    )
+    audio = [
+        _noise(25, 0.001),
+        _hum(5),
+        _noise(5, 0.001),
+        _voiced(2),
+        _noise(1, 0.001),
+        _voiced(1),
+    ]
+
+    with patch.object(
+        service_module, "iter_audio", return_value=(block for block in audio)
+    ):
+        result = await service.transcribe(tmp_path / "video.mp4")
+
+    assert result["duration"] == 39
+    assert result["chunks"] == 3
+    assert result["speech_duration"] == pytest.approx(3.0, abs=0.1)
+    assert sent == [pytest.approx(3.3, abs=0.1)]
+    segment = result["segments"][0]
+    assert segment["start"] == pytest.approx(35.1, abs=0.05)
+    assert segment["end"] == pytest.approx(38.2, abs=0.05)
@@ -0,0 +1,123 @@
+"""Tests for parallel frame export."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from video_understanding.core import frame_export as export_module
+from video_understanding.core.exceptions import ProcessingError
+from video_understanding.core.frame_export import FrameWriter
+
+
+@pytest.fixture
+def fake_cv2():
+    """Patch cv2 in the export module with recording fakes."""
+    with patch.object(export_module, "cv2") as mock_cv2:
+        writes = []
+
+        def imwrite(path, frame, params):
+            # Later frames finish first to exercise ordering
+            time.sleep(0.01 * (3 - int(frame[0, 0, 0]) % 3))
+            writes.append((path, frame.shape, list(params)))
+            with open(path, "wb") as f:
+                f.write(frame.tobytes())
+            return True
+
+        def resize(frame, size, interpolation=None):
+            width, height = size
+            return np.zeros((height, width, frame.shape[2]), dtype=frame.dtype)
+
+        mock_cv2.imwrite.side_effect = imwrite
+        mock_cv2.resize.side_effect = resize
+        mock_cv2.writes = writes
+        yield mock_cv2
+
+
+def _frame(value, height=90, width=160):
+    return np.full((height, width, 3), value, dtype=np.uint8)
+
+
+def test_writer_returns_paths_in_order(fake_cv2, tmp_path):
+    """Test that frames are written in parallel and paths keep frame order."""
+    with FrameWriter(tmp_path, image_format="webp", quality=70, workers=3) as writer:
+        for index in range(6):
+            writer.write(_frame(index), index * 30)
+
+    assert writer.paths == [tmp_path / f"frame_{i * 30:06d}.webp" for i in range(6)]
+    assert all(path.exists() for path in writer.paths)
+    assert fake_cv2.writes[0][2] == [fake_cv2.IMWRITE_WEBP_QUALITY, 70]
+
+
+def test_writer_downscales_to_max_size(fake_cv2, tmp_path):
+    """Test that frames are downscaled keeping their aspect ratio."""
+    with FrameWriter(tmp_path, max_size=(80, 80)) as writer:
+        writer.write(_frame(0), 0)
+        writer.write(_frame(1, height=40, width=60), 1)
+
+    shapes = sorted(shape for _, shape, _ in fake_cv2.writes)
+    assert shapes == [(40, 60, 3), (45, 80, 3)]
+
+
+def test_writer_bounds_queued_frames(fake_cv2, tmp_path):
+    """Test that write() blocks once queue_size frames are waiting."""
+    release = threading.Event()
+    fake_cv2.imwrite.side_effect = lambda path, frame, params: release.wait(5)
+    writer = FrameWriter(tmp_path, workers=1, queue_size=2)
+    writer.write(_frame(0), 0)
+    writer.write(_frame(1), 1)
+
+    blocked = threading.Thread(target=writer.write, args=(_frame(2), 2))
+    blocked.start()
+    blocked.join(0.1)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join(5)
+    assert len(writer.close()) == 3
+
+
+def test_writer_reports_encode_failures(fake_cv2, tmp_path):
+    """Test that a failed encode surfaces as ProcessingError."""
+    fake_cv2.imwrite.side_effect = lambda path, frame, params: False
+    writer = FrameWriter(tmp_path)
+    writer.write(_frame(0), 0)
+
+    with pytest.raises(ProcessingError):
+        writer.close()
+
+
+def test_writer_close_failure_keeps_original_error(fake_cv2, tmp_path):
+    """Test that an error inside the with block is not replaced on close."""
+    fake_cv2.imwrite.side_effect = lambda path, frame, params: False
+
+    with pytest.raises(RuntimeError, match="decode failed"):
+        with FrameWriter(tmp_path) as writer:
+            writer.write(_frame(0), 0)
+            raise RuntimeError("decode failed")
+
+    with pytest.raises(ProcessingError):
+        with FrameWriter(tmp_path) as writer:
+            writer.write(_frame(0), 0)
+
+
+def test_writer_npy_stack(tmp_path):
+    """Test that the npy format writes one loadable stack in frame order."""
+    with FrameWriter(tmp_path, image_format="npy") as writer:
+        for index in range(4):
+            writer.write(_frame(index, height=4, width=5), index)
+
+    assert writer.paths == [tmp_path / "frames.npy"]
+    stack = np.load(writer.paths[0])
+    assert stack.shape == (4, 4, 5, 3)
+    assert stack[:, 0, 0, 0].tolist() == [0, 1, 2, 3]
+
+
+def test_writer_rejects_invalid_options(tmp_path):
+    """Test option validation."""
+    with pytest.raises(ValueError):
+        FrameWriter(tmp_path, image_format="gif")
+    with pytest.raises(ValueError):
+        FrameWriter(tmp_path, quality=0)
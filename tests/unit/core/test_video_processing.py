@@ -0,0 +1,142 @@
+"""Tests for the streaming video processing pipeline."""
+
+import asyncio
+import importlib
+import time
+import types
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from video_understanding.core.metrics import MetricsTracker
+from video_understanding.core.processing.video import VideoProcessor
+
+# Imported by full name: the package root does not load this module
+video_module = importlib.import_module("video_understanding.core.processing.video")
+
+
+class _FakeCapture:
+    """VideoCapture stand-in counting frames that were retrieved."""
+
+    def __init__(self, frame_total, fps=10.0):
+        self.frame_total = frame_total
+        self.fps = fps
+        self.position = 0
+        self.retrieved = 0
+        self.released = False
+
+    def isOpened(self):
+        return True
+
+    def get(self, prop):
+        return self.fps
+
+    def grab(self):
+        if self.position >= self.frame_total:
+            return False
+        self.position += 1
+        return True
+
+    def retrieve(self):
+        self.retrieved += 1
+        return True, np.full((4, 4, 3), self.position - 1, dtype=np.uint8)
+
+    def release(self):
+        self.released = True
+
+
+@pytest.fixture
+def capture():
+    """Patch the video module's cv2 with a fake 35-frame capture."""
+    fake = _FakeCapture(35)
+    with patch.object(video_module, "cv2") as mock_cv2:
+        mock_cv2.VideoCapture.return_value = fake
+        mock_cv2.cvtColor.side_effect = lambda frame, code: frame
+        yield fake
+
+
+def test_extract_frames_streams_sampled_frames(capture):
+    """Test that frames are decoded lazily and only sampled frames retrieved."""
+    processor = VideoProcessor(metrics_tracker=MagicMock())
+
+    frames = processor.extract_frames("video.mp4", {"frame_interval": 1})
+    assert isinstance(frames, types.GeneratorType)
+    assert capture.position == 0
+
+    decoded = list(frames)
+    assert [(f.index, f.timestamp) for f in decoded] == [
+        (0, 0.0), (10, 1.0), (20, 2.0), (30, 3.0)
+    ]
+    assert capture.retrieved == 4
+    assert int(decoded[1].image[0, 0, 0]) == 10
+
+
+def test_stage_metrics_exclude_consumer_time(capture):
+    """Test that stage timings stop while the consumer holds a frame."""
+    tracker = MetricsTracker()
+    processor = VideoProcessor(metrics_tracker=tracker)
+
+    frames = processor.extract_frames("video.mp4")
+    texts = processor.iter_text(frames)
+    next(texts)
+    time.sleep(0.05)
+    texts.close()
+    frames.close()
+
+    # Closing early releases the capture and records both stages
+    assert capture.released
+    for metric in ("frame_extraction_time", "text_detection_time"):
+        [measurement] = tracker.measurements[metric]
+        assert measurement.value < 0.05
+        assert measurement.context == {"error": None}
+
+
+def test_process_video_returns_frame_references(capture, tmp_path):
+    """Test that results reference frames by index instead of holding them."""
+    video_file = tmp_path / "video.mp4"
+    video_file.write_bytes(b"\0")
+    processor = VideoProcessor(metrics_tracker=MagicMock())
+    processor.metrics_tracker.get_active_count.return_value = 0
+
+    with patch.object(processor, "check_resources", return_value=True):
+        results = processor.process_video(str(video_file))
+
+    assert results["frames"] == [
+        {"index": i, "timestamp": i / 10} for i in (0, 10, 20, 30)
+    ]
+    assert [r["frame_index"] for r in results["text_results"]] == [0, 10, 20, 30]
+    assert not any(
+        isinstance(value, np.ndarray)
+        for frame in results["frames"]
+        for value in frame.values()
+    )
+
+
+class _FakeTranscriber:
+    """Transcription service stand-in."""
+
+    async def transcribe(self, video_path):
+        await asyncio.sleep(0)
+        return {
+            "text": "hello there",
+            "segments": [
+                {"text": "hello", "confidence": 0.8, "speaker": "A"},
+                {"text": "there", "confidence": 0.6},
+            ],
+        }
+
+
+@pytest.mark.asyncio
+async def test_transcription_inside_a_running_event_loop():
+    """Test both transcription entry points from async code."""
+    processor = VideoProcessor(
+        metrics_tracker=MagicMock(), transcriber=_FakeTranscriber()
+    )
+
+    result = await processor.transcribe_audio_async("video.mp4")
+    assert result["speakers"] == ["A"]
+    assert result["confidence"] == pytest.approx(0.7)
+
+    # The sync method runs the transcriber on a worker thread's loop
+    assert processor.transcribe_audio("video.mp4") == result
@@ -0,0 +1,158 @@
+"""Tests for bounded-concurrency batch uploads."""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from video_understanding.core.upload import batch as batch_module
+from video_understanding.core.upload.batch import BatchExecutor, analyze_video
+from video_understanding.core.upload.config import UploadConfig
+from video_understanding.core.upload.ocr import OCRProcessor
+from video_understanding.core.upload.processor import VideoUploader
+from video_understanding.core.upload.scene import SceneDetector
+
+
+class FakeUploader:
+    """Uploader that takes a per-file time and records concurrency."""
+
+    def __init__(self, delays):
+        self.config = UploadConfig()
+        self.analysis_pool = None
+        self.delays = delays
+        self.running = 0
+        self.peak = 0
+        self.started = 0
+
+    async def process_upload(self, file_path):
+        self.started += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delays[file_path.name])
+            if file_path.name.startswith("bad"):
+                raise ValueError(f"cannot process {file_path.name}")
+            return {"name": file_path.name}
+        finally:
+            self.running -= 1
+
+
+@pytest.mark.asyncio
+async def test_results_stream_in_completion_order():
+    """Test bounded concurrency and completion-ordered results."""
+    uploader = FakeUploader(
+        {"a.mp4": 0.06, "b.mp4": 0.01, "c.mp4": 0.03, "d.mp4": 0.01}
+    )
+    executor = BatchExecutor(uploader, max_concurrency=2)
+
+    names = [
+        r.file_path.name async for r in executor.stream(map(Path, uploader.delays))
+    ]
+
+    assert names == ["b.mp4", "c.mp4", "d.mp4", "a.mp4"]
+    assert uploader.peak == 2
+    # The analysis process pool is opt-in
+    assert executor.analysis_workers == 0
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_applies_backpressure():
+    """Test that paths are only read a bounded distance ahead."""
+    uploader = FakeUploader({f"{i}.mp4": 0.001 for i in range(50)})
+    executor = BatchExecutor(uploader, max_concurrency=2, queue_size=3)
+    ahead = []
+
+    async def paths():
+        for i in range(50):
+            ahead.append(i - uploader.started)
+            yield Path(f"{i}.mp4")
+
+    results = await executor.run(paths())
+
+    assert [r.index for r in results] == list(range(50))
+    assert max(ahead) <= 3 + 2 + 1
+
+
+@pytest.mark.asyncio
+async def test_failures_are_reported_per_file():
+    """Test that one failed upload does not stop the batch."""
+    uploader = FakeUploader({"ok.mp4": 0.0, "bad.mp4": 0.0})
+    executor = BatchExecutor(uploader, max_concurrency=2)
+
+    ok, bad = await executor.run([Path("ok.mp4"), Path("bad.mp4")])
+
+    assert ok.ok and ok.result == {"name": "ok.mp4"}
+    assert not bad.ok and isinstance(bad.error, ValueError)
+
+
+def test_worker_analyzes_with_its_own_analyzers(tmp_path):
+    """Test the analysis function run in worker processes."""
+    scenes = [{"start_time": 0.0, "end_time": 2.0}]
+    with (
+        patch.object(SceneDetector, "detect", AsyncMock(return_value=scenes)),
+        patch.object(OCRProcessor, "process", AsyncMock(return_value=[])),
+    ):
+        batch_module._init_worker(UploadConfig(scene_decode_profile="fast"))
+        assert batch_module._worker_detector.decode_profile == "fast"
+
+        assert analyze_video(tmp_path / "video.mp4") == (scenes, [])
+
+
+def test_worker_frame_caches_share_the_size_cap(tmp_path):
+    """Test that detectors of different workers account one cache together."""
+    config = UploadConfig(
+        frame_cache_dir=tmp_path / "cache", frame_cache_max_bytes=10**6
+    )
+    first = batch_module.create_scene_detector(config).frame_cache
+    second = batch_module.create_scene_detector(config).frame_cache
+    try:
+        first.put_result("video", -1, "scenes", "1", None, {"diffs": [0.5] * 100})
+        first.flush()
+        assert second.total_bytes == first.total_bytes > 0
+    finally:
+        first.close()
+        second.close()
+
+
+class BlockingDetector:
+    """Scene detector that decodes synchronously, like the real one."""
+
+    def __init__(self):
+        self.both_running = threading.Barrier(2, timeout=5)
+
+    async def detect(self, file_path):
+        # Passes only once both uploads are analyzing at the same time
+        self.both_running.wait()
+        time.sleep(0.05)
+        return [{"file": file_path.name}]
+
+
+@pytest.mark.asyncio
+async def test_analysis_without_pool_runs_off_the_loop():
+    """Test that default analysis overlaps and leaves the loop responsive."""
+    uploader = SimpleNamespace(
+        analysis_pool=None,
+        scene_detector=BlockingDetector(),
+        ocr_processor=SimpleNamespace(process=AsyncMock(return_value=[])),
+    )
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticker = asyncio.create_task(tick())
+    results = await asyncio.gather(
+        VideoUploader._analyze(uploader, Path("a.mp4")),
+        VideoUploader._analyze(uploader, Path("b.mp4")),
+    )
+    ticker.cancel()
+
+    assert results == [([{"file": "a.mp4"}], []), ([{"file": "b.mp4"}], [])]
+    assert ticks > 5
@@ -0,0 +1,120 @@
+"""Tests for content-hash upload deduplication."""
+
+import hashlib
+import os
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from video_understanding.core.upload.content_registry import ContentRegistry
+from video_understanding.core.upload.processor import UploadProcessor
+from video_understanding.models.video import ProcessingStatus, VideoMetadata
+
+CONTENT = os.urandom(50_000)
+METADATA = VideoMetadata(
+    duration=10.0, width=640, height=480, fps=30.0, codec="h264", total_frames=300
+)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """Registry in a temporary database."""
+    with ContentRegistry(tmp_path / "registry.sqlite") as registry:
+        yield registry
+
+
+@pytest.fixture
+def processor(tmp_path, registry):
+    """Upload processor with validation stubbed out."""
+    processor = UploadProcessor(tmp_path / "uploads", content_registry=registry)
+    processor.directory_manager.initialize_directories()
+    with patch.object(processor, "_validate_security") as security, patch.object(
+        processor, "_validate_integrity", return_value=METADATA
+    ) as integrity:
+        processor.validators = (security, integrity)
+        yield processor
+
+
+def upload(tmp_path, name):
+    """Write an uploaded copy of the test content."""
+    path = tmp_path / name
+    path.write_bytes(CONTENT)
+    return path
+
+
+def test_reference_counting(tmp_path, registry):
+    """Test that entries live until the last reference is released."""
+    content_hash = registry.hash_file(upload(tmp_path, "a.mp4"))
+    assert content_hash == hashlib.sha256(CONTENT).hexdigest()
+
+    first, second = uuid4(), uuid4()
+    entry = registry.register(
+        content_hash, first, tmp_path / "a.mp4", {"scenes": [1, 2]}
+    )
+    assert entry.ref_count == 1
+    assert registry.add_reference(content_hash, second).ref_count == 2
+
+    found = registry.lookup(content_hash)
+    assert found.video_id == first
+    assert found.results == {"scenes": [1, 2]}
+    assert registry.lookup("0" * 64) is None
+    assert registry.stats.to_dict() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+    assert registry.release(first) is None
+    released = registry.release(second)
+    assert released.file_path == tmp_path / "a.mp4"
+    assert registry.lookup(content_hash) is None
+
+
+def test_concurrent_register_keeps_first_entry(registry):
+    """Test that a second registration references the existing entry."""
+    first, second = uuid4(), uuid4()
+    registry.register("abc", first, None, {"n": 1})
+
+    entry = registry.register("abc", second, None, {"n": 2})
+
+    assert entry.video_id == first
+    assert entry.results == {"n": 1}
+    assert set(registry.references("abc")) == {first, second}
+
+
+def test_duplicate_upload_short_circuits(tmp_path, processor, registry):
+    """Test that a duplicate upload reuses the first upload's artifact."""
+    original = processor.process_upload(upload(tmp_path, "a.mp4"))
+    assert original.file_info.file_path.exists()
+
+    duplicate_path = upload(tmp_path, "b.mp4")
+    duplicate = processor.process_upload(duplicate_path)
+
+    for validator in processor.validators:
+        assert validator.call_count == 1
+    assert duplicate.processing.status == ProcessingStatus.COMPLETED
+    assert duplicate.file_info.file_path == original.file_info.file_path
+    assert duplicate.metadata == METADATA
+    assert not duplicate_path.exists()
+    assert registry.lookup(duplicate.file_info.checksum).ref_count == 2
+
+
+def test_release_deletes_artifact_with_last_reference(tmp_path, processor):
+    """Test that the shared artifact outlives all but the last reference."""
+    original = processor.process_upload(upload(tmp_path, "a.mp4"))
+    duplicate = processor.process_upload(upload(tmp_path, "b.mp4"))
+    artifact = original.file_info.file_path
+
+    assert processor.release_video(original.id) is False
+    assert artifact.exists()
+    assert processor.release_video(duplicate.id) is True
+    assert not artifact.exists()
+
+
+def test_missing_artifact_is_processed_again(tmp_path, processor):
+    """Test that an entry whose artifact was deleted is not reused."""
+    original = processor.process_upload(upload(tmp_path, "a.mp4"))
+    original.file_info.file_path.unlink()
+
+    again = processor.process_upload(upload(tmp_path, "b.mp4"))
+
+    assert processor.validators[0].call_count == 2
+    assert again.file_info.file_path.exists()
+    assert again.file_info.file_path != original.file_info.file_path
@@ -0,0 +1,211 @@
+"""Tests for frame decoding backends."""
+
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from video_understanding.core import decoder as decoder_module
+from video_understanding.core.decoder import FrameDecoder, PrefetchFrameReader
+from video_understanding.core.exceptions import VideoProcessingError
+
+
+@pytest.fixture
+def h264_video(tmp_path: Path) -> Path:
+    """Create a 3 second, 30 fps H.264 video with a keyframe every 15 frames."""
+    av = pytest.importorskip("av")
+    path = tmp_path / "gop.mp4"
+    container = av.open(str(path), "w")
+    stream = container.add_stream("libx264", rate=30)
+    stream.width = 64
+    stream.height = 48
+    stream.pix_fmt = "yuv420p"
+    stream.options = {"g": "15", "keyint_min": "15", "sc_threshold": "0"}
+    for i in range(90):
+        image = np.full((48, 64, 3), (i * 2) % 255, dtype=np.uint8)
+        frame = av.VideoFrame.from_ndarray(image, format="bgr24")
+        for packet in stream.encode(frame):
+            container.mux(packet)
+    for packet in stream.encode():
+        container.mux(packet)
+    container.close()
+    return path
+
+
+def _mock_capture(frame_count: int, fps: float = 30.0) -> MagicMock:
+    """Create a VideoCapture mock yielding frame_count frames."""
+    cap = MagicMock()
+    cap.isOpened.return_value = True
+    cap.get.return_value = fps
+    cap.grab.side_effect = [True] * frame_count + [False]
+    cap.retrieve.return_value = (True, np.zeros((4, 4, 3), dtype=np.uint8))
+    return cap
+
+
+def test_invalid_profile():
+    """Test that unknown profiles are rejected."""
+    with pytest.raises(ValueError):
+        FrameDecoder("video.mp4", profile="turbo")
+
+
+def test_pyav_keyframes_only(h264_video):
+    """Test that the fast profile yields only keyframes with exact timestamps."""
+    frames = list(FrameDecoder(h264_video, profile="fast", backend="pyav"))
+
+    assert [f.index for f in frames] == [0, 15, 30, 45, 60, 75]
+    assert [f.timestamp for f in frames] == pytest.approx([0, 0.5, 1, 1.5, 2, 2.5])
+    assert all(f.keyframe for f in frames)
+    assert frames[0].image.shape == (48, 64, 3)
+
+
+def test_pyav_full_profile(h264_video):
+    """Test that the full profile yields every frame."""
+    frames = list(FrameDecoder(h264_video, backend="pyav"))
+
+    assert len(frames) == 90
+    assert [f.index for f in frames] == list(range(90))
+
+
+def test_pyav_read_at(h264_video):
+    """Test seeking to the nearest keyframe or the exact frame."""
+    keyframe = FrameDecoder(h264_video, profile="fast", backend="pyav").read_at(1.7)
+    exact = FrameDecoder(h264_video, backend="pyav").read_at(1.7)
+
+    assert keyframe.index == 45
+    assert keyframe.keyframe
+    assert exact.index == 51
+
+
+def test_pyav_open_failure(tmp_path):
+    """Test that undecodable files raise VideoProcessingError."""
+    pytest.importorskip("av")
+    bad_file = tmp_path / "bad.mp4"
+    bad_file.write_bytes(b"not a video")
+
+    with pytest.raises(VideoProcessingError):
+        list(FrameDecoder(bad_file, backend="pyav"))
+
+
+def test_opencv_fast_profile_samples_interval():
+    """Test that the OpenCV fallback samples one frame per interval."""
+    cap = _mock_capture(frame_count=75)
+    with patch.object(decoder_module, "cv2") as mock_cv2:
+        mock_cv2.VideoCapture.return_value = cap
+        frames = list(FrameDecoder("video.mp4", profile="fast", backend="opencv"))
+
+    assert [f.index for f in frames] == [0, 30, 60]
+    assert [f.timestamp for f in frames] == [0.0, 1.0, 2.0]
+    assert cap.grab.call_count == 76
+    assert cap.retrieve.call_count == 3
+    cap.release.assert_called_once()
+
+
+def test_opencv_open_failure():
+    """Test that unopenable files raise VideoProcessingError."""
+    cap = MagicMock()
+    cap.isOpened.return_value = False
+    with patch.object(decoder_module, "cv2") as mock_cv2:
+        mock_cv2.VideoCapture.return_value = cap
+        with pytest.raises(VideoProcessingError):
+            list(FrameDecoder("video.mp4", backend="opencv"))
+
+
+class _FakeCapture:
+    """VideoCapture stand-in that decodes numbered frames into buffers."""
+
+    def __init__(self, frame_count: int, fail_at: int | None = None):
+        self.frame_count = frame_count
+        self.fail_at = fail_at
+        self.position = 0
+        self.buffers_passed = 0
+
+    def isOpened(self):  # noqa: N802
+        return True
+
+    def get(self, prop):
+        return self.frame_count if prop == "count" else 30.0
+
+    def read(self, image=None):
+        if self.position == self.fail_at:
+            raise RuntimeError("corrupt packet")
+        if self.position >= self.frame_count:
+            return False, None
+        if image is None:
+            image = np.empty((2, 2), dtype=np.int64)
+        else:
+            self.buffers_passed += 1
+        image[:] = self.position
+        self.position += 1
+        return True, image
+
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def fake_cv2():
+    """Patch cv2 in the decoder module with a fake capture factory."""
+    with patch.object(decoder_module, "cv2") as mock_cv2:
+        mock_cv2.CAP_PROP_FRAME_COUNT = "count"
+        yield mock_cv2
+
+
+def test_prefetch_reader_reads_in_order(fake_cv2):
+    """Test that prefetched frames arrive in order and buffers are reused."""
+    capture = _FakeCapture(frame_count=20)
+    fake_cv2.VideoCapture.return_value = capture
+
+    with PrefetchFrameReader("video.mp4", queue_size=2) as reader:
+        values = [int(frame[0, 0]) for frame in reader]
+
+    assert values == list(range(20))
+    assert reader.frame_count == 20
+    assert reader.stats.frames_read == 20
+    # Only queue_size + 2 buffers are ever allocated
+    assert capture.buffers_passed == 20 - 4
+    assert not reader.isOpened()
+
+
+def test_prefetch_reader_reports_starvation(fake_cv2):
+    """Test that waits on an empty queue are counted."""
+    capture = _FakeCapture(frame_count=3)
+    original_read = capture.read
+
+    def slow_read(image=None):
+        time.sleep(0.01)
+        return original_read(image)
+
+    capture.read = slow_read
+    fake_cv2.VideoCapture.return_value = capture
+
+    with PrefetchFrameReader("video.mp4") as reader:
+        frames = list(reader)
+
+    assert len(frames) == 3
+    assert reader.stats.starved_reads >= 1
+    assert reader.stats.starved_seconds > 0
+    assert 0 < reader.stats.starvation_ratio <= 1
+
+
+def test_prefetch_reader_propagates_errors(fake_cv2):
+    """Test that decoder thread failures surface in read()."""
+    fake_cv2.VideoCapture.return_value = _FakeCapture(frame_count=10, fail_at=2)
+
+    with PrefetchFrameReader("video.mp4") as reader:
+        assert reader.read()[0]
+        assert reader.read()[0]
+        with pytest.raises(VideoProcessingError):
+            reader.read()
+
+
+def test_prefetch_reader_release_stops_thread(fake_cv2):
+    """Test that release() stops decoding before the end of the video."""
+    fake_cv2.VideoCapture.return_value = _FakeCapture(frame_count=1000)
+
+    reader = PrefetchFrameReader("video.mp4", queue_size=1)
+    assert reader.read()[0]
+    reader.release()
+
+    assert reader.read() == (False, None)
@@ -0,0 +1,77 @@
+"""Tests for perceptual-hash frame deduplication."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from video_understanding.core.upload import dedup as dedup_module
+from video_understanding.core.upload.dedup import (
+    FrameDeduplicator,
+    dhash,
+    hamming_distance,
+)
+
+
+@pytest.fixture
+def thumbnail_cv2():
+    """Patch cv2 in the dedup module so resize returns the frame unchanged."""
+    with patch.object(dedup_module, "cv2") as mock_cv2:
+        mock_cv2.cvtColor.side_effect = lambda frame, code: frame.mean(axis=2)
+        mock_cv2.resize.side_effect = lambda frame, size, interpolation=None: frame
+        yield mock_cv2
+
+
+def test_hamming_distance():
+    """Test bit counting between hashes."""
+    assert hamming_distance(0b1011, 0b1011) == 0
+    assert hamming_distance(0b1011, 0b0110) == 3
+
+
+def test_dhash_gradient_signs(thumbnail_cv2):
+    """Test that dhash encodes the sign of horizontal gradients."""
+    rising = np.tile(np.arange(9, dtype=np.float32), (8, 1))
+    falling = rising[:, ::-1]
+
+    assert dhash(rising) == 2**64 - 1
+    assert dhash(falling) == 0
+    assert dhash(np.stack([rising] * 3, axis=2)) == dhash(rising)
+
+
+def test_deduplicator_skips_near_identical_frames():
+    """Test duplicate detection against the last analyzed frame."""
+    dedup = FrameDeduplicator(threshold=2)
+    hashes = iter([0b0000, 0b0001, 0b0011, 0b0111, 0b1111])
+
+    with patch.object(dedup, "compute_hash", side_effect=lambda frame: next(hashes)):
+        flags = [dedup.is_duplicate(None) for _ in range(5)]
+
+    # 0b0111 is 3 bits away from the reference 0b0000 and becomes the new one
+    assert flags == [False, True, True, False, True]
+    assert dedup.stats.frames_checked == 5
+    assert dedup.stats.frames_skipped == 3
+    assert dedup.stats.skip_ratio == pytest.approx(0.6)
+
+
+def test_deduplicator_reset():
+    """Test that reset clears the reference frame and counters."""
+    dedup = FrameDeduplicator()
+    with patch.object(dedup, "compute_hash", return_value=42):
+        dedup.is_duplicate(None)
+        assert dedup.is_duplicate(None)
+        dedup.reset()
+        assert not dedup.is_duplicate(None)
+
+    assert dedup.stats.to_dict() == {
+        "frames_checked": 1,
+        "frames_skipped": 0,
+        "skip_ratio": 0.0,
+    }
+
+
+def test_deduplicator_invalid_parameters():
+    """Test parameter validation."""
+    with pytest.raises(ValueError):
+        FrameDeduplicator(method="ahash")
+    with pytest.raises(ValueError):
+        FrameDeduplicator(threshold=64)
@@ -3,9 +3,13 @@ from unittest.mock import Mock, patch
 import numpy as np
 from pathlib import Path
 from video_understanding.core.upload.scene import SceneDetector
+from video_understanding.core.upload import detection as detection_module
 from video_understanding.core.upload.detection import ObjectDetector, DetectedObject
+from video_understanding.core.upload.model_registry import ModelRegistry
 import cv2
 
+from video_understanding.utils.exceptions import ProcessingError
+
 class TestSceneDetection:
     def setup_method(self):
         """Set up test fixtures before each test method."""
@@ -110,3 +114,95 @@ class TestObjectDetection:
         detector = ObjectDetector(confidence_threshold=0.8)
         results = detector.detect_objects(self.frame)
         assert all(obj.confidence >= 0.8 for obj in results)
+
+
+class _FakeTensor:
+    """Minimal stand-in for a torch tensor returned by YOLO."""
+
+    def __init__(self, values):
+        self._values = np.asarray(values, dtype=np.float32)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._values
+
+
+def _fake_result(xyxy, conf, cls):
+    """Create a YOLO-style result with the given boxes."""
+    result = Mock()
+    result.boxes.xyxy = _FakeTensor(np.reshape(xyxy, (-1, 4)))
+    result.boxes.conf = _FakeTensor(conf)
+    result.boxes.cls = _FakeTensor(cls)
+    result.names = {0: "person", 1: "car"}
+    return result
+
+
+class TestBatchObjectDetection:
+    @pytest.fixture
+    def model(self):
+        """Patch the YOLO model used by the detector."""
+        with patch.object(detection_module, "YOLO") as mock_yolo, \
+                patch.object(detection_module, "get_model_registry", ModelRegistry):
+            yield mock_yolo.return_value
+
+    @pytest.fixture(autouse=True)
+    def passthrough_resize(self):
+        """Make cv2.resize in the detection module resize by slicing."""
+        def resize(frame, size, interpolation=None):
+            width, height = size
+            rows = np.linspace(0, frame.shape[0] - 1, height).astype(int)
+            cols = np.linspace(0, frame.shape[1] - 1, width).astype(int)
+            return frame[rows][:, cols]
+
+        with patch.object(detection_module, "cv2") as mock_cv2:
+            mock_cv2.resize.side_effect = resize
+            yield
+
+    def test_detect_batch_chunks_frames(self, model):
+        """Test that frames are sent to the model in configured batch sizes."""
+        model.side_effect = lambda images, **kwargs: [
+            _fake_result([], [], []) for _ in images
+        ]
+        detector = ObjectDetector(batch_size=4)
+        frames = [np.zeros((360, 640, 3), dtype=np.uint8)] * 10
+
+        results = detector.detect_batch(frames, list(range(0, 100, 10)))
+
+        assert len(results) == 10
+        assert [len(call.args[0]) for call in model.call_args_list] == [4, 4, 2]
+        batch = model.call_args_list[0].args[0]
+        assert batch[0].shape == (384, 640, 3)
+
+    def test_detect_batch_maps_boxes_to_frame(self, model):
+        """Test threshold masking and mapping boxes out of the letterbox."""
+        # 1280x720 frames are scaled by 0.5 and padded by 12 rows at the top
+        model.side_effect = lambda images, **kwargs: [
+            _fake_result(
+                [[10, 22, 110, 72], [0, 0, 5, 5], [600, 300, 700, 400]],
+                [0.9, 0.3, 0.8],
+                [0, 0, 1],
+            )
+            for _ in images
+        ]
+        detector = ObjectDetector(confidence_threshold=0.5)
+        frames = [np.zeros((720, 1280, 3), dtype=np.uint8)] * 2
+
+        results = detector.detect_batch(frames, [30, 60])
+
+        assert [len(r) for r in results] == [2, 2]
+        person, car = results[1]
+        assert person.label == "person"
+        assert person.frame_number == 60
+        assert person.confidence == pytest.approx(0.9)
+        assert person.bbox == pytest.approx([20, 20, 220, 120])
+        # Boxes are clipped to the original frame
+        assert car.label == "car"
+        assert car.bbox == pytest.approx([1200, 576, 1280, 720])
+
+    def test_detect_batch_rejects_mismatched_numbers(self, model):
+        """Test that frame numbers must match the frames."""
+        detector = ObjectDetector()
+        with pytest.raises(ProcessingError):
+            detector.detect_batch([np.zeros((32, 32, 3), dtype=np.uint8)], [1, 2])
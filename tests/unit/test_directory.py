@@ -0,0 +1,90 @@
+"""Tests for the sharded upload directory layout."""
+
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from video_understanding.core.upload.directory import DirectoryManager
+from video_understanding.utils.exceptions import StorageError
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Directory manager with the default layout."""
+    manager = DirectoryManager(tmp_path / "uploads")
+    manager.initialize_directories()
+    return manager
+
+
+def test_entries_resolve_to_shards(manager):
+    """Test shard prefixes for ids, other names and sidecars."""
+    video_id = uuid4()
+    digits = video_id.hex
+
+    path = manager.get_path(f"completed/{video_id}", "video.mp4")
+    shard_dir = manager.base_dir / "completed" / digits[:2] / digits[2:4]
+    assert path == shard_dir / str(video_id) / "video.mp4"
+    flat_path = manager.base_dir / "processing" / "video.mp4"
+    assert manager.get_path("processing", "video.mp4") == flat_path
+
+    quarantined = manager.get_path("quarantine", "20240101_120000_video.mp4")
+    assert quarantined.parent.parent.parent == manager.base_dir / "quarantine"
+    sidecar = manager.get_path("quarantine", "20240101_120000_video.meta")
+    assert sidecar.parent == quarantined.parent
+
+    wide = DirectoryManager(manager.base_dir, shard_depth=1, shard_width=3)
+    assert wide.shard_prefix(str(video_id)) == Path(digits[:3])
+    with pytest.raises(StorageError, match="Invalid shard layout"):
+        DirectoryManager(manager.base_dir, shard_depth=9, shard_width=2)
+
+
+def test_move_and_prune_keep_shard_directories(manager, tmp_path):
+    """Test that pruning stops at shard directories."""
+    source = tmp_path / "video.mp4"
+    source.write_bytes(b"data")
+    video_id = uuid4()
+
+    moved = manager.move_file(source, f"completed/{video_id}")
+    assert moved.read_bytes() == b"data"
+
+    moved.unlink()
+    manager.prune_empty_dirs(moved.parent)
+    assert not moved.parent.exists()
+    assert moved.parent.parent.is_dir()
+
+
+def test_online_migration_of_flat_entries(manager, tmp_path):
+    """Test resolving and migrating entries stored before sharding."""
+    flat = DirectoryManager(manager.base_dir, shard_depth=0)
+    legacy_ids = [uuid4() for _ in range(5)]
+    legacy = []
+    for video_id in legacy_ids:
+        flat.ensure_directory_exists(f"completed/{video_id}")
+        path = flat.get_path(f"completed/{video_id}", "video.mp4")
+        path.write_bytes(video_id.bytes)
+        legacy.append(path)
+    (manager.get_path("completed") / "catalog.sqlite").write_bytes(b"")
+
+    # Flat entries are found where they are
+    assert manager.get_path(f"completed/{legacy_ids[0]}", "video.mp4") == legacy[0]
+
+    # A conflicting entry already exists in the sharded layout
+    shard = manager.shard_prefix(str(legacy_ids[1]))
+    (manager.get_path("completed") / shard / str(legacy_ids[1])).mkdir(parents=True)
+
+    stats = manager.migrate_to_sharded(
+        "completed", batch_size=2, exclude={"catalog.sqlite"}
+    )
+
+    assert stats.to_dict() == {"moved": 4, "conflicts": 1, "failed": 0}
+    assert (manager.get_path("completed") / "catalog.sqlite").exists()
+    for video_id, old_path in zip(legacy_ids, legacy):
+        if video_id == legacy_ids[1]:
+            continue
+        new_path = manager.get_path(f"completed/{video_id}", "video.mp4")
+        assert new_path != old_path
+        assert new_path.read_bytes() == video_id.bytes
+        assert manager.locate(old_path) == new_path
+    with pytest.raises(StorageError, match="not sharded"):
+        manager.migrate_to_sharded("processing")
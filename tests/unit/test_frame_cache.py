@@ -0,0 +1,303 @@
+"""Tests for the content-addressed frame cache."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from video_understanding.core.decoder import PrefetchStats
+from video_understanding.core.upload import processor as processor_module
+from video_understanding.core.upload import scene as scene_module
+from video_understanding.core.upload.config import ProcessorConfig
+from video_understanding.core.upload.detection import DetectedObject
+from video_understanding.core.upload.frame_cache import FrameCache, FrameTransform
+from video_understanding.core.upload.processor import VideoProcessor
+from video_understanding.core.upload.scene import SceneDetector
+
+THUMB = FrameTransform(8, 6)
+
+
+def _frame(value):
+    return np.full((6, 8, 3), value, dtype=np.uint8)
+
+
+@pytest.fixture
+def video_file(tmp_path):
+    """Small file standing in for a video."""
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"video content")
+    return path
+
+
+def test_video_key_is_content_addressed(tmp_path, video_file):
+    """Test that copies share a key and changed content gets a new one."""
+    cache = FrameCache(tmp_path / "cache")
+    copy = tmp_path / "copy.mp4"
+    copy.write_bytes(video_file.read_bytes())
+
+    assert cache.video_key(video_file) == cache.video_key(copy)
+    copy.write_bytes(b"other content")
+    assert cache.video_key(copy) != cache.video_key(video_file)
+
+
+def test_results_keyed_by_version_and_params(tmp_path):
+    """Test that a changed version or parameter misses the cache."""
+    params, other_params = {"confidence": 0.5}, {"confidence": 0.6}
+    with FrameCache(tmp_path) as cache:
+        cache.put_result("v", 10, "objects", "yolo:1", params, [1, 2])
+        cache.put_result("v", 20, "objects", "yolo:1", params, [3])
+
+        assert cache.get_result("v", 10, "objects", "yolo:1", params) == [1, 2]
+        assert cache.get_result("v", 10, "objects", "yolo:2", params) is None
+        assert cache.get_result("v", 10, "objects", "yolo:1", other_params) is None
+        assert cache.get_results("v", "objects", "yolo:1", params) == {
+            10: [1, 2],
+            20: [3],
+        }
+
+    # Results persist across instances
+    with FrameCache(tmp_path) as cache:
+        assert cache.get_result("v", 20, "objects", "yolo:1", params) == [3]
+        assert cache.stats.result_hits == 1
+
+
+def test_frames_stored_in_memory_mapped_chunks(tmp_path):
+    """Test frame round trips through chunk files."""
+    with FrameCache(tmp_path, chunk_frames=4) as cache:
+        for index in range(6):
+            cache.put_frame("v", index, THUMB, _frame(index))
+
+        frame = cache.get_frame("v", 5, THUMB)
+        assert frame.shape == (6, 8, 3)
+        assert int(frame[0, 0, 0]) == 5
+        assert cache.get_frame("v", 6, THUMB) is None
+        assert cache.get_frame("v", 5, FrameTransform(4, 3)) is None
+        assert cache.frame_indices("v", THUMB) == set(range(6))
+
+        # Returned frames are copies of the cached data
+        frame[:] = 0
+        assert int(cache.get_frame("v", 5, THUMB)[0, 0, 0]) == 5
+
+    assert len(list((tmp_path / "chunks").glob("*.npy"))) == 2
+
+
+def test_lru_eviction_under_size_cap(tmp_path):
+    """Test that least recently used chunks are evicted above the cap."""
+    chunk_bytes = 128 + 2 * 6 * 8 * 3
+    with FrameCache(
+        tmp_path, max_bytes=int(chunk_bytes * 2.5), chunk_frames=2
+    ) as cache:
+        cache.put_frame("a", 0, THUMB, _frame(1))
+        cache.put_frame("b", 0, THUMB, _frame(2))
+        cache.get_frame("a", 0, THUMB)  # b is now least recently used
+        cache.put_frame("c", 0, THUMB, _frame(3))
+
+        assert cache.get_frame("b", 0, THUMB) is None
+        assert cache.get_frame("a", 0, THUMB) is not None
+        assert cache.get_frame("c", 0, THUMB) is not None
+        assert cache.total_bytes <= cache.max_bytes
+        assert cache.stats.evicted_bytes == chunk_bytes
+
+
+def test_chunk_being_filled_is_not_evicted(tmp_path):
+    """Test that writing to a chunk marks it as recently used."""
+    chunk_bytes = 128 + 2 * 6 * 8 * 3
+    with FrameCache(
+        tmp_path, max_bytes=int(chunk_bytes * 2.5), chunk_frames=2
+    ) as cache:
+        cache.put_frame("a", 0, THUMB, _frame(1))
+        cache.put_frame("b", 0, THUMB, _frame(2))
+        cache.put_frame("a", 1, THUMB, _frame(3))  # same chunk as frame 0
+        cache.put_frame("c", 0, THUMB, _frame(4))  # above the cap
+
+        assert cache.frame_indices("a", THUMB) == {0, 1}
+        assert cache.get_frame("b", 0, THUMB) is None
+        assert cache.stats.evicted_bytes == chunk_bytes
+
+
+def test_instances_share_chunks_and_size_cap(tmp_path):
+    """Test caches on one directory, as used by several worker processes."""
+    chunk_bytes = 128 + 2 * 6 * 8 * 3
+    max_bytes = int(chunk_bytes * 2.5)
+    first = FrameCache(tmp_path, max_bytes=max_bytes, chunk_frames=2)
+    second = FrameCache(tmp_path, max_bytes=max_bytes, chunk_frames=2)
+
+    # Both write frames of the same chunk
+    first.put_frame("a", 0, THUMB, _frame(1))
+    second.put_frame("a", 1, THUMB, _frame(2))
+    assert int(first.get_frame("a", 1, THUMB)[0, 0, 0]) == 2
+    assert int(second.get_frame("a", 0, THUMB)[0, 0, 0]) == 1
+
+    # Replaced results are counted once
+    first.put_result("a", -1, "frames", "1", None, [1])
+    second.put_result("a", -1, "frames", "1", None, [2])
+    assert first.total_bytes == second.total_bytes == chunk_bytes + 3
+
+    # The cap applies to the total of both
+    second.put_frame("b", 0, THUMB, _frame(3))
+    first.put_frame("c", 0, THUMB, _frame(4))
+    assert second.get_frame("a", 0, THUMB) is None
+    assert second.total_bytes == 2 * chunk_bytes + 3
+    assert first.stats.evicted_bytes == chunk_bytes
+    first.close()
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_scene_detector_reuses_difference_series(tmp_path, video_file):
+    """Test that new scene settings are applied without decoding again."""
+    series = {"profile": "full", "fps": 1.0, "frames": 6, "diffs": [0, 50, 0, 0, 50]}
+    detector = SceneDetector()
+    detector.set_frame_cache(FrameCache(tmp_path / "cache"))
+    detector.set_min_scene_duration(1.0)
+
+    with patch.object(detector, "_frame_diffs", return_value=series) as decode:
+        first = await detector.detect(video_file)
+        detector.set_threshold(60.0)
+        second = await detector.detect(video_file)
+
+    decode.assert_called_once()
+    boundaries = [(s["start_frame"], s["end_frame"]) for s in first]
+    assert boundaries == [(0, 2), (2, 5), (5, 6)]
+    assert [(s["start_frame"], s["end_frame"]) for s in second] == [(0, 6)]
+
+
+@pytest.mark.asyncio
+async def test_capped_detection_stops_decoding(tmp_path, video_file):
+    """Test that decoding stops at max_scenes and partial series are not cached."""
+    detector = SceneDetector()
+    detector.set_frame_cache(FrameCache(tmp_path / "cache"))
+    detector.set_min_scene_duration(1.0)
+    detector.set_max_scenes(2)
+
+    with patch.object(scene_module, "cv2") as mock_cv2, patch.object(
+        detector,
+        "_calculate_frame_diff",
+        side_effect=lambda a, b: float(np.abs(a.astype(int) - b).mean()),
+    ):
+        frames = [_frame(v) for v in (0, 100, 0, 100, 0, 100)]
+        capture = mock_cv2.VideoCapture.return_value
+        capture.isOpened.return_value = True
+        capture.get.side_effect = (
+            lambda prop: 1.0 if prop is mock_cv2.CAP_PROP_FPS else len(frames)
+        )
+
+        def decode():
+            capture.read.reset_mock()
+            capture.read.side_effect = [(True, frame) for frame in frames]
+
+        decode()
+        capped = await detector.detect(video_file)
+        assert [(s["start_frame"], s["end_frame"]) for s in capped] == [(0, 1), (1, 2)]
+        assert capture.read.call_count == 3
+
+        # The full series is decoded and cached once no cap is reached
+        decode()
+        detector.set_max_scenes(500)
+        assert len(await detector.detect(video_file)) == 6
+        assert capture.read.call_count == len(frames)
+
+        decode()
+        detector.set_threshold(200.0)
+        assert len(await detector.detect(video_file)) == 1
+        assert capture.read.call_count == 0
+    detector.frame_cache.close()
+
+
+class _FakeReader:
+    """PrefetchFrameReader stand-in yielding fixed frames."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.frame_count = len(self.frames)
+        self.fps = 1.0
+        self.stats = PrefetchStats()
+
+    def read(self):
+        if not self.frames:
+            return False, None
+        return True, self.frames.pop(0)
+
+    def release(self):
+        pass
+
+
+class _FakeDetector:
+    """Object detector stand-in counting detected frames."""
+
+    model_key = "fake:1"
+
+    def __init__(self):
+        self.detected = []
+
+    def detect_batch(self, frames, frame_numbers):
+        self.detected.extend(frame_numbers)
+        return [
+            [
+                DetectedObject(
+                    label="cat", confidence=0.9, bbox=[0, 0, 1, 1], frame_number=n
+                )
+            ]
+            for n in frame_numbers
+        ]
+
+
+def _analyze(cache_dir, video_file, threshold=30.0):
+    """Run analyze_frames over fake frames with a scene cut at frame 3."""
+    config = ProcessorConfig(
+        detection_enabled=False,
+        ocr_enabled=False,
+        frame_dedup_enabled=False,
+        frame_cache_dir=str(cache_dir),
+    )
+    processor = VideoProcessor(config)
+    processor.object_detector = _FakeDetector()
+    processor.scene_detector.set_threshold(threshold)
+    context = MagicMock()
+    context.video.file_info.file_path = Path(video_file)
+    frames = [_frame(v) for v in (0, 0, 0, 100, 100, 140)]
+
+    with (
+        patch.object(
+            processor_module, "PrefetchFrameReader", return_value=_FakeReader(frames)
+        ) as reader,
+        patch.object(processor, "_read_fps", return_value=1.0) as read_fps,
+        patch.object(
+            processor.scene_detector,
+            "_calculate_frame_diff",
+            side_effect=lambda a, b: float(np.abs(a.astype(int) - b).mean()),
+        ),
+    ):
+        results = processor.analyze_frames(context)
+    processor.close()
+    return (
+        results,
+        processor.object_detector.detected,
+        reader.called,
+        read_fps.call_count,
+    )
+
+
+def test_analysis_replays_cached_stages(tmp_path, video_file):
+    """Test that a re-run only recomputes the stage whose settings changed."""
+    first, detected, decoded, fps_reads = _analyze(tmp_path, video_file)
+    assert detected == list(range(6))
+    assert decoded
+    assert fps_reads == 0
+    assert not first["frame_cache"]["replayed"]
+
+    second, detected, decoded, fps_reads = _analyze(tmp_path, video_file)
+    assert detected == []
+    assert not decoded
+    # Replayed frames read the frame rate from the container once
+    assert fps_reads == 1
+    assert second["frame_cache"]["replayed"]
+    assert second["objects"] == first["objects"]
+    assert second["scenes"] == first["scenes"]
+    assert [scene["frame"] for scene in first["scenes"]] == [3, 5]
+
+    # A new scene threshold is applied to the cached frame differences
+    third, detected, decoded, _ = _analyze(tmp_path, video_file, threshold=60.0)
+    assert detected == [] and not decoded
+    assert [scene["frame"] for scene in third["scenes"]] == [3]
@@ -0,0 +1,124 @@
+"""Tests for streaming file ingest."""
+
+import errno
+import hashlib
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# The package root imports every storage backend, and those need optional
+# dependencies (faiss) that ingest does not use. They are mocked while the
+# video package is imported.
+STORAGE_MODULES = (
+    "video_understanding.storage",
+    "video_understanding.storage.cache",
+    "video_understanding.storage.metadata",
+    "video_understanding.storage.vector",
+)
+with patch.dict(sys.modules, {name: MagicMock() for name in STORAGE_MODULES}):
+    from video_understanding.video import ingest as ingest_module
+    from video_understanding.video.ingest import ingest_file
+    from video_understanding.video.upload import LocalVideoUploader
+
+CONTENT = os.urandom(100_000)
+
+
+@pytest.fixture
+def source(tmp_path):
+    """Source file with random content."""
+    path = tmp_path / "source.mp4"
+    path.write_bytes(CONTENT)
+    return path
+
+
+def test_chunked_copy_hashes_and_reports_progress(tmp_path, source):
+    """Test a buffered copy with checksum and progress reports."""
+    progress = []
+    result = ingest_file(
+        source,
+        tmp_path / "out.mp4",
+        allow_links=False,
+        chunk_size=30_000,
+        progress_callback=lambda done, total: progress.append((done, total)),
+    )
+
+    assert result.method == "chunked"
+    assert result.checksum == hashlib.sha256(CONTENT).hexdigest()
+    assert (tmp_path / "out.mp4").read_bytes() == CONTENT
+    assert progress == [
+        (30_000, 100_000),
+        (60_000, 100_000),
+        (90_000, 100_000),
+        (100_000, 100_000),
+    ]
+
+
+def test_kernel_copy_without_checksum(tmp_path, source):
+    """Test that unhashed copies use an in-kernel copy."""
+    result = ingest_file(
+        source, tmp_path / "out.mp4", checksum_algorithm=None, allow_links=False
+    )
+
+    assert result.method in ("copy_file_range", "sendfile")
+    assert result.checksum is None
+    assert result.size == len(CONTENT)
+    assert (tmp_path / "out.mp4").read_bytes() == CONTENT
+
+
+def test_unsupported_kernel_copy_falls_back(tmp_path, source):
+    """Test the buffered copy when the kernel refuses to copy the files."""
+
+    def unsupported(src, dst, offset, count):
+        raise OSError(errno.EXDEV, "cross-device")
+
+    with patch.object(
+        ingest_module, "_kernel_copies", return_value=[("copy_file_range", unsupported)]
+    ):
+        result = ingest_file(
+            source, tmp_path / "out.mp4", checksum_algorithm=None, allow_links=False
+        )
+
+    assert result.method == "chunked"
+    assert (tmp_path / "out.mp4").read_bytes() == CONTENT
+
+
+def test_same_filesystem_ingest_links(tmp_path, source):
+    """Test that a file on the same filesystem is linked, not copied."""
+    with patch.object(ingest_module, "_copy") as copy:
+        result = ingest_file(source, tmp_path / "out.mp4")
+
+    copy.assert_not_called()
+    assert result.method in ("reflink", "hardlink")
+    assert result.checksum == hashlib.sha256(CONTENT).hexdigest()
+    assert (tmp_path / "out.mp4").read_bytes() == CONTENT
+
+
+def test_failed_ingest_leaves_no_partial_file(tmp_path, source):
+    """Test cleanup of the temporary file after a failed copy."""
+    target_dir = tmp_path / "target"
+    target_dir.mkdir()
+
+    with patch.object(
+        ingest_module, "_copy", side_effect=OSError(errno.ENOSPC, "disk full")
+    ):
+        with pytest.raises(OSError):
+            ingest_file(source, target_dir / "out.mp4", allow_links=False)
+
+    assert list(target_dir.iterdir()) == []
+
+
+def test_local_uploader_records_checksum(tmp_path, source):
+    """Test that uploaded videos carry the streamed checksum."""
+    uploader = LocalVideoUploader(str(tmp_path / "uploads"), allow_links=False)
+    progress = []
+
+    video = uploader.upload(
+        str(source), progress_callback=lambda done, total: progress.append(done)
+    )
+
+    assert video.file_info.file_path == tmp_path / "uploads" / "source.mp4"
+    assert video.file_info.file_size == len(CONTENT)
+    assert video.file_info.checksum == hashlib.sha256(CONTENT).hexdigest()
+    assert progress[-1] == len(CONTENT)
@@ -2,11 +2,21 @@
 
 import pytest
 from pathlib import Path
+import hashlib
 import tempfile
 import os
+from types import SimpleNamespace
+from unittest.mock import patch
 
-from video_understanding.core.upload.integrity import FileIntegrityChecker
+from video_understanding.core.upload import integrity as integrity_module
+from video_understanding.core.upload.checksum import ChecksumEngine, TREE_HASH_KEY
+from video_understanding.core.upload.container import inspect_container
+from video_understanding.core.upload.integrity import (
+    FileIntegrityChecker,
+    VideoIntegrityChecker,
+)
 from video_understanding.core.exceptions import IntegrityError
+from video_understanding.utils.exceptions import VideoIntegrityError
 
 @pytest.fixture
 def sample_file():
@@ -71,3 +81,138 @@ async def test_nonexistent_file():
     checker = FileIntegrityChecker()
     with pytest.raises(IntegrityError, match="File not found"):
         await checker.check(Path("nonexistent.mp4"))
+
+@pytest.mark.asyncio
+async def test_checksums_match_hashlib(sample_file):
+    """Test that the single-read engine gives standard digests."""
+    content = sample_file.read_bytes()
+    engine = ChecksumEngine(buffer_size=4096)
+
+    checksums = await engine.compute_async(sample_file)
+
+    assert checksums == {
+        "md5": hashlib.md5(content).hexdigest(),
+        "sha256": hashlib.sha256(content).hexdigest(),
+    }
+
+def test_tree_hash_independent_of_buffer_size(sample_file):
+    """Test that the tree hash only depends on content and leaf size."""
+    small = ChecksumEngine(algorithms=(), tree_hash=True, leaf_size=1000, buffer_size=1)
+    large = ChecksumEngine(
+        algorithms=(), tree_hash=True, leaf_size=1000, buffer_size=10_000
+    )
+    other_leaves = ChecksumEngine(algorithms=(), tree_hash=True, leaf_size=2000)
+
+    digest = small.compute(sample_file)[TREE_HASH_KEY]
+
+    assert small.buffer_size == 1000
+    assert large.compute(sample_file)[TREE_HASH_KEY] == digest
+    assert other_leaves.compute(sample_file)[TREE_HASH_KEY] != digest
+
+@pytest.mark.asyncio
+async def test_integrity_check_records_tree_hash(sample_file):
+    """Test that the checker keeps the checksums of the last file."""
+    checker = FileIntegrityChecker(tree_hash=True)
+    await checker.check(sample_file)
+
+    assert set(checker.checksums) == {"md5", "sha256", TREE_HASH_KEY}
+
+
+av = pytest.importorskip("av")
+
+
+@pytest.fixture
+def encoded_video(tmp_path):
+    """Encode a 3 second MP4 with a keyframe every half second."""
+    import numpy as np
+
+    path = tmp_path / "video.mp4"
+    with av.open(str(path), "w") as container:
+        stream = container.add_stream("mpeg4", rate=30)
+        stream.width, stream.height, stream.pix_fmt = 64, 48, "yuv420p"
+        stream.codec_context.gop_size = 15
+        for _ in range(90):
+            image = np.full((48, 64, 3), 128, np.uint8)
+            frame = av.VideoFrame.from_ndarray(image, format="rgb24")
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+    return path
+
+
+def test_one_pass_validation(encoded_video):
+    """Test that validate() reports metadata, bitrate and samples together."""
+    checker = VideoIntegrityChecker(check_structure=True)
+
+    report = checker.validate(encoded_video, sample_count=5)
+
+    assert report.metadata.width == 64 and report.metadata.height == 48
+    assert report.metadata.fps == 30.0
+    assert report.metadata.duration == pytest.approx(3.0, abs=0.1)
+    assert report.bitrate > 0
+    assert (report.frame_width, report.frame_height) == (64, 48)
+    assert report.samples_checked == 5
+    assert report.structure.format == "isobmff"
+    assert report.structure.tracks == 1
+    assert "moov" in report.structure.boxes
+
+
+def test_samples_sharing_a_keyframe_are_decoded_once(encoded_video):
+    """Test that seeks landing on the same keyframe are not decoded twice."""
+    report = VideoIntegrityChecker().validate(encoded_video, sample_count=20)
+
+    # 90 frames with a keyframe every 15 frames
+    assert report.samples_checked == 6
+
+
+def test_structure_check_detects_truncation(encoded_video):
+    """Test that a truncated upload fails without decoding."""
+    data = encoded_video.read_bytes()
+    encoded_video.write_bytes(data[: len(data) // 2])
+
+    with pytest.raises(VideoIntegrityError, match="truncated|moov"):
+        inspect_container(encoded_video)
+
+
+class _UnknownDurationCapture:
+    """OpenCV capture of a stream whose frame rate cannot be read."""
+
+    def __init__(self, path):
+        self.props = {integrity_module.cv2.CAP_PROP_FRAME_COUNT: 90.0}
+
+    def isOpened(self):
+        return True
+
+    def get(self, prop):
+        return self.props.get(prop, 0.0)
+
+    def release(self):
+        pass
+
+
+def test_zero_duration_fails_metadata_validation(encoded_video):
+    """Test that an unknown duration fails validation, not the bitrate."""
+    stream = SimpleNamespace(
+        average_rate=30,
+        guessed_rate=30,
+        duration=None,
+        frames=0,
+        codec_context=SimpleNamespace(width=64, height=48, name="mpeg4"),
+    )
+    container = SimpleNamespace(
+        streams=SimpleNamespace(video=[stream]),
+        duration=None,
+        bit_rate=0,
+        close=lambda: None,
+    )
+    checker = VideoIntegrityChecker()
+    invalid = "Invalid video metadata: Duration"
+
+    with patch.object(integrity_module.av, "open", return_value=container):
+        with pytest.raises(VideoIntegrityError, match=invalid):
+            checker.validate(encoded_video)
+
+    with patch.object(integrity_module.cv2, "VideoCapture", _UnknownDurationCapture):
+        with pytest.raises(VideoIntegrityError, match=invalid):
+            checker._probe_opencv(encoded_video, 5)
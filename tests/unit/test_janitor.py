@@ -0,0 +1,107 @@
+"""Tests for the upload directory janitor."""
+
+import asyncio
+
+import pytest
+
+from video_understanding.core.metrics import MetricsTracker
+from video_understanding.core.upload.directory import DirectoryManager
+from video_understanding.core.upload.janitor import Janitor, LeaseRegistry
+
+DAY = 24 * 60 * 60
+
+
+@pytest.fixture
+def directory_manager(tmp_path):
+    """Initialized upload directory."""
+    manager = DirectoryManager(tmp_path / "uploads")
+    manager.initialize_directories()
+    return manager
+
+
+@pytest.fixture
+def leases(directory_manager):
+    """Lease registry of the upload directory."""
+    return LeaseRegistry(directory_manager.get_path("leases"))
+
+
+def leftover(directory_manager, subdir, name, size):
+    """Create a file left behind by a job."""
+    path = directory_manager.get_path(subdir, name)
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_leases_protect_live_files(leases):
+    """Test lease expiry, renewal and release."""
+    with leases.hold("video.mp4") as lease:
+        assert leases.is_held("video.mp4")
+        assert not leases.is_held("other.mp4")
+        second = leases.acquire("video.mp4", ttl=-1)
+        assert leases.is_held("video.mp4")
+    assert not leases.is_held("video.mp4")
+
+    second.ttl = 60
+    second.renew()
+    assert leases.is_held("video.mp4")
+    second.ttl = -1
+    second.renew()
+    assert not leases.is_held("video.mp4")
+    assert leases.cleanup_expired() == 1
+    assert not any(leases.lease_dir.iterdir())
+    lease.release()
+
+
+def test_incremental_sweep_reclaims_unleased_files(directory_manager, leases):
+    """Test batched passes, leases, age limit and metrics."""
+    metrics = MetricsTracker()
+    abandoned = [
+        leftover(directory_manager, "temp", f"crashed{i}.mp4", 100) for i in range(3)
+    ]
+    held = leftover(directory_manager, "processing", "live.mp4", 50)
+    workdir = directory_manager.get_path("processing", "workdir")
+    workdir.mkdir()
+    (workdir / "frames.bin").write_bytes(b"y" * 25)
+
+    janitor = Janitor(
+        directory_manager, leases, max_age=0, batch_size=2, metrics=metrics
+    )
+    with leases.hold("live.mp4"):
+        assert janitor.step() is False
+        assert janitor.stats.scanned == 2
+        while not janitor.step():
+            pass
+
+    stats = janitor.stats.to_dict()
+    assert stats["passes"] == 1 and stats["scanned"] == 5
+    assert stats["reclaimed"] == 4 and stats["leased"] == 1
+    assert stats["reclaimed_bytes"] == 3 * 100 + 25
+    processing = str(directory_manager.get_path("processing"))
+    assert stats["reclaimed_bytes_by_dir"][processing] == 25
+    assert held.exists() and not workdir.exists()
+    assert not any(path.exists() for path in abandoned)
+    assert metrics.measurements["janitor_reclaimed_bytes"][0].value == 325
+
+    # Entries changed within max_age are kept
+    janitor = Janitor(directory_manager, leases, max_age=DAY)
+    assert janitor.sweep().reclaimed == 0
+    assert held.exists()
+
+
+@pytest.mark.asyncio
+async def test_background_task_is_rate_limited(directory_manager, leases):
+    """Test that the service sweeps in the background at a bounded rate."""
+    for i in range(6):
+        leftover(directory_manager, "temp", f"crashed{i}.mp4", 1)
+    janitor = Janitor(
+        directory_manager, leases, max_age=0, batch_size=2, max_entries_per_second=40
+    )
+
+    janitor.start()
+    await asyncio.sleep(0.1)
+    partial = janitor.stats.reclaimed
+    await asyncio.sleep(0.2)
+    await janitor.stop()
+
+    assert 0 < partial < 6
+    assert janitor.stats.reclaimed == 6
@@ -0,0 +1,154 @@
+"""Tests for the shared model registry."""
+
+import gc
+import threading
+import time
+import weakref
+from unittest.mock import patch
+
+import pytest
+import torch
+
+from video_understanding.core.upload import detection as detection_module
+from video_understanding.core.upload import model_registry as registry_module
+from video_understanding.core.upload.detection import ObjectDetector
+from video_understanding.core.upload.model_registry import (
+    ModelRegistry,
+    estimate_model_memory,
+)
+
+
+class _FakeModel:
+    """Model stand-in reporting a fixed memory size."""
+
+    def __init__(self, name, size=100):
+        self.name = name
+        self.size = size
+
+
+@pytest.fixture
+def registry():
+    """Registry whose memory estimate is the fake model's size."""
+    with patch.object(
+        registry_module,
+        "estimate_model_memory",
+        side_effect=lambda model: model.size,
+    ):
+        yield ModelRegistry()
+
+
+def test_models_load_lazily_and_are_shared(registry):
+    """Test that a model loads on first get() and is reused afterwards."""
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return _FakeModel("a")
+
+    registry.register("a", loader)
+    assert not registry.is_loaded("a")
+
+    first = registry.get("a")
+    second = registry.get("a")
+
+    assert first is second
+    assert len(loads) == 1
+    stats = registry.stats()["a"]
+    assert stats["loads"] == 1
+    assert stats["hits"] == 1
+    assert stats["memory_bytes"] == 100
+    assert stats["loaded"]
+
+
+def test_concurrent_first_use_loads_once(registry):
+    """Test that threads racing on first use share a single load."""
+    loads = []
+
+    def loader():
+        loads.append(1)
+        time.sleep(0.05)
+        return _FakeModel("a")
+
+    registry.register("a", loader)
+    models = []
+    threads = [
+        threading.Thread(target=lambda: models.append(registry.get("a")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert all(model is models[0] for model in models)
+
+
+def test_preload_and_unknown_model(registry):
+    """Test preloading registered models and errors for unknown keys."""
+    registry.register("a", lambda: _FakeModel("a"))
+    registry.register("b", lambda: _FakeModel("b"))
+
+    registry.preload()
+
+    assert registry.is_loaded("a") and registry.is_loaded("b")
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+
+def test_lru_eviction_under_memory_cap(registry):
+    """Test that least recently used models are evicted above the cap."""
+    registry.set_memory_limit(250)
+    for key in "abc":
+        registry.register(key, lambda key=key: _FakeModel(key))
+
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")  # b is now least recently used
+    registry.get("c")
+
+    assert registry.is_loaded("a") and registry.is_loaded("c")
+    assert not registry.is_loaded("b")
+    assert registry.memory_bytes == 200
+    assert registry.stats()["b"]["evictions"] == 1
+
+    # Evicted models load again on demand
+    registry.get("b")
+    assert registry.stats()["b"]["loads"] == 2
+
+
+def test_estimate_model_memory():
+    """Test memory estimation of torch modules held by a model."""
+
+    class Reader:
+        def __init__(self):
+            self.detector = torch.nn.Linear(10, 10)
+            self.recognizer = self.detector
+
+    assert estimate_model_memory(torch.nn.Linear(10, 10)) == 110 * 4
+    assert estimate_model_memory(Reader()) == 110 * 4
+    assert estimate_model_memory(object()) == 0
+
+
+def test_object_detector_loads_model_on_first_use():
+    """Test that detectors share one lazily loaded model."""
+    registry = ModelRegistry()
+    with patch.object(detection_module, "YOLO") as mock_yolo:
+        first = ObjectDetector(registry=registry)
+        second = ObjectDetector(registry=registry)
+        mock_yolo.assert_not_called()
+
+        assert first.model is second.model
+        mock_yolo.assert_called_once_with("yolov8n.pt")
+
+
+def test_registry_does_not_keep_detectors_alive():
+    """Test that a registered loader does not reference its detector."""
+    registry = ModelRegistry()
+    with patch.object(detection_module, "YOLO") as mock_yolo:
+        detector = weakref.ref(ObjectDetector(registry=registry))
+        gc.collect()
+
+        assert detector() is None
+        registry.get("yolo:yolov8n.pt")
+        mock_yolo.assert_called_once_with("yolov8n.pt")
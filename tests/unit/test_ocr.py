@@ -3,10 +3,16 @@
 import pytest
 from pathlib import Path
 import tempfile
+from unittest.mock import patch
 import cv2
 import numpy as np
 
-from video_understanding.core.upload.ocr import OCRProcessor
+from video_understanding.core.upload import ocr as ocr_module
+from video_understanding.core.upload.ocr import (
+    IncrementalTextExtractor,
+    OCRProcessor,
+    crop_similarity,
+)
 
 @pytest.fixture
 def sample_video():
@@ -77,3 +83,118 @@ async def test_ocr_invalid_file():
     processor = OCRProcessor()
     with pytest.raises(FileNotFoundError):
         await processor.process(Path("nonexistent.mp4"))
+
+
+class _FakeReader:
+    """EasyOCR reader stand-in with scripted text boxes.
+
+    Recognized text is derived from the box's pixels, so changed content
+    yields different text.
+    """
+
+    def __init__(self, confidence=0.9):
+        self.boxes = []
+        self.confidence = confidence
+        self.recognized = 0
+
+    def detect(self, image):
+        return [list(self.boxes)], [[]]
+
+    def recognize(self, image, horizontal_list=None, free_list=None):
+        self.recognized += 1
+        x_min, x_max, y_min, y_max = horizontal_list[0]
+        crop = image[y_min:y_max, x_min:x_max]
+        text = f"text-{int(crop.sum()) % 1000}"
+        bbox = [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+        return [(bbox, text, self.confidence)]
+
+
+def _resize(image, size, interpolation=None):
+    """Nearest-neighbour resize used in place of cv2.resize."""
+    width, height = size
+    rows = np.arange(height) * image.shape[0] // height
+    cols = np.arange(width) * image.shape[1] // width
+    return image[rows][:, cols]
+
+
+def _text_frame(seed, box=(10, 90, 10, 30)):
+    """Create a grayscale frame with a textured "text" region."""
+    frame = np.zeros((40, 100), dtype=np.uint8)
+    x_min, x_max, y_min, y_max = box
+    rng = np.random.default_rng(seed)
+    frame[y_min:y_max, x_min:x_max] = rng.integers(
+        0, 255, (y_max - y_min, x_max - x_min)
+    )
+    return frame
+
+
+@pytest.fixture
+def incremental():
+    """Incremental extractor with a fake reader and numpy resizing."""
+    reader = _FakeReader()
+    reader.boxes = [[10, 90, 10, 30]]
+    with patch.object(ocr_module, "cv2") as mock_cv2:
+        mock_cv2.resize.side_effect = _resize
+        yield IncrementalTextExtractor(reader, confidence_threshold=0.5)
+
+
+def test_incremental_ocr_carries_unchanged_text(incremental):
+    """Test that static text is recognized once and spans all frames."""
+    for number in range(5):
+        frame = _text_frame(seed=1)
+        frame[10:30, 10:90] = np.clip(frame[10:30, 10:90].astype(int) + number, 0, 255)
+        incremental.process_frame(frame, number, number / 10)
+
+    spans = incremental.finish()
+
+    assert len(spans) == 1
+    assert (spans[0].start_frame, spans[0].end_frame) == (0, 4)
+    assert spans[0].end_time == pytest.approx(0.4)
+    assert incremental.reader.recognized == 1
+    assert incremental.stats.reuse_ratio == pytest.approx(0.8)
+
+
+def test_incremental_ocr_recognizes_changed_text(incremental):
+    """Test that new content in the same box starts a new span."""
+    frames = [_text_frame(seed=1)] * 3 + [_text_frame(seed=2)] * 3
+    for number, frame in enumerate(frames):
+        incremental.process_frame(frame, number, float(number))
+
+    spans = incremental.finish()
+
+    assert [(s.start_frame, s.end_frame) for s in spans] == [(0, 2), (3, 5)]
+    assert spans[0].text != spans[1].text
+    assert incremental.reader.recognized == 2
+
+
+def test_incremental_ocr_closes_disappearing_text(incremental):
+    """Test that text leaving the frame ends its span."""
+    reader = incremental.reader
+    incremental.process_frame(_text_frame(seed=1), 0, 0.0)
+    incremental.process_frame(_text_frame(seed=1), 1, 1.0)
+    reader.boxes = []
+    assert incremental.process_frame(np.zeros((40, 100), np.uint8), 2, 2.0) == []
+    reader.boxes = [[10, 90, 10, 30]]
+    incremental.process_frame(_text_frame(seed=1), 3, 3.0)
+    incremental.extend(4, 4.0)
+
+    spans = incremental.finish()
+
+    assert [(s.start_frame, s.end_frame) for s in spans] == [(0, 1), (3, 4)]
+
+
+def test_incremental_ocr_skips_unchanged_low_confidence_boxes(incremental):
+    """Test that boxes below the threshold are not recognized repeatedly."""
+    incremental.reader.confidence = 0.1
+    for number in range(3):
+        assert incremental.process_frame(_text_frame(seed=1), number, 0.0) == []
+
+    assert incremental.finish() == []
+    assert incremental.reader.recognized == 1
+
+
+def test_crop_similarity():
+    """Test SSIM of identical and unrelated crops."""
+    crop = _text_frame(seed=1)[10:30, 10:90]
+    assert crop_similarity(crop, crop) == pytest.approx(1.0)
+    assert crop_similarity(crop, _text_frame(seed=2)[10:30, 10:90]) < 0.5
@@ -0,0 +1,97 @@
+"""Tests for the process-pool OCR engine."""
+
+import time
+
+import numpy as np
+import pytest
+
+from video_understanding.core.exceptions import OCRError
+from video_understanding.core.upload.ocr import ExtractedText
+from video_understanding.core.upload.ocr_engine import OCREngine
+
+
+class _FakeReader:
+    """Reader that reports the first pixel value of each frame as text."""
+
+    def readtext(self, frame):
+        value = int(frame.flat[0])
+        if value == 13:
+            raise RuntimeError("unreadable frame")
+        # Later frames finish first to exercise ordering
+        time.sleep(0.02 * (value % 3))
+        return [
+            (np.array([[0, 0], [8, 0], [8, 4], [0, 4]]), f"frame {value}", 0.9),
+            ([[0, 0], [1, 0], [1, 1], [0, 1]], "noise", 0.1),
+        ]
+
+
+def _fake_reader_factory(languages, gpu):
+    return _FakeReader()
+
+
+@pytest.fixture
+def engine():
+    """Create an OCR engine backed by fake readers."""
+    # Workers unpickle task functions by importing the package by name
+    pytest.importorskip("video_understanding")
+    with OCREngine(
+        workers=2,
+        max_in_flight=3,
+        confidence_threshold=0.5,
+        reader_factory=_fake_reader_factory,
+        start_method="fork",
+    ) as ocr_engine:
+        yield ocr_engine
+
+
+def _frames(count):
+    return [(n, np.full((16, 16, 3), n, dtype=np.uint8)) for n in range(count)]
+
+
+def test_map_returns_results_in_order(engine):
+    """Test that results arrive in submission order with thresholds applied."""
+    results = list(engine.map(iter(_frames(10))))
+
+    assert [number for number, _ in results] == list(range(10))
+    texts = results[4][1]
+    assert texts == [
+        ExtractedText(
+            text="frame 4",
+            confidence=0.9,
+            bounding_box=[[0, 0], [8, 0], [8, 4], [0, 4]],
+        )
+    ]
+    assert engine.in_flight == 0
+
+
+def test_results_keyed_by_frame_number(engine):
+    """Test collecting individual results by frame number."""
+    futures = {number: engine.submit(frame, number) for number, frame in _frames(3)}
+
+    assert engine.result(2)[0].text == "frame 2"
+    assert futures[0].result()[0].text == "frame 0"
+    assert [number for number, _ in engine.results()] == [0, 1]
+
+
+def test_failed_frame_raises_ocr_error(engine):
+    """Test that worker failures surface for the failing frame only."""
+    engine.submit(np.full((4, 4), 13, dtype=np.uint8), 13)
+    engine.submit(np.full((4, 4), 14, dtype=np.uint8), 14)
+
+    with pytest.raises(OCRError):
+        engine.result(13)
+    assert engine.result(14)[0].text == "frame 14"
+
+
+def test_duplicate_submission_rejected(engine):
+    """Test that a frame number can only be pending once."""
+    frame = np.zeros((4, 4), dtype=np.uint8)
+    engine.submit(frame, 1)
+    with pytest.raises(OCRError):
+        engine.submit(frame, 1)
+
+
+def test_invalid_worker_count():
+    """Test worker count validation."""
+    with pytest.raises(ValueError):
+        OCREngine(workers=0)
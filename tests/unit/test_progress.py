@@ -0,0 +1,107 @@
+"""Tests for coalesced progress tracking."""
+
+import threading
+import time
+from uuid import uuid4
+
+from video_understanding.core.upload.progress import ProgressTracker
+from video_understanding.models.video import ProcessingStatus
+
+PROCESSING = ProcessingStatus.PROCESSING
+
+
+def test_updates_coalesce_by_progress_change():
+    """Test that per-frame updates publish about once per percent."""
+    tracker = ProgressTracker(uuid4(), min_interval=60.0, synchronous=True)
+    published = []
+    tracker.add_callback(lambda info: published.append(info.progress))
+
+    frame_count = 10_000
+    for frame in range(1, frame_count):
+        tracker.update_progress(
+            PROCESSING, frame / frame_count * 100, frames_processed=frame
+        )
+
+    assert 99 <= len(published) <= 101
+    assert published == sorted(published)
+    # The latest update is visible even if it was not published
+    info = tracker.get_stage_progress(PROCESSING)
+    assert info.details["frames_processed"] == frame_count - 1
+
+    tracker.update_progress(PROCESSING, 100.0)
+    assert published[-1] == 100.0
+
+
+def test_updates_publish_at_the_configured_rate():
+    """Test that slow progress is still published after min_interval."""
+    tracker = ProgressTracker(
+        uuid4(), min_interval=0.05, min_delta=50.0, synchronous=True
+    )
+    published = []
+    tracker.add_callback(lambda info: published.append(info.progress))
+
+    tracker.update_progress(PROCESSING, 1.0)
+    tracker.update_progress(PROCESSING, 2.0)
+    tracker.update_progress(ProcessingStatus.VALIDATING, 0.0)
+    time.sleep(0.06)
+    tracker.update_progress(ProcessingStatus.VALIDATING, 3.0)
+
+    assert published == [1.0, 2.0, 0.0, 3.0]
+
+
+def test_callbacks_run_on_the_delivery_thread():
+    """Test queued delivery, coalescing in the queue and error handling."""
+    tracker = ProgressTracker(uuid4(), min_interval=0.0)
+    release = threading.Event()
+    seen = []
+
+    def slow(info):
+        release.wait(5)
+        seen.append(
+            (info.stage, info.progress, info.error, threading.current_thread().name)
+        )
+
+    def broken(info):
+        raise RuntimeError("callback failed")
+
+    tracker.add_callback(slow)
+    tracker.add_callback(broken)
+    started = time.monotonic()
+    for progress in range(0, 101, 10):
+        tracker.update_progress(PROCESSING, float(progress))
+    tracker.mark_stage_error(PROCESSING, "decode failed")
+    assert time.monotonic() - started < 1.0
+
+    release.set()
+    assert tracker.flush(timeout=5)
+    tracker.close()
+
+    # Updates queued behind the slow callback coalesced, the error last
+    assert len(seen) <= 3
+    progresses = [progress for _, progress, _, _ in seen]
+    assert progresses == sorted(progresses)
+    assert seen[-1][1:3] == (100.0, "decode failed")
+    assert all(name.startswith("progress-") for *_, name in seen)
+    assert tracker.callbacks == [slow]
+
+
+def test_callbacks_may_flush_and_close_the_tracker():
+    """Test that a callback re-entering the tracker does not deadlock."""
+    tracker = ProgressTracker(uuid4(), min_interval=0.0)
+    done = threading.Event()
+    seen = []
+
+    def reentrant(info):
+        overall = tracker.get_overall_progress()
+        seen.append((info.progress, overall, tracker.flush(timeout=5)))
+        if info.progress == 100.0:
+            tracker.close()
+            done.set()
+
+    tracker.add_callback(reentrant)
+    tracker.update_progress(PROCESSING, 50.0)
+    tracker.update_progress(PROCESSING, 100.0)
+
+    assert done.wait(5)
+    assert seen[-1][0] == 100.0
+    assert tracker.flush(timeout=5)
@@ -0,0 +1,113 @@
+"""Tests for the quarantine catalog."""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from video_understanding.core.upload import quarantine as quarantine_module
+from video_understanding.core.upload.directory import DirectoryManager
+from video_understanding.core.upload.quarantine import QuarantineManager
+from video_understanding.core.upload.quarantine_catalog import CATALOG_NAME
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Quarantine manager on a temporary upload directory."""
+    directory_manager = DirectoryManager(tmp_path / "uploads")
+    directory_manager.initialize_directories()
+    manager = QuarantineManager(directory_manager)
+    yield manager
+    manager.close()
+
+
+def quarantine(manager, tmp_path, name, reason="Failed security check", age_days=0):
+    """Quarantine a new file, backdated by age_days."""
+    file_path = tmp_path / name
+    file_path.write_bytes(b"\x00\x00\x00\x18ftypmp42" + name.encode())
+    quarantined_at = datetime.now() - timedelta(days=age_days)
+    with patch.object(quarantine_module, "datetime") as clock:
+        clock.now.return_value = quarantined_at
+        return manager.quarantine_file(file_path, reason, {"mime_type": "video/mp4"})
+
+
+def test_paginated_listing(manager, tmp_path):
+    """Test listing pages newest first and filtering by reason."""
+    for day in range(5):
+        reason = "Malware" if day % 2 else "Failed security check"
+        quarantine(manager, tmp_path, f"video{day}.mp4", reason, age_days=day)
+
+    first = manager.list_quarantined_files(limit=2)
+    second = manager.list_quarantined_files(limit=2, offset=2)
+    assert [key.split("_", 2)[2] for key in first] == ["video0", "video1"]
+    assert [key.split("_", 2)[2] for key in second] == ["video2", "video3"]
+    assert set(first[next(iter(first))]) == {"quarantine_time", "reason"}
+
+    malware = manager.list_quarantined_files(include_metadata=True, reason="Malware")
+    assert len(malware) == manager.count_quarantined_files("Malware") == 2
+    assert all(
+        info["file_info"]["mime_type"] == "video/mp4" for info in malware.values()
+    )
+
+
+def test_cleanup_removes_only_expired_files(manager, tmp_path):
+    """Test that cleanup removes old files, sidecars and catalog entries."""
+    old = quarantine(manager, tmp_path, "old.mp4", age_days=40)
+    recent = quarantine(manager, tmp_path, "recent.mp4", age_days=10)
+
+    with patch.object(quarantine_module, "CLEANUP_BATCH_SIZE", 1):
+        assert manager.cleanup_quarantine(max_age_days=30) == 1
+
+    assert not old.exists() and not old.with_suffix(".meta").exists()
+    assert recent.exists()
+    assert manager.count_quarantined_files() == 1
+    assert manager.get_quarantine_info(recent)["reason"] == "Failed security check"
+
+
+def test_cleanup_keeps_entries_it_cannot_delete(manager, tmp_path):
+    """Test that files failing to unlink stay catalogued and are retried."""
+    stuck = quarantine(manager, tmp_path, "stuck.mp4", age_days=50)
+    old = quarantine(manager, tmp_path, "old.mp4", age_days=40)
+    unlink = Path.unlink
+
+    def failing_unlink(path, missing_ok=False):
+        if path == stuck:
+            raise PermissionError("busy")
+        unlink(path, missing_ok=missing_ok)
+
+    with patch.object(quarantine_module, "CLEANUP_BATCH_SIZE", 1):
+        with patch.object(Path, "unlink", failing_unlink):
+            assert manager.cleanup_quarantine(max_age_days=30) == 1
+
+        assert stuck.exists() and not old.exists()
+        assert manager.count_quarantined_files() == 1
+        assert manager.get_quarantine_info(stuck) is not None
+
+        assert manager.cleanup_quarantine(max_age_days=30) == 1
+    assert not stuck.exists() and manager.count_quarantined_files() == 0
+
+
+def test_rebuild_catalog_from_sidecars(manager, tmp_path):
+    """Test recovering a lost catalog from the .meta files."""
+    quarantined = quarantine(manager, tmp_path, "video.mp4", age_days=3)
+    info = json.loads(quarantined.with_suffix(".meta").read_text())
+    assert info["file_info"]["size"] == quarantined.stat().st_size
+    manager.close()
+    (manager.directory_manager.get_path("quarantine") / CATALOG_NAME).unlink()
+
+    reopened = QuarantineManager(manager.directory_manager)
+    assert reopened.get_quarantine_info(quarantined) == info
+    assert reopened.list_quarantined_files() == {
+        quarantined.stem: {
+            "quarantine_time": info["quarantine_time"],
+            "reason": info["reason"],
+        }
+    }
+
+    destination = manager.directory_manager.get_path("processing", "restored.mp4")
+    restored = reopened.restore_file(quarantined, destination)
+    assert restored.exists()
+    assert reopened.rebuild_catalog() == 0
+    reopened.close()
@@ -0,0 +1,88 @@
+"""Tests for motion-adaptive frame sampling."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from video_understanding.core.upload import sampling as sampling_module
+from video_understanding.core.upload.sampling import MotionAdaptiveSampler
+
+
+@pytest.fixture(autouse=True)
+def thumbnail_cv2():
+    """Patch cv2 in the sampling module so resize returns the frame unchanged."""
+    with patch.object(sampling_module, "cv2") as mock_cv2:
+        mock_cv2.resize.side_effect = lambda frame, size, interpolation=None: frame
+        yield mock_cv2
+
+
+def _frame(changed_pixels=0):
+    """Grayscale 10x10 frame with the first pixels brightened."""
+    frame = np.zeros((10, 10), dtype=np.uint8)
+    frame.ravel()[:changed_pixels] = 200
+    return frame
+
+
+def _sample(sampler, frames):
+    return [
+        number
+        for number, frame in enumerate(frames)
+        if sampler.should_sample(frame, number)
+    ]
+
+
+def test_static_video_falls_to_floor_rate():
+    """Test that unchanged frames are only sampled at the floor rate."""
+    sampler = MotionAdaptiveSampler(floor_interval=10)
+
+    assert _sample(sampler, [_frame()] * 35) == [0, 10, 20, 30]
+    assert sampler.stats.floor_samples == 4
+    assert sampler.stats.motion_samples == 0
+
+
+def test_changing_content_raises_sample_rate():
+    """Test that changed frames are sampled, at most every min_interval frames."""
+    sampler = MotionAdaptiveSampler(
+        motion_threshold=0.05, min_interval=2, floor_interval=10
+    )
+    # Frames keep changing from frame 5 on; the first frames differ by less
+    # than the threshold and are ignored
+    frames = [_frame(i % 2) for i in range(5)] + [_frame(10 * i) for i in range(1, 11)]
+
+    assert _sample(sampler, frames) == [0, 5, 7, 9, 11, 13]
+    assert sampler.stats.motion_samples == 5
+    assert sampler.stats.sample_ratio == pytest.approx(6 / 15)
+
+
+def test_budget_reserves_floor_samples():
+    """Test that motion samples never use budget needed for the floor rate."""
+    sampler = MotionAdaptiveSampler(floor_interval=10, frame_budget=5)
+    sampler.reset(frame_count=40)
+    # Every frame differs from the previous one
+    frames = [_frame(50 * (i % 2)) for i in range(40)]
+
+    sampled = _sample(sampler, frames)
+
+    assert len(sampled) == 5
+    assert sampled[-1] >= 30
+    assert sampler.stats.budget_skipped > 0
+
+
+def test_floor_interval_stretched_to_fit_budget():
+    """Test that the floor rate alone never exceeds the budget."""
+    sampler = MotionAdaptiveSampler(floor_interval=10, frame_budget=4)
+    sampler.reset(frame_count=100)
+
+    assert sampler.effective_floor_interval == 25
+    assert _sample(sampler, [_frame()] * 100) == [0, 25, 50, 75]
+
+
+def test_sampler_invalid_parameters():
+    """Test parameter validation."""
+    with pytest.raises(ValueError):
+        MotionAdaptiveSampler(motion_threshold=0)
+    with pytest.raises(ValueError):
+        MotionAdaptiveSampler(min_interval=5, floor_interval=2)
+    with pytest.raises(ValueError):
+        MotionAdaptiveSampler(frame_budget=0)
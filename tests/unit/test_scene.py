@@ -3,10 +3,17 @@
 import pytest
 from pathlib import Path
 import tempfile
+from unittest.mock import MagicMock, patch
 import cv2
 import numpy as np
 
-from video_understanding.core.upload.scene import SceneDetector
+from video_understanding.core.decoder import DecodedFrame
+from video_understanding.core.upload import scene as scene_module
+from video_understanding.core.upload.scene import (
+    HistogramSceneDetector,
+    SceneChangeType,
+    SceneDetector,
+)
 
 @pytest.fixture
 def sample_video():
@@ -76,6 +83,34 @@ async def test_scene_detection_invalid_file():
     scenes = await detector.detect(Path("nonexistent.mp4"))
     assert len(scenes) == 0
 
+@pytest.mark.asyncio
+async def test_scene_detection_fast_profile(tmp_path):
+    """Test that the fast profile compares consecutive keyframes only."""
+    video_file = tmp_path / "video.mp4"
+    video_file.touch()
+    keyframes = [
+        DecodedFrame(index=i * 30, timestamp=float(i), image=np.full((4, 4, 3), v))
+        for i, v in enumerate([0, 0, 0, 255, 255])
+    ]
+    decoder = MagicMock()
+    decoder.__iter__.return_value = iter(keyframes)
+    decoder.fps = 30.0
+
+    def frame_diff(frame1, frame2):
+        return float(abs(int(frame2[0, 0, 0]) - int(frame1[0, 0, 0])))
+
+    detector = SceneDetector()
+    detector.set_decode_profile("fast")
+    with patch.object(scene_module, "FrameDecoder", return_value=decoder), \
+            patch.object(detector, "_calculate_frame_diff", side_effect=frame_diff):
+        scenes = await detector.detect(video_file)
+
+    assert [(s["start_frame"], s["end_frame"]) for s in scenes] == [(0, 90), (90, 121)]
+    assert scenes[0]["end_time"] == 3.0
+
+    with pytest.raises(ValueError):
+        detector.set_decode_profile("turbo")
+
 @pytest.mark.asyncio
 async def test_frame_difference():
     """Test frame difference calculation."""
@@ -90,3 +125,94 @@ async def test_frame_difference():
 
     diff = detector._calculate_frame_diff(frame1, frame2)
     assert diff > 0
+
+
+@pytest.fixture
+def histogram_detector():
+    """Histogram detector with cv2 resize/colour conversion passed through.
+
+    Test frames are built directly in HSV space at thumbnail size.
+    """
+    with patch.object(scene_module, "cv2") as mock_cv2:
+        mock_cv2.resize.side_effect = lambda frame, size, interpolation=None: frame
+        mock_cv2.cvtColor.side_effect = lambda frame, code: frame
+        yield HistogramSceneDetector(thumbnail_size=(64, 36))
+
+
+def _hsv_frame(hue: int, saturation: int = 200, value: int = 200, seed: int = 0):
+    """Create a textured HSV test frame around the given colour."""
+    rng = np.random.default_rng(seed)
+    frame = np.empty((36, 64, 3), dtype=np.uint8)
+    frame[:, :, 0] = np.clip(rng.normal(hue, 4, (36, 64)), 0, 179)
+    frame[:, :, 1] = np.clip(rng.normal(saturation, 20, (36, 64)), 0, 255)
+    frame[:, :, 2] = np.clip(rng.normal(value, 30, (36, 64)), 0, 255)
+    return frame
+
+
+def _feed(detector, frames):
+    """Feed frames to a detector and collect reported changes."""
+    changes = []
+    for number, frame in enumerate(frames):
+        change = detector.detect_change(frame, number, number / 30.0)
+        if change:
+            changes.append(change)
+    return changes
+
+
+def test_histogram_detector_cut(histogram_detector):
+    """Test that an abrupt content change is reported as a cut."""
+    frames = [_hsv_frame(30, seed=i) for i in range(20)]
+    frames += [_hsv_frame(120, seed=i) for i in range(20, 40)]
+
+    changes = _feed(histogram_detector, frames)
+
+    assert len(changes) == 1
+    assert changes[0].type == SceneChangeType.CUT
+    assert changes[0].frame_number == 20
+
+
+def test_histogram_detector_ignores_motion(histogram_detector):
+    """Test that moving content with a stable distribution is not a change."""
+    texture = _hsv_frame(60, seed=1)
+    frames = [np.roll(texture, shift * 3, axis=1) for shift in range(40)]
+
+    assert _feed(histogram_detector, frames) == []
+
+
+def test_histogram_detector_fade(histogram_detector):
+    """Test that a fade through black is classified as a fade."""
+    scene = _hsv_frame(30)
+    frames = [scene.copy() for _ in range(20)]
+    for step in range(15):
+        faded = scene.copy()
+        faded[:, :, 2] = (scene[:, :, 2] * (1 - step / 14)).astype(np.uint8)
+        frames.append(faded)
+    frames += [np.zeros_like(scene) for _ in range(10)]
+
+    changes = _feed(histogram_detector, frames)
+
+    assert [change.type for change in changes] == [SceneChangeType.FADE]
+    assert 20 <= changes[0].frame_number <= 22
+
+
+def test_histogram_detector_dissolve(histogram_detector):
+    """Test that a cross-dissolve is classified as a dissolve."""
+    first, second = _hsv_frame(30), _hsv_frame(120, seed=1)
+    frames = [first.copy() for _ in range(20)]
+    for step in range(20):
+        alpha = step / 19
+        frames.append((first * (1 - alpha) + second * alpha).astype(np.uint8))
+    frames += [second.copy() for _ in range(10)]
+
+    changes = _feed(histogram_detector, frames)
+
+    assert [change.type for change in changes] == [SceneChangeType.DISSOLVE]
+    assert changes[0].frame_number >= 20
+
+
+def test_histogram_detector_reset(histogram_detector):
+    """Test that reset clears stream state between videos."""
+    _feed(histogram_detector, [_hsv_frame(30, seed=i) for i in range(5)])
+    histogram_detector.reset()
+
+    assert histogram_detector.detect_change(_hsv_frame(120), 0, 0.0) is None
@@ -8,9 +8,11 @@ from unittest.mock import patch
 from uuid import uuid4
 
 # Third-party imports
+import numpy as np
 import pytest
 
 # Local imports
+from video_understanding.core import scene as scene_module
 from video_understanding.core.scene import SceneDetector
 from video_understanding.models.scene import Scene
 from video_understanding.models.video import Video, VideoFile
@@ -129,3 +131,69 @@ def test_scene_detection_error_handling(
     )
     with pytest.raises(ValueError, match="Unsupported video format"):
         scene_detector.detect_scenes(invalid_video)
+
+
+class _SeekCountingCapture:
+    """VideoCapture stand-in whose frames hold their own index."""
+
+    def __init__(self, frame_total: int = 600, fps: float = 30.0) -> None:
+        self.frame_total = frame_total
+        self.fps = fps
+        self.position = 0
+        self.seeks: list[int] = []
+
+    def isOpened(self) -> bool:
+        return True
+
+    def get(self, prop: int) -> float:
+        return self.fps
+
+    def set(self, prop: int, value: int) -> bool:
+        self.seeks.append(value)
+        self.position = value
+        return True
+
+    def grab(self) -> bool:
+        if self.position >= self.frame_total:
+            return False
+        self.position += 1
+        return True
+
+    def read(self) -> tuple[bool, np.ndarray | None]:
+        if self.position >= self.frame_total:
+            return False, None
+        self.position += 1
+        return True, np.full((2, 2, 3), self.position - 1, dtype=np.int32)
+
+    def release(self) -> None:
+        pass
+
+
+def test_extract_keyframes_single_pass(scene_detector: SceneDetector) -> None:
+    """Test that keyframes are read in one pass, seeking only over large gaps."""
+    capture = _SeekCountingCapture()
+    with patch.object(scene_module, "cv2") as mock_cv2:
+        mock_cv2.VideoCapture.return_value = capture
+        frames = scene_detector.extract_keyframes(
+            Path("video.mp4"), [15.0, 1.0, 1.5, 1.0, 0.0], seek_threshold=2.0
+        )
+
+    assert [int(frame[0, 0, 0]) for frame in frames] == [450, 30, 45, 30, 0]
+    # Only the jump from 1.5s to 15s is longer than the seek threshold
+    assert capture.seeks == [450]
+
+
+def test_extract_keyframes_past_end(scene_detector: SceneDetector) -> None:
+    """Test that timestamps beyond the video raise ValueError."""
+    with patch.object(scene_module, "cv2") as mock_cv2:
+        mock_cv2.VideoCapture.return_value = _SeekCountingCapture(frame_total=30)
+        with pytest.raises(ValueError):
+            scene_detector.extract_keyframes(Path("video.mp4"), [0.5, 1.5])
+
+
+def test_extract_keyframes_unknown_frame_rate(scene_detector: SceneDetector) -> None:
+    """Test that an unreadable frame rate raises instead of using frame 0."""
+    with patch.object(scene_module, "cv2") as mock_cv2:
+        mock_cv2.VideoCapture.return_value = _SeekCountingCapture(fps=0.0)
+        with pytest.raises(ValueError, match="frame rate"):
+            scene_detector.extract_keyframes(Path("video.mp4"), [0.5, 1.5])
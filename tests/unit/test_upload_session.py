@@ -0,0 +1,126 @@
+"""Tests for resumable chunked upload sessions."""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from video_understanding.core.upload.processor import UploadProcessor
+from video_understanding.core.upload.session import UploadSessionManager
+from video_understanding.models.video import ProcessingStatus, VideoMetadata
+from video_understanding.utils.exceptions import UploadSessionError
+
+CHUNK_SIZE = 1000
+CONTENT = os.urandom(4500)
+METADATA = VideoMetadata(
+    duration=10.0, width=640, height=480, fps=30.0, codec="h264", total_frames=300
+)
+
+
+def chunk(index):
+    """Content of one chunk."""
+    return CONTENT[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE]
+
+
+@pytest.fixture
+def processor(tmp_path):
+    """Upload processor with validation stubbed out."""
+    processor = UploadProcessor(tmp_path / "uploads")
+    processor.directory_manager.initialize_directories()
+    with patch.object(processor, "_validate_security"), patch.object(
+        processor, "_validate_integrity", return_value=METADATA
+    ):
+        yield processor
+
+
+@pytest.fixture
+def sessions(processor):
+    """Session manager with small chunks."""
+    return UploadSessionManager(processor, chunk_size=CHUNK_SIZE)
+
+
+def test_parallel_out_of_order_chunks_commit(sessions):
+    """Test that chunks written in any order assemble the file."""
+    session = sessions.create_session("video.mp4", len(CONTENT))
+    assert session.chunk_count == 5
+    data_path = sessions.sessions_dir / session.session_id / "data.partial"
+    assert data_path.stat().st_size == len(CONTENT)
+
+    def put(index):
+        return sessions.put_chunk(session.session_id, index, chunk(index))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(put, [4, 2, 0, 3, 1]))
+    assert session.is_complete
+
+    video = sessions.commit(session.session_id)
+
+    assert video.processing.status == ProcessingStatus.COMPLETED
+    assert video.file_info.filename == "video.mp4"
+    assert video.file_info.file_path.read_bytes() == CONTENT
+    assert not (sessions.sessions_dir / session.session_id).exists()
+
+
+def test_session_resumes_from_manifest(processor, sessions):
+    """Test that a new manager resumes a session from disk."""
+    session = sessions.create_session("video.mp4", len(CONTENT))
+    for index in (0, 1, 3):
+        sessions.put_chunk(session.session_id, index, chunk(index))
+
+    resumed = UploadSessionManager(processor, chunk_size=CHUNK_SIZE)
+    assert resumed.get_session(session.session_id).missing_chunks() == [2, 4]
+    for index in (2, 4):
+        resumed.put_chunk(session.session_id, index, chunk(index))
+
+    video = resumed.commit(session.session_id)
+    assert video.file_info.file_path.read_bytes() == CONTENT
+
+
+def test_chunk_validation(sessions):
+    """Test rejection of corrupted, misplaced and missing chunks."""
+    session = sessions.create_session("video.mp4", len(CONTENT))
+
+    with pytest.raises(UploadSessionError, match="checksum"):
+        sessions.put_chunk(session.session_id, 0, chunk(0), checksum="0" * 64)
+    with pytest.raises(UploadSessionError, match="expected 500"):
+        sessions.put_chunk(session.session_id, 4, chunk(0))
+    with pytest.raises(UploadSessionError, match="out of range"):
+        sessions.put_chunk(session.session_id, 5, chunk(0))
+
+    sessions.put_chunk(
+        session.session_id, 0, chunk(0), hashlib.sha256(chunk(0)).hexdigest()
+    )
+    sessions.put_chunk(session.session_id, 0, chunk(0))
+    assert session.received_bytes == CHUNK_SIZE
+    with pytest.raises(UploadSessionError, match="missing 4 chunks"):
+        sessions.commit(session.session_id)
+
+
+def test_whole_file_checksum_mismatch_aborts(sessions):
+    """Test that a commit not matching the announced checksum is refused."""
+    session = sessions.create_session("video.mp4", len(CONTENT), checksum="0" * 64)
+    for index in range(session.chunk_count):
+        sessions.put_chunk(session.session_id, index, chunk(index))
+
+    with pytest.raises(UploadSessionError, match="does not match"):
+        sessions.commit(session.session_id)
+    with pytest.raises(UploadSessionError, match="not found"):
+        sessions.get_session(session.session_id)
+
+
+def test_cleanup_expired_sessions(sessions):
+    """Test that only inactive sessions are removed."""
+    stale = sessions.create_session("stale.mp4", len(CONTENT))
+    live = sessions.create_session("live.mp4", len(CONTENT))
+    manifest = sessions.sessions_dir / stale.session_id / "manifest.json"
+    data = json.loads(manifest.read_text())
+    data["expires_at"] = time.time() - 1
+    manifest.write_text(json.dumps(data))
+
+    assert sessions.cleanup_expired() == 1
+    assert not (sessions.sessions_dir / stale.session_id).exists()
+    assert sessions.get_session(live.session_id) is live